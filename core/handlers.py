@@ -8,9 +8,11 @@ from sverchok.core.event_system import handle_event
 from sverchok.core.socket_data import clear_all_socket_cache
 from sverchok.ui import bgl_callback_nodeview, bgl_callback_3dview
 from sverchok.utils import app_handler_ops
+from sverchok.utils.blender_mesh import tag_geometry_updates, reset_geometry_revisions
 from sverchok.utils.handle_blender_data import BlTrees
 from sverchok.utils import dummy_nodes
 from sverchok.utils.logging import catch_log_error, debug
+from sverchok.utils.evaluation_cache import evaluation_cache, update_evaluation_cache
 
 _state = {'frame': None}
 
@@ -83,6 +85,7 @@ def sv_handler_undo_post(scene):
         sv_main_handler(scene)
 
     undo_handler_node_count['sv_groups'] = 0
+    reset_geometry_revisions()
 
 
 @persistent
@@ -136,6 +139,15 @@ def sv_main_handler(scene):
         ng.scene_update()
 
 
+@persistent
+def sv_post_depsgraph_handler(scene, depsgraph):
+    """
+    On depsgraph update (post): remember which objects had their geometry
+    changed, so that nodes can reuse data of other objects
+    """
+    tag_geometry_updates(depsgraph)
+
+
 @persistent
 def sv_clean(scene):
     """
@@ -158,6 +170,8 @@ def sv_pre_load(scene):
     4. evaluate trees from main tree handler
     """
     clear_all_socket_cache()
+    evaluation_cache.clear()
+    reset_geometry_revisions()
     sv_clean(scene)
 
     handle_event(ev.FileEvent())
@@ -224,6 +238,7 @@ handler_dict = {
     'load_pre': sv_pre_load,
     'load_post': sv_post_load,
     'depsgraph_update_pre': sv_main_handler,
+    'depsgraph_update_post': sv_post_depsgraph_handler,
 }
 
 
@@ -238,6 +253,7 @@ def register():
     data_structure.setup_init()
 
     update_frame_change_mode()
+    update_evaluation_cache()
     bpy.app.handlers.load_post.append(call_user_functions_on_post_load_event)
 
 
@@ -26,7 +26,8 @@ from sverchok.utils.curve import SvCurve
 from sverchok.utils.surface import SvSurface
 from sverchok.utils.solid_conversion import to_solid_recursive
 
-from mathutils import Matrix, Quaternion
+import numpy as np
+from mathutils import Matrix
 from numpy import ndarray
 
 
@@ -59,68 +60,80 @@ def numbers_to_sfield(data):
         raise TypeError("Unexpected data type from String socket: %s" % type(data))
 
 
-def vectors_to_matrices(source_data):
-    """This means we're going to get a flat list of the incoming
-    locations and convert those into matrices proper."""
-    location_matrices = []
-    collect_matrix = location_matrices.append
+def _is_vector(item, size):
+    return isinstance(item, (tuple, list, ndarray)) and len(item) == size \
+        and isinstance(item[0], (float, int, np.floating, np.integer))
+
+
+def collect_vectors(source_data, size):
+    """Returns all vectors of given size found in nested source data as a flat
+    NumPy array of shape (n, size). Lists of vectors and arrays are converted
+    at once, other data is walked recursively."""
+    chunks = []
 
     def get_all(data):
+        if isinstance(data, ndarray) and data.ndim >= 2 and data.shape[-1] == size:
+            chunks.append(data.reshape(-1, size))
+            return
+        if len(data) and _is_vector(data[0], size):
+            try:
+                array = np.asarray(data, dtype=np.float64)
+            except (ValueError, TypeError):
+                array = None
+            if array is not None and array.ndim == 2:
+                chunks.append(array)
+                return
         for item in data:
-            if isinstance(item, (tuple, list, ndarray)) and len(item) == 3 and isinstance(item[0], (float, int)):
-                # generate location matrix from location
-                x, y, z = item
-                collect_matrix(Matrix([(1., .0, .0, x), (.0, 1., .0, y), (.0, .0, 1., z), (.0, .0, .0, 1.)]))
+            if _is_vector(item, size):
+                chunks.append(np.asarray(item, dtype=np.float64)[np.newaxis])
             else:
                 get_all(item)
 
     get_all(source_data)
-    return location_matrices
+    if not chunks:
+        return np.empty((0, size))
+    return np.concatenate(chunks)
 
 
-def matrices_to_vectors(source_data):
-    locations = []
-    collect_vector = locations.append
+def vectors_to_matrices(source_data):
+    """This means we're going to get a flat list of the incoming
+    locations and convert those into matrices proper."""
+    locations = collect_vectors(source_data, 3)
+    matrices = np.zeros((len(locations), 4, 4))
+    matrices[:, range(4), range(4)] = 1.0
+    matrices[:, :3, 3] = locations
+    return [Matrix(m) for m in matrices.tolist()]
 
-    def get_all(data):
-        for sublist in data:
-            collect_vector(sublist.to_translation()[:])
 
-    get_all(source_data)
-    return [locations]
+def matrices_to_vectors(source_data):
+    return [[m.translation[:] for m in source_data]]
 
 
 def quaternions_to_matrices(source_data):
-    matrices = []
-    collect_matrix = matrices.append
-
-    def get_all(data):
-        for item in data:
-            if isinstance(item, (tuple, list)) and len(item) == 4 and isinstance(item[0], (float, int)):
-                mat = Quaternion(item).to_matrix().to_4x4()
-                collect_matrix(mat)
-            else:
-                get_all(item)
-
-    get_all(source_data)
-    return matrices
+    # the same formula as in Quaternion.to_matrix, it does not normalize quaternions
+    w, x, y, z = collect_vectors(source_data, 4).T
+    matrices = np.zeros((len(w), 4, 4))
+    matrices[:, 0, 0] = 1.0 - 2.0 * (y*y + z*z)
+    matrices[:, 0, 1] = 2.0 * (x*y - w*z)
+    matrices[:, 0, 2] = 2.0 * (x*z + w*y)
+    matrices[:, 1, 0] = 2.0 * (x*y + w*z)
+    matrices[:, 1, 1] = 1.0 - 2.0 * (x*x + z*z)
+    matrices[:, 1, 2] = 2.0 * (y*z - w*x)
+    matrices[:, 2, 0] = 2.0 * (x*z - w*y)
+    matrices[:, 2, 1] = 2.0 * (y*z + w*x)
+    matrices[:, 2, 2] = 1.0 - 2.0 * (x*x + y*y)
+    matrices[:, 3, 3] = 1.0
+    return [Matrix(m) for m in matrices.tolist()]
 
 
 def matrices_to_quaternions(source_data):
-    quaternions = []
-    collect_quaternion = quaternions.append
-
-    def get_all(data):
-        for mat in data:
-            q = tuple(mat.to_quaternion())
-            collect_quaternion(q)
-
-    get_all(source_data)
-    return [quaternions]
+    return [[tuple(m.to_quaternion()) for m in source_data]]
 
 
 def string_to_vector(source_data):
     # it can be so that socket is string but data their are already vectors, performance-wise we check only first item
+    if isinstance(source_data[0], ndarray) and source_data[0].ndim == 1:
+        return [np.repeat(np.asarray(obj)[:, np.newaxis], 3, axis=1) for obj in source_data]
     if isinstance(source_data[0][0], (float, int)):
         return [[(v, v, v) for v in obj] for obj in source_data]
     return source_data
@@ -128,6 +141,11 @@ def string_to_vector(source_data):
 
 def string_to_color(source_data):
     # it can be so that socket is string but data their are already colors, performance-wise we check only first item
+    if isinstance(source_data[0], ndarray) and source_data[0].ndim == 1:
+        colors = [np.ones((len(obj), 4)) for obj in source_data]
+        for obj, color in zip(source_data, colors):
+            color[:, :3] = np.asarray(obj)[:, np.newaxis]
+        return colors
     if isinstance(source_data[0][0], (float, int)):
         return [[(v, v, v, 1) for v in obj] for obj in source_data]
     if len(source_data[0][0]) == 3:
@@ -136,7 +154,15 @@ def string_to_color(source_data):
 
 
 def vector_to_color(source_data):
-    return [[(v[0], v[1], v[2], 1) for v in obj] for obj in source_data]
+    colors = []
+    for obj in source_data:
+        if isinstance(obj, ndarray) and obj.ndim == 2 and obj.shape[1] == 3:
+            color = np.ones((len(obj), 4), dtype=obj.dtype if obj.dtype.kind == 'f' else np.float64)
+            color[:, :3] = obj
+            colors.append(color)
+        else:
+            colors.append([(v[0], v[1], v[2], 1) for v in obj])
+    return colors
 
 
 class NoImplicitConversionPolicy:
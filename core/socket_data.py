@@ -23,7 +23,9 @@ from itertools import chain
 from traceback import format_list, extract_stack
 from typing import NewType, Optional, Literal
 
+import numpy as np
 from bpy.types import NodeSocket
+from mathutils import Matrix, Vector, Quaternion, Color
 from sverchok.core.sv_custom_exceptions import SvNoDataError
 from sverchok.utils.logging import debug
 from sverchok.utils.handle_blender_data import BlTrees
@@ -156,6 +158,10 @@ class DebugMemory(UserDict):
 socket_data_cache: dict[SockId, list] = dict()
 # socket_data_cache = DebugMemory(socket_data_cache)
 
+# results of implicit conversions of output sockets data,
+# {source socket id: {(target socket type, conversion policy): (source data, converted data)}}
+socket_conversion_cache: dict[SockId, dict[tuple[str, str], tuple[list, list]]] = dict()
+
 
 def sv_deep_copy(lst):
     """return deep copied data of list/tuple structure"""
@@ -170,17 +176,51 @@ def sv_deep_copy(lst):
     return lst
 
 
+def sv_copy_converted(data):
+    """return a copy of converted socket data, so that a node changing its
+    input in place does not change data handed out to other nodes;
+    unlike sv_deep_copy it also copies matrices, vectors and numpy arrays"""
+    if isinstance(data, (list, tuple)):
+        # numbers and tuples of numbers (vertices, colors) are immutable
+        first = data[0] if data else None
+        if isinstance(first, (int, float, str)) or \
+                isinstance(first, tuple) and first and isinstance(first[0], (int, float)):
+            return data[:]
+        return type(data)(sv_copy_converted(item) for item in data)
+    if isinstance(data, (np.ndarray, Matrix, Vector, Quaternion, Color)):
+        return data.copy()
+    return data
+
+
 def sv_forget_socket(socket):
     """deletes socket data from cache"""
     try:
         del socket_data_cache[socket.socket_id]
     except KeyError:
         pass
+    socket_conversion_cache.pop(socket.socket_id, None)
 
 
 def sv_set_socket(socket, data):
     """sets socket data for socket"""
     socket_data_cache[socket.socket_id] = data
+    socket_conversion_cache.pop(socket.socket_id, None)
+
+
+def sv_get_converted_socket(from_socket, to_socket, source_data, conversion):
+    """returns data of the output socket converted for the input socket,
+    the result is reused by all links from the output socket to sockets
+    of the same type and conversion policy until the output socket gets new data
+    :conversion: implicit conversion policy class
+    :source_data: data of from_socket (not a copy)"""
+    key = (to_socket.bl_idname, to_socket.default_conversion_name)
+    cache = socket_conversion_cache.setdefault(from_socket.socket_id, dict())
+    cached = cache.get(key)
+    if cached is not None and cached[0] is source_data:
+        return sv_copy_converted(cached[1])
+    data = conversion.convert(to_socket, from_socket, source_data)
+    cache[key] = (source_data, data)
+    return sv_copy_converted(data)
 
 
 def sv_get_socket(socket, deepcopy=True):
@@ -215,3 +255,4 @@ def clear_all_socket_cache():
     Reset socket cache for all node-trees.
     """
     socket_data_cache.clear()
+    socket_conversion_cache.clear()
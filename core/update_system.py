@@ -11,6 +11,7 @@ import sverchok.core.events as ev
 import sverchok.core.tasks as ts
 from sverchok.core.sv_custom_exceptions import CancelError, SvNoDataError
 from sverchok.core.socket_conversions import conversions
+from sverchok.core.socket_data import sv_get_converted_socket
 from sverchok.utils.profile import profile
 from sverchok.utils.logging import log_error
 from sverchok.utils.tree_walk import bfs_walk
@@ -693,10 +694,10 @@ def prepare_input_data(prev_socks: list[Optional[NodeSocket]],
             # let to the node handle No Data error
             ns.sv_forget()
         else:
-            # cast data
+            # cast data, the result is cached per output socket
             if ps.bl_idname != ns.bl_idname:
                 implicit_conversion = conversions[ns.default_conversion_name]
-                data = implicit_conversion.convert(ns, ps, data)
+                data = sv_get_converted_socket(ps, ns, data, implicit_conversion)
 
             ns.sv_set(data)
 
@@ -37,6 +37,7 @@ from numpy import (
     float64,
     int32, int64)
 from sverchok.utils.logging import debug
+from sverchok.utils.mesh.ragged import SvPolygons
 import numpy as np
 
 
@@ -488,6 +489,8 @@ def data_standard(data, dept, nominal_dept):
 
 def levelsOflist(lst):
     """calc list nesting only in countainment level integer"""
+    if isinstance(lst, SvPolygons):
+        return 2
     level = 1
     for n in lst:
         if n and isinstance(n, (list, tuple)):
@@ -503,6 +506,8 @@ def levels_of_list_or_np(lst):
             level += levels_of_list_or_np(n)
         elif isinstance(n, (ndarray)):
             level += len(n.shape)
+        elif isinstance(n, SvPolygons):
+            level += 2
 
         return level
     return 0
@@ -534,7 +539,7 @@ def get_data_nesting_level(data, data_types=SIMPLE_DATA_TYPES):
         """ Needed only for better error reporting. """
         if isinstance(data, data_types):
             return 0
-        elif isinstance(data, (list, tuple, ndarray)):
+        elif isinstance(data, (list, tuple, ndarray, SvPolygons)):
             if len(data) == 0:
                 return 1
             else:
@@ -1097,6 +1102,8 @@ def matrixdef(orig, loc, scale, rot, angle, vec_angle=[[]]):
 def has_element(pol_edge):
     if pol_edge is None:
         return False
+    if isinstance(pol_edge, SvPolygons):
+        return len(pol_edge) > 0 and pol_edge.offsets[1] > 0
     if len(pol_edge) > 0 and hasattr(pol_edge[0], '__len__') and len(pol_edge[0]) > 0:
         return True
     return False
@@ -21,9 +21,10 @@ import numpy as np
 from mathutils import Vector
 from mathutils.bvhtree import BVHTree
 
-from bpy.props import BoolProperty, IntProperty
+from bpy.props import BoolProperty, IntProperty, EnumProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, match_long_repeat, match_cross)
+from sverchok.utils.raycast import SvRayCaster
 
 
 class FakeObj(object):
@@ -54,6 +55,22 @@ class FakeObj(object):
             return [True, tv[0], tv[1], tv[2]]
 
 
+def mesh_data(obj):
+    """
+    Vertices and polygons of object's mesh, read with foreach_get.
+    """
+    data = obj.to_mesh()
+    vertices = np.empty(len(data.vertices) * 3)
+    data.vertices.foreach_get('co', vertices)
+    loop_starts = np.empty(len(data.polygons), dtype=np.int32)
+    data.polygons.foreach_get('loop_start', loop_starts)
+    loop_vertices = np.empty(len(data.loops), dtype=np.int32)
+    data.loops.foreach_get('vertex_index', loop_vertices)
+    obj.to_mesh_clear()
+    polygons = np.split(loop_vertices, loop_starts[1:]) if len(loop_starts) else []
+    return vertices.reshape((-1, 3)), polygons
+
+
 class SvOBJInsolationNode(bpy.types.Node, SverchCustomTreeNode):
     ''' Insolation by RayCast Object '''
     bl_idname = 'SvOBJInsolationNode'
@@ -76,6 +93,17 @@ class SvOBJInsolationNode(bpy.types.Node, SverchCustomTreeNode):
     sort_critical: IntProperty(name='sort_critical', default=12, min=1,max=24, update=updateNode)
     separate: BoolProperty(name='separate the', default=False, update=updateNode)
 
+    implementations = [
+        ('MATHUTILS', "Mathutils", "Cast rays one by one with Blender's ray_cast", 0),
+        ('NUMPY', "NumPy", "Cast all rays at once; much faster for many rays", 1)
+    ]
+
+    implementation: EnumProperty(
+        name='Implementation',
+        items=implementations,
+        default='MATHUTILS', # for existing nodes
+        update=updateNode)
+
     def sv_init(self, context):
         si,so = self.inputs.new,self.outputs.new
         #si('SvStringsSocket', 'Date')
@@ -87,12 +115,39 @@ class SvOBJInsolationNode(bpy.types.Node, SverchCustomTreeNode):
         #so('SvVerticesSocket', "HitP")
         so('SvStringsSocket',  "Hours")
         # self.inputs[2].prop[2] = -1  # z down   # <--- mayybe?
+        self.implementation = 'NUMPY'
 
     def sv_draw_buttons_ext(self, context, layout):
         row = layout.row(align=True)
         row.prop(self,    "mode",   text="In Mode")
         row.prop(self,    "sort_critical",text="Limit")
         #row.prop(self,    "mode2",   text="Out Mode")
+        layout.prop(self, "implementation")
+
+    def cast_rays(self, objects, rec, directions):
+        """
+        Batched version of ray casting: for each predator object, returns
+        np.array of shape (lenor, lendir) with True where the ray from
+        the victim polygon center to the sun is blocked.
+        """
+        centers = np.empty(len(rec.data.polygons) * 3)
+        rec.data.polygons.foreach_get('center', centers)
+        centers = centers.reshape((-1, 3))
+        directions = np.array(directions, dtype=np.float64).reshape((-1, 3))
+        # same order as match_cross: 1,1,1,2,2,2 + 4,5,6,4,5,6
+        starts = np.repeat(centers, len(directions), axis=0)
+        ends = np.tile(directions, (len(centers), 1))
+        result = []
+        for obj in objects:
+            vertices, polygons = mesh_data(obj)
+            st, en = starts, ends
+            if self.mode:
+                obm = np.array(obj.matrix_local.inverted())
+                st = st @ obm[:3,:3].T + obm[:3,3]
+                en = en @ obm[:3,:3].T + obm[:3,3]
+            hits = SvRayCaster(vertices, polygons).any_hit(st, en)
+            result.append(hits.reshape((len(centers), len(directions))))
+        return centers.tolist(), result
 
     def process(self):
 
@@ -100,11 +155,24 @@ class SvOBJInsolationNode(bpy.types.Node, SverchCustomTreeNode):
         #dd,o,r,e = self.inputs
         N,H = self.outputs
         #S,H,P,N = self.outputs
-        outfin,OutLoc_,obj,rec,sm1,sc = [],[],o.sv_get(),r.sv_get()[0],self.mode,self.sort_critical
+        obj,rec,sm1,sc = o.sv_get(),r.sv_get()[0],self.mode,self.sort_critical
         #lenor = len(s.sv_get()[0])
         lendir = len(e.sv_get()[0])
         leno = len(obj)
-        #st, en = match_cross([s.sv_get()[0], e.sv_get()[0]]) # 1,1,1,2,2,2 + 4,5,6,4,5,6
+
+        if self.implementation == 'NUMPY':
+            st_, hits = self.cast_rays(obj, rec, e.sv_get()[0])
+            lenor = len(st_)
+            OutS_ = np.array(hits).reshape([leno,lenor,lendir])
+        else:
+            OutS_, st_, lenor = self.cast_rays_mathutils(obj, rec, e, sm1, leno, lendir)
+
+        self.colset(rec, OutS_, lendir)
+        self.matset(rec)
+        self.output_hours(OutS_, st_, lendir, sc)
+
+    def cast_rays_mathutils(self, obj, rec, e, sm1, leno, lendir):
+        outfin = []
         st = []
         for i in rec.data.polygons:
             st.append(i.center[:])
@@ -132,53 +200,58 @@ class SvOBJInsolationNode(bpy.types.Node, SverchCustomTreeNode):
         self.debug(outfin)
 
         OutS_ = np.array([[i[0] for i in i2] for i2 in outfin]).reshape([leno,lenor,lendir])
+        return OutS_, st_, lenor
+
+    def colset(self, rec, OutS_, lendir):
+        # colors of the first predator only are shown
+        shade = 1 - OutS_[0].sum(axis=1) / lendir
+        polygons = rec.data.polygons
+        loop_starts = np.empty(len(polygons), dtype=np.int32)
+        loop_totals = np.empty(len(polygons), dtype=np.int32)
+        polygons.foreach_get('loop_start', loop_starts)
+        polygons.foreach_get('loop_total', loop_totals)
+        offsets = np.repeat(loop_starts - (np.cumsum(loop_totals) - loop_totals), loop_totals)
+        loop_idxs = np.arange(loop_totals.sum()) + offsets
+        colors = np.ones((len(rec.data.loops), 4), dtype=np.float32)
+        colors[loop_idxs, :3] = np.repeat(shade, loop_totals)[:, np.newaxis]
+        if not 'SvInsol' in rec.data.vertex_colors:
+            rec.data.vertex_colors.new(name='SvInsol')
+        rec.data.vertex_colors['SvInsol'].data.foreach_set('color', colors.ravel())
+
+    def matset(self, rec):
+        # add new material with nodes
+        ms = rec.material_slots
+        if not 'svmat' in bpy.data.materials:
+            manew = bpy.data.materials.new('svmat')
+            manew.use_nodes = True
+        else:
+            manew = bpy.data.materials['svmat']
+        if not len(ms):
+            # append if no slots
+            rec.data.materials.append(manew)
+        if not ms[-1].material:
+            # assign if no material in slot
+            ms[-1].material = manew
+        trem = ms[-1].material.node_tree
+        matnodes = trem.nodes
+        if not 'Attribute' in matnodes:
+            att = matnodes.new('ShaderNodeAttribute')
+        else:
+            att = matnodes['Attribute']
+        if not 'Diffuse BSDF' in matnodes:
+            dif = matnodes.new('ShaderNodeBsdfDiffuse')
+        else:
+            dif = matnodes['Diffuse BSDF']
+        if not 'Material Output' in matnodes:
+            out = matnodes.new('ShaderNodeOutputMaterial')
+        else:
+            out = matnodes['Material Output']
+        att.attribute_name = 'SvInsol'
+        trem.links.new(dif.inputs[0],att.outputs[0])
+        trem.links.new(out.inputs[0],dif.outputs[0])
 
-        def colset(rec,OutS_):
-            OutS_ = 1-OutS_.sum(axis=2)/lendir
-            OutS = np.array([[[i,i,i,1] for i in k] for k in OutS_.tolist()]).reshape([leno,lenor,4]).tolist()
-            if not 'SvInsol' in rec.data.vertex_colors:
-                rec.data.vertex_colors.new(name='SvInsol')
-            colors = rec.data.vertex_colors['SvInsol'].data
-            for i, pol in enumerate(rec.data.polygons):
-                for co in pol.loop_indices:
-                    colors[co].color = OutS[0][i]
-
-        colset(rec,OutS_)
-
-        def matset(rec):
-            # add new material with nodes
-            ms = rec.material_slots
-            if not 'svmat' in bpy.data.materials:
-                manew = bpy.data.materials.new('svmat')
-                manew.use_nodes = True
-            else:
-                manew = bpy.data.materials['svmat']
-            if not len(ms):
-                # append if no slots
-                rec.data.materials.append(manew)
-            if not ms[-1].material:
-                # assign if no material in slot
-                ms[-1].material = manew
-            trem = ms[-1].material.node_tree
-            matnodes = trem.nodes
-            if not 'Attribute' in matnodes:
-                att = matnodes.new('ShaderNodeAttribute')
-            else:
-                att = matnodes['Attribute']
-            if not 'Diffuse BSDF' in matnodes:
-                dif = matnodes.new('ShaderNodeBsdfDiffuse')
-            else:
-                dif = matnodes['Diffuse BSDF']
-            if not 'Material Output' in matnodes:
-                out = matnodes.new('ShaderNodeOutputMaterial')
-            else:
-                out = matnodes['Material Output']
-            att.attribute_name = 'SvInsol'
-            trem.links.new(dif.inputs[0],att.outputs[0])
-            trem.links.new(out.inputs[0],dif.outputs[0])
-
-        matset(rec)
-
+    def output_hours(self, OutS_, st_, lendir, sc):
+        N,H = self.outputs
         if N.is_linked:
             OutH, OutN = [], []
             for k in OutS_.sum(axis=2).tolist():
@@ -27,6 +27,7 @@ from mathutils.noise import seed_set, random_unit_vector
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, list_match_func, list_match_modes
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
+from sverchok.utils.winding_number import SvWindingNumber
 
 
 def generate_random_unitvectors():
@@ -98,6 +99,11 @@ def are_inside(verts, faces, points, eps):
     return mask_inside
 
 
+def get_points_in_mesh_winding(verts, faces, points, eps=0.0):
+    # eps is not used; kept for the same signature as other algorithms
+    return SvWindingNumber(verts, faces).are_inside(points).tolist()
+
+
 def get_points_in_mesh_2D(verts, faces, points, normal, eps=0.0):
     mask_totals = []
     bvh = BVHTree.FromPolygons(verts, faces, all_triangles=False, epsilon=eps)
@@ -148,7 +154,7 @@ class SvPointInside(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Points Inside Mesh'
     sv_icon = 'SV_POINTS_INSIDE_MESH'
 
-    mode_options = [(k[0], k[1], '', i) for i, k in enumerate([("algo_1", "Regular"), ("algo_2", "Multisample")])]
+    mode_options = [(k[0], k[1], '', i) for i, k in enumerate([("algo_1", "Regular"), ("algo_2", "Multisample"), ("algo_3", "Winding Number")])]
     dimension_options = [(k, k, '', i) for i, k in enumerate(["2D", "3D"])]
 
     def update_sockets(self, context):
@@ -184,7 +190,8 @@ class SvPointInside(bpy.types.Node, SverchCustomTreeNode):
     selected_algo: EnumProperty(
         items=mode_options,
         description="offers different approaches to finding internal points",
-        default="algo_1", update=updateNode)
+        default="algo_1", # for existing nodes
+        update=updateNode)
 
     epsilon_bvh: FloatProperty(
         name='Tolerance', description='fudge value. You will encounter 32-bit float precision errors if input vertices have big numbers. For big numbers increase the value. see documentation',
@@ -219,6 +226,7 @@ class SvPointInside(bpy.types.Node, SverchCustomTreeNode):
         s = self.outputs.new('SvVerticesSocket', 'verts') # to be removed in MK2
         s.label = "Inside Vertices" # to be removed in MK2
         self.outputs.new('SvVerticesSocket', 'Outside Vertices')
+        self.selected_algo = 'algo_3'
         self.update_sockets(context)
 
     def draw_buttons(self, context, layout):
@@ -264,6 +272,8 @@ class SvPointInside(bpy.types.Node, SverchCustomTreeNode):
             elif self.selected_algo == 'algo_2':
                 params.append(cycle([self.num_samples]))
                 main_func = get_points_in_mesh
+            elif self.selected_algo == 'algo_3':
+                main_func = get_points_in_mesh_winding
         else:
             if self.limit_max_dist:
                 params.append(cycle([self.list_match_local]))
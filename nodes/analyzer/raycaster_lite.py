@@ -17,9 +17,11 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import numpy as np
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, match_long_cycle as C)
 from sverchok.utils.bvh_tree import bvh_tree_from_polygons
+from sverchok.utils.raycast import SvRayCaster
 
 # zeffii 2017 8 okt
 # airlifted from Kosvor's Raycast nodes..
@@ -46,9 +48,22 @@ class SvRaycasterLiteNode(bpy.types.Node, SverchCustomTreeNode):
         description='When disabled polygon indices referring to unexisting points will crash Blender but makes node faster',
         default=True)
 
+    implementations = [
+        ('MATHUTILS', "Mathutils", "Cast rays one by one with Blender's BVHTree", 0),
+        ('NUMPY', "NumPy", "Cast all rays at once; much faster for many rays", 1)
+    ]
+
+    implementation: bpy.props.EnumProperty(
+        name='Implementation',
+        items=implementations,
+        default='MATHUTILS', # for existing nodes
+        update=updateNode)
+
     def draw_buttons_ext(self, context, layout):
-        layout.prop(self, 'all_triangles')
-        layout.prop(self, 'safe_check')
+        layout.prop(self, 'implementation')
+        if self.implementation == 'MATHUTILS':
+            layout.prop(self, 'all_triangles')
+            layout.prop(self, 'safe_check')
     def sv_init(self, context):
         si = self.inputs.new
         so = self.outputs.new
@@ -64,17 +79,40 @@ class SvRaycasterLiteNode(bpy.types.Node, SverchCustomTreeNode):
         so('SvStringsSocket', 'Distance')
         so('SvStringsSocket', 'Success')
 
+        self.implementation = 'NUMPY'
+
     @staticmethod
     def svmesh_to_bvh_lists(v, f, all_tris, safe_check):
         for vertices, polygons in zip(*C([v, f])):
             yield bvh_tree_from_polygons(vertices, polygons, all_triangles=all_tris, epsilon=0.0, safe_check=safe_check)
 
+    def process_numpy(self, vert_in, face_in, start_in, direction_in):
+        L, N, I, D, S = self.outputs
+        locations, normals, indices, distances, success = [], [], [], [], []
+        for vertices, polygons, st, di in zip(vert_in, face_in, start_in, direction_in):
+            st, di = C([st, di])
+            hits = SvRayCaster(vertices, polygons).ray_cast(st, di)
+            locations.append(hits.locations.tolist())
+            normals.append(hits.normals.tolist())
+            indices.append(hits.indices.tolist())
+            distances.append(hits.distances.tolist())
+            success.append(hits.hit.tolist())
+
+        L.sv_set(locations)
+        N.sv_set(normals)
+        I.sv_set(indices)
+        D.sv_set(distances)
+        S.sv_set(success)
+
     def process(self):
         L, N, I, D, S = self.outputs
         RL = []
         if not any([s.is_linked for s in self.outputs]):
             return
         vert_in, face_in, start_in, direction_in = C([sock.sv_get(deepcopy=False) for sock in self.inputs])
+        if self.implementation == 'NUMPY':
+            self.process_numpy(vert_in, face_in, start_in, direction_in)
+            return
 
         for bvh, st, di in zip(*[self.svmesh_to_bvh_lists(vert_in, face_in, self.all_triangles, self.safe_check), start_in, direction_in]):
             st, di = C([st, di])
@@ -6,7 +6,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level
-from sverchok.utils.curve.algorithms import SvCurveLengthSolver
+from sverchok.utils.curve.algorithms import SvCurveQuadratureLengthSolver
 from sverchok.utils.curve.nurbs import SvNurbsCurve
 from sverchok.utils.curve.nurbs_algorithms import SvNurbsCurveLengthSolver
 
@@ -111,17 +111,18 @@ class SvCurveLengthNode(bpy.types.Node, SverchCustomTreeNode):
 
                 if t_min >= t_max:
                     length = 0.0
-                else:
+                elif self.use_nurbs:
                     # "resolution" is for whole range of curve;
                     # take only part of it which corresponds to t_min...t_max segment.
                     curve_t_min, curve_t_max = curve.get_u_bounds()
                     resolution = int(resolution * (t_max - t_min) / (curve_t_max - curve_t_min))
                     if resolution < 1:
                         resolution = 1
-                    if self.use_nurbs:
-                        solver = SvNurbsCurveLengthSolver(curve)
-                    else:
-                        solver = SvCurveLengthSolver(curve)
+                    solver = SvNurbsCurveLengthSolver(curve)
+                    solver.prepare('SPL', resolution, tolerance=tolerance)
+                    length = solver.calc_length(t_min, t_max)
+                else:
+                    solver = SvCurveQuadratureLengthSolver(curve)
                     solver.prepare('SPL', resolution, tolerance=tolerance)
                     length = solver.calc_length(t_min, t_max)
 
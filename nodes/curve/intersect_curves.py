@@ -15,12 +15,9 @@ from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_
 from sverchok.utils.curve import SvCurve
 from sverchok.utils.curve.nurbs import SvNurbsCurve
 from sverchok.utils.curve.nurbs_algorithms import intersect_nurbs_curves
+from sverchok.utils.curve.intersections import intersect_nurbs_curves_batch
 from sverchok.utils.curve.freecad import curve_to_freecad
 from sverchok.dependencies import FreeCAD, scipy
-from sverchok.utils.dummy_nodes import add_dummy
-
-if FreeCAD is None and scipy is None:
-    add_dummy('SvIntersectNurbsCurvesNode', "Intersect Curves", 'FreeCAD or scipy')
 
 if FreeCAD is not None:
     from FreeCAD import Base
@@ -45,6 +42,9 @@ class SvIntersectNurbsCurvesNode(bpy.types.Node, SverchCustomTreeNode):
             item = ('SCIPY', "SciPy", "Sverchok built-in implementation", 1)
             result.append(item)
 
+        item = ('CLIPPING', "Bezier Clipping", "Sverchok built-in implementation; processes all pairs of curves at once", 2)
+        result.append(item)
+
         return result
 
     implementation : EnumProperty(
@@ -109,8 +109,9 @@ class SvIntersectNurbsCurvesNode(bpy.types.Node, SverchCustomTreeNode):
 
     def draw_buttons_ext(self, context, layout):
         self.draw_buttons(context, layout)
-        if self.implementation == 'SCIPY':
+        if self.implementation in {'SCIPY', 'CLIPPING'}:
             layout.prop(self, 'precision')
+        if self.implementation == 'SCIPY':
             layout.prop(self, 'method')
 
     def sv_init(self, context):
@@ -119,6 +120,7 @@ class SvIntersectNurbsCurvesNode(bpy.types.Node, SverchCustomTreeNode):
         self.outputs.new('SvVerticesSocket', "Intersections")
         self.outputs.new('SvStringsSocket', "T1")
         self.outputs.new('SvStringsSocket', "T2")
+        self.implementation = 'CLIPPING'
 
     def _filter(self, points):
         if not points:
@@ -145,6 +147,24 @@ class SvIntersectNurbsCurvesNode(bpy.types.Node, SverchCustomTreeNode):
         points = [(r[0], r[1], r[2].tolist()) for r in res]
         return self._filter(points)
 
+    def process_batch(self, curves1, curves2, pairs):
+        curves1 = [self._to_nurbs(curve, "Curve1") for curve in curves1]
+        curves2 = [self._to_nurbs(curve, "Curve2") for curve in curves2]
+        res = intersect_nurbs_curves_batch(curves1, curves2,
+                    pairs = pairs,
+                    precision = self.precision)
+        result = dict()
+        for pair in pairs:
+            points = [(t1, t2, p.tolist()) for t1, t2, p in res.get(pair, [])]
+            result[pair] = self._filter(points)
+        return result
+
+    def _to_nurbs(self, curve, name):
+        nurbs = SvNurbsCurve.to_nurbs(curve)
+        if nurbs is None:
+            raise Exception(f"{name} is not a NURBS")
+        return nurbs
+
     def process_freecad(self, sv_curve1, sv_curve2):
         fc_curve1 = curve_to_freecad(sv_curve1)[0]
         fc_curve2 = curve_to_freecad(sv_curve2)[0]
@@ -183,18 +203,22 @@ class SvIntersectNurbsCurvesNode(bpy.types.Node, SverchCustomTreeNode):
             new_points = []
             new_t1 = []
             new_t2 = []
-            for (i, curve1), (j, curve2) in self.match(curve1s, curve2s):
-                curve1 = SvNurbsCurve.to_nurbs(curve1)
-                if curve1 is None:
-                    raise Exception("Curve1 is not a NURBS")
-                curve2 = SvNurbsCurve.to_nurbs(curve2)
-                if curve2 is None:
-                    raise Exception("Curve2 is not a NURBS")
-
-                if self.implementation == 'SCIPY':
-                    t1s, t2s, ps = self.process_native(curve1, curve2)
+            matched = list(self.match(curve1s, curve2s))
+            if self.implementation == 'CLIPPING':
+                pairs = list(dict.fromkeys((i, j) for (i, _), (j, _) in matched))
+                batch = self.process_batch(curve1s, curve2s, pairs)
+
+            for (i, curve1), (j, curve2) in matched:
+                if self.implementation == 'CLIPPING':
+                    t1s, t2s, ps = batch[(i, j)]
                 else:
-                    t1s, t2s, ps = self.process_freecad(curve1, curve2)
+                    curve1 = self._to_nurbs(curve1, "Curve1")
+                    curve2 = self._to_nurbs(curve2, "Curve2")
+
+                    if self.implementation == 'SCIPY':
+                        t1s, t2s, ps = self.process_native(curve1, curve2)
+                    else:
+                        t1s, t2s, ps = self.process_freecad(curve1, curve2)
 
                 if self.check_intersection:
                     if not ps:
@@ -227,10 +251,8 @@ class SvIntersectNurbsCurvesNode(bpy.types.Node, SverchCustomTreeNode):
         self.outputs['T2'].sv_set(t2_out)
 
 def register():
-    if FreeCAD is not None or scipy is not None:
-        bpy.utils.register_class(SvIntersectNurbsCurvesNode)
+    bpy.utils.register_class(SvIntersectNurbsCurvesNode)
 
 def unregister():
-    if FreeCAD is not None or scipy is not None:
-        bpy.utils.unregister_class(SvIntersectNurbsCurvesNode)
+    bpy.utils.unregister_class(SvIntersectNurbsCurvesNode)
 
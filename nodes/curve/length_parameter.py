@@ -5,7 +5,8 @@ from bpy.props import FloatProperty, EnumProperty, IntProperty, BoolProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level
-from sverchok.utils.curve import SvCurveLengthSolver, SvCurve
+from sverchok.utils.curve import SvCurve
+from sverchok.utils.curve.algorithms import SvCurveQuadratureLengthSolver
 from sverchok.utils.nodes_mixins.draft_mode import DraftMode
 
 
@@ -136,10 +137,8 @@ class SvCurveLengthParameterNode(DraftMode, bpy.types.Node, SverchCustomTreeNode
         for curves, resolutions, input_lengths_i, samples_i in zip_long_repeat(curves_s, resolution_s, length_s, samples_s):
             for curve, resolution, input_lengths, samples in zip_long_repeat(curves, resolutions, input_lengths_i, samples_i):
 
-                mode = self.mode
                 accuracy = self.accuracy
                 if self.id_data.sv_draft:
-                    mode = 'LIN'
                     accuracy = self.accuracy_draft
 
                 if self.specify_accuracy:
@@ -147,7 +146,11 @@ class SvCurveLengthParameterNode(DraftMode, bpy.types.Node, SverchCustomTreeNode
                 else:
                     tolerance = None
 
-                solver = SvCurveLengthSolver(curve)
+                mode = self.mode
+                if self.id_data.sv_draft:
+                    mode = 'LIN'
+
+                solver = SvCurveQuadratureLengthSolver(curve)
                 solver.prepare(mode, resolution, tolerance=tolerance)
 
                 if self.eval_mode == 'AUTO':
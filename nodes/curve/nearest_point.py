@@ -42,7 +42,8 @@ else:
         solvers = [
                 ('Brent', "Brent", "Uses inverse parabolic interpolation when possible to speed up convergence of golden section method", 0),
                 ('Bounded', "Bounded", "Uses the Brent method to find a local minimum in the interval", 1),
-                ('Golden', 'Golden Section', "Uses the golden section search technique", 2)
+                ('Golden', 'Golden Section', "Uses the golden section search technique", 2),
+                ('NEWTON', "Newton", "Newton iterations, made for all points at once; much faster for many points", 3)
             ]
 
         method : EnumProperty(
@@ -66,6 +67,8 @@ else:
             p.default_property = (0.0, 0.0, 0.0)
             self.outputs.new('SvVerticesSocket', "Point")
             self.outputs.new('SvStringsSocket', "T")
+            # Old nodes keep using Brent; new nodes use batched Newton method
+            self.method = 'NEWTON'
 
         def process(self):
             if not any(socket.is_linked for socket in self.outputs):
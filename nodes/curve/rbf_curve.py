@@ -16,7 +16,7 @@ from sverchok.utils.math import rbf_functions
 if scipy is None:
     add_dummy('SvRbfCurveNode', "RBF Curve", 'scipy')
 else:
-    from scipy.interpolate import Rbf
+    from sverchok.utils.rbf import SvRbfInterpolator
 
     class SvExRbfCurveNode(bpy.types.Node, SverchCustomTreeNode):
         """
@@ -73,10 +73,10 @@ else:
 
                 vertices = np.array(vertices)
                 ts = make_euclidean_ts(vertices)
-                rbf = Rbf(ts, vertices,
+                rbf = SvRbfInterpolator(ts, vertices,
                             function=self.function,
                             smooth=smooth,
-                            epsilon=epsilon, mode='N-D')
+                            epsilon=epsilon)
                 curve = SvRbfCurve(rbf, (0.0, 1.0))
                 curves_out.append(curve)
 
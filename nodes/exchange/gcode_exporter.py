@@ -13,9 +13,8 @@ import itertools
 import pprint
 import sverchok
 
-import bpy, os, mathutils
-from numpy import mean
-import operator
+import bpy, os
+import numpy as np
 from math import pi
 
 from bpy.props import BoolProperty, EnumProperty, StringProperty, FloatProperty, IntProperty
@@ -27,6 +26,7 @@ from sverchok.data_structure import dataCorrect as list_of_lists
 from sverchok.data_structure import flatten_data as flatten
 from sverchok.utils.sv_itertools import sv_zip_longest2
 from sverchok.utils.context_managers import sv_preferences
+from sverchok.utils.gcode import GcodeSettings, write_gcode, gcode_inputs_hash
 
 from sverchok.utils.sv_text_io_common import (
     FAIL_COLOR, READY_COLOR, TEXT_IO_CALLBACK,
@@ -36,6 +36,9 @@ from sverchok.utils.sv_text_io_common import (
     text_modes
 )
 
+# node_id -> ((path, inputs hash), GcodeResult) of the last export
+exported_gcode_cache = {}
+
 def convert_to_text(list):
     while True:
         if type(list) is str: break
@@ -76,6 +79,9 @@ class SvExportGcodeNode(bpy.types.Node, SverchCustomTreeNode):
     nozzle : FloatProperty(name="Nozzle", default=0.4, min=0, soft_max=10)
     layer_height : FloatProperty(name="Layer Height", default=0.1, min=0, soft_max=10)
     filament : FloatProperty(name="Filament (\u03A6)", default=1.75, min=0, soft_max=120)
+    skip_unchanged : BoolProperty(name="Skip Unchanged",
+            description = "Do not rewrite the file on tree updates if input data and settings did not change",
+            default=True)
 
     gcode_mode : EnumProperty(items=[
             ("CONT", "Continuous", ""),
@@ -128,159 +134,81 @@ class SvExportGcodeNode(bpy.types.Node, SverchCustomTreeNode):
         col.prop_search(self, 'start_code', bpy.data, 'texts')
         col.prop_search(self, 'end_code', bpy.data, 'texts')
         col.separator()
+        col.prop(self, 'skip_unchanged')
         row = col.row(align=True)
         row.scale_y = 4.0
-        row.operator(TEXT_IO_CALLBACK, text='Export Gcode').fn_name = 'process'
+        row.operator(TEXT_IO_CALLBACK, text='Export Gcode').fn_name = 'export_gcode'
 
     def update_socket(self, context):
         self.update()
 
-    def process(self):
+    def get_settings(self):
+        return GcodeSettings(mode = self.gcode_mode,
+                    feed = self.feed,
+                    feed_vertical = self.feed_vertical,
+                    feed_horizontal = self.feed_horizontal,
+                    pull = self.pull, push = self.push, dz = self.dz,
+                    nozzle = self.nozzle, filament = self.filament,
+                    auto_sort = self.auto_sort, close_all = self.close_all)
+
+    def get_text(self, name):
+        if name in bpy.data.texts:
+            return ''.join(line.body + '\n' for line in bpy.data.texts[name].lines)
+        return ''
+
+    def get_path(self):
+        if self.folder == '':
+            folder = '//' + os.path.splitext(bpy.path.basename(bpy.context.blend_data.filepath))[0]
+        else:
+            folder = self.folder
+        if '.gcode' not in folder: folder += '.gcode'
+        return bpy.path.abspath(folder)
+
+    def export_gcode(self):
+        self.process(force=True)
+
+    def process(self, force=False):
         # manage data
-        feed = self.feed
-        feed_v = self.feed_vertical
-        feed_h = self.feed_horizontal
-        layer = self.layer_height
-        layer = self.inputs['Layer Height'].sv_get()
+        layer = self.inputs['Layer Height'].sv_get(default=[[self.layer_height]])
         vertices = self.inputs['Vertices'].sv_get()
-        flow_mult = self.inputs['Flow Mult'].sv_get()
+        flow_mult = self.inputs['Flow Mult'].sv_get(default=[[self.flow_mult]])
 
         # data matching
         vertices = list_of_lists(vertices)
         flow_mult = list_of_lists(flow_mult)
         layer = list_of_lists(layer)
         vertices, flow_mult, layer = match_longest_lists([vertices, flow_mult, layer])
-        #print(vertices)
-        #print(layer)
 
-        # open file
-        if self.folder == '':
-            folder = '//' + os.path.splitext(bpy.path.basename(bpy.context.blend_data.filepath))[0]
-        else:
-            folder = self.folder
-        if '.gcode' not in folder: folder += '.gcode'
-        path = bpy.path.abspath(folder)
-        file = open(path, 'w')
-        try:
-            for line in bpy.data.texts[self.start_code].lines:
-                file.write(line.body + '\n')
-        except:
-            pass
-
-        # sort vertices
-        if self.auto_sort and self.gcode_mode == 'RETR':
-            sorted_verts = []
-            for curve in vertices:
-                # mean z
-                listz = [v[2] for v in curve]
-                meanz = mean(listz)
-                # store curve and meanz
-                sorted_verts.append((curve, meanz))
-            vertices = [data[0] for data in sorted(sorted_verts, key=lambda height: height[1])]
-
-        # initialize variables
-        e = 0
-        last_vert = mathutils.Vector((0,0,0))
-        maxz = 0
-        path_length = 0
-        printed_verts = []
-        printed_edges = []
-        travel_verts = []
-        travel_edges = []
-
-        # write movements
-        for i in range(len(vertices)):
-            curve = vertices[i]
-            first_id = len(printed_verts)
-            for j in range(len(curve)):
-                v = curve[j]
-                #print('_______________',len(layer))
-                v_flow_mult = flow_mult[i][0][j]
-                v_layer = layer[i][0][j]
-
-                # record max z
-                maxz = max(maxz,v[2])
-
-                # first point of the gcode
-                if i ==  j == 0:
-                    printed_verts.append(v)
-                    file.write('G92 E0 \n')
-                    params = list(v[:3]) + [feed,]
-                    to_write = 'G1 X{0:.4f} Y{1:.4f} Z{2:.4f} F{3:.0f}\n'.format(*params)
-                    file.write(to_write)
-                else:
-                    # start after retraction
-                    if j == 0 and self.gcode_mode == 'RETR':
-                        params = v[:2] + (maxz+self.dz,) + (feed_h,)
-                        to_write = 'G1 X{0:.4f} Y{1:.4f} Z{2:.4f} F{3:.0f}\n'.format(*params)
-                        file.write(to_write)
-                        e += self.push
-                        params = list(v[:3]) + (feed_v,)
-                        to_write = 'G1 X{0:.4f} Y{1:.4f} Z{2:.4f} F{3:.0f}\n'.format(*params)
-                        file.write(to_write)
-                        file.write( 'G1 E' + format(e, '.4f') + '\n')
-                        printed_verts.append((v[0], v[1], maxz+self.dz))
-                        travel_edges.append((len(printed_verts)-1, len(printed_verts)-2))
-                        printed_verts.append(v)
-                        travel_edges.append((len(printed_verts)-1, len(printed_verts)-2))
-                    # regular extrusion
-                    else:
-                        printed_verts.append(v)
-                        v1 = mathutils.Vector(v)
-                        v0 = mathutils.Vector(curve[j-1])
-                        dist = (v1-v0).length
-                        #print(dist)
-                        area = v_layer * self.nozzle + pi*(v_layer/2)**2 # rectangle + circle
-                        cylinder = pi*(self.filament/2)**2
-                        flow = area / cylinder
-                        e += dist * v_flow_mult * flow
-                        params = list(v[:3]) + [e,]
-                        to_write = 'G1 X{0:.4f} Y{1:.4f} Z{2:.4f} E{3:.4f}\n'.format(*params)
-                        file.write(to_write)
-                        path_length += dist
-                        printed_edges.append([len(printed_verts)-1, len(printed_verts)-2])
-            if self.gcode_mode == 'RETR':
-                v0 = mathutils.Vector(curve[-1])
-                if self.close_all:
-                    #printed_verts.append(v0)
-                    printed_edges.append([len(printed_verts)-1, first_id])
-
-                    v1 = mathutils.Vector(curve[0])
-                    dist = (v0-v1).length
-                    area = v_layer * self.nozzle + pi*(v_layer/2)**2 # rectangle + circle
-                    cylinder = pi*(self.filament/2)**2
-                    flow = area / cylinder
-                    e += dist * v_flow_mult * flow
-                    params = list(v1[:3]) + [e,]
-                    to_write = 'G1 X{0:.4f} Y{1:.4f} Z{2:.4f} E{3:.4f}\n'.format(*params)
-                    file.write(to_write)
-                    path_length += dist
-                    v0 = v1
-                if i < len(vertices)-1:
-                    e -= self.pull
-                    file.write('G0 E' + format(e, '.4f') + '\n')
-                    params = list(v0[:2]) + [maxz+self.dz,] + [feed_v,]
-                    to_write = 'G1 X{0:.4f} Y{1:.4f} Z{2:.4f} F{3:.0f}\n'.format(*params)
-                    file.write(to_write)
-                    printed_verts.append(v0.to_tuple())
-                    printed_verts.append((v0.x, v0.y, maxz+self.dz))
-                    travel_edges.append((len(printed_verts)-1, len(printed_verts)-2))
-
-        # end code
-        try:
-            for line in bpy.data.texts[self.end_code].lines:
-                file.write(line.body + '\n')
-        except:
-            pass
-        file.close()
+        curves = [np.asarray(curve, dtype=np.float64).reshape((-1, 3)) for curve in vertices]
+        settings = self.get_settings()
+        start_code = self.get_text(self.start_code)
+        end_code = self.get_text(self.end_code)
+        path = self.get_path()
+
+        inputs_hash = None
+        if self.skip_unchanged:
+            inputs_hash = gcode_inputs_hash(curves, flow_mult, layer, settings, start_code, end_code)
+            cached = exported_gcode_cache.get(self.node_id)
+            if not force and cached is not None and cached[0] == (path, inputs_hash) and os.path.exists(path):
+                self.set_outputs(cached[1])
+                return
+
+        with open(path, 'w', buffering=1 << 20) as file:
+            result = write_gcode(file, curves, flow_mult, layer, settings, start_code, end_code)
         print("Saved gcode to " + path)
-        info = "Extruded Filament: " + format(e, '.2f') + '\n'
-        info += "Extruded Volume: " + format(e*pi*(self.filament/2)**2, '.2f') + '\n'
-        info += "Printed Path: " + format(path_length, '.2f')
+
+        if inputs_hash is not None:
+            exported_gcode_cache[self.node_id] = ((path, inputs_hash), result)
+        self.set_outputs(result)
+
+    def set_outputs(self, result):
+        info = "Extruded Filament: " + format(result.e, '.2f') + '\n'
+        info += "Extruded Volume: " + format(result.e*pi*(self.filament/2)**2, '.2f') + '\n'
+        info += "Printed Path: " + format(result.path_length, '.2f')
         self.outputs[0].sv_set(info)
-        self.outputs[1].sv_set([printed_verts])
-        self.outputs[2].sv_set([printed_edges])
-        self.outputs[3].sv_set([travel_edges])
+        self.outputs[1].sv_set([result.verts.tolist()])
+        self.outputs[2].sv_set([result.printed_edges.tolist()])
+        self.outputs[3].sv_set([result.travel_edges.tolist()])
 
 def register():
     bpy.utils.register_class(SvExportGcodeNode)
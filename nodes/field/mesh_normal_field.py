@@ -19,10 +19,8 @@ from sverchok.utils.logging import info, exception
 from sverchok.utils.field.vector import SvBvhAttractorVectorField
 from sverchok.utils.field.rbf import SvBvhRbfNormalVectorField
 from sverchok.dependencies import scipy
-from sverchok.utils.math import rbf_functions
-
-if scipy is not None:
-    from scipy.interpolate import Rbf
+from sverchok.utils.math import rbf_functions, compact_rbf_functions
+from sverchok.utils.rbf import SvRbfInterpolator, rbf_modes, GLOBAL
 
 class SvExMeshNormalFieldNode(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -40,10 +38,16 @@ class SvExMeshNormalFieldNode(bpy.types.Node, SverchCustomTreeNode):
 
     function : EnumProperty(
             name = "Function",
-            items = rbf_functions,
+            items = rbf_functions + compact_rbf_functions,
             default = 'multiquadric',
             update = updateNode)
 
+    rbf_mode : EnumProperty(
+            name = "Mode",
+            items = rbf_modes,
+            default = GLOBAL,
+            update = updateNode)
+
     signed : BoolProperty(
             name = "Signed",
             default = False,
@@ -54,6 +58,7 @@ class SvExMeshNormalFieldNode(bpy.types.Node, SverchCustomTreeNode):
             layout.prop(self, "interpolate", toggle=True)
             if self.interpolate:
                 layout.prop(self, "function")
+                layout.prop(self, "rbf_mode")
         if scipy is None or not self.interpolate:
             layout.prop(self, "signed", toggle=True)
 
@@ -81,13 +86,9 @@ class SvExMeshNormalFieldNode(bpy.types.Node, SverchCustomTreeNode):
                 centers = np.array([f.calc_center_median() for f in bm.faces])
                 bm.free()
 
-                xs_from = centers[:,0]
-                ys_from = centers[:,1]
-                zs_from = centers[:,2]
-
-                rbf = Rbf(xs_from, ys_from, zs_from, normals,
+                rbf = SvRbfInterpolator(centers, normals,
                         function = self.function,
-                        mode = 'N-D')
+                        mode = self.rbf_mode)
 
                 field = SvBvhRbfNormalVectorField(bvh, rbf)
             else:
@@ -10,14 +10,14 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok.utils.logging import info, exception
 from sverchok.utils.field.rbf import SvRbfScalarField
-from sverchok.utils.math import rbf_functions
+from sverchok.utils.math import rbf_functions, compact_rbf_functions
 from sverchok.utils.dummy_nodes import add_dummy
 from sverchok.dependencies import scipy
 
 if scipy is None:
     add_dummy('SvExMinimalScalarFieldNode', "Minimal Scalar Field", 'scipy')
 else:
-    from scipy.interpolate import Rbf
+    from sverchok.utils.rbf import SvRbfInterpolator, is_compact_function, rbf_modes, GLOBAL
 
     class SvExMinimalScalarFieldNode(bpy.types.Node, SverchCustomTreeNode):
         """
@@ -30,10 +30,23 @@ else:
 
         function : EnumProperty(
                 name = "Function",
-                items = rbf_functions,
+                items = rbf_functions + compact_rbf_functions,
                 default = 'multiquadric',
                 update = updateNode)
 
+        rbf_mode : EnumProperty(
+                name = "Mode",
+                items = rbf_modes,
+                default = GLOBAL,
+                update = updateNode)
+
+        radius : FloatProperty(
+                name = "Radius",
+                description = "Support radius of compactly supported function; 0 means automatic",
+                default = 0.0,
+                min = 0.0,
+                update = updateNode)
+
         epsilon : FloatProperty(
                 name = "Epsilon",
                 default = 1.0,
@@ -55,6 +68,9 @@ else:
 
         def draw_buttons(self, context, layout):
             layout.prop(self, "function")
+            if is_compact_function(self.function):
+                layout.prop(self, "radius")
+            layout.prop(self, "rbf_mode")
 
         def process(self):
 
@@ -74,16 +90,14 @@ else:
                     smooth = smooth[0]
 
                 XYZ_from = np.array(vertices)
-                xs_from = XYZ_from[:,0]
-                ys_from = XYZ_from[:,1]
-                zs_from = XYZ_from[:,2]
-                
                 values = np.array(values)
 
-                rbf = Rbf(xs_from, ys_from, zs_from, values,
+                rbf = SvRbfInterpolator(XYZ_from, values,
                         function = self.function,
                         smooth = smooth,
-                        epsilon = epsilon, mode='1-D')
+                        epsilon = epsilon,
+                        radius = self.radius if self.radius > 0 else None,
+                        mode = self.rbf_mode)
 
                 field = SvRbfScalarField(rbf)
                 fields_out.append(field)
@@ -12,12 +12,12 @@ from sverchok.utils.logging import info, exception
 from sverchok.utils.field.rbf import SvRbfVectorField
 from sverchok.utils.dummy_nodes import add_dummy
 from sverchok.dependencies import scipy
-from sverchok.utils.math import rbf_functions
+from sverchok.utils.math import rbf_functions, compact_rbf_functions
 
 if scipy is None:
     add_dummy('SvExMinimalVectorFieldNode', "Minimal Vector Field", 'scipy')
 else:
-    from scipy.interpolate import Rbf
+    from sverchok.utils.rbf import SvRbfInterpolator, is_compact_function, rbf_modes, GLOBAL
 
     class SvExMinimalVectorFieldNode(bpy.types.Node, SverchCustomTreeNode):
         """
@@ -30,10 +30,23 @@ else:
 
         function : EnumProperty(
                 name = "Function",
-                items = rbf_functions,
+                items = rbf_functions + compact_rbf_functions,
                 default = 'multiquadric',
                 update = updateNode)
 
+        rbf_mode : EnumProperty(
+                name = "Mode",
+                items = rbf_modes,
+                default = GLOBAL,
+                update = updateNode)
+
+        radius : FloatProperty(
+                name = "Radius",
+                description = "Support radius of compactly supported function; 0 means automatic",
+                default = 0.0,
+                min = 0.0,
+                update = updateNode)
+
         epsilon : FloatProperty(
                 name = "Epsilon",
                 default = 1.0,
@@ -68,6 +81,9 @@ else:
         def draw_buttons(self, context, layout):
             layout.prop(self, "field_type", text='')
             layout.prop(self, "function")
+            if is_compact_function(self.function):
+                layout.prop(self, "radius")
+            layout.prop(self, "rbf_mode")
 
         def process(self):
 
@@ -87,18 +103,16 @@ else:
                     smooth = smooth[0]
 
                 XYZ_from = np.array(vertices_from)
-                xs_from = XYZ_from[:,0]
-                ys_from = XYZ_from[:,1]
-                zs_from = XYZ_from[:,2]
-                
                 XYZ_to = np.array(vertices_to)
                 if self.field_type == 'R':
                     XYZ_to = XYZ_from + XYZ_to
 
-                rbf = Rbf(xs_from, ys_from, zs_from, XYZ_to,
+                rbf = SvRbfInterpolator(XYZ_from, XYZ_to,
                         function = self.function,
                         smooth = smooth,
-                        epsilon = epsilon, mode='N-D')
+                        epsilon = epsilon,
+                        radius = self.radius if self.radius > 0 else None,
+                        mode = self.rbf_mode)
 
                 field = SvRbfVectorField(rbf, relative = self.field_type == 'R')
                 fields_out.append(field)
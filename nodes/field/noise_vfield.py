@@ -31,6 +31,17 @@ class SvNoiseVectorFieldNode(bpy.types.Node, SverchCustomTreeNode):
 
     seed: IntProperty(default=0, name='Seed', update=updateNode)
 
+    implementation_modes = [
+        ('MATHUTILS', "Mathutils", "Use mathutils.noise, one point at a time", 0),
+        ('NUMPY', "NumPy", "Vectorized implementation of Blender noise types; much faster", 1)]
+
+    implementation: EnumProperty(
+        name='Implementation',
+        items=implementation_modes,
+        default='MATHUTILS',
+        description='Implementation of noise functions',
+        update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvStringsSocket', 'Seed').prop_name = 'seed'
         self.outputs.new('SvVectorFieldSocket', 'Noise')
@@ -38,6 +49,10 @@ class SvNoiseVectorFieldNode(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons(self, context, layout):
         layout.prop(self, 'noise_type', text="Type")
 
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, 'implementation', text='')
+
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
             return
@@ -51,7 +66,7 @@ class SvNoiseVectorFieldNode(bpy.types.Node, SverchCustomTreeNode):
 
             if seed == 0:
                 seed = 12345
-            field = SvNoiseVectorField(self.noise_type, seed)
+            field = SvNoiseVectorField(self.noise_type, seed, implementation=self.implementation)
             fields_out.append(field)
 
         self.outputs['Noise'].sv_set(fields_out)
@@ -12,6 +12,7 @@ from sverchok.utils.math import from_cylindrical, from_spherical, to_cylindrical
 
 from sverchok.utils.math import coordinate_modes
 from sverchok.utils.field.scalar import SvScalarField
+from sverchok.utils.field.graph import compile_field
 
 class SvScalarFieldEvaluateNode(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -64,6 +65,7 @@ class SvScalarFieldEvaluateNode(bpy.types.Node, SverchCustomTreeNode):
                     xs = XYZ[:,0]
                     ys = XYZ[:,1]
                     zs = XYZ[:,2]
+                    field = compile_field(field)
                     new_values = field.evaluate_grid(xs, ys, zs) if self.output_numpy else field.evaluate_grid(xs, ys, zs).tolist()
                 values_out.append(new_values)
 
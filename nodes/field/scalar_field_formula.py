@@ -14,6 +14,7 @@ from sverchok.utils.math import (
         coordinate_modes
     )
 from sverchok.utils.field.scalar import SvScalarFieldLambda
+from sverchok.utils.field.derivatives import jet_formula_names, jet_to_cylindrical, jet_to_spherical
 
 class SvScalarFieldFormulaNode(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -129,6 +130,25 @@ class SvScalarFieldFormulaNode(bpy.types.Node, SverchCustomTreeNode):
 
         return function
 
+    def make_function_jet(self, variables):
+        # Same formula evaluated with SvJet instances instead of arrays,
+        # to calculate exact derivatives of the field.
+        compiled = sv_compile(self.formula)
+        names = jet_formula_names(safe_names_np)
+
+        def function(x, y, z, V):
+            if self.input_mode == 'XYZ':
+                variables.update(dict(x=x, y=y, z=z, V=V))
+            elif self.input_mode == 'CYL':
+                rho, phi, z = jet_to_cylindrical(x, y, z)
+                variables.update(dict(rho=rho, phi=phi, z=z, V=V))
+            else: # SPH
+                rho, phi, theta = jet_to_spherical(x, y, z)
+                variables.update(dict(rho=rho, phi=phi, theta=theta, V=V))
+            return safe_eval_compiled(compiled, variables, allowed_names = names)
+
+        return function
+
     def get_coordinate_variables(self):
         if self.input_mode == 'XYZ':
             return {'x', 'y', 'z', 'V'}
@@ -192,9 +212,11 @@ class SvScalarFieldFormulaNode(bpy.types.Node, SverchCustomTreeNode):
                 function = self.make_function(variables)
                 if self.use_numpy_function:
                     function_vector = self.make_function_vector(variables)
+                    function_jet = self.make_function_jet(variables)
                 else:
                     function_vector = None
-                new_field = SvScalarFieldLambda(function, variables, field_in, function_vector)
+                    function_jet = None
+                new_field = SvScalarFieldLambda(function, variables, field_in, function_vector, function_jet)
                 fields_out.append(new_field)
 
         self.outputs['Field'].sv_set(fields_out)
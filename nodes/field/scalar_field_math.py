@@ -103,9 +103,9 @@ class SvScalarFieldMathNode(bpy.types.Node, SverchCustomTreeNode):
                 elif self.operation == 'ABS':
                     field_c = SvAbsScalarField(field_a)
                 elif self.operation in vectorized_ops:
-                    field_c = SvScalarFieldVectorizedFunction(field_a, operation)
+                    field_c = SvScalarFieldVectorizedFunction(field_a, operation, op=self.operation)
                 elif self.operation in binary_ops:
-                    field_c = SvScalarFieldBinOp(field_a, field_b, operation)
+                    field_c = SvScalarFieldBinOp(field_a, field_b, operation, op=self.operation)
                 else:
                     raise Exception("Unsupported operation: " + self.operation)
                 fields_out.append(field_c)
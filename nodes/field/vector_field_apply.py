@@ -8,6 +8,8 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, repeat_last_for_length, match_long_repeat, ensure_nesting_level
 from sverchok.utils.logging import info, exception
 from sverchok.utils.field.vector import SvVectorField
+from sverchok.utils.field.graph import compile_field
+from sverchok.utils.field.flow import advect, integration_methods
 
 class SvVectorFieldApplyNode(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -36,6 +38,13 @@ class SvVectorFieldApplyNode(bpy.types.Node, SverchCustomTreeNode):
         default=False,
         update=updateNode)
 
+    method: EnumProperty(
+        name="Method",
+        description="Integration method. Euler means simple repeated application of the field",
+        items=integration_methods,
+        default='EULER',
+        update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvVectorFieldSocket', "Field")
         d = self.inputs.new('SvVerticesSocket', "Vertices")
@@ -46,6 +55,7 @@ class SvVectorFieldApplyNode(bpy.types.Node, SverchCustomTreeNode):
         self.outputs.new('SvVerticesSocket', 'Vertices')
 
     def draw_buttons_ext(self, context, layout):
+        layout.prop(self, 'method')
         layout.prop(self, 'output_numpy')
     def rclick_menu(self, context, layout):
         layout.prop(self, "output_numpy")
@@ -74,6 +84,11 @@ class SvVectorFieldApplyNode(bpy.types.Node, SverchCustomTreeNode):
 
                 if len(vertices) == 0:
                     new_verts = []
+                elif self.method != 'EULER':
+                    coeffs = repeat_last_for_length(coeffs, len(vertices))
+                    vertices = advect(compile_field(field), np.array(vertices), iterations,
+                                    np.array(coeffs), method=self.method, normalize=False)
+                    new_verts = vertices if self.output_numpy else vertices.tolist()
                 elif len(vertices) == 1:
                     vertex = vertices[0]
                     coeff = coeffs[0]
@@ -84,6 +99,7 @@ class SvVectorFieldApplyNode(bpy.types.Node, SverchCustomTreeNode):
                 else:
                     coeffs = repeat_last_for_length(coeffs, len(vertices))
                     vertices = np.array(vertices)
+                    field = compile_field(field)
                     for i in range(iterations):
                         xs = vertices[:,0]
                         ys = vertices[:,1]
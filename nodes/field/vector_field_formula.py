@@ -16,6 +16,8 @@ from sverchok.utils.math import (
         coordinate_modes
     )
 from sverchok.utils.field.vector import SvVectorFieldLambda
+from sverchok.utils.field.derivatives import (jet_formula_names, jet_functions,
+            jet_to_cylindrical, jet_to_spherical)
 
 class SvVectorFieldFormulaNode(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -193,6 +195,32 @@ class SvVectorFieldFormulaNode(bpy.types.Node, SverchCustomTreeNode):
 
         return function
 
+    def make_function_jet(self, variables):
+        # Same formulas evaluated with SvJet instances instead of arrays,
+        # to calculate exact derivatives of the field.
+        compiled = [sv_compile(formula) for formula in [self.formula1, self.formula2, self.formula3]]
+        names = jet_formula_names(safe_names_np)
+        sin, cos = jet_functions['sin'], jet_functions['cos']
+
+        def function(x, y, z, V):
+            if self.input_mode == 'XYZ':
+                variables.update(dict(x=x, y=y, z=z, V=V))
+            elif self.input_mode == 'CYL':
+                rho, phi, z = jet_to_cylindrical(x, y, z)
+                variables.update(dict(rho=rho, phi=phi, z=z, V=V))
+            else: # SPH
+                rho, phi, theta = jet_to_spherical(x, y, z)
+                variables.update(dict(rho=rho, phi=phi, theta=theta, V=V))
+            v1, v2, v3 = [safe_eval_compiled(c, variables, allowed_names = names) for c in compiled]
+            if self.output_mode == 'XYZ':
+                return v1, v2, v3
+            elif self.output_mode == 'CYL':
+                return v1*cos(v2), v1*sin(v2), v3
+            else: # SPH
+                return v1*sin(v3)*cos(v2), v1*sin(v3)*sin(v2), v1*cos(v3)
+
+        return function
+
     def get_coordinate_variables(self):
         if self.input_mode == 'XYZ':
             return {'x', 'y', 'z', 'V'}
@@ -259,9 +287,11 @@ class SvVectorFieldFormulaNode(bpy.types.Node, SverchCustomTreeNode):
                 function = self.make_function(variables)
                 if self.use_numpy_function:
                     function_vector = self.make_function_vector(variables)
+                    function_jet = self.make_function_jet(variables)
                 else:
                     function_vector = None
-                new_field = SvVectorFieldLambda(function, variables, field_in, function_vector)
+                    function_jet = None
+                new_field = SvVectorFieldLambda(function, variables, field_in, function_vector, function_jet)
                 fields_out.append(new_field)
 
         self.outputs['Field'].sv_set(fields_out)
@@ -7,7 +7,8 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, St
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, repeat_last_for_length, match_long_repeat, ensure_nesting_level
 from sverchok.utils.logging import info, exception
-from sverchok.utils.mesh_functions import mesh_join
+from sverchok.utils.field.graph import compile_field
+from sverchok.utils.field.flow import SvFieldIntegrator, integration_methods, join_lines
 
 class SvVectorFieldLinesNode(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -47,12 +48,38 @@ class SvVectorFieldLinesNode(bpy.types.Node, SverchCustomTreeNode):
         default=False,
         update=updateNode)
 
+    method: EnumProperty(
+        name="Method",
+        description="Integration method",
+        items=integration_methods,
+        default='EULER', # for existing nodes
+        update=updateNode)
+
+    tolerance: FloatProperty(
+        name="Tolerance",
+        description="Allowed error of one step for adaptive method",
+        default=1e-4,
+        min=1e-12,
+        precision=6,
+        update=updateNode)
+
+    max_length: FloatProperty(
+        name="Max Length",
+        description="Stop lines when their length exceeds this value; 0 means no limit",
+        default=0.0,
+        min=0.0,
+        update=updateNode)
+
     def draw_buttons(self, context, layout):
+        layout.prop(self, 'method', text='')
         layout.prop(self, 'normalize', toggle=True)
         layout.prop(self, 'join', toggle=True)
 
     def draw_buttons_ext(self, context, layout):
         self.draw_buttons(context, layout)
+        if self.method == 'RK45':
+            layout.prop(self, 'tolerance')
+        layout.prop(self, 'max_length')
         layout.prop(self, 'output_numpy')
     def rclick_menu(self, context, layout):
         layout.prop(self, "output_numpy")
@@ -64,23 +91,16 @@ class SvVectorFieldLinesNode(bpy.types.Node, SverchCustomTreeNode):
         self.inputs.new('SvStringsSocket', "Iterations").prop_name = 'iterations'
         self.outputs.new('SvVerticesSocket', 'Vertices')
         self.outputs.new('SvStringsSocket', 'Edges')
+        self.method = 'RK4'
 
-    def generate_all(self, field, vertices, step, iterations, output_numpy):
-        new_verts = np.empty((iterations, len(vertices), 3))
-        for i in range(iterations):
-            xs = vertices[:,0]
-            ys = vertices[:,1]
-            zs = vertices[:,2]
-            new_xs, new_ys, new_zs = field.evaluate_grid(xs, ys, zs)
-            vectors = np.stack((new_xs, new_ys, new_zs)).T
-            if self.normalize:
-                norms = np.linalg.norm(vectors, axis=1)[np.newaxis].T
-                vertices = vertices + step * vectors / norms
-            else:
-                vertices = vertices + step * vectors
-            new_verts[i,:,:] = vertices
-        result = np.transpose(new_verts, axes=(1, 0, 2))
-        return result if output_numpy else result.tolist()
+    def generate_all(self, field, vertices, step, iterations):
+        integrator = SvFieldIntegrator(compile_field(field),
+                        method = self.method,
+                        normalize = self.normalize,
+                        tolerance = self.tolerance,
+                        max_length = self.max_length if self.max_length > 0 else None)
+        lines = integrator.integrate(vertices, iterations, step)
+        return lines.get_lines(), lines.get_edges()
 
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
@@ -113,10 +133,13 @@ class SvVectorFieldLinesNode(bpy.types.Node, SverchCustomTreeNode):
                     new_verts = []
                     new_edges = []
                 else:
-                    new_verts = self.generate_all(field, np.array(vertices), step, iterations, self.output_numpy)
-                    new_edges = [[(i,i+1) for i in range(iterations-1)]] * len(vertices)
+                    new_verts, new_edges = self.generate_all(field, np.array(vertices), step, iterations)
                     if self.join:
-                        new_verts, new_edges, _ = mesh_join(new_verts, new_edges, [[]] * len(new_verts))
+                        verts, edges = join_lines(new_verts)
+                        new_verts, new_edges = [verts], [edges]
+                    if not self.output_numpy:
+                        new_verts = [vs.tolist() for vs in new_verts]
+                        new_edges = [es.tolist() for es in new_edges]
 
                 field_verts.extend(new_verts)
                 field_edges.extend(new_edges)
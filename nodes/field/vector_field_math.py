@@ -161,7 +161,7 @@ class SvVectorFieldMathNode(bpy.types.Node, SverchCustomTreeNode):
                     vfields_c_out.append(field_c)
                 else:
                     operation = get_operation(self.operation)
-                    field_c = SvVectorFieldBinOp(vfield_a, vfield_b, operation)
+                    field_c = SvVectorFieldBinOp(vfield_a, vfield_b, operation, op=self.operation)
                     vfields_c_out.append(field_c)
 
         self.outputs[V_FIELD_C.idx].sv_set(vfields_c_out)
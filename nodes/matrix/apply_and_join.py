@@ -29,6 +29,7 @@ from sverchok.data_structure import updateNode
 from sverchok.utils.mesh_functions import apply_matrix_to_vertices_py
 from sverchok.utils.vectorize import vectorize, devectorize, SvVerts, SvEdges, SvPolys
 from sverchok.utils.modules.matrix_utils import matrix_apply_np
+from sverchok.utils.mesh.ragged import SvPolygons
 
 
 def apply_matrices(
@@ -105,7 +106,13 @@ def join_meshes(*, vertices: List[SvVerts], edges: List[SvEdges], polygons: List
                     joined_edges.extend([(e[0] + vertexes_number, e[1] + vertexes_number) for e in es])
                 vertexes_number += len(vertices[i])
 
-    if polygons:
+    if polygons and any(isinstance(ps, SvPolygons) for ps in polygons):
+        # polygons in CSR form are joined with NumPy and stay in this form
+        shifts = np.cumsum([0] + [len(vs) for vs in vertices[:-1]])
+        polygon_sets = [(ps, shift) for ps, shift in zip(polygons, shifts) if ps is not None and len(ps)]
+        if polygon_sets:
+            joined_polygons = SvPolygons.concatenate(*zip(*polygon_sets))
+    elif polygons:
         vertexes_number = 0
         for i, ps in enumerate(polygons):
             if ps:
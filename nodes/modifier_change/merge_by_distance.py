@@ -15,14 +15,13 @@
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 #
 # ##### END GPL LICENSE BLOCK #####
-from itertools import chain, repeat
+import numpy as np
 import bpy
 from bpy.props import FloatProperty
-import bmesh
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import updateNode, Vector_generate, zip_long_repeat
-from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata, face_data_from_bmesh_faces, vert_data_from_bmesh_verts
+from sverchok.data_structure import updateNode, zip_long_repeat, repeat_last_for_length
+from sverchok.utils.mesh.weld import weld_mesh
 from sverchok.utils.nodes_mixins.sockets_config import ModifierNode
 
 
@@ -32,51 +31,34 @@ def remove_doubles(vertices, faces, distance, face_data=None, find_doubles=False
         edge_mode = (len(faces[0]) == 2)
     else:
         edge_mode = False
-    if face_data:
-        mark_face_data = True
-    else:
-        mark_face_data = False
 
-    bm = bmesh_from_pydata(
-        vertices,
-        faces if edge_mode else [],
-        [] if edge_mode else faces,
-        markup_face_data=mark_face_data,
-        markup_vert_data=output_mask)
-    bm_verts = bm.verts
+    result = weld_mesh(vertices,
+                faces if edge_mode else [],
+                [] if edge_mode else faces,
+                distance, mask=mask if mask else None,
+                add_face_edges=True)
 
-    if mask:
-        mask_full = chain(mask, repeat(mask[-1]))
-        bm_verts = [v for v, m in zip(bm_verts, mask_full) if m]
+    verts = result.verts.tolist()
+    edges = result.edges.tolist()
+    faces = result.faces
 
     if find_doubles:
-        res = bmesh.ops.find_doubles(bm, verts=bm_verts, dist=distance)
-        doubles = [vert.co[:] for vert in res['targetmap'].keys()]
+        doubles = np.asarray(vertices, dtype=np.float64)[result.doubles_mask].tolist()
     else:
         doubles = []
 
-    bmesh.ops.remove_doubles(bm, verts=bm_verts, dist=distance)
-    edges = []
-    faces = []
-    face_data_out = []
-    bm.verts.index_update()
-    verts = [vert.co[:] for vert in bm.verts[:]]
-
-    bm.edges.index_update()
-    bm.faces.index_update()
-    for edge in bm.edges[:]:
-        edges.append([v.index for v in edge.verts[:]])
-    for face in bm.faces:
-        faces.append([v.index for v in face.verts[:]])
     if face_data:
-        face_data_out = face_data_from_bmesh_faces(bm, face_data)
+        n_face_data = len(face_data)
+        face_data_out = [face_data[idx] if idx < n_face_data else None for idx in result.face_init_index.tolist()]
+    else:
+        face_data_out = []
+
     if mask and output_mask:
-        mask_out = vert_data_from_bmesh_verts(bm, mask)
+        mask_full = repeat_last_for_length(mask, len(vertices))
+        mask_out = [mask_full[idx] for idx in result.vert_init_index.tolist()]
     else:
         mask_out = []
 
-    bm.clear()
-    bm.free()
     return (verts, edges, faces, face_data_out, doubles, mask_out)
 
 
@@ -128,7 +110,7 @@ class SvMergeByDistanceNode(ModifierNode, bpy.types.Node, SverchCustomTreeNode):
         if not self.inputs['Vertices'].is_linked:
             return
 
-        verts = Vector_generate(self.inputs['Vertices'].sv_get(deepcopy=False))
+        verts = self.inputs['Vertices'].sv_get(deepcopy=False)
         polys = self.inputs['PolyEdge'].sv_get(default=[[]], deepcopy=False)
         face_data = self.inputs['FaceData'].sv_get(default=[[]], deepcopy=False)
         distance = self.inputs['Distance'].sv_get(default=[self.distance], deepcopy=False)[0]
@@ -17,16 +17,24 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
+from sverchok.data_structure import updateNode
 from sverchok.utils.mesh_functions import meshes_py, join_meshes, meshes_np, to_elements
 from sverchok.utils.nodes_mixins.recursive_nodes import SvRecursiveNode
 from sverchok.utils.nodes_mixins.sockets_config import ModifierNode
+from sverchok.utils.mesh.ragged import SvPolygons
 
 
-def mesh_join(vertices, edges, polygons):
-    is_py_input = isinstance(vertices[0], (list, tuple))
-    meshes = (meshes_py if is_py_input else meshes_np)(vertices, edges, polygons)
+def mesh_join(vertices, edges, polygons, output_numpy=False):
+    if output_numpy:
+        vertices = [np.asarray(vs, dtype=np.float64) for vs in vertices]
+        polygons = [SvPolygons.from_data(ps) for ps in polygons]
+        meshes = meshes_py(vertices, edges, polygons)
+    else:
+        is_py_input = isinstance(vertices[0], (list, tuple))
+        meshes = (meshes_py if is_py_input else meshes_np)(vertices, edges, polygons)
     meshes = join_meshes(meshes)
     out_vertices, out_edges, out_polygons = to_elements(meshes)
 
@@ -45,6 +53,12 @@ class SvMeshJoinNodeMk2(
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_MESH_JOIN'
 
+    output_numpy: bpy.props.BoolProperty(
+        name='Output NumPy',
+        description='Output vertices as NumPy arrays and polygons in compact form (makes node faster)',
+        default=False,
+        update=updateNode)
+
     def sv_init(self, context):
         verts = self.inputs.new('SvVerticesSocket', 'Vertices')
         verts.is_mandatory = True
@@ -76,8 +90,11 @@ class SvMeshJoinNodeMk2(
         pols.nesting_level = 3
         pols.default_mode = 'EMPTY_LIST'
 
+    def draw_buttons_ext(self, context, layout):
+        layout.prop(self, 'output_numpy')
+
     def process_data(self, params):
-        return mesh_join(*params)
+        return mesh_join(*params, output_numpy=self.output_numpy)
 
 
 def register():
@@ -10,7 +10,9 @@ from bpy.props import IntProperty, FloatProperty, BoolProperty, EnumProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, get_data_nesting_level, ensure_nesting_level
+from sverchok.dependencies import scipy
 from sverchok.utils.relax_mesh import *
+from sverchok.utils.relax_mesh_np import lloyd_relax_np, edges_relax_np, faces_relax_np
 from sverchok.utils.nodes_mixins.sockets_config import TransformNode
 
 
@@ -96,6 +98,17 @@ class SvRelaxMeshNode(TransformNode, bpy.types.Node, SverchCustomTreeNode):
         name="Z", description="smooth vertices along Z axis",
         default=True, update=updateNode)
 
+    implementations = [
+            ('BMESH', "Bmesh", "Rebuild bmesh object on each iteration", 0),
+            ('NUMPY', "NumPy", "Build sparse matrices of mesh topology once and relax all vertices at once; much faster. Requires SciPy", 1)
+        ]
+
+    implementation : EnumProperty(
+            name = "Implementation",
+            items = implementations,
+            default = 'BMESH', # for existing nodes
+            update = updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', "Vertices")
         self.inputs.new('SvStringsSocket', 'Edges')
@@ -109,6 +122,8 @@ class SvRelaxMeshNode(TransformNode, bpy.types.Node, SverchCustomTreeNode):
         #self.outputs.new('SvStringsSocket', 'Faces')
 
         self.update_sockets(context)
+        if scipy is not None:
+            self.implementation = 'NUMPY'
 
     def draw_buttons(self, context, layout):
         layout.prop(self, 'algorithm')
@@ -121,6 +136,10 @@ class SvRelaxMeshNode(TransformNode, bpy.types.Node, SverchCustomTreeNode):
         row.prop(self, "use_y", toggle=True)
         row.prop(self, "use_z", toggle=True)
 
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, 'implementation')
+
     def process(self):
         if not any(output.is_linked for output in self.outputs):
             return
@@ -150,17 +169,22 @@ class SvRelaxMeshNode(TransformNode, bpy.types.Node, SverchCustomTreeNode):
         if self.use_z:
             used_axes.add(2)
 
+        if self.implementation == 'NUMPY' and scipy is not None:
+            lloyd_func, edges_func, faces_func = lloyd_relax_np, edges_relax_np, faces_relax_np
+        else:
+            lloyd_func, edges_func, faces_func = lloyd_relax, edges_relax, faces_relax
+
         verts_out = []
         for params in zip_long_repeat(vertices_s, edges_s, faces_s, masks_s, iterations_s, factor_s):
             for vertices, edges, faces, mask, iterations, factor in zip_long_repeat(*params):
                 if self.algorithm == 'LLOYD':
-                    vertices = lloyd_relax(vertices, faces, iterations,
+                    vertices = lloyd_func(vertices, faces, iterations,
                                     mask = mask,
                                     method = self.preserve_shape,
                                     skip_boundary = self.skip_bounds,
                                     use_axes = used_axes)
                 elif self.algorithm == 'EDGES':
-                    vertices = edges_relax(vertices, edges, faces, iterations,
+                    vertices = edges_func(vertices, edges, faces, iterations,
                                     k = factor,
                                     mask = mask,
                                     method = self.preserve_shape,
@@ -168,7 +192,7 @@ class SvRelaxMeshNode(TransformNode, bpy.types.Node, SverchCustomTreeNode):
                                     skip_boundary = self.skip_bounds,
                                     use_axes = used_axes)
                 elif self.algorithm == 'FACES':
-                    vertices = faces_relax(vertices, edges, faces, iterations,
+                    vertices = faces_func(vertices, edges, faces, iterations,
                                     k = factor,
                                     mask = mask,
                                     method = self.preserve_shape,
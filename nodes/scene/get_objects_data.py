@@ -5,6 +5,8 @@
 # SPDX-License-Identifier: GPL3
 # License-Filename: LICENSE
 
+import numpy as np
+
 import bpy
 from bpy.props import BoolProperty, StringProperty, IntProperty
 import bmesh
@@ -16,8 +18,10 @@ from sverchok.utils.sv_bmesh_utils import pydata_from_bmesh
 from sverchok.core.handlers import get_sv_depsgraph, set_sv_depsgraph_need
 from sverchok.utils.nodes_mixins.show_3d_properties import Show3DProperties
 from sverchok.utils.blender_mesh import (
-    read_verts, read_edges, read_verts_normal,
-    read_face_normal, read_face_center, read_face_area, read_materials_idx)
+    read_verts, read_edges, read_verts_normal, read_loops,
+    read_face_normal, read_face_center, read_face_area, read_materials_idx,
+    loops_from_polygons, polygons_from_loops, calc_polygon_centers, calc_polygon_normals,
+    SvObjectDataCache, output_cached_array)
 
 class SvOB3BDataCollection(bpy.types.PropertyGroup):
     name: bpy.props.StringProperty()
@@ -75,6 +79,31 @@ def get_vertgroups(mesh):
     return [k for k,v in enumerate(mesh.vertices) if v.groups.values()]
 
 numpy_socket_names = ['Vertices', 'Edges', 'Vertex Normals', 'Material Idx', 'Polygon Areas', 'Polygon Centers', 'Polygon Normals']
+mesh_socket_names = ['Vertices', 'Edges', 'Polygons', 'Vertex Normals', 'Material Idx', 'Polygon Areas', 'Polygon Centers', 'Polygon Normals']
+
+# Data of objects read by each node, by node_id
+object_data_caches = dict()
+
+# Functions to read mesh data into numpy arrays, by output name
+mesh_readers = {
+    'Vertices': lambda mesh: read_verts(mesh, output_numpy=True),
+    'Edges': lambda mesh: read_edges(mesh, output_numpy=True),
+    'Polygons': read_loops,
+    'Vertex Normals': lambda mesh: read_verts_normal(mesh, output_numpy=True),
+    'Material Idx': lambda mesh: read_materials_idx(mesh, output_numpy=True),
+    'Polygon Areas': lambda mesh: read_face_area(mesh, output_numpy=True),
+    'Polygon Centers': lambda mesh: read_face_center(mesh, output_numpy=True),
+    'Polygon Normals': lambda mesh: read_face_normal(mesh, output_numpy=True),
+    'Vers_grouped': lambda mesh: np.array(get_vertgroups(mesh), dtype=np.int64)
+}
+
+def output_mesh_data(name, data, output_numpy):
+    """
+    Convert cached arrays into data for output socket.
+    """
+    if name == 'Polygons':
+        return polygons_from_loops(*data)
+    return output_cached_array(data, output_numpy)
 
 
 class SvGetObjectsData(Show3DProperties, bpy.types.Node, SverchCustomTreeNode):
@@ -257,8 +286,50 @@ class SvGetObjectsData(Show3DProperties, bpy.types.Node, SverchCustomTreeNode):
     def get_materials_from_bmesh(self, bm):
         return [face.material_index for face in bm.faces[:]]
 
+    def read_edit_mesh(self, obj, names):
+        """
+        Mesh objects do not currently return what you see from 3dview while
+        in edit mode when using obj.to_mesh, so edit mesh is read with bmesh.
+        Data of such objects is not cached.
+        """
+        bm = bmesh.from_edit_mesh(obj.data)
+        vers, edgs, pols = pydata_from_bmesh(bm)
+        loop_totals, loop_verts = loops_from_polygons(pols)
+        data = {'Vertices': vers, 'Edges': edgs, 'Polygons': pols}
+        if 'Vertex Normals' in names:
+            data['Vertex Normals'] = [v.normal[:] for v in bm.verts]
+        if 'Material Idx' in names:
+            data['Material Idx'] = self.get_materials_from_bmesh(bm)
+        if 'Polygon Centers' in names:
+            data['Polygon Centers'] = calc_polygon_centers(vers, loop_totals, loop_verts).tolist()
+        if 'Polygon Areas' in names or 'Polygon Normals' in names:
+            normals, areas = calc_polygon_normals(vers, loop_totals, loop_verts)
+            data['Polygon Areas'] = areas.tolist()
+            data['Polygon Normals'] = normals.tolist()
+        del bm
+        return data
+
+    def read_object_mesh(self, obj, names, cached, sv_depsgraph):
+        """
+        Read data which is not in the cache yet; the mesh is not evaluated at
+        all if everything is cached.
+        """
+        missing = [name for name in names if name not in cached]
+        if not missing:
+            return cached
+        if self.modifiers:
+            obj = sv_depsgraph.objects[obj.name]
+            obj_data = obj.to_mesh(preserve_all_data_layers=True, depsgraph=sv_depsgraph)
+        else:
+            obj_data = obj.to_mesh()
+        for name in missing:
+            cached[name] = mesh_readers[name](obj_data)
+        obj.to_mesh_clear()
+        return cached
+
     def sv_free(self):
         set_sv_depsgraph_need(False)
+        object_data_caches.pop(self.node_id, None)
 
     def process(self):
 
@@ -270,20 +341,32 @@ class SvGetObjectsData(Show3DProperties, bpy.types.Node, SverchCustomTreeNode):
         outputs = self.outputs
 
         vers_out_grouped = []
-
         o_vs, o_es, o_ps, o_vn, o_mi, o_pa, o_pc, o_pn, o_ms, o_ob = [s.is_linked for s in self.outputs[:10]]
         vs, es, ps, vn, mi, pa, pc, pn, ms = [[] for s in self.outputs[:9]]
-        if self.modifiers:
-            sv_depsgraph = get_sv_depsgraph()
-
+        # Evaluation of depsgraph before reading objects reports which of
+        # them were changed, so that cached data of the others can be reused
+        sv_depsgraph = get_sv_depsgraph()
+        cache = object_data_caches.setdefault(self.node_id, SvObjectDataCache())
+        frame = bpy.context.scene.frame_current
 
         out_np = self.out_np if not self.output_np_all else [True for i in range(7)]
+        # (output name, whether to output numpy, list of results) for linked outputs
+        outs = []
+        for name, out_list in zip(mesh_socket_names, [vs, es, ps, vn, mi, pa, pc, pn]):
+            if outputs[name].is_linked:
+                output_numpy = out_np[numpy_socket_names.index(name)] if name in numpy_socket_names else False
+                outs.append((name, output_numpy, out_list))
+        if self.vergroups:
+            outs.append(('Vers_grouped', False, vers_out_grouped))
+        out_names = [name for name, _, _ in outs]
+
         if isinstance(objs[0], list):
             objs = objs[0]
         if not objs:
             objs = (data_objects.get(o.name) for o in self.object_names)
 
         # iterate through references
+        names = []
         for obj in objs:
 
             if not obj:
@@ -295,65 +378,18 @@ class SvGetObjectsData(Show3DProperties, bpy.types.Node, SverchCustomTreeNode):
                     ms.append(mtrx)
                 continue
             try:
+                names.append(obj.name_full)
                 if obj.mode == 'EDIT' and obj.type == 'MESH':
-                    # Mesh objects do not currently return what you see
-                    # from 3dview while in edit mode when using obj.to_mesh.
-                    me = obj.data
-                    bm = bmesh.from_edit_mesh(me)
-                    vers, edgs, pols = pydata_from_bmesh(bm)
-
-                    if o_vs:
-                        vs.append(vers)
-                    if o_es:
-                        es.append(edgs)
-                    if o_ps:
-                        ps.append(pols)
-                    if o_vn:
-                        vn.append([v.normal[:] for v in bm.verts])
-                    if o_mi:
-                        mi.append(self.get_materials_from_bmesh(bm))
-                    if o_pa:
-                        pa.append([p.calc_area() for p in bm.faces])
-                    if o_pc:
-                        pc.append([p.calc_center_median()[:] for p in bm.faces])
-                    if o_pn:
-                        pn.append([p.normal[:] for p in bm.faces])
-
-                    del bm
+                    cache.drop(obj.name_full)
+                    data = self.read_edit_mesh(obj, out_names)
+                    for name, _, out_list in outs:
+                        if name in data:
+                            out_list.append(data[name])
                 else:
-
-                    if self.modifiers:
-                        obj = sv_depsgraph.objects[obj.name]
-                        obj_data = obj.to_mesh(preserve_all_data_layers=True, depsgraph=sv_depsgraph)
-                    else:
-                        obj_data = obj.to_mesh()
-
-                    if o_vs:
-                        vs.append(read_verts(obj_data, out_np[0]))
-                    if o_es:
-                        es.append(read_edges(obj_data, out_np[1]))
-                    if o_ps:
-                        ps.append([list(p.vertices) for p in obj_data.polygons])
-                    if self.vergroups:
-                        vers_out_grouped.append(get_vertgroups(obj_data))
-                    if o_vn:
-                        vn.append(read_verts_normal(obj_data, out_np[2]))
-                    if o_mi:
-                        mi.append(read_materials_idx(obj_data, out_np[3]))
-                    if o_pa:
-                        pa.append(read_face_area(obj_data, out_np[4]))
-                    if o_pc:
-                        if out_np[5]:
-                            pc.append(read_face_center(obj_data, output_numpy=True))
-                        else:
-                            pc.append([p.center[:] for p in obj_data.polygons])
-                    if o_pn:
-                        if out_np[6]:
-                            pn.append(read_face_normal(obj_data, True))
-                        else:
-                            pn.append([p.normal[:] for p in obj_data.polygons])
-
-                    obj.to_mesh_clear()
+                    cached = cache.get(obj.name_full, cache.stamp(obj, frame, self.modifiers))
+                    cached = self.read_object_mesh(obj, out_names, cached, sv_depsgraph)
+                    for name, output_numpy, out_list in outs:
+                        out_list.append(output_mesh_data(name, cached[name], output_numpy))
 
             except Exception as err:
                 print('failure in process between frozen area', self.name, err)
@@ -361,6 +397,7 @@ class SvGetObjectsData(Show3DProperties, bpy.types.Node, SverchCustomTreeNode):
             if o_ms:
                 ms.append(mtrx)
 
+        cache.retain(names)
 
         for i, i2 in zip(self.outputs, [vs, es, ps, vn, mi, pa, pc, pn, ms]):
             if i.is_linked:
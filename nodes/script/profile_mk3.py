@@ -31,8 +31,8 @@ from sverchok.utils.logging import info, debug, warning
 from sverchok.utils.curve.algorithms import concatenate_curves, unify_curves_degree
 from sverchok.utils.sv_update_utils import sv_get_local_path
 
-from sverchok.utils.modules.profile_mk3.interpreter import Interpreter
-from sverchok.utils.modules.profile_mk3.parser import parse_profile
+from sverchok.utils.modules.profile_mk3.interpreter import Interpreter, ArrayInterpreter
+from sverchok.utils.modules.profile_mk3.parser import parse_profile_cached
 
 '''
 input like:
@@ -526,12 +526,13 @@ class SvProfileNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         # we do not store stripped self.filename, else prop_search will shows it as read
         internal_file = bpy.data.texts[self.filename.strip()]
         f = internal_file.as_string()
-        profile = parse_profile(f)
+        profile = parse_profile_cached(f)
         return profile
 
-    def get_variables(self):
+    def get_variables(self, profile=None):
         variables = set()
-        profile = self.load_profile()
+        if profile is None:
+            profile = self.load_profile()
         if not profile:
             return variables
 
@@ -579,8 +580,9 @@ class SvProfileNodeMK3(bpy.types.Node, SverchCustomTreeNode):
 
         self.adjust_sockets()
 
-    def get_input(self):
-        variables = self.get_variables()
+    def get_input(self, variables=None):
+        if variables is None:
+            variables = self.get_variables()
         result = {}
 
         for var in variables:
@@ -612,6 +614,38 @@ class SvProfileNodeMK3(bpy.types.Node, SverchCustomTreeNode):
                 result[-1].append(curve2)
         return result
 
+    def interpret_batch(self, profile, var_names, parameters, input_names):
+        """
+        Interpret the profile for all sets of variable values at once.
+        Returns None if that is not possible for this profile and these values;
+        the caller should then interpret the profile for each set separately.
+        """
+        count = len(parameters[0])
+        variables = dict()
+        for name, values in zip(var_names, parameters):
+            if values[0] is None:
+                variables[name] = None
+                continue
+            try:
+                variables[name] = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                return None
+            if variables[name].shape != (count,):
+                return None
+
+        interpreter = ArrayInterpreter(self, input_names, count, z_axis=self.selected_axis)
+        try:
+            interpreter.interpret(profile, variables)
+        except Exception as e:
+            self.debug("Can not interpret profile for all values at once, will do one by one: %s", e)
+            return None
+
+        vertices = interpreter.get_vertices().tolist()
+        knots = interpreter.get_knots().tolist()
+        edges = [interpreter.edges for _ in range(count)]
+        names = [[[name] for name in interpreter.knotnames] for _ in range(count)]
+        return vertices, edges, knots, names
+
     def process(self):
 
         # upgrades older versions of ProfileMK3 to the version that has self.file_pointer
@@ -628,9 +662,9 @@ class SvProfileNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         profile = self.load_profile()
         optional_inputs = self.get_optional_inputs(profile)
 
-        var_names = self.get_variables()
+        var_names = self.get_variables(profile)
         self.debug("Var_names: %s; optional: %s", var_names, optional_inputs)
-        inputs = self.get_input()
+        inputs = self.get_input(var_names)
 
         result_vertices = []
         result_edges = []
@@ -659,6 +693,18 @@ class SvProfileNodeMK3(bpy.types.Node, SverchCustomTreeNode):
 
         input_names = [socket.name for socket in self.inputs if socket.is_linked]
 
+        need_curves = 'Curve' in self.outputs and self.outputs['Curve'].is_linked
+        if not need_curves and len(parameters[0]) > 1:
+            batch = self.interpret_batch(profile, var_names, parameters, input_names)
+            if batch is not None:
+                self.outputs['Vertices'].sv_set(batch[0])
+                self.outputs['Edges'].sv_set(batch[1])
+                self.outputs['Knots'].sv_set(batch[2])
+                self.outputs['KnotNames'].sv_set(batch[3])
+                if 'Curve' in self.outputs:
+                    self.outputs['Curve'].sv_set([[] for _ in batch[0]])
+                return
+
         for values in zip(*parameters):
             variables = dict(zip(var_names, values))
             curves_form = Interpreter.NURBS if self.nurbs_out else None
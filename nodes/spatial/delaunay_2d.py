@@ -16,14 +16,16 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import numpy as np
+
 import bpy
-from bpy.props import FloatProperty
+from bpy.props import FloatProperty, EnumProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
-from sverchok.utils.voronoi import Site, computeVoronoiDiagram, computeDelaunayTriangulation
+from sverchok.dependencies import scipy
+from sverchok.utils.delaunay2d import delaunay_2d_multi, AUTO, SCIPY, NUMPY, FORTUNE
 
-# computeDelaunayTriangulation
 class DelaunayTriangulation2DNode(bpy.types.Node, SverchCustomTreeNode):
     '''dea Verts. Triangulation '''
     bl_idname = 'DelaunayTriangulation2DNode'
@@ -31,10 +33,31 @@ class DelaunayTriangulation2DNode(bpy.types.Node, SverchCustomTreeNode):
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_DELAUNAY'
 
+    implementations = [
+            (SCIPY, "SciPy", "Qhull implementation from SciPy library", 0),
+            (NUMPY, "NumPy", "Sverchok built-in Bowyer-Watson implementation; fast only when Numba library is installed", 1),
+            (FORTUNE, "Python", "Pure-python implementation of Fortune's algorithm", 2)
+        ]
+
+    implementation : EnumProperty(
+            name = "Implementation",
+            items = implementations,
+            default = SCIPY,
+            update = updateNode)
+
+    def get_backend(self):
+        if self.implementation == SCIPY and scipy is None:
+            self.info("SciPy is not available currently, will use built-in implementation")
+            return AUTO
+        return self.implementation
+
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', "Vertices")
         self.outputs.new('SvStringsSocket', "Polygons")
 
+    def draw_buttons_ext(self, context, layout):
+        layout.prop(self, 'implementation', text='')
+
     def process(self):
 
         if not self.inputs['Vertices'].is_linked:
@@ -42,15 +65,10 @@ class DelaunayTriangulation2DNode(bpy.types.Node, SverchCustomTreeNode):
         if not self.outputs['Polygons'].is_linked:
             return
 
-        tris_out = []
-        points_in = []
         points_in = self.inputs['Vertices'].sv_get()
 
-        for obj in points_in:
-            pt_list = [Site(pt[0], pt[1]) for pt in obj]
-            res = computeDelaunayTriangulation(pt_list)
-            tris_out.append([tri for tri in res if -1 not in tri])
-
+        point_sets = [np.asarray(obj) for obj in points_in]
+        tris_out = [tris.tolist() for tris in delaunay_2d_multi(point_sets, backend=self.get_backend())]
 
         self.outputs['Polygons'].sv_set(tris_out)
 
@@ -11,7 +11,7 @@ from bpy.props import FloatProperty, EnumProperty, IntProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, ensure_nesting_level, zip_long_repeat, get_data_nesting_level
 from sverchok.utils.field.scalar import SvScalarField
-from sverchok.utils.voronoi3d import Bounds, lloyd3d_bounded
+from sverchok.utils.voronoi3d import Bounds, lloyd3d_bounded, lloyd3d_bounded_samples
 from sverchok.utils.dummy_nodes import add_dummy
 from sverchok.dependencies import scipy
 
@@ -53,16 +53,50 @@ class SvLloyd3dNode(bpy.types.Node, SverchCustomTreeNode):
         default = 'BOX',
         update = updateNode)
 
+    algorithms = [
+            ('VORONOI', "Voronoi diagram", "Build Voronoi diagram on each iteration and calculate exact centroids of its regions", 0),
+            ('SAMPLES', "Sampling", "Estimate centroids of regions by many random sample points; much faster for many sites", 1)
+        ]
+
+    algorithm : EnumProperty(
+        name = "Algorithm",
+        items = algorithms,
+        default = 'VORONOI', # for existing nodes
+        update = updateNode)
+
+    samples : IntProperty(
+        name = "Samples per site",
+        description = "Number of random sample points per site; more samples give more precise result",
+        min = 1,
+        default = 50,
+        update = updateNode)
+
+    tolerance : FloatProperty(
+        name = "Tolerance",
+        description = "Stop iterations when no site moves more than this distance",
+        min = 0.0,
+        default = 1e-4,
+        precision = 6,
+        update = updateNode)
+
+    def draw_algorithm(self, layout):
+        layout.prop(self, 'algorithm', text='')
+        if self.algorithm == 'SAMPLES':
+            layout.prop(self, 'samples')
+            layout.prop(self, 'tolerance')
+
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', "Sites").enable_input_link_menu = False
         self.inputs.new('SvStringsSocket', "Clipping").prop_name = 'clipping'
         self.inputs.new('SvStringsSocket', 'Iterations').prop_name = 'iterations'
         self.inputs.new('SvScalarFieldSocket', 'Weights').enable_input_link_menu = False
         self.outputs.new('SvVerticesSocket', "Sites")
+        self.algorithm = 'SAMPLES'
 
     def draw_buttons(self, context, layout):
         layout.label(text="Bounds mode:")
         layout.prop(self, "bounds_mode", text='')
+        self.draw_algorithm(layout)
 
     def process(self):
 
@@ -88,7 +122,11 @@ class SvLloyd3dNode(bpy.types.Node, SverchCustomTreeNode):
             new_verts = []
             for sites, iterations, clipping, weights in zip_long_repeat(*params):
                 bounds = Bounds.new(self.bounds_mode, sites, clipping)
-                sites = lloyd3d_bounded(bounds, sites, iterations, weight_field = weights)
+                if self.algorithm == 'SAMPLES':
+                    sites = lloyd3d_bounded_samples(bounds, sites, iterations, weight_field = weights,
+                                samples_per_site = self.samples, tolerance = self.tolerance)
+                else:
+                    sites = lloyd3d_bounded(bounds, sites, iterations, weight_field = weights)
                 new_verts.append(sites)
             if nested_output:
                 verts_out.append(new_verts)
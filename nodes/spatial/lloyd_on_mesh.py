@@ -6,12 +6,12 @@
 # License-Filename: LICENSE
 
 import bpy
-from bpy.props import FloatProperty, IntProperty
+from bpy.props import FloatProperty, IntProperty, EnumProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, ensure_nesting_level, zip_long_repeat, get_data_nesting_level
 from sverchok.utils.field.scalar import SvScalarField
-from sverchok.utils.voronoi3d import lloyd_on_mesh, lloyd_in_mesh
+from sverchok.utils.voronoi3d import lloyd_on_mesh, lloyd_in_mesh, lloyd_on_mesh_samples, lloyd_in_mesh_samples
 from sverchok.utils.dummy_nodes import add_dummy
 from sverchok.dependencies import scipy
 
@@ -52,8 +52,49 @@ class SvLloydOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
             default = 'SURFACE',
             update=updateNode)
 
+    algorithms = [
+            ('VORONOI', "Voronoi diagram", "Build Voronoi diagram on each iteration and calculate exact centroids of its regions", 0),
+            ('SAMPLES', "Sampling", "Estimate centroids of regions by many random sample points; much faster for many sites", 1)
+        ]
+
+    def update_algorithm(self, context):
+        self.update_sockets()
+        updateNode(self, context)
+
+    algorithm : EnumProperty(
+        name = "Algorithm",
+        items = algorithms,
+        default = 'VORONOI', # for existing nodes
+        update = update_algorithm)
+
+    samples : IntProperty(
+        name = "Samples per site",
+        description = "Number of random sample points per site; more samples give more precise result",
+        min = 1,
+        default = 50,
+        update = updateNode)
+
+    tolerance : FloatProperty(
+        name = "Tolerance",
+        description = "Stop iterations when no site moves more than this distance",
+        min = 0.0,
+        default = 1e-4,
+        precision = 6,
+        update = updateNode)
+
+    def draw_algorithm(self, layout):
+        layout.prop(self, 'algorithm', text='')
+        if self.algorithm == 'SAMPLES':
+            layout.prop(self, 'samples')
+            layout.prop(self, 'tolerance')
+
+    def update_sockets(self):
+        if 'Thickness' in self.inputs:
+            self.inputs['Thickness'].hide_safe = self.algorithm == 'SAMPLES'
+
     def draw_buttons(self, context, layout):
         layout.prop(self, "mode")
+        self.draw_algorithm(layout)
     
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', "Vertices")
@@ -63,6 +104,7 @@ class SvLloydOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
         self.inputs.new('SvStringsSocket', 'Thickness').prop_name = 'thickness'
         self.inputs.new('SvScalarFieldSocket', 'Weights').enable_input_link_menu = False
         self.outputs.new('SvVerticesSocket', "Sites")
+        self.algorithm = 'SAMPLES'
 
     def process(self):
 
@@ -91,7 +133,14 @@ class SvLloydOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
         for params in zip_long_repeat(verts_in, faces_in, sites_in, thickness_in, iterations_in, weights_in):
             new_verts = []
             for verts, faces, sites, thickness, iterations, weights in zip_long_repeat(*params):
-                if self.mode == 'SURFACE':
+                if self.algorithm == 'SAMPLES':
+                    if self.mode == 'SURFACE':
+                        sites = lloyd_on_mesh_samples(verts, faces, sites, iterations, weight_field = weights,
+                                    samples_per_site = self.samples, tolerance = self.tolerance)
+                    else:
+                        sites = lloyd_in_mesh_samples(verts, faces, sites, iterations, weight_field = weights,
+                                    samples_per_site = self.samples, tolerance = self.tolerance)
+                elif self.mode == 'SURFACE':
                     sites = lloyd_on_mesh(verts, faces, sites, thickness, iterations, weight_field = weights)
                 else:
                     sites = lloyd_in_mesh(verts, faces, sites, iterations, thickness=thickness, weight_field = weights)
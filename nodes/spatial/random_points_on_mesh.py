@@ -20,6 +20,7 @@ from sverchok.data_structure import updateNode, numpy_full_list
 from sverchok.utils.bvh_tree import bvh_tree_from_polygons
 from sverchok.utils.geom import calc_bounds
 from sverchok.utils.sv_mesh_utils import point_inside_mesh
+from sverchok.utils.winding_number import SvWindingNumber
 
 def np_calc_tris_areas(v_pols):
     perp = np.cross(v_pols[:, 1]- v_pols[:, 0], v_pols[:, 2]- v_pols[:, 0])/2
@@ -85,6 +86,28 @@ def populate_mesh(verts, faces, count, seed, all_triangles, safe_check):
             break
     return result, []
 
+def populate_mesh_np(verts, faces, count, seed):
+    inside = SvWindingNumber(verts, faces)
+    np.random.seed(seed)
+    x_min, x_max, y_min, y_max, z_min, z_max = calc_bounds(verts)
+    low = np.array([x_min, y_min, z_min])
+    high = np.array([x_max, y_max, z_max])
+    result = []
+    done = 0
+    iterations = 0
+    while True:
+        if iterations > MAX_ITERATIONS:
+            raise Exception("Iterations limit is reached")
+        max_pts = max(count, count-done)
+        points = np.random.uniform(low, high, size=(max_pts, 3))
+        points = points[inside.are_inside(points)]
+        result.append(points)
+        done += len(points)
+        iterations += 1
+        if done >= count:
+            break
+    return np.concatenate(result).tolist(), []
+
 def node_process(inputs: InputData, properties: NodeProperties):
     if properties.mode == 'SURFACE':
         me = TriangulatedMesh(inputs.verts, inputs.faces, properties.all_triangles, properties.implementation)
@@ -98,6 +121,8 @@ def node_process(inputs: InputData, properties: NodeProperties):
         return me.generate_random_points(inputs.number[0], inputs.seed[0])
 
     elif properties.mode == 'VOLUME':
+        if properties.implementation == 'NUMPY':
+            return populate_mesh_np(inputs.verts, inputs.faces, inputs.number[0], inputs.seed[0])
         return populate_mesh(inputs.verts, inputs.faces,
                              inputs.number[0], inputs.seed[0],
                              properties.all_triangles, properties.safe_check)
@@ -406,8 +431,10 @@ class SvRandomPointsOnMesh(bpy.types.Node, SverchCustomTreeNode):
                 r.prop(self, "out_np", index=0, text='Verts', toggle=True)
                 r.prop(self, "out_np", index=1, text='Face index', toggle=True)
         elif self.mode == 'VOLUME':
-            layout.prop(self, "all_triangles")
-            layout.prop(self, "safe_check")
+            layout.prop(self, "implementation")
+            if self.implementation == 'MATHUTILS':
+                layout.prop(self, "all_triangles")
+                layout.prop(self, "safe_check")
         else:
             layout.prop(self, "proportional")
             b = layout.box()
@@ -432,7 +459,9 @@ class SvRandomPointsOnMesh(bpy.types.Node, SverchCustomTreeNode):
             layout.prop(self, "out_np", index=0, text='Verts')
             layout.prop(self, "out_np", index=1, text='Edge index')
         else:
-            layout.prop(self, "all_triangles")
+            layout.prop_menu_enum(self, "implementation")
+            if self.implementation == 'MATHUTILS':
+                layout.prop(self, "all_triangles")
 
     def sv_init(self, context):
         [self.inputs.new(p.socket_type, p.name) for p in INPUT_CONFIG]
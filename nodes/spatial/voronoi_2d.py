@@ -22,6 +22,8 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat
 from sverchok.utils.voronoi import voronoi_bounded
+from sverchok.dependencies import scipy
+from sverchok.utils.delaunay2d import AUTO, SCIPY, NUMPY, FORTUNE
 
 
 class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
@@ -62,6 +64,24 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
         default = True,
         update = updateNode)
 
+    implementations = [
+            (SCIPY, "SciPy", "Qhull implementation from SciPy library", 0),
+            (NUMPY, "NumPy", "Sverchok built-in implementation; fast only when Numba library is installed", 1),
+            (FORTUNE, "Python", "Pure-python implementation of Fortune's algorithm", 2)
+        ]
+
+    implementation : EnumProperty(
+            name = "Implementation",
+            items = implementations,
+            default = SCIPY,
+            update = updateNode)
+
+    def get_backend(self):
+        if self.implementation == SCIPY and scipy is None:
+            self.info("SciPy is not available currently, will use built-in implementation")
+            return AUTO
+        return self.implementation
+
     def update_sockets(self, context):
         if 'Faces' in self.outputs:
             self.outputs['Faces'].hide_safe = not self.make_faces
@@ -106,6 +126,7 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
         layout.prop(self, "make_faces")
 
     def draw_buttons_ext(self, context, layout):
+        layout.prop(self, 'implementation', text='')
         self.draw_buttons(context, layout)
         if self.make_faces:
             layout.prop(self, 'ordered_faces')
@@ -138,7 +159,8 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
                         draw_hangs = self.draw_hangs,
                         make_faces = self.make_faces,
                         ordered_faces = self.ordered_faces,
-                        max_sides = max_sides)
+                        max_sides = max_sides,
+                        backend = self.get_backend())
 
             pts_out.append(new_vertices)
             edges_out.append(edges)
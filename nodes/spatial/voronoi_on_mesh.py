@@ -88,6 +88,17 @@ class SvVoronoiOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
             min = 1,
             update = updateNode)
 
+    implementations = [
+            ('BMESH', "Bmesh", "Cut cells one by one with bmesh bisect operator", 0),
+            ('NUMPY', "NumPy", "Clip cells with NumPy in parallel threads; much faster. Split Volume mode uses it for convex meshes only", 1)
+        ]
+
+    implementation : EnumProperty(
+            name = "Implementation",
+            items = implementations,
+            default = 'BMESH', # for existing nodes
+            update = updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', 'Vertices')
         self.inputs.new('SvStringsSocket', 'Faces')
@@ -99,6 +110,7 @@ class SvVoronoiOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
         self.outputs.new('SvStringsSocket', "Faces")
         #self.outputs.new('SvVerticesSocket', "AllSites")
         self.update_sockets(context)
+        self.implementation = 'NUMPY'
 
     def draw_buttons(self, context, layout):
         layout.label(text="Mode:")
@@ -111,6 +123,7 @@ class SvVoronoiOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons_ext(self, context, layout):
         self.draw_buttons(context, layout)
         layout.prop(self, 'accuracy')
+        layout.prop(self, 'implementation')
 
     def process(self):
 
@@ -149,7 +162,8 @@ class SvVoronoiOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
                             #clip_inner = self.clip_inner, clip_outer = self.clip_outer,
                             do_clip=True, clipping=None,
                             mode = self.mode,
-                            precision = precision)
+                            precision = precision,
+                            implementation = self.implementation)
                 if self.mode == 'VOLUME' and self.normals:
                     verts, edges, faces = recalc_normals(verts, edges, faces, loop=True)
 
@@ -12,7 +12,7 @@ from sverchok.utils.geom_2d.merge_mesh import crop_mesh_delaunay
 
 from sverchok.utils.curve import SvCurve
 from sverchok.utils.surface import SvSurface
-from sverchok.utils.adaptive_surface import adaptive_subdivide, MAXIMUM, GAUSS, MEAN
+from sverchok.utils.adaptive_surface import adaptive_subdivide, adaptive_refine, MAXIMUM, GAUSS, MEAN
 
 class SvAdaptiveTessellateNode(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -101,7 +101,44 @@ class SvAdaptiveTessellateNode(bpy.types.Node, SverchCustomTreeNode):
         name='Trim Accuracy', update=updateNode, default=5, min=3, max=12,
         description='Some errors of the node can be fixed by changing this value')
 
+    def update_sockets(self, context):
+        random = self.algorithm == 'RANDOM'
+        self.inputs['MinPpf'].hide_safe = not random
+        self.inputs['MaxPpf'].hide_safe = not random
+        self.inputs['Seed'].hide_safe = not random
+        updateNode(self, context)
+
+    algorithms = [
+            ('RANDOM', "Random", "Add random points to cells of the grid, more points where curvature or area is bigger, and triangulate all points", 0),
+            ('REFINE', "Refine", "Split triangles of the grid, while they deviate from the surface more than tolerance", 1)
+        ]
+
+    algorithm : EnumProperty(
+            name = "Algorithm",
+            items = algorithms,
+            default = 'RANDOM', # for existing nodes
+            update = update_sockets)
+
+    tolerance : FloatProperty(
+            name = "Tolerance",
+            description = "Maximum allowed distance between triangles and the surface",
+            default = 0.01,
+            min = 0.0,
+            precision = 4,
+            update = updateNode)
+
+    max_level : IntProperty(
+            name = "Max Level",
+            description = "Maximum number of subdivisions of initial grid triangles",
+            default = 5,
+            min = 0,
+            update = updateNode)
+
     def draw_buttons(self, context, layout):
+        layout.prop(self, 'algorithm')
+        if self.algorithm == 'REFINE':
+            layout.prop(self, 'tolerance')
+            layout.prop(self, 'max_level')
         row = layout.row(align=True)
         row.prop(self, 'by_curvature', toggle=True)
         row.prop(self, 'by_area', toggle=True)
@@ -128,6 +165,7 @@ class SvAdaptiveTessellateNode(bpy.types.Node, SverchCustomTreeNode):
         self.outputs.new('SvVerticesSocket', "Vertices")
         self.outputs.new('SvStringsSocket', "Faces")
         self.outputs.new('SvVerticesSocket', "UVPoints")
+        self.algorithm = 'REFINE'
 
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
@@ -162,20 +200,35 @@ class SvAdaptiveTessellateNode(bpy.types.Node, SverchCustomTreeNode):
         for surfaces, curves, samples_u_i, samples_v_i, samples_t_i, min_ppf_i, max_ppf_i, seed_i, add_points_i in inputs:
             objects = zip_long_repeat(surfaces, curves, samples_u_i, samples_v_i, samples_t_i, min_ppf_i, max_ppf_i, seed_i, add_points_i)
             for surface, curve, samples_u, samples_v, samples_t, min_ppf, max_ppf, seed, add_points in objects:
-                us, vs, new_faces = adaptive_subdivide(surface,
-                                        samples_u, samples_v,
-                                        trim_curve = curve,
-                                        samples_t = samples_t,
-                                        trim_mode = self.crop_mode,
-                                        epsilon = epsilon,
-                                        by_curvature = self.by_curvature,
-                                        curvature_clip = self.curvature_clip,
-                                        curvature_type = self.curvature_type,
-                                        by_area = self.by_area,
-                                        add_points = add_points,
-                                        min_ppf = min_ppf, max_ppf = max_ppf, seed = seed)
+                if self.algorithm == 'REFINE':
+                    us, vs, new_faces = adaptive_refine(surface,
+                                            samples_u, samples_v,
+                                            trim_curve = curve,
+                                            samples_t = samples_t,
+                                            trim_mode = self.crop_mode,
+                                            epsilon = epsilon,
+                                            by_curvature = self.by_curvature,
+                                            curvature_clip = self.curvature_clip,
+                                            curvature_type = self.curvature_type,
+                                            by_area = self.by_area,
+                                            add_points = add_points,
+                                            tolerance = self.tolerance,
+                                            max_level = self.max_level)
+                else:
+                    us, vs, new_faces = adaptive_subdivide(surface,
+                                            samples_u, samples_v,
+                                            trim_curve = curve,
+                                            samples_t = samples_t,
+                                            trim_mode = self.crop_mode,
+                                            epsilon = epsilon,
+                                            by_curvature = self.by_curvature,
+                                            curvature_clip = self.curvature_clip,
+                                            curvature_type = self.curvature_type,
+                                            by_area = self.by_area,
+                                            add_points = add_points,
+                                            min_ppf = min_ppf, max_ppf = max_ppf, seed = seed)
                 new_verts = surface.evaluate_array(us, vs).tolist()
-                new_uv = [(u,v,0) for u, v in zip(us, vs)]
+                new_uv = np.stack((us, vs, np.zeros(len(us))), axis=1).tolist()
                 uv_out.append(new_uv)
                 verts_out.append(new_verts)
                 faces_out.append(new_faces)
@@ -117,14 +117,14 @@ class SvInterpolatingSurfaceNode(bpy.types.Node, SverchCustomTreeNode):
                 return curve
             return make
         elif scipy is not None and self.interp_mode == 'RBF':
-            from scipy.interpolate import Rbf
+            from sverchok.utils.rbf import SvRbfInterpolator
             def make(vertices):
                 vertices = np.array(vertices)
                 ts = make_euclidean_ts(vertices)
-                rbf = Rbf(ts, vertices,
+                rbf = SvRbfInterpolator(ts, vertices,
                             function=self.function,
                             smooth=smooth,
-                            epsilon=epsilon, mode='N-D')
+                            epsilon=epsilon)
                 return SvRbfCurve(rbf, (0.0, 1.0))
             return make
         else:
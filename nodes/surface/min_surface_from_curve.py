@@ -19,7 +19,7 @@ from sverchok.utils.math import rbf_functions
 if scipy is None:
     add_dummy('SvExMinSurfaceFromCurveNode', "Minimal Surface from Curve", 'scipy')
 else:
-    from scipy.interpolate import Rbf
+    from sverchok.utils.rbf import SvRbfInterpolator
 
     class SvExMinSurfaceFromCurveNode(bpy.types.Node, SverchCustomTreeNode):
         """
@@ -89,9 +89,9 @@ else:
             us = np.cos(ts)
             vs = np.sin(ts)
 
-            rbf = Rbf(us, vs, curve_points,
+            rbf = SvRbfInterpolator(np.stack((us, vs), axis=1), curve_points,
                     function = self.function,
-                    epsilon = epsilon, smooth = smooth, mode = 'N-D')
+                    epsilon = epsilon, smooth = smooth)
             surface = SvRbfSurface(rbf, 'UV', 'Z', Matrix())
             surface.u_bounds = (-1.0, 1.0)
             surface.v_bounds = (-1.0, 1.0)
@@ -15,7 +15,7 @@ from sverchok.utils.surface.rbf import SvRbfSurface
 if scipy is None:
     add_dummy('SvExMinimalSurfaceNode', "Minimal Surface", 'scipy')
 else:
-    from scipy.interpolate import Rbf
+    from sverchok.utils.rbf import SvRbfInterpolator
 
     class SvExMinimalSurfaceNode(bpy.types.Node, SverchCustomTreeNode):
         """
@@ -197,10 +197,10 @@ else:
                     #print(XYZ[:,0])
                     #print(XYZ[:,1])
                     #print(XYZ[:,2])
-                    rbf = Rbf(XYZ[:,0],XYZ[:,1],XYZ[:,2],
+                    rbf = SvRbfInterpolator(XYZ[:,:2], XYZ[:,2],
                             function=self.function,
                             smooth=smooth,
-                            epsilon=epsilon, mode='1-D')
+                            epsilon=epsilon)
 
                     x_min = XYZ[:,0].min()
                     x_max = XYZ[:,0].max()
@@ -217,10 +217,10 @@ else:
                         src_vs = np.array(src_vs)
 
                     #self.info("Us: %s, Vs: %s", len(src_us), len(src_vs))
-                    rbf = Rbf(src_us, src_vs, all_vertices,
+                    rbf = SvRbfInterpolator(np.stack((src_us, src_vs), axis=1), all_vertices,
                             function = self.function,
                             smooth = smooth,
-                            epsilon = epsilon, mode='N-D')
+                            epsilon = epsilon)
 
                     u_min = src_us.min()
                     v_min = src_vs.min()
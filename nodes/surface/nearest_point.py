@@ -42,7 +42,8 @@ else:
             ('L-BFGS-B', "L-BFGS-B", "L-BFGS-B algorithm", 0),
             ('CG', "Conjugate Gradient", "Conjugate gradient algorithm", 1),
             ('TNC', "Truncated Newton", "Truncated Newton algorithm", 2),
-            ('SLSQP', "SLSQP", "Sequential Least SQuares Programming algorithm", 3)
+            ('SLSQP', "SLSQP", "Sequential Least SQuares Programming algorithm", 3),
+            ('NEWTON', "Newton", "Newton iterations, made for all points at once; much faster for many points", 4)
         ]
 
         method : EnumProperty(
@@ -65,7 +66,8 @@ else:
             self.draw_buttons(context, layout)
             if self.precise:
                 layout.prop(self, 'method')
-                layout.prop(self, 'sequential')
+                if self.method != 'NEWTON':
+                    layout.prop(self, 'sequential')
 
         def sv_init(self, context):
             self.inputs.new('SvSurfaceSocket', "Surface")
@@ -74,6 +76,8 @@ else:
             p.default_property = (0.0, 0.0, 0.0)
             self.outputs.new('SvVerticesSocket', "Point")
             self.outputs.new('SvVerticesSocket', "UVPoint")
+            # Old nodes keep using L-BFGS-B; new nodes use batched Newton method
+            self.method = 'NEWTON'
 
         def process(self):
             if not any(socket.is_linked for socket in self.outputs):
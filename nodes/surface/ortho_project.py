@@ -11,7 +11,7 @@ from sverchok.utils.logging import info, exception
 from sverchok.utils.surface import SvSurface
 from sverchok.utils.dummy_nodes import add_dummy
 from sverchok.dependencies import scipy
-from sverchok.utils.manifolds import ortho_project_surface
+from sverchok.utils.manifolds import ortho_project_surface, nearest_point_on_surface, NEWTON
 
 if scipy is None:
     add_dummy('SvExOrthoProjectSurfaceNode', "Ortho Project on Surface", 'scipy')
@@ -32,10 +32,26 @@ else:
             default = 5,
             min = 3,
             update = updateNode)
+
+        algorithms = [
+            ('ALTERNATE', "Alternating", "Project onto U and V iso-curves alternately, point by point", 0),
+            ('NEWTON', "Newton", "Newton iterations, made for all points at once; much faster for many points", 1)
+        ]
+
+        # Old nodes keep the alternating algorithm; new nodes use Newton (see sv_init)
+        algorithm : EnumProperty(
+            name = "Algorithm",
+            items = algorithms,
+            default = 'ALTERNATE',
+            update = updateNode)
         
         def draw_buttons(self, context, layout):
             layout.prop(self, 'samples')
 
+        def draw_buttons_ext(self, context, layout):
+            self.draw_buttons(context, layout)
+            layout.prop(self, 'algorithm')
+
         def sv_init(self, context):
             self.inputs.new('SvSurfaceSocket', "Surface")
             p = self.inputs.new('SvVerticesSocket', "Point")
@@ -43,6 +59,7 @@ else:
             p.default_property = (0.0, 0.0, 0.0)
             self.outputs.new('SvVerticesSocket', "Point")
             self.outputs.new('SvVerticesSocket', "UVPoint")
+            self.algorithm = 'NEWTON'
 
         def process(self):
             if not any(socket.is_linked for socket in self.outputs):
@@ -59,11 +76,17 @@ else:
                 for surface, src_points in zip_long_repeat(surfaces, src_points_i):
                     new_points = []
                     new_uv = []
-                    for src_point in src_points:
-                        src_point = np.array(src_point)
-                        u, v, point = ortho_project_surface(src_point, surface, init_samples=self.samples)
-                        new_uv.append((u, v, 0))
-                        new_points.append(point)
+                    if self.algorithm == 'NEWTON':
+                        us, vs, new_points = nearest_point_on_surface(src_points, surface,
+                                                init_samples = self.samples,
+                                                method = NEWTON)
+                        new_uv = [(u, v, 0) for u, v in zip(us, vs)]
+                    else:
+                        for src_point in src_points:
+                            src_point = np.array(src_point)
+                            u, v, point = ortho_project_surface(src_point, surface, init_samples=self.samples)
+                            new_uv.append((u, v, 0))
+                            new_points.append(point)
                     points_out.append(new_points)
                     uv_out.append(new_uv)
 
@@ -20,12 +20,12 @@
 
 import bpy
 from bpy.props import EnumProperty, IntProperty, BoolProperty
-from mathutils import noise, Matrix, Vector
-from itertools import cycle
+from mathutils import noise, Matrix
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat
 from sverchok.utils.sv_noise_utils import noise_options, PERLIN_ORIGINAL, noise_numpy_types
+from sverchok.utils.sv_noise_np import get_noise
 from sverchok.utils.modules.matrix_utils import matrix_apply_np
 import numpy as np
 
@@ -57,6 +57,25 @@ def mathulis_noise(vecs, out, out_mode, noise_type, noise_function, output_numpy
         noise_output = np.linalg.norm(vecs, axis=1)*0.5
         out.append(noise_output if output_numpy else noise_output.tolist())
 
+def numpy_blender_noise(vecs, out, out_mode, seed, noise_type, output_numpy):
+    generator = get_noise(seed)
+    if out_mode == 'VECTOR':
+        noise_output = generator.noise_vector(vecs, noise_type)
+    else:
+        # same as for mathutils implementation
+        vecs = generator.noise_vector(vecs, noise_type)
+        vecs[:,2] -= 1
+        noise_output = np.linalg.norm(vecs, axis=1)*0.5
+    out.append(noise_output if output_numpy else noise_output.tolist())
+
+def apply_matrices_np(vs, ms):
+    # each vertex is transformed by matrix with the same index, matrices are cycled
+    vs = vs if isinstance(vs, np.ndarray) else np.array(vs)
+    inverted = np.linalg.inv(np.array(ms))
+    idxs = np.arange(len(vs)) % len(inverted)
+    matrices = inverted[idxs]
+    return np.einsum('nij,nj->ni', matrices[:,:3,:3], vs) + matrices[:,:3,3]
+
 def preprocess_verts(noise_matrix, verts, numpy_mode):
     if isinstance(noise_matrix[0], Matrix):
         if numpy_mode:
@@ -74,7 +93,9 @@ def preprocess_verts(noise_matrix, verts, numpy_mode):
                 for vs, m in zip_long_repeat(verts, noise_matrix)
                 ]
     else:
-        verts = [[m.inverted() @ Vector(v) for v, m in zip(vs, cycle(ms))] for vs, ms in zip_long_repeat(verts, noise_matrix)]
+        verts = [apply_matrices_np(vs, ms) for vs, ms in zip_long_repeat(verts, noise_matrix)]
+        if not numpy_mode:
+            verts = [vs.tolist() for vs in verts]
 
     return verts
 
@@ -83,6 +104,10 @@ avail_noise = [(t[0], t[0].title().replace('_', ' '), t[0].title(), '', t[1]) fo
 for idx, new_type in enumerate(noise_numpy_types.keys()):
     avail_noise.append((new_type, new_type.title().replace('_', ' '), new_type.title(), '', 100 + idx))
 
+implementation_modes = [
+    ('MATHUTILS', "Mathutils", "Use mathutils.noise, one vertex at a time", 0),
+    ('NUMPY', "NumPy", "Vectorized implementation of Blender noise types; much faster for big meshes", 1)]
+
 
 class SvNoiseNodeMK3(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -142,6 +167,13 @@ class SvNoiseNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         description='Output NumPy arrays',
         default=False, update=updateNode)
 
+    implementation: EnumProperty(
+        name='Implementation',
+        items=implementation_modes,
+        default='MATHUTILS',
+        description='Implementation of Blender noise types',
+        update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', 'Vertices')
         self.inputs.new('SvStringsSocket', 'Seed').prop_name = 'seed'
@@ -160,6 +192,8 @@ class SvNoiseNodeMK3(bpy.types.Node, SverchCustomTreeNode):
 
     def draw_buttons_ext(self, ctx, layout):
         self.draw_buttons(ctx, layout)
+        if self.noise_type not in noise_numpy_types.keys():
+            layout.prop(self, 'implementation', text='')
         layout.prop(self, "output_numpy", toggle=False)
 
     def rclick_menu(self, context, layout):
@@ -168,6 +202,8 @@ class SvNoiseNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         if self.noise_type in noise_numpy_types.keys():
             layout.prop(self, 'smooth', toggle=True)
             layout.prop(self, 'interpolate', toggle=True)
+        if self.noise_type not in noise_numpy_types.keys():
+            layout.prop_menu_enum(self, "implementation")
         layout.prop(self, "output_numpy", toggle=True)
 
     def process(self):
@@ -182,7 +218,7 @@ class SvNoiseNodeMK3(bpy.types.Node, SverchCustomTreeNode):
 
         seeds = inputs['Seed'].sv_get()[0]
         noise_type = self.noise_type
-        numpy_mode = noise_type in noise_numpy_types.keys()
+        numpy_mode = noise_type in noise_numpy_types.keys() or self.implementation == 'NUMPY'
         if noise_matrix:
             verts = preprocess_verts(noise_matrix, verts, numpy_mode)
 
@@ -191,7 +227,7 @@ class SvNoiseNodeMK3(bpy.types.Node, SverchCustomTreeNode):
         out_mode = self.out_mode
         output_numpy = self.output_numpy
 
-        if numpy_mode:
+        if noise_type in noise_numpy_types.keys():
 
             noise_function = noise_numpy_types[noise_type][self.interpolate]
             smooth = self.smooth
@@ -200,6 +236,14 @@ class SvNoiseNodeMK3(bpy.types.Node, SverchCustomTreeNode):
                 obj_id = min(i, len(verts)-1)
                 numpy_noise(verts[obj_id], out, out_mode, seed, noise_function, smooth, output_numpy)
 
+        elif numpy_mode:
+
+            for i in range(max_len):
+                seed = seeds[min(i, len(seeds)-1)]
+                obj_id = min(i, len(verts)-1)
+                seed_val = int(round(seed)) or 140230
+                numpy_blender_noise(verts[obj_id], out, out_mode, seed_val, noise_type, output_numpy)
+
         else:
 
             noise_function = noise.noise_vector
@@ -7,12 +7,14 @@
 
 from itertools import cycle
 
+import numpy as np
+
 import bpy
 from bpy.props import BoolProperty
 from mathutils import Matrix
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import updateNode, repeat_last
+from sverchok.data_structure import updateNode, repeat_last, numpy_full_list_cycle
 from sverchok.utils.nodes_mixins.generating_objects import SvMeshData, SvViewerNode
 from sverchok.utils.handle_blender_data import correct_collection_length
 from sverchok.utils.nodes_mixins.show_3d_properties import Show3DProperties
@@ -185,9 +187,12 @@ class SvMeshViewer(Show3DProperties, SvViewerNode, SverchCustomTreeNode, bpy.typ
             if self.material:
                 me_data.mesh.materials.clear()
                 me_data.mesh.materials.append(self.material)
-            if mat_indexes:
-                with fix_error_msg({TypeError: "Unsupported material format"}):
-                    mat_i = [int(mi) for _, mi in zip(me_data.mesh.polygons, cycle(mat_i))]
+            if mat_indexes and len(mat_i):
+                with fix_error_msg({TypeError: "Unsupported material format", ValueError: "Unsupported material format"}):
+                    mat_i = np.asarray(mat_i).astype(np.int32)
+                    if mat_i.ndim != 1:
+                        raise TypeError()
+                mat_i = numpy_full_list_cycle(mat_i, len(me_data.mesh.polygons))
                 me_data.mesh.polygons.foreach_set('material_index', mat_i)
             me_data.set_smooth(self.is_smooth_mesh)
 
@@ -230,6 +230,20 @@ class SverchokPreferences(AddonPreferences):
             description = "Show some additional panels or features useful for Sverchok developers only",
             default = False)
 
+    def update_evaluation_cache(self, context):
+        from sverchok.utils.evaluation_cache import update_evaluation_cache
+        update_evaluation_cache()
+
+    evaluation_cache_enabled: BoolProperty(name = "Cache curves evaluation",
+            description = "Remember results of curves and surfaces evaluation, so that several nodes evaluating the same curve at the same points do it only once",
+            default = False,
+            update = update_evaluation_cache)
+
+    evaluation_cache_size: IntProperty(name = "Cache size (MB)",
+            description = "Maximum memory used by curves evaluation cache; least recently used results are dropped first",
+            default = 256, min = 1,
+            update = update_evaluation_cache)
+
     #  theme settings
 
     sv_theme: EnumProperty(
@@ -453,6 +467,16 @@ class SverchokPreferences(AddonPreferences):
         col2box.prop(self, "show_debug")
         col2box.prop(self, "developer_mode")
 
+        cache_box = col2.box()
+        cache_box.label(text="Evaluation cache:")
+        cache_box.prop(self, "evaluation_cache_enabled")
+        if self.evaluation_cache_enabled:
+            from sverchok.utils.evaluation_cache import evaluation_cache
+            cache_box.prop(self, "evaluation_cache_size")
+            stats = evaluation_cache.get_statistics()
+            cache_box.label(text="Hit rate: {:.0%}; hits: {}, misses: {}".format(stats['hit_rate'], stats['hits'], stats['misses']))
+            cache_box.label(text="Entries: {}; memory used: {:.1f} MB".format(stats['entries'], stats['memory'] / (1024*1024)))
+
         log_box = col2.box()
         log_box.label(text="Logging:")
         log_box.prop(self, "log_level")
@@ -0,0 +1,52 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.surface.core import SvLambdaSurface
+from sverchok.utils.adaptive_surface import adaptive_refine, grid_triangles, split_triangles
+
+def bump(us, vs):
+    return np.stack((us, vs, 0.3 * np.exp(-((us - 0.5)**2 + (vs - 0.5)**2) * 40)), axis=-1)
+
+class AdaptiveRefineTests(SverchokTestCase):
+    def check_triangulation(self, us, vs, faces):
+        faces = np.array(faces)
+        # consistent orientation: each directed edge is used once
+        starts, ends = faces.ravel(), np.roll(faces, -1, axis=1).ravel()
+        keys = starts * len(us) + ends
+        self.assertEqual(len(np.unique(keys)), len(keys))
+        # triangles cover the whole UV square without overlaps
+        a_u, a_v = us[faces[:,1]] - us[faces[:,0]], vs[faces[:,1]] - vs[faces[:,0]]
+        b_u, b_v = us[faces[:,2]] - us[faces[:,0]], vs[faces[:,2]] - vs[faces[:,0]]
+        areas = (a_u * b_v - a_v * b_u) / 2.0
+        self.assertTrue((areas > 0).all())
+        self.assertAlmostEqual(areas.sum(), 1.0)
+
+    def test_split_triangles(self):
+        points = np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0), (0.5, 0, 0), (0.5, 0.5, 0), (0, 0.5, 0)], dtype=np.float64)
+        triangles = np.array([[0, 1, 2]] * 4)
+        mids = np.array([[-1, -1, -1], [-1, 4, -1], [3, -1, 5], [3, 4, 5]])
+        result = split_triangles(triangles, mids, points)
+        self.assertEqual(len(result), 1 + 2 + 3 + 4)
+        self.assertEqual(sorted(map(sorted, result[-4:].tolist())), [[0, 3, 5], [1, 3, 4], [2, 4, 5], [3, 4, 5]])
+
+    def test_flat(self):
+        surface = SvLambdaSurface(None, lambda us, vs: np.stack((us, vs, np.zeros_like(us)), axis=-1))
+        us, vs, faces = adaptive_refine(surface, 5, 4, by_curvature=False, by_area=False)
+        self.assertEqual(len(us), 20)
+        self.assert_numpy_arrays_equal(np.array(faces), grid_triangles(5, 4))
+
+    def test_bump(self):
+        surface = SvLambdaSurface(None, bump)
+        tolerance = 0.001
+        us, vs, faces = adaptive_refine(surface, 20, 20, by_curvature=False, by_area=False, tolerance=tolerance, max_level=8)
+        self.assertGreater(len(us), 400)
+        self.check_triangulation(us, vs, faces)
+        # centers of triangles are close to the surface
+        faces = np.array(faces)
+        points = bump(us, vs)
+        centers = bump(us[faces].mean(axis=1), vs[faces].mean(axis=1))
+        errors = np.linalg.norm(centers - points[faces].mean(axis=1), axis=1)
+        self.assertLess(errors.max(), 2 * tolerance)
+        # refinement is local: far from the bump, triangles are not split
+        corner = (us < 0.1) & (vs < 0.1)
+        self.assertEqual(corner.sum(), 4)
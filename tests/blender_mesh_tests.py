@@ -0,0 +1,76 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.blender_mesh import (
+        loops_from_polygons, polygons_from_loops,
+        calc_polygon_centers, calc_polygon_normals,
+        SvObjectDataCache, tag_geometry_updates, reset_geometry_revisions,
+        output_cached_array)
+
+class FakeID(object):
+    def __init__(self, id_type, name, data=None):
+        self.id_type = id_type
+        self.name_full = name
+        self.data = data
+        self.animation_data = None
+        self.modifiers = []
+        self.original = self
+
+class FakeUpdate(object):
+    def __init__(self, id, is_updated_geometry=True):
+        self.id = id
+        self.is_updated_geometry = is_updated_geometry
+
+class FakeDepsgraph(object):
+    def __init__(self, updates):
+        self.updates = updates
+
+class BlenderMeshTests(SverchokTestCase):
+    def test_loops(self):
+        polygons = [[0, 1, 2], [2, 1, 3, 4]]
+        loop_totals, loop_verts = loops_from_polygons(polygons)
+        self.assertEqual(loop_totals.tolist(), [3, 4])
+        self.assertEqual(polygons_from_loops(loop_totals, loop_verts), polygons)
+        quads = [[0, 1, 2, 3], [3, 2, 4, 5]]
+        self.assertEqual(polygons_from_loops(*loops_from_polygons(quads)), quads)
+        self.assertEqual(polygons_from_loops(*loops_from_polygons([])), [])
+
+    def test_polygon_data(self):
+        verts = [(0, 0, 0), (2, 0, 0), (2, 2, 0), (0, 2, 0), (0, 0, 1)]
+        polygons = [[0, 1, 2, 3], [0, 4, 1]]
+        loop_totals, loop_verts = loops_from_polygons(polygons)
+        centers = calc_polygon_centers(verts, loop_totals, loop_verts)
+        self.assert_numpy_arrays_equal(centers, np.array([[1, 1, 0], [2/3.0, 0, 1/3.0]]), precision=8)
+        normals, areas = calc_polygon_normals(verts, loop_totals, loop_verts)
+        self.assert_numpy_arrays_equal(normals, np.array([[0, 0, 1], [0, 1, 0]]), precision=8)
+        self.assert_numpy_arrays_equal(areas, np.array([4.0, 1.0]), precision=8)
+
+    def test_cache_stamp(self):
+        reset_geometry_revisions()
+        mesh = FakeID('MESH', "Mesh")
+        obj = FakeID('OBJECT', "Object", mesh)
+        cache = SvObjectDataCache()
+        data = cache.get(obj.name_full, cache.stamp(obj, frame=1))
+        data['Vertices'] = [(0, 0, 0)]
+        # static object is not re-read on other frame
+        self.assertIn('Vertices', cache.get(obj.name_full, cache.stamp(obj, frame=2)))
+        # ... unless other objects changed
+        tag_geometry_updates(FakeDepsgraph([FakeUpdate(FakeID('OBJECT', "Other")), FakeUpdate(mesh, False)]))
+        self.assertIn('Vertices', cache.get(obj.name_full, cache.stamp(obj, frame=2)))
+        tag_geometry_updates(FakeDepsgraph([FakeUpdate(mesh)]))
+        self.assertEqual(cache.get(obj.name_full, cache.stamp(obj, frame=2)), dict())
+        # animated object is re-read on each frame
+        cache.get(obj.name_full, cache.stamp(obj, frame=2))['Vertices'] = [(0, 0, 0)]
+        obj.animation_data = object()
+        self.assertEqual(cache.get(obj.name_full, cache.stamp(obj, frame=3)), dict())
+        cache.retain([])
+        self.assertEqual(cache._entries, dict())
+
+    def test_cached_output(self):
+        cached = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+        # Changing output data in place does not change the cache
+        output = output_cached_array(cached, output_numpy=True)
+        output[0, 0] = 5.0
+        output = output_cached_array(cached)
+        output[1][0] = 5.0
+        self.assertEqual(output_cached_array(cached), [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
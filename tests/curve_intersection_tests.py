@@ -0,0 +1,61 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.curve import knotvector as sv_knotvector
+from sverchok.utils.curve.nurbs import SvNurbsCurve
+from sverchok.utils.curve.intersections import (intersect_nurbs_curves_batch,
+            bezier_decomposition, bezier_evaluate)
+
+def build_curve(control_points, degree=3, weights=None):
+    n = len(control_points)
+    if weights is None:
+        weights = np.ones(n)
+    knotvector = sv_knotvector.generate(degree, n)
+    return SvNurbsCurve.build(SvNurbsCurve.NATIVE, degree, knotvector,
+                np.array(control_points, dtype=np.float64), np.array(weights, dtype=np.float64))
+
+class CurveIntersectionTests(SverchokTestCase):
+    def test_decomposition(self):
+        curve = build_curve([[0,0,0], [1,2,0], [2,-2,0], [3,1,0], [4,0,1], [5,2,0]])
+        points, bounds = bezier_decomposition(curve)
+        self.assertEqual(points.shape, (3, 4, 4))
+        ts = np.linspace(0, 1, 5)
+        for segment, (u_min, u_max) in zip(points, bounds):
+            pts, _ = bezier_evaluate(np.repeat(segment[np.newaxis], len(ts), axis=0), ts)
+            expected = curve.evaluate_array(u_min + ts * (u_max - u_min))
+            self.assert_numpy_arrays_equal(pts, expected, precision=10)
+
+    def test_several_intersections(self):
+        curve = build_curve([[0,0,0], [1,2,0], [2,-2,0], [3,1,0], [4,0,0], [5,2,0]])
+        line = build_curve([[0,0.3,0], [5,0.3,0]], degree=1)
+        result = intersect_nurbs_curves_batch([curve], [line], precision=1e-6)
+        items = result[(0, 0)]
+        self.assertEqual(len(items), 3)
+        for t1, t2, point in items:
+            self.assert_numpy_arrays_equal(curve.evaluate(t1), point, precision=5)
+            self.assert_numpy_arrays_equal(line.evaluate(t2), point, precision=5)
+            self.assertAlmostEqual(point[1], 0.3, places=5)
+
+    def test_rational(self):
+        w = np.sqrt(2) / 2
+        arc = build_curve([[1,0,0], [1,1,0], [0,1,0]], degree=2, weights=[1, w, 1])
+        diagonal = build_curve([[0,0,0], [2,2,0]], degree=1)
+        skew = build_curve([[0,0,1], [2,2,1]], degree=1)
+        result = intersect_nurbs_curves_batch([arc], [diagonal, skew], precision=1e-6)
+        self.assertEqual(list(result.keys()), [(0, 0)])
+        (t1, t2, point), = result[(0, 0)]
+        self.assert_numpy_arrays_equal(point, np.array([w, w, 0]), precision=5)
+
+    def test_all_pairs(self):
+        # Lines y = x + k intersect vertical lines x = m at (m, m + k)
+        slanted = [build_curve([[-1, -1 + k, 0], [5, 5 + k, 0]], degree=1) for k in range(3)]
+        vertical = [build_curve([[m, -5, 0], [m, 10, 0]], degree=1) for m in range(4)]
+        result = intersect_nurbs_curves_batch(slanted + vertical, precision=1e-6)
+        self.assertEqual(len(result), 12)
+        for (i, j), items in result.items():
+            self.assertTrue(i < 3 <= j)
+            (t1, t2, point), = items
+            self.assert_numpy_arrays_equal(point, np.array([j-3, j-3+i, 0]), precision=5)
+
+        result = intersect_nurbs_curves_batch(slanted, vertical, pairs=[(0, 1), (2, 3)], precision=1e-6)
+        self.assertEqual(sorted(result.keys()), [(0, 1), (2, 3)])
@@ -38,3 +38,60 @@ class TaylorTests(SverchokTestCase):
 
         self.assert_numpy_arrays_equal(cpts, expected_cpts, precision=6)
 
+
+class QuadratureLengthTests(SverchokTestCase):
+    def test_circle_length(self):
+        from sverchok.utils.curve.primitives import SvCircle
+        from sverchok.utils.curve.algorithms import SvCurveQuadratureLengthSolver
+        circle = SvCircle(center=np.array([0.0, 0.0, 0.0]), normal=np.array([0.0, 0.0, 1.0]),
+                    vectorx=np.array([2.0, 0.0, 0.0]))
+        solver = SvCurveQuadratureLengthSolver(circle)
+        solver.prepare('SPL', resolution=10, tolerance=1e-8)
+        self.assertAlmostEqual(solver.get_total_length(), 4*np.pi, places=6)
+
+    def test_solve(self):
+        from sverchok.utils.curve.nurbs import SvNativeNurbsCurve
+        from sverchok.utils.curve.algorithms import SvCurveQuadratureLengthSolver
+        cpts = np.array([[0,0,0], [1,2,0], [3,-1,0], [4,3,1], [6,0,0]], dtype=np.float64)
+        knotvector = np.array([0, 0, 0, 0, 0.5, 1, 1, 1, 1], dtype=np.float64)
+        curve = SvNativeNurbsCurve(3, knotvector, cpts, np.ones(5))
+        solver = SvCurveQuadratureLengthSolver(curve)
+        solver.prepare('SPL', resolution=10, tolerance=1e-8)
+
+        lengths = np.linspace(0.0, solver.get_total_length(), num=11)
+        ts = solver.solve(lengths)
+        self.assert_numpy_arrays_equal(solver.calc_length_params(ts), lengths, precision=6)
+
+class RotationMinimizingFrameTests(SverchokTestCase):
+    def test_helix_frames(self):
+        from sverchok.utils.curve.algorithms import rotation_minimizing_frames
+        ts = np.linspace(0, 4*np.pi, num=400)
+        points = np.stack((np.cos(ts), np.sin(ts), 0.5*ts), axis=1)
+        tangents = np.stack((-np.sin(ts), np.cos(ts), np.full_like(ts, 0.5)), axis=1)
+        tangents /= np.linalg.norm(tangents, axis=1, keepdims=True)
+        normals, binormals = rotation_minimizing_frames(points, tangents, np.array([1.0, 0.0, 0.0]))
+        self.assert_numpy_arrays_equal(np.linalg.norm(normals, axis=1), np.ones(len(ts)), precision=8)
+        self.assert_numpy_arrays_equal((normals * tangents).sum(axis=1), np.zeros(len(ts)), precision=8)
+        self.assert_numpy_arrays_equal((binormals * tangents).sum(axis=1), np.zeros(len(ts)), precision=8)
+        # No rotation around the tangent: change of normal
+        # between consecutive frames has no component along binormal.
+        mid_binormals = 0.5 * (binormals[1:] + binormals[:-1])
+        twist = ((normals[1:] - normals[:-1]) * mid_binormals).sum(axis=1)
+        self.assertLess(np.abs(twist).max(), 1e-6)
+
+    def test_normal_track(self):
+        from sverchok.utils.curve.nurbs import SvNativeNurbsCurve
+        from sverchok.utils.curve.algorithms import SvNormalTrack
+        cpts = np.array([[0,0,0], [1,2,0], [3,-1,0], [4,3,1], [6,0,0]], dtype=np.float64)
+        knotvector = np.array([0, 0, 0, 0, 0.5, 1, 1, 1, 1], dtype=np.float64)
+        curve = SvNativeNurbsCurve(3, knotvector, cpts, np.ones(5))
+        tracker = SvNormalTrack(curve, 50)
+        ts = np.linspace(0.0, 1.0, num=17)
+        matrices = tracker.evaluate_array(ts)
+        self.assertEqual(matrices.shape, (17, 3, 3))
+        products = np.transpose(matrices, axes=(0,2,1)) @ matrices
+        self.assert_numpy_arrays_equal(products, np.broadcast_to(np.eye(3), (17, 3, 3)), precision=6)
+        # Z axis of each frame is the curve tangent
+        tangents = curve.tangent_array(ts)
+        tangents /= np.linalg.norm(tangents, axis=1, keepdims=True)
+        np.testing.assert_allclose(matrices[:,:,2], tangents, atol=1e-10)
@@ -0,0 +1,45 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase, requires
+from sverchok.dependencies import scipy
+from sverchok.utils.cvt import SvSampledCVT, box_samples, ball_samples, mesh_volume_samples
+
+class SampledCVTTests(SverchokTestCase):
+    @requires(scipy)
+    def test_centroids(self):
+        samples = np.array([[0, 0, 0], [1, 0, 0], [9, 0, 0], [11, 0, 0]], dtype=np.float64)
+        sites = np.array([[0, 0, 0], [10, 0, 0], [100, 100, 100]], dtype=np.float64)
+        centers, masses = SvSampledCVT(samples).centroids(sites)
+        expected = np.array([[0.5, 0, 0], [10, 0, 0], [100, 100, 100]])
+        self.assert_numpy_arrays_equal(centers, expected, precision=8)
+        self.assert_numpy_arrays_equal(masses, np.array([2.0, 2.0, 0.0]), precision=8)
+
+    @requires(scipy)
+    def test_weighted_centroids(self):
+        samples = np.array([[0, 0, 0], [1, 0, 0]], dtype=np.float64)
+        weights = np.array([1.0, 3.0])
+        centers, _ = SvSampledCVT(samples, weights).centroids(np.array([[0.5, 0, 0]]))
+        self.assert_numpy_arrays_equal(centers, np.array([[0.75, 0, 0]]), precision=8)
+
+    @requires(scipy)
+    def test_relax_box(self):
+        rng = np.random.default_rng(1)
+        sites = rng.random((20, 3)) * 0.1
+        samples = box_samples((0, 0, 0), (1, 1, 1), 20000)
+        cvt = SvSampledCVT(samples)
+        result = cvt.relax(sites, 200, tolerance=1e-3)
+        self.assertTrue(cvt.iterations < 200)
+        # points are spread over the whole box
+        self.assertTrue((result.min(axis=0) < 0.3).all())
+        self.assertTrue((result.max(axis=0) > 0.7).all())
+
+    def test_samples(self):
+        points = ball_samples((1, 0, 0), 2.0, 1000)
+        self.assertTrue((np.linalg.norm(points - [1, 0, 0], axis=1) <= 2.0).all())
+        verts = [(-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+                 (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)]
+        faces = [[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4],
+                 [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
+        points = mesh_volume_samples(verts, faces, 500)
+        self.assertEqual(points.shape, (500, 3))
+        self.assertTrue((np.abs(points) <= 1.0).all())
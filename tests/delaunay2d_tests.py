@@ -0,0 +1,79 @@
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase, requires
+from sverchok.utils.delaunay2d import delaunay_2d, delaunay_2d_multi, voronoi_2d, SCIPY, NUMPY, FORTUNE
+from sverchok.dependencies import scipy
+
+def triangles_set(tris):
+    return set(tuple(sorted(tri)) for tri in tris.tolist())
+
+class DelaunayTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.points = np.random.RandomState(11).uniform(-1.0, 1.0, size=(300, 2))
+
+    def test_square(self):
+        points = np.array([[0, 0], [1, 0], [1, 1.1], [0, 1]], dtype=np.float64)
+        tris = delaunay_2d(points, backend=NUMPY)
+        self.assertEqual(triangles_set(tris), {(0, 1, 3), (1, 2, 3)})
+
+    def test_collinear(self):
+        points = np.array([[0, 0], [1, 1], [2, 2]], dtype=np.float64)
+        tris = delaunay_2d(points, backend=NUMPY)
+        self.assertEqual(len(tris), 0)
+
+    def test_counterclockwise(self):
+        tris = delaunay_2d(self.points, backend=NUMPY)
+        a, b, c = self.points[tris[:,0]], self.points[tris[:,1]], self.points[tris[:,2]]
+        orient = (b[:,0] - a[:,0]) * (c[:,1] - a[:,1]) - (b[:,1] - a[:,1]) * (c[:,0] - a[:,0])
+        self.assertTrue((orient > 0).all())
+
+    def test_multi(self):
+        sets = [self.points[:50], self.points[50:], self.points[:3]]
+        results = delaunay_2d_multi(sets, backend=NUMPY)
+        self.assertEqual(len(results), 3)
+        for points, tris in zip(sets, results):
+            self.assertEqual(triangles_set(tris), triangles_set(delaunay_2d(points, backend=NUMPY)))
+
+    @requires(scipy)
+    def test_backends_match(self):
+        tris_1 = delaunay_2d(self.points, backend=NUMPY)
+        tris_2 = delaunay_2d(self.points, backend=SCIPY)
+        self.assertEqual(triangles_set(tris_1), triangles_set(tris_2))
+
+    @requires(scipy)
+    def test_hull_triangles(self):
+        # Thin and near-collinear sets have circumcircles of hull triangles
+        # much larger than the point set itself.
+        rng = np.random.RandomState(3)
+        xs = np.linspace(0.0, 1.0, num=500)
+        sets = [rng.uniform(0.0, 1.0, size=(3000, 2)),
+                np.stack((rng.uniform(0.0, 1.0, 3000), rng.uniform(0.0, 1e-3, 3000)), axis=1),
+                np.stack((xs, 1e-6 * rng.uniform(-1.0, 1.0, 500)), axis=1)]
+        for points in sets:
+            tris_1 = delaunay_2d(points, backend=NUMPY)
+            tris_2 = delaunay_2d(points, backend=SCIPY)
+            self.assertEqual(len(tris_1), len(tris_2))
+
+    def test_fortune(self):
+        tris_1 = delaunay_2d(self.points, backend=NUMPY)
+        tris_2 = delaunay_2d(self.points, backend=FORTUNE)
+        self.assertEqual(triangles_set(tris_1), triangles_set(tris_2))
+        data_1 = voronoi_2d(self.points, backend=NUMPY)
+        data_2 = voronoi_2d(self.points, backend=FORTUNE)
+        self.assertEqual(len(data_1.vertices), len(data_2.vertices))
+
+    def test_collinear_start(self):
+        points = np.array([[0, 0], [1, 0], [2, 0], [3, 0], [1, 1]], dtype=np.float64)
+        tris = delaunay_2d(points, backend=NUMPY)
+        self.assertEqual(triangles_set(tris), {(0, 1, 4), (1, 2, 4), (2, 3, 4)})
+
+    @requires(scipy)
+    def test_voronoi_grid(self):
+        points = np.array([(i, j) for i in range(5) for j in range(5)], dtype=np.float64)
+        data_1 = voronoi_2d(points, backend=NUMPY)
+        data_2 = voronoi_2d(points, backend=SCIPY)
+        self.assertEqual(len(data_1.vertices), len(data_2.vertices))
+        self.assertEqual(len(data_1.edges), len(data_2.edges))
+
@@ -0,0 +1,90 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.evaluation_cache import evaluation_cache
+from sverchok.utils.curve.core import SvCurve
+from sverchok.utils.curve.primitives import SvCircle
+from sverchok.utils.surface.algorithms import SvCurveLerpSurface
+
+class CountingCurve(SvCurve):
+    def __init__(self):
+        self.count = 0
+
+    def get_u_bounds(self):
+        return 0.0, 1.0
+
+    def evaluate_array(self, ts):
+        self.count += 1
+        return np.stack((ts, ts*ts, np.zeros_like(ts)), axis=1)
+
+def make_circle(radius):
+    return SvCircle(center=np.array([0.0, 0.0, 0.0]), normal=np.array([0.0, 0.0, 1.0]),
+                vectorx=np.array([radius, 0.0, 0.0]))
+
+class EvaluationCacheTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.max_memory = evaluation_cache.max_memory
+        evaluation_cache.configure(True, 1024*1024)
+        evaluation_cache.reset_statistics()
+
+    def tearDown(self):
+        evaluation_cache.configure(False, self.max_memory)
+        super().tearDown()
+
+    def test_hits(self):
+        curve = CountingCurve()
+        ts = np.linspace(0, 1, 100)
+        points1 = curve.evaluate_array(ts)
+        points2 = curve.evaluate_array(ts.copy())
+        self.assertEqual(curve.count, 1)
+        self.assert_numpy_arrays_equal(points1, points2)
+        # callers may modify the result; the cached value must not change
+        points2[:] = 0
+        self.assert_numpy_arrays_equal(curve.evaluate_array(ts), points1)
+        curve.evaluate_array(ts + 0.5)
+        self.assertEqual(curve.count, 2)
+        stats = evaluation_cache.get_statistics()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 2))
+
+    def test_disabled(self):
+        evaluation_cache.configure(False)
+        curve = CountingCurve()
+        ts = np.linspace(0, 1, 10)
+        curve.evaluate_array(ts)
+        curve.evaluate_array(ts)
+        self.assertEqual(curve.count, 2)
+        self.assertEqual(evaluation_cache.get_statistics()['entries'], 0)
+
+    def test_eviction(self):
+        evaluation_cache.configure(True, 3 * 1000 * 3 * 8)
+        curve = CountingCurve()
+        arrays = [np.linspace(0, i+1, 1000) for i in range(4)]
+        for ts in arrays:
+            curve.evaluate_array(ts)
+        self.assertEqual(evaluation_cache.get_statistics()['evictions'], 1)
+        curve.evaluate_array(arrays[3])
+        self.assertEqual(curve.count, 4)
+        curve.evaluate_array(arrays[0])
+        self.assertEqual(curve.count, 5)
+
+    def test_garbage_collected(self):
+        curve = CountingCurve()
+        curve.evaluate_array(np.linspace(0, 1, 10))
+        self.assertEqual(evaluation_cache.get_statistics()['entries'], 1)
+        del curve
+        stats = evaluation_cache.get_statistics()
+        self.assertEqual((stats['entries'], stats['memory']), (0, 0))
+
+    def test_curves_and_surfaces(self):
+        circle = make_circle(1.0)
+        ts = np.linspace(0, 1, 20)
+        expected = circle.tangent_array(ts)
+        self.assert_numpy_arrays_equal(circle.tangent_array(ts), expected)
+        surface = SvCurveLerpSurface(circle, make_circle(2.0))
+        us, vs = np.meshgrid(ts, ts)
+        data1 = surface.derivatives_data_array(us.flatten(), vs.flatten())
+        data2 = surface.derivatives_data_array(us.flatten(), vs.flatten())
+        self.assertTrue(data1 is not data2)
+        self.assert_numpy_arrays_equal(data1.du, data2.du)
+        self.assertTrue(evaluation_cache.get_statistics()['hits'] >= 2)
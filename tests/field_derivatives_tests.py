@@ -0,0 +1,107 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.field.scalar import (SvScalarFieldBinOp, SvScalarFieldVectorizedFunction,
+            SvCoordinateScalarField, SvConstantScalarField, SvMergedScalarField,
+            SvScalarFieldPointDistance, SvLineAttractorScalarField, SvScalarFieldLambda,
+            SvVectorScalarFieldComposition, SvScalarFieldLaplacian, SvVectorFieldDivergence)
+from sverchok.utils.field.vector import (SvComposedVectorField, SvScalarFieldGradient,
+            SvVectorFieldRotor)
+from sverchok.utils.field.derivatives import (jet_formula_names, finite_difference_jet,
+            finite_difference_jacobian)
+
+class FieldDerivativesTests(SverchokTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.xs, self.ys, self.zs = rng.uniform(0.2, 1.0, size=(3, 200))
+        super().setUp()
+
+    def _scalar_tree(self):
+        x = SvCoordinateScalarField('X')
+        y = SvCoordinateScalarField('Y')
+        rho = SvCoordinateScalarField('CYL_RHO')
+        dist = SvScalarFieldPointDistance(np.array([-1.0, 0.0, 0.0]), falloff=lambda r: np.exp(-r*r))
+        line = SvLineAttractorScalarField(np.array([0.0, 0.0, -2.0]), np.array([1.0, 1.0, 0.0]))
+        s1 = SvScalarFieldBinOp(x, y, lambda a, b: a * b, op='MUL')
+        s2 = SvScalarFieldVectorizedFunction(s1, np.sin, op='SIN')
+        s3 = SvScalarFieldBinOp(s2, dist, lambda a, b: a * b, op='MUL')
+        s4 = SvScalarFieldBinOp(s3, rho, lambda a, b: np.power(a, b), op='POW')
+        return SvMergedScalarField('SUM', [s4, line, SvConstantScalarField(2.0)])
+
+    def test_scalar_analytic(self):
+        field = self._scalar_tree()
+        jet = field.jet_grid(self.xs, self.ys, self.zs)
+        self.assertTrue(jet is not None)
+        expected = finite_difference_jet(field, self.xs, self.ys, self.zs, step=1e-4)
+        self.assert_numpy_arrays_equal(jet.value, field.evaluate_grid(self.xs, self.ys, self.zs), precision=10)
+        np.testing.assert_allclose(jet.gradient, expected.gradient, atol=1e-6)
+        np.testing.assert_allclose(jet.hessian, expected.hessian, atol=1e-4)
+
+    def test_gradient_field(self):
+        field = self._scalar_tree()
+        gradient = np.array(field.gradient_grid(self.xs, self.ys, self.zs)).T
+        expected = finite_difference_jet(field, self.xs, self.ys, self.zs, step=1e-4, order=1)
+        self.assert_numpy_arrays_equal(gradient, expected.gradient, precision=5)
+
+    def test_formula_jet(self):
+        names = jet_formula_names({})
+        def function(x, y, z, V):
+            return eval("sin(x)*exp(y) + atan2(y, x)*sqrt(z)", names, dict(x=x, y=y, z=z))
+        def function_numpy(x, y, z, V):
+            return np.sin(x)*np.exp(y) + np.arctan2(y, x)*np.sqrt(z)
+        field = SvScalarFieldLambda(None, dict(), None, function_numpy, function_jet=function)
+        xs, ys, zs = self.xs, self.ys, self.zs
+        jet = field.jet_grid(xs, ys, zs)
+        r2 = xs*xs + ys*ys
+        expected_dx = np.cos(xs)*np.exp(ys) - ys/r2*np.sqrt(zs)
+        expected_dy = np.sin(xs)*np.exp(ys) + xs/r2*np.sqrt(zs)
+        expected_dz = np.arctan2(ys, xs) / (2*np.sqrt(zs))
+        self.assert_numpy_arrays_equal(jet.gradient, np.stack((expected_dx, expected_dy, expected_dz), axis=1), precision=10)
+
+    def test_fallback(self):
+        # formula with comparison can not be differentiated; finite differences are used
+        def function(x, y, z, V):
+            return np.where(x > 0.5, x*x, y)
+        field = SvScalarFieldLambda(None, dict(), None, function, function_jet=function)
+        self.assertTrue(field.jet_grid(self.xs, self.ys, self.zs) is None)
+        hessian = field.hessian_grid(self.xs, self.ys, self.zs)
+        self.assertEqual(hessian.shape, (len(self.xs), 3, 3))
+
+    def test_laplacian(self):
+        x = SvCoordinateScalarField('X')
+        y = SvCoordinateScalarField('Y')
+        field = SvScalarFieldBinOp(SvScalarFieldBinOp(x, x, lambda a, b: a * b, op='MUL'), y, lambda a, b: a * b, op='MUL')
+        laplacian = SvScalarFieldLaplacian(field, 0.001)
+        self.assert_numpy_arrays_equal(laplacian.evaluate_grid(self.xs, self.ys, self.zs), 2*self.ys, precision=8)
+
+    def test_jacobian(self):
+        x = SvCoordinateScalarField('X')
+        y = SvCoordinateScalarField('Y')
+        z = SvCoordinateScalarField('Z')
+        sin_y = SvScalarFieldVectorizedFunction(y, np.sin, op='SIN')
+        vfield = SvComposedVectorField('CYL', x, sin_y, SvScalarFieldBinOp(y, z, lambda a, b: a * b, op='MUL'))
+        jacobian = vfield.jacobian_grid(self.xs, self.ys, self.zs)
+        expected = finite_difference_jacobian(vfield, self.xs, self.ys, self.zs, step=1e-5)
+        self.assert_numpy_arrays_equal(jacobian, expected, precision=6)
+
+        divergence = SvVectorFieldDivergence(vfield, 0.001).evaluate_grid(self.xs, self.ys, self.zs)
+        self.assert_numpy_arrays_equal(divergence, np.trace(expected, axis1=1, axis2=2), precision=6)
+
+    def test_rotor_of_gradient(self):
+        field = self._scalar_tree()
+        rotor = SvVectorFieldRotor(SvScalarFieldGradient(field, 0.001), 0.001)
+        rx, ry, rz = rotor.evaluate_grid(self.xs, self.ys, self.zs)
+        zeros = np.zeros_like(self.xs)
+        self.assert_numpy_arrays_equal(rx, zeros, precision=8)
+        self.assert_numpy_arrays_equal(ry, zeros, precision=8)
+        self.assert_numpy_arrays_equal(rz, zeros, precision=8)
+
+    def test_composition(self):
+        x = SvCoordinateScalarField('X')
+        y = SvCoordinateScalarField('Y')
+        vfield = SvComposedVectorField('XYZ', SvScalarFieldBinOp(x, y, lambda a, b: a * b, op='MUL'), y, x)
+        field = SvVectorScalarFieldComposition(vfield, self._scalar_tree())
+        jet = field.jet_grid(self.xs, self.ys, self.zs)
+        expected = finite_difference_jet(field, self.xs, self.ys, self.zs, step=1e-4)
+        np.testing.assert_allclose(jet.gradient, expected.gradient, atol=1e-6)
+        np.testing.assert_allclose(jet.hessian, expected.hessian, atol=1e-4)
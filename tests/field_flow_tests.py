@@ -0,0 +1,94 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.field.vector import SvVectorFieldLambda
+from sverchok.utils.field.flow import (SvFieldIntegrator, EULER, RK4, RK45,
+            join_lines, advect)
+
+class RotationField(object):
+    def evaluate_grid(self, xs, ys, zs):
+        return -ys, xs, np.zeros_like(zs)
+
+class NanField(object):
+    # constant field, which is not defined for x >= 1
+    def evaluate_grid(self, xs, ys, zs):
+        xs = np.where(xs >= 1.0, np.nan, np.ones_like(xs))
+        return xs, np.zeros_like(ys), np.zeros_like(zs)
+
+class FieldFlowTests(SverchokTestCase):
+    def setUp(self):
+        angles = np.linspace(0, 2*np.pi, 7)
+        self.vertices = np.stack((np.cos(angles), np.sin(angles), np.zeros_like(angles)), axis=1)
+        super().setUp()
+
+    def _radius_error(self, method, **kwargs):
+        integrator = SvFieldIntegrator(RotationField(), method=method, normalize=False, **kwargs)
+        lines = integrator.integrate(self.vertices, 20, 0.3)
+        self.assertEqual(lines.points.shape, (7, 20, 3))
+        return np.abs(np.linalg.norm(lines.points, axis=2) - 1.0).max()
+
+    def test_accuracy(self):
+        euler = self._radius_error(EULER)
+        rk4 = self._radius_error(RK4)
+        rk45 = self._radius_error(RK45, tolerance=1e-6)
+        self.assertLess(rk4, 1e-3)
+        self.assertLess(rk45, 1e-5)
+        self.assertGreater(euler, 100 * rk4)
+
+    def test_euler_compatibility(self):
+        # EULER method gives the same points as simple repeated application of the field
+        vertices = self.vertices.copy()
+        expected = []
+        for i in range(5):
+            xs, ys, zs = RotationField().evaluate_grid(vertices[:,0], vertices[:,1], vertices[:,2])
+            vectors = np.stack((xs, ys, zs), axis=1)
+            vertices = vertices + 0.1 * vectors / np.linalg.norm(vectors, axis=1)[:, np.newaxis]
+            expected.append(vertices)
+        expected = np.transpose(np.array(expected), axes=(1, 0, 2))
+        lines = SvFieldIntegrator(RotationField(), method=EULER, normalize=True).integrate(self.vertices, 5, 0.1)
+        self.assert_numpy_arrays_equal(lines.points, expected, precision=12)
+
+    def test_stop_conditions(self):
+        integrator = SvFieldIntegrator(RotationField(), method=RK4, normalize=True,
+                        bounds=(np.array([-2.0, 0.0, -1.0]), np.array([2.0, 2.0, 1.0])))
+        lines = integrator.integrate(np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 0.0]]), 50, 0.1)
+        # first line leaves the upper half-plane after about pi / 0.1 steps;
+        # second line starts at zero of the field
+        self.assertTrue(30 <= lines.counts[0] < 33)
+        self.assertEqual(lines.counts[1], 0)
+        self.assertTrue((lines.points[:, :, 1] >= -1e-12).all())
+
+        integrator = SvFieldIntegrator(RotationField(), method=RK4, normalize=True, max_length=1.0)
+        lines = integrator.integrate(self.vertices, 50, 0.1)
+        self.assertTrue((lines.lengths <= 1.0).all())
+        self.assertTrue((lines.counts == 10).all())
+
+    def test_nan_field(self):
+        vertices = np.array([[0.0, 0.0, 0.0], [0.5, 1.0, 0.0]])
+        for method in [RK4, RK45]:
+            lines = SvFieldIntegrator(NanField(), method=method, normalize=False).integrate(vertices, 20, 0.1)
+            self.assertTrue(np.isfinite(lines.points).all())
+            self.assertTrue((lines.counts < 20).all())
+            self.assertTrue((lines.points[:, :, 0] < 1.2).all())
+
+    def test_euler_fixed_length(self):
+        # EULER lines are not stopped where the field is zero or not defined
+        vertices = np.array([[0.0, 0.0, 0.0], [0.5, 1.0, 0.0]])
+        lines = SvFieldIntegrator(NanField(), method=EULER, normalize=False).integrate(vertices, 20, 0.1)
+        self.assertTrue((lines.counts == 20).all())
+        lines = SvFieldIntegrator(RotationField(), method=EULER, normalize=True).integrate(vertices, 20, 0.1)
+        self.assertTrue((lines.counts == 20).all())
+        self.assert_numpy_arrays_equal(lines.points[0], np.zeros((20, 3)))
+
+    def test_join_lines(self):
+        lines = [np.zeros((3, 3)), np.zeros((0, 3)), np.ones((2, 3))]
+        verts, edges = join_lines(lines)
+        self.assertEqual(verts.shape, (5, 3))
+        self.assert_numpy_arrays_equal(edges, np.array([[0, 1], [1, 2], [3, 4]]))
+
+    def test_advect(self):
+        field = SvVectorFieldLambda(None, dict(), None, lambda x, y, z, V: (-y, x, np.zeros_like(z)))
+        points = advect(field, self.vertices, 10, np.full(len(self.vertices), np.pi / 20), method=RK45)
+        angles = np.linspace(0, 2*np.pi, 7) + np.pi / 2
+        expected = np.stack((np.cos(angles), np.sin(angles), np.zeros_like(angles)), axis=1)
+        self.assert_numpy_arrays_equal(points, expected, precision=3)
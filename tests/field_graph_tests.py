@@ -0,0 +1,95 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.field.scalar import (SvScalarField, SvScalarFieldBinOp,
+            SvScalarFieldVectorizedFunction, SvCoordinateScalarField, SvConstantScalarField,
+            SvMergedScalarField, SvVectorFieldNorm, SvVectorScalarFieldComposition,
+            SvScalarFieldPointDistance)
+from sverchok.utils.field.vector import (SvComposedVectorField, SvVectorFieldsLerp,
+            SvVectorFieldCrossProduct, SvVectorFieldBinOp, SvAbsoluteVectorField,
+            SvVectorFieldMultipliedByScalar)
+from sverchok.utils.field.graph import (SvFieldGraph, SvCompiledScalarField,
+            SvCompiledVectorField, compile_field)
+
+class CountingScalarField(SvScalarField):
+    def __init__(self):
+        self.points = 0
+
+    def evaluate_grid(self, xs, ys, zs):
+        self.points += len(xs)
+        return xs * ys + zs
+
+class FieldGraphTests(SverchokTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.xs, self.ys, self.zs = rng.uniform(-1.0, 1.0, size=(3, 1000))
+        super().setUp()
+
+    def _scalar_tree(self):
+        x = SvCoordinateScalarField('X')
+        y = SvCoordinateScalarField('Y')
+        rho = SvCoordinateScalarField('SPH_RHO')
+        dist = SvScalarFieldPointDistance(np.array([0.5, 0.0, 0.0]))
+        s1 = SvScalarFieldBinOp(x, y, lambda a, b: a * b, op='MUL')
+        s2 = SvScalarFieldVectorizedFunction(s1, np.sin, op='SIN')
+        s3 = SvScalarFieldBinOp(s2, dist, lambda a, b: (a + b) / 2, op='AVG')
+        s4 = SvScalarFieldBinOp(s3, rho, lambda a, b: np.max([a, b], axis=0), op='MAX')
+        return SvMergedScalarField('SUM', [s4, s3, SvConstantScalarField(2.0)])
+
+    def test_scalar_same_result(self):
+        field = self._scalar_tree()
+        compiled = compile_field(field, chunk_size=100)
+        self.assertTrue(isinstance(compiled, SvCompiledScalarField))
+        expected = field.evaluate_grid(self.xs, self.ys, self.zs)
+        result = compiled.evaluate_grid(self.xs, self.ys, self.zs)
+        self.assert_numpy_arrays_equal(result, expected, precision=10)
+
+    def test_vector_same_result(self):
+        x = SvCoordinateScalarField('X')
+        phi = SvCoordinateScalarField('PHI')
+        v1 = SvComposedVectorField('CYL', x, phi, SvConstantScalarField(1.0))
+        v2 = SvAbsoluteVectorField(SvVectorFieldCrossProduct(v1, SvComposedVectorField('XYZ', phi, x, x)))
+        v3 = SvVectorFieldBinOp(v1, v2, lambda a, b: a * b)
+        v4 = SvVectorFieldsLerp(v2, v3, SvVectorFieldNorm(v1))
+        field = SvVectorFieldMultipliedByScalar(v4, SvVectorScalarFieldComposition(v1, x))
+        compiled = compile_field(field, chunk_size=128)
+        self.assertTrue(isinstance(compiled, SvCompiledVectorField))
+        expected = np.array(field.evaluate_grid(self.xs, self.ys, self.zs))
+        result = np.array(compiled.evaluate_grid(self.xs, self.ys, self.zs))
+        self.assert_numpy_arrays_equal(result, expected, precision=10)
+
+    def test_shared_subfield(self):
+        leaf = CountingScalarField()
+        square = SvScalarFieldBinOp(leaf, leaf, lambda a, b: a * b, op='MUL')
+        field = SvScalarFieldBinOp(square, leaf, lambda a, b: a - b, op='SUB')
+        compiled = compile_field(field, chunk_size=300)
+        result = compiled.evaluate_grid(self.xs, self.ys, self.zs)
+        # the opaque field is evaluated only once for each point
+        self.assertEqual(leaf.points, len(self.xs))
+        values = self.xs * self.ys + self.zs
+        self.assert_numpy_arrays_equal(result, values * values - values, precision=10)
+
+    def test_constant_folding(self):
+        graph = SvFieldGraph()
+        two = graph.const(2.0)
+        three = graph.op('add', two, graph.const(1.0))
+        self.assertEqual(graph.nodes[three], ('const', (), 3.0))
+        x = graph.coords[0]
+        self.assertEqual(graph.op('mul', x, three), graph.op('mul', x, three))
+
+    def test_trivial(self):
+        leaf = CountingScalarField()
+        self.assertTrue(compile_field(leaf) is leaf)
+
+    def test_kernel_source(self):
+        # without Numba, the generated kernel is a plain Python function
+        field = self._scalar_tree()
+        compiled = compile_field(field)
+        graph = compiled.graph
+        kernel = graph.build_kernel()
+        self.assertTrue(kernel is not None)
+        n = len(self.xs)
+        out = np.empty(n)
+        graph.evaluate_chunk_kernel(kernel, self.xs, self.ys, self.zs, [out])
+        expected = field.evaluate_grid(self.xs, self.ys, self.zs)
+        self.assert_numpy_arrays_equal(out, expected, precision=10)
@@ -0,0 +1,115 @@
+from io import StringIO
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.gcode import (GcodeSettings, SvGcodeWriter, write_gcode, gcode_inputs_hash,
+            extrusion_coefficients, CONTINUOUS, RETRACTION)
+
+def square(z, size=10.0):
+    return np.array([[0, 0, z], [size, 0, z], [size, size, z], [0, size, z]], dtype=np.float64)
+
+def e_values(text):
+    return [float(line.split('E')[-1]) for line in text.splitlines() if line.startswith('G1') and ' E' in line]
+
+class GcodeTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.curves = [square(0.2), square(0.4)]
+        self.flows = [[1.0], [1.0]]
+        self.layers = [[0.2], [0.2]]
+
+    def _write(self, settings, curves=None, start_code='', end_code=''):
+        curves = self.curves if curves is None else curves
+        stream = StringIO()
+        result = write_gcode(stream, curves, [[1.0]] * len(curves), [[0.2]] * len(curves),
+                    settings, start_code=start_code, end_code=end_code)
+        return stream.getvalue(), result
+
+    def test_continuous(self):
+        text, result = self._write(GcodeSettings(mode=CONTINUOUS), start_code='START\n', end_code='END\n')
+        lines = text.splitlines()
+        self.assertEqual(lines[0], 'START')
+        self.assertEqual(lines[1], 'G92 E0 ')
+        self.assertEqual(lines[2], 'G1 X0.0000 Y0.0000 Z0.2000 F1000')
+        self.assertEqual(lines[-1], 'END')
+        # 3 segments of the first square, 4 of the second one (from the end of the first)
+        es = e_values(text)
+        self.assertEqual(len(es), 7)
+        self.assertTrue((np.diff(es) > 0).all())
+        expected_length = 30.0 + np.sqrt(10.0**2 + 0.2**2) + 30.0
+        self.assertAlmostEqual(result.path_length, expected_length, places=6)
+        coeff = extrusion_coefficients(0.2, 1.0, 0.4, 1.75)
+        self.assertAlmostEqual(result.e, expected_length * coeff, places=6)
+        self.assertAlmostEqual(es[-1], result.e, places=4)
+        self.assertEqual(len(result.verts), 8)
+        self.assertEqual(len(result.printed_edges), 7)
+        self.assertEqual(len(result.travel_edges), 0)
+
+    def test_retraction(self):
+        settings = GcodeSettings(mode=RETRACTION, pull=5.0, push=5.0, dz=2.0, close_all=True)
+        # auto_sort puts the lower layer first
+        text, result = self._write(settings, curves=[square(0.4), square(0.2)])
+        lines = text.splitlines()
+        self.assertEqual(lines[1], 'G1 X0.0000 Y0.0000 Z0.2000 F1000')
+        coeff = extrusion_coefficients(0.2, 1.0, 0.4, 1.75)
+        e1 = 40.0 * coeff
+        self.assertIn('G0 E' + format(e1 - 5.0, '.4f'), lines)
+        self.assertIn('G1 X0.0000 Y0.0000 Z2.2000 F500', lines)
+        self.assertIn('G1 X0.0000 Y0.0000 Z2.4000 F2000', lines)
+        self.assertIn('G1 E' + format(e1, '.4f'), lines)
+        self.assertAlmostEqual(result.e, 80.0 * coeff, places=6)
+        self.assertAlmostEqual(result.path_length, 80.0, places=6)
+        # each square: 4 vertices, 4 printed edges as it is closed
+        self.assertEqual(len(result.printed_edges), 8)
+        self.assertEqual(len(result.travel_edges), 3)
+        n = len(result.verts)
+        for edges in (result.printed_edges, result.travel_edges):
+            self.assertTrue((edges >= 0).all() and (edges < n).all())
+            self.assertTrue((edges[:,0] != edges[:,1]).all())
+
+    def test_single_point_layers(self):
+        curves = [square(0.2), np.array([[5.0, 5.0, 0.4]]), square(0.6)]
+        for mode in [CONTINUOUS, RETRACTION]:
+            with self.subTest(mode=mode):
+                settings = GcodeSettings(mode=mode, close_all=True)
+                text, result = self._write(settings, curves=curves)
+                self.assertTrue(np.isfinite(result.e))
+                self.assertTrue(np.isfinite(e_values(text)).all())
+                for edges in (result.printed_edges, result.travel_edges):
+                    self.assertTrue((edges[:,0] != edges[:,1]).all())
+                self.assertTrue((result.printed_edges < len(result.verts)).all())
+
+        # the only layer has only one point: nothing is extruded
+        text, result = self._write(GcodeSettings(mode=RETRACTION, close_all=True),
+                    curves=[np.array([[1.0, 2.0, 0.2]])])
+        self.assertEqual(result.e, 0.0)
+        self.assertEqual(len(result.printed_edges), 0)
+
+    def test_inputs_hash(self):
+        settings = GcodeSettings()
+        hash1 = gcode_inputs_hash(self.curves, self.flows, self.layers, settings)
+        hash2 = gcode_inputs_hash([c.copy() for c in self.curves], [[1.0], [1.0]], [[0.2], [0.2]], GcodeSettings())
+        self.assertEqual(hash1, hash2)
+
+        moved = [self.curves[0], self.curves[1] + np.array([0.0, 0.0, 1e-9])]
+        self.assertNotEqual(hash1, gcode_inputs_hash(moved, self.flows, self.layers, settings))
+        self.assertNotEqual(hash1, gcode_inputs_hash(self.curves, [[1.0], [1.1]], self.layers, settings))
+        self.assertNotEqual(hash1, gcode_inputs_hash(self.curves, self.flows, self.layers, GcodeSettings(mode=RETRACTION)))
+        self.assertNotEqual(hash1, gcode_inputs_hash(self.curves, self.flows, self.layers, settings, end_code='M84'))
+
+    def test_writer_chunks(self):
+        points = np.random.RandomState(1).uniform(-1.0, 1.0, size=(100, 3))
+        values = np.arange(100.0)
+        stream1 = StringIO()
+        writer = SvGcodeWriter(stream1, buffer_size=50, chunk_size=7)
+        writer.write_moves(points, values, 'G1 X%.4f Y%.4f Z%.4f E%.4f\n')
+        writer.flush()
+        stream2 = StringIO()
+        writer = SvGcodeWriter(stream2)
+        writer.write_moves(points, values, 'G1 X%.4f Y%.4f Z%.4f E%.4f\n')
+        # nothing is written before flush with the default buffer size
+        self.assertEqual(stream2.getvalue(), '')
+        writer.flush()
+        self.assertEqual(stream1.getvalue(), stream2.getvalue())
+        self.assertEqual(len(stream1.getvalue().splitlines()), 100)
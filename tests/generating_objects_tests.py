@@ -0,0 +1,42 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.nodes_mixins.generating_objects import get_topology_hash
+
+class TopologyHashTests(SverchokTestCase):
+    edges = [[0, 1], [1, 2], [2, 3], [3, 0]]
+    faces = [[0, 1, 2], [0, 2, 3]]
+
+    def test_list_and_array(self):
+        expected = get_topology_hash(self.edges, self.faces)
+        self.assertEqual(get_topology_hash(np.array(self.edges), np.array(self.faces)), expected)
+        self.assertEqual(get_topology_hash(np.array(self.edges, dtype=np.int32), self.faces), expected)
+        self.assertEqual(get_topology_hash([tuple(e) for e in self.edges], self.faces), expected)
+
+    def test_ragged_faces(self):
+        faces = [[0, 1, 2, 3], [3, 2, 4]]
+        self.assertEqual(get_topology_hash([], faces),
+                         get_topology_hash([], [np.array(f) for f in faces]))
+        self.assertNotEqual(get_topology_hash([], faces), get_topology_hash([], [[0, 1, 2], [3, 3, 2, 4]]))
+
+    def test_face_order(self):
+        expected = get_topology_hash(self.edges, self.faces)
+        self.assertNotEqual(get_topology_hash(self.edges, self.faces[::-1]), expected)
+        self.assertNotEqual(get_topology_hash(self.edges, [[1, 2, 0], [0, 2, 3]]), expected)
+
+    def test_indexes(self):
+        expected = get_topology_hash(self.edges, self.faces)
+        self.assertNotEqual(get_topology_hash(self.edges, [[0, 1, 2], [0, 2, 4]]), expected)
+        self.assertNotEqual(get_topology_hash([[0, 1], [1, 2], [2, 3], [3, 1]], self.faces), expected)
+
+    def test_edges_and_faces_differ(self):
+        # the same indexes given as edges or as faces are different topologies
+        self.assertNotEqual(get_topology_hash([[0, 1, 2]], []), get_topology_hash([], [[0, 1, 2]]))
+
+    def test_empty(self):
+        expected = get_topology_hash([], [])
+        self.assertEqual(get_topology_hash(None, None), expected)
+        self.assertEqual(get_topology_hash(np.empty((0, 2), dtype=np.int64), np.array([])), expected)
+        self.assertEqual(get_topology_hash(None, self.faces), get_topology_hash([], self.faces))
+        self.assertEqual(get_topology_hash(self.edges, None), get_topology_hash(self.edges, []))
+        self.assertNotEqual(get_topology_hash(self.edges, []), expected)
@@ -0,0 +1,63 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.halfspace_clip import SvHalfSpaceClipper, MeshClipError, is_convex_mesh, clip_cells
+
+def cube():
+    verts = [(-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+             (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)]
+    faces = [[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4],
+             [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
+    return verts, faces
+
+def signed_volume(verts, faces):
+    verts = np.array(verts)
+    volume = 0.0
+    for face in faces:
+        for i in range(1, len(face) - 1):
+            volume += np.dot(verts[face[0]], np.cross(verts[face[i]], verts[face[i+1]]))
+    return volume / 6.0
+
+class HalfSpaceClipTests(SverchokTestCase):
+    def test_convex(self):
+        verts, faces = cube()
+        self.assertTrue(is_convex_mesh(verts, faces))
+        # top face replaced by a pyramid pointing inside
+        verts = verts + [(0, 0, 0.5)]
+        faces = faces[:1] + [[4, 5, 8], [5, 6, 8], [6, 7, 8], [7, 4, 8]] + faces[2:]
+        self.assertFalse(is_convex_mesh(verts, faces))
+
+    def test_clip_half(self):
+        verts, faces = cube()
+        clipper = SvHalfSpaceClipper(verts, faces)
+        new_verts, new_edges, new_faces = clipper.clip(np.array([[0.0, 0.0, 1.0]]), np.array([0.0]))
+        self.assertEqual(len(new_verts), 8)
+        self.assertEqual(len(new_edges), 12)
+        self.assertEqual(len(new_faces), 6)
+        self.assertAlmostEqual(signed_volume(new_verts, new_faces), 4.0)
+
+    def test_octants(self):
+        verts, faces = cube()
+        clipper = SvHalfSpaceClipper(verts, faces)
+        cells = []
+        for signs in np.ndindex(2, 2, 2):
+            normals = np.eye(3) * (2 * np.array(signs) - 1)[:, np.newaxis]
+            cells.append((normals, np.zeros(3)))
+        results = clip_cells(clipper, cells, workers=2)
+        for new_verts, new_edges, new_faces in results:
+            self.assertEqual(len(new_faces), 6)
+            self.assertAlmostEqual(signed_volume(new_verts, new_faces), 1.0)
+
+    def test_no_cut(self):
+        verts, faces = cube()
+        clipper = SvHalfSpaceClipper(verts, faces)
+        self.assertIsNone(clipper.clip(np.array([[1.0, 0.0, 0.0]]), np.array([2.0])))
+        self.assertEqual(clipper.clip(np.array([[1.0, 0.0, 0.0]]), np.array([-2.0])), ([], [], []))
+
+    def test_concave_face(self):
+        verts = [(0, 0, 0), (3, 0, 0), (3, 1, 0), (1, 1, 0), (1, 3, 0), (0, 3, 0)]
+        clipper = SvHalfSpaceClipper(verts, [[0, 1, 2, 3, 4, 5]], fill=False)
+        cell = (np.array([[1.0, 1.0, 0.0]]) / np.sqrt(2), np.array([2.5 / np.sqrt(2)]))
+        with self.assertRaises(MeshClipError):
+            clipper.clip(*cell)
+        self.assertEqual(clip_cells(clipper, [cell], fallback=lambda i: None), [None])
@@ -0,0 +1,60 @@
+
+import numpy as np
+import logging
+
+from sverchok.utils.testing import SverchokTestCase, requires
+from sverchok.utils.curve import knotvector as sv_knotvector
+from sverchok.utils.curve.nurbs import SvNativeNurbsCurve
+from sverchok.utils.surface.nurbs import SvNativeNurbsSurface
+from sverchok.utils.manifolds import nearest_point_on_curve, nearest_point_on_surface, NEWTON
+from sverchok.dependencies import scipy
+
+@requires(scipy)
+class NearestPointTests(SverchokTestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(1)
+        super().setUp()
+
+    def test_curve_newton(self):
+        cpts = self.rng.uniform(0, 5, (8, 3))
+        curve = SvNativeNurbsCurve(3, sv_knotvector.generate(3, 8), cpts, np.ones(8))
+        points = self.rng.uniform(0, 5, (300, 3))
+        result = nearest_point_on_curve(points, curve, samples=50, method=NEWTON,
+                                        logger=logging.getLogger(__name__))
+        ts = np.array([t for t, _ in result])
+        found = np.array([p for _, p in result])
+        self.assert_numpy_arrays_equal(found, curve.evaluate_array(ts), precision=8)
+        # the result can not be worse than initial guess
+        samples = curve.evaluate_array(np.linspace(0, 1, 50))
+        init = np.linalg.norm(samples[np.newaxis] - points[:, np.newaxis], axis=2).min(axis=1)
+        distances = np.linalg.norm(found - points, axis=1)
+        self.assertTrue((distances <= init + 1e-9).all())
+        # vector from found point to source point must be orthogonal to the curve,
+        # unless the point is at the end of the curve
+        inner = (ts > 1e-6) & (ts < 1 - 1e-6)
+        tangents = curve.tangent_array(ts[inner])
+        dots = ((points[inner] - found[inner]) * tangents).sum(axis=1)
+        self.assertLess(np.abs(dots).max(), 1e-5)
+
+    def test_surface_newton(self):
+        n = 6
+        xs, ys = np.meshgrid(np.linspace(0, 5, n), np.linspace(0, 5, n))
+        cpts = np.stack((xs, ys, self.rng.uniform(-0.5, 0.5, (n, n))), axis=2)
+        knotvector = sv_knotvector.generate(3, n)
+        surface = SvNativeNurbsSurface(3, 3, knotvector, knotvector, cpts, np.ones((n, n)))
+        points = self.rng.uniform(0.5, 4.5, (300, 3))
+        points[:, 2] = self.rng.uniform(-0.5, 0.5, 300)
+        us, vs, found = nearest_point_on_surface(points, surface, init_samples=10, method=NEWTON)
+        found = np.array(found)
+        self.assert_numpy_arrays_equal(found, surface.evaluate_array(np.array(us), np.array(vs)), precision=8)
+        # vector from found point to source point must be orthogonal to the surface
+        data = surface.derivatives_data_array(np.array(us), np.array(vs))
+        vectors = points - found
+        self.assertLess(np.abs((vectors * data.du).sum(axis=1)).max(), 1e-5)
+        self.assertLess(np.abs((vectors * data.dv).sum(axis=1)).max(), 1e-5)
+
+    def test_empty(self):
+        cpts = self.rng.uniform(0, 5, (4, 3))
+        curve = SvNativeNurbsCurve(3, sv_knotvector.generate(3, 4), cpts, np.ones(4))
+        result = nearest_point_on_curve([], curve, method=NEWTON, logger=logging.getLogger(__name__))
+        self.assertEqual(len(result), 0)
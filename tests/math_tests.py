@@ -51,3 +51,25 @@ class MathTests(SverchokTestCase):
 
         self.assert_numpy_arrays_equal(binom, expected_binom)
 
+    def test_quaternions_round_trip(self):
+        angles = np.array([0.0, 0.5, 2.0, 3.1, np.pi])
+        axes = np.array([[0,0,1], [1,0,0], [0,1,1], [1,1,1], [0,1,0]], dtype=np.float64)
+        axes /= np.linalg.norm(axes, axis=1, keepdims=True)
+        quats = np.concatenate((np.cos(angles/2)[:,np.newaxis], np.sin(angles/2)[:,np.newaxis] * axes), axis=1)
+        matrices = np_quaternions_to_matrices(quats)
+        result = np_matrices_to_quaternions(matrices)
+        # q and -q represent the same rotation
+        signs = np.sign(np_dot(result, quats))[:,np.newaxis]
+        self.assert_numpy_arrays_equal(signs * result, quats, precision=8)
+
+    def test_quaternions_slerp(self):
+        angle = 2.0
+        q1 = np.array([[1.0, 0.0, 0.0, 0.0]] * 3)
+        q2 = np.array([[np.cos(angle/2), 0.0, 0.0, np.sin(angle/2)]] * 3)
+        ts = np.array([0.0, 0.25, 1.0])
+        result = np_quaternions_slerp(q1, q2, ts)
+        expected = np.array([[np.cos(t*angle/2), 0.0, 0.0, np.sin(t*angle/2)] for t in ts])
+        self.assert_numpy_arrays_equal(result, expected, precision=8)
+        # equal quaternions
+        result = np_quaternions_slerp(q2, q2, ts)
+        self.assert_numpy_arrays_equal(result, q2, precision=8)
@@ -0,0 +1,123 @@
+from math import floor
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.sv_noise_utils import noise_options
+from sverchok.utils.sv_noise_np import SvNoise, get_noise, seed_offset
+
+def blender_cell_noise(x, y, z):
+    # cellNoiseU from Blender sources, with explicit 32-bit unsigned arithmetic
+    x, y, z = [(c + 0.000001) * 1.00001 for c in (x, y, z)]
+    xi, yi, zi = int(floor(x)), int(floor(y)), int(floor(z))
+    mask = 0xFFFFFFFF
+    n = (xi + yi * 1301 + zi * 314159) & mask
+    n ^= (n << 13) & mask
+    n = (n * ((n * n * 15731 + 789221) & mask) + 1376312589) & mask
+    return n / 4294967296.0
+
+# Values given by mathutils.noise in Blender
+MATHUTILS_POINTS = np.array([[0.3, 0.7, 1.1], [-2.45, 3.1, 0.6], [5.7, -1.3, -4.2], [12.1, 7.9, -0.35]])
+MATHUTILS_SIGNED = {
+    'BLENDER': [-0.172292, 0.262672, -0.730088, -0.011996],
+    'PERLIN_ORIGINAL': [-0.319141, -0.445485, -0.173889, -0.032487],
+    'PERLIN_NEW': [0.310031, 0.043958, 0.488235, 0.033095],
+    'VORONOI_F1': [-0.160587, 0.161495, -0.369935, -0.250930],
+    'VORONOI_F2': [0.726973, 0.350625, 0.430693, -0.155914],
+    'VORONOI_F3': [0.902176, 0.809754, 0.641542, 0.757790],
+    'VORONOI_F4': [1.088441, 0.825722, 0.683793, 0.928403],
+    'VORONOI_F2F1': [-0.112440, -0.810870, -0.199372, -0.904984],
+    'VORONOI_CRACKLE': [1.000000, 0.891299, 1.000000, -0.049843],
+    'CELLNOISE': [0.998548, 0.000169, 0.413428, -0.956096],
+}
+# noise.seed_set(7); noise.noise_vector(p, noise_basis='PERLIN_NEW')
+MATHUTILS_VECTOR_7 = [[-0.234455, -0.463823, -0.121578], [0.107944, -0.129895, -0.003351],
+                      [0.127075, -0.076288, 0.139193], [0.396507, 0.103195, 0.336942]]
+# noise.turbulence(p, 3, True, noise_basis='BLENDER')
+MATHUTILS_TURBULENCE = [0.509974, 0.511805, 0.943012, 0.302781]
+# noise.fractal(p, 0.7, 2.0, 3.5, noise_basis='BLENDER')
+MATHUTILS_FRACTAL = [0.576178, -0.147745, 0.291519, 0.548249]
+# noise.hybrid_multi_fractal(p, 0.7, 2.0, 4.5, 0.3, 1.5, noise_basis='PERLIN_ORIGINAL')
+MATHUTILS_HYBRID = [-0.027973, 0.016521, 0.138098, 0.400491]
+# noise.seed_set(7); noise.random_unit_vector()
+MATHUTILS_RANDOM_VECTOR_7 = [-0.769767, 0.125494, -0.625867]
+
+class NoiseTests(SverchokTestCase):
+    def setUp(self):
+        self.points = np.random.default_rng(7).uniform(-10.0, 10.0, size=(3000, 3))
+        super().setUp()
+
+    def test_cell_noise(self):
+        noise = SvNoise(0)
+        result = noise.noise(self.points[:50], 'CELLNOISE')
+        expected = np.array([blender_cell_noise(*p) for p in self.points[:50]])
+        self.assert_numpy_arrays_equal(result, expected, precision=12)
+
+    def test_ranges(self):
+        noise = get_noise(1)
+        for noise_type, _ in noise_options:
+            with self.subTest(noise_type=noise_type):
+                values = noise.noise(self.points, noise_type)
+                self.assertEqual(values.shape, (len(self.points),))
+                self.assertTrue(np.isfinite(values).all())
+                self.assertTrue((values >= 0).all())
+                if not noise_type.startswith('VORONOI_F'):
+                    self.assertTrue((values <= 1).all())
+                hard = noise.noise(self.points, noise_type, hard=True)
+                self.assert_numpy_arrays_equal(hard, np.abs(2*values - 1), precision=10)
+
+    def test_continuity(self):
+        noise = get_noise(2)
+        delta = np.array([1e-6, -1e-6, 1e-6])
+        for noise_type in ['BLENDER', 'PERLIN_ORIGINAL', 'PERLIN_NEW', 'VORONOI_F1', 'VORONOI_F2']:
+            with self.subTest(noise_type=noise_type):
+                values1 = noise.noise(self.points, noise_type)
+                values2 = noise.noise(self.points + delta, noise_type)
+                self.assertLess(np.abs(values1 - values2).max(), 1e-3)
+
+    def test_chunks(self):
+        noise = get_noise(3)
+        chunked = SvNoise(3, chunk_size=256, threads=4)
+        self.assert_numpy_arrays_equal(chunked.noise_vector(self.points, 'PERLIN_NEW'),
+                    noise.noise_vector(self.points, 'PERLIN_NEW'), precision=12)
+        self.assert_numpy_arrays_equal(
+                    chunked.hybrid_multi_fractal(self.points, 0.5, 2.0, 4, 0.5, 1.0, 'VORONOI_F1'),
+                    noise.hybrid_multi_fractal(self.points, 0.5, 2.0, 4, 0.5, 1.0, 'VORONOI_F1'),
+                    precision=12)
+
+    def test_mathutils_values(self):
+        noise = get_noise(7)
+        points = MATHUTILS_POINTS
+        for noise_type, expected in MATHUTILS_SIGNED.items():
+            with self.subTest(noise_type=noise_type):
+                np.testing.assert_allclose(noise.signed_noise(points, noise_type), expected, atol=1e-5)
+        np.testing.assert_allclose(noise.noise_vector(points, 'PERLIN_NEW'), MATHUTILS_VECTOR_7, atol=1e-5)
+        np.testing.assert_allclose(noise.turbulence(points, 3, True, 'BLENDER'), MATHUTILS_TURBULENCE, atol=1e-5)
+        np.testing.assert_allclose(noise.fractal(points, 0.7, 2.0, 3.5, 'BLENDER'), MATHUTILS_FRACTAL, atol=1e-5)
+        np.testing.assert_allclose(noise.hybrid_multi_fractal(points, 0.7, 2.0, 4.5, 0.3, 1.5, 'PERLIN_ORIGINAL'),
+                    MATHUTILS_HYBRID, atol=1e-5)
+        np.testing.assert_allclose(seed_offset(7), 10.0 * np.array(MATHUTILS_RANDOM_VECTOR_7), atol=1e-4)
+
+    def test_seed(self):
+        # as in mathutils.noise, the seed changes vector noise only
+        values1 = SvNoise(1).noise(self.points, 'PERLIN_ORIGINAL')
+        values2 = SvNoise(2).noise(self.points, 'PERLIN_ORIGINAL')
+        self.assert_numpy_arrays_equal(values1, values2, precision=12)
+        vectors1 = SvNoise(1).noise_vector(self.points, 'PERLIN_ORIGINAL')
+        vectors2 = SvNoise(1).noise_vector(self.points, 'PERLIN_ORIGINAL')
+        vectors3 = SvNoise(2).noise_vector(self.points, 'PERLIN_ORIGINAL')
+        self.assert_numpy_arrays_equal(vectors1, vectors2, precision=12)
+        self.assertGreater(np.abs(vectors1 - vectors3).max(), 0.1)
+        self.assert_numpy_arrays_equal(seed_offset(0), np.zeros(3), precision=12)
+
+    def test_fractals(self):
+        noise = get_noise(4)
+        points = self.points[:100]
+        signed = noise.signed_noise(points, 'PERLIN_NEW')
+        # with one octave, fBm is just the signed noise
+        self.assert_numpy_arrays_equal(noise.fractal(points, 1.0, 2.0, 1, 'PERLIN_NEW'), signed, precision=12)
+        self.assert_numpy_arrays_equal(noise.turbulence(points, 1, False, 'PERLIN_NEW'), signed, precision=12)
+        fbm = noise.fractal(points, 1.0, 2.0, 2, 'PERLIN_NEW')
+        expected = signed + 0.5 * noise.signed_noise(points * 2.0, 'PERLIN_NEW')
+        self.assert_numpy_arrays_equal(fbm, expected, precision=12)
+        self.assertEqual(noise.turbulence_vector(points, 3, True).shape, (100, 3))
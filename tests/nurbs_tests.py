@@ -10,7 +10,7 @@ from sverchok.utils.curve import knotvector as sv_knotvector
 from sverchok.utils.curve.primitives import SvCircle
 from sverchok.utils.curve.nurbs import SvGeomdlCurve, SvNativeNurbsCurve, SvNurbsBasisFunctions, SvNurbsCurve
 from sverchok.utils.curve.nurbs_algorithms import interpolate_nurbs_curve
-from sverchok.utils.nurbs_common import elevate_bezier_degree, from_homogenous
+from sverchok.utils.nurbs_common import elevate_bezier_degree, from_homogenous, refine_knotvector
 from sverchok.utils.surface.nurbs import SvGeomdlSurface, SvNativeNurbsSurface
 from sverchok.utils.surface.algorithms import SvCurveLerpSurface
 from sverchok.dependencies import geomdl
@@ -292,6 +292,26 @@ class NurbsSurfaceTests(SverchokTestCase):
         vs2 = native_surface.gauss_curvature_array(self.us, self.vs)
         self.assert_numpy_arrays_equal(vs1, vs2, precision=8, fail_fast=False)
 
+    def test_insert_remove_knot(self):
+        weights = [[1,1,1,1], [1,2,3,1], [1,3,4,1], [1,4,5,1], [1,1,1,1]]
+        surface = SvNativeNurbsSurface(self.degree_u, self.degree_v, self.knotvector_u, self.knotvector_v, self.control_points, weights)
+        expected = surface.evaluate_array(self.us, self.vs)
+        for direction in ['U', 'V']:
+            inserted = surface.insert_knot(direction, 0.3, 2)
+            self.assert_numpy_arrays_equal(inserted.evaluate_array(self.us, self.vs), expected, precision=8)
+            removed = inserted.remove_knot(direction, 0.3, 2)
+            self.assertEquals(removed.get_control_points().shape, (5, 4, 3))
+            self.assert_numpy_arrays_equal(removed.evaluate_array(self.us, self.vs), expected, precision=8)
+
+    def test_elevate_degree(self):
+        surface = SvNativeNurbsSurface(self.degree_u, self.degree_v, self.knotvector_u, self.knotvector_v, self.control_points, self.weights)
+        expected = surface.evaluate_array(self.us, self.vs)
+        elevated = surface.elevate_degree('U', delta=1)
+        self.assertEquals(elevated.get_degree_u(), 4)
+        # one internal knot of multiplicity 1
+        self.assertEquals(elevated.get_control_points().shape, (7, 4, 3))
+        self.assert_numpy_arrays_equal(elevated.evaluate_array(self.us, self.vs), expected, precision=8)
+
 class OtherNurbsTests(SverchokTestCase):
     def test_ruled_surface_1(self):
         """
@@ -698,6 +718,34 @@ class OtherNurbsTests(SverchokTestCase):
         endpoint = nurbs.evaluate(u_max)
         self.assert_sverchok_data_equal(endpoint.tolist(), pt3, precision=6)
 
+    def test_refine_knotvector(self):
+        degree = 3
+        kv = np.array([0, 0, 0, 0, 0.25, 0.75, 1, 1, 1, 1], dtype=np.float64)
+        points = np.array([[0,0,0], [0,1,0], [1,2,0], [2,2,0], [3,1,0], [3,0,0]], dtype=np.float64)
+        curves = [SvNativeNurbsCurve(degree, kv, points + [0, 0, i], [1, 1, 2, 1, 3, 1]) for i in range(3)]
+        ts = np.linspace(0.0, 1.0, num=11)
+
+        control_points = np.array([curve.get_homogenous_control_points() for curve in curves])
+        new_kv, new_points = refine_knotvector(degree, kv, control_points, [0.1, 0.5, 0.5])
+        self.assert_numpy_arrays_equal(new_kv, np.array([0, 0, 0, 0, 0.1, 0.25, 0.5, 0.5, 0.75, 1, 1, 1, 1]), precision=8)
+        self.assertEquals(new_points.shape, (3, 9, 4))
+        for curve, curve_points in zip(curves, new_points):
+            curve_points, weights = from_homogenous(curve_points)
+            refined = SvNativeNurbsCurve(degree, new_kv, curve_points, weights)
+            self.assert_numpy_arrays_equal(refined.evaluate_array(ts), curve.evaluate_array(ts), precision=8)
+
+    def test_elevate_degree_nurbs(self):
+        degree = 3
+        kv = np.array([0, 0, 0, 0, 0.25, 0.75, 1, 1, 1, 1], dtype=np.float64)
+        points = np.array([[0,0,0], [0,1,0], [1,2,0], [2,2,0], [3,1,0], [3,0,0]], dtype=np.float64)
+        curve = SvNativeNurbsCurve(degree, kv, points, [1, 1, 2, 1, 3, 1])
+        elevated = curve.elevate_degree(delta=2)
+        ts = np.linspace(0.0, 1.0, num=11)
+        expected_kv = np.array([0, 0, 0, 0, 0, 0, 0.25, 0.25, 0.25, 0.75, 0.75, 0.75, 1, 1, 1, 1, 1, 1])
+        self.assertEquals(elevated.get_degree(), 5)
+        self.assert_numpy_arrays_equal(elevated.get_knotvector(), expected_kv, precision=8)
+        self.assert_numpy_arrays_equal(elevated.evaluate_array(ts), curve.evaluate_array(ts), precision=8)
+
 class KnotvectorTests(SverchokTestCase):
     def test_to_multiplicity_1(self):
         kv = np.array([0, 0, 0, 1, 1, 1], dtype=np.float64)
@@ -1,5 +1,6 @@
 
 from pathlib import Path
+import numpy as np
 from os.path import basename
 
 from sverchok.utils.logging import error
@@ -118,3 +119,44 @@ class ExamplesParseTests(SverchokTestCase):
                     profile_text = f.read()
                     with self.assert_logs_no_errors():
                         parse_profile(profile_text)
+
+class FakeProfileNode(object):
+    curve_points_count = 20
+    close_threshold = 0.0005
+
+class ArrayInterpreterTests(SverchokTestCase):
+    profile_text = """
+        default r = 1;
+        M 0,0;
+        L {r},0 {r},{2*r};
+        H {r+1};
+        v {sqrt(r)};
+        C {r},{r} 0,{r} 0,{r*2} n=5;
+        X
+    """
+
+    def test_parse_cached(self):
+        profile = parse_profile_cached(self.profile_text)
+        self.assertIs(parse_profile_cached(self.profile_text), profile)
+
+    def test_array_interpreter(self):
+        profile = parse_profile_cached(self.profile_text)
+        values = np.array([1.0, 2.0, 3.5])
+        interpreter = ArrayInterpreter(FakeProfileNode(), ['r'], len(values))
+        interpreter.interpret(profile, {'r': values})
+        vertices = interpreter.get_vertices()
+        for i, r in enumerate(values):
+            with self.subTest(r=r):
+                expected = Interpreter(FakeProfileNode(), ['r'])
+                expected.interpret(profile, {'r': r.item()})
+                expected_vertices = [(x, y, 0) for x, y in expected.vertices]
+                # The reference interpreter computes with single-precision mathutils vectors
+                np.testing.assert_allclose(vertices[i], np.array(expected_vertices), rtol=1e-6, atol=1e-6)
+                self.assertEqual(interpreter.edges, expected.edges)
+
+    def test_not_vectorizable(self):
+        # The path is closed by the last vertex for x = 0, but not for x = 2
+        profile = parse_profile_cached("M 0,0; L 1,0 1,1 {x},0; X")
+        interpreter = ArrayInterpreter(FakeProfileNode(), ['x'], 2)
+        with self.assertRaises(NotVectorizable):
+            interpreter.interpret(profile, {'x': np.array([0.0, 2.0])})
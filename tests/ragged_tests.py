@@ -0,0 +1,52 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.mesh.ragged import SvPolygons
+
+class RaggedPolygonsTests(SverchokTestCase):
+    # unit square split into a triangle, a quad and an empty polygon in between
+    verts = np.array([[0,0,0], [1,0,0], [1,1,0], [0,1,0], [2,0,0]], dtype=np.float64)
+    faces = [[1, 4, 2], [], [0, 1, 2, 3]]
+
+    def test_from_list(self):
+        polygons = SvPolygons.from_list(self.faces)
+        self.assert_numpy_arrays_equal(polygons.indices, np.array([1, 4, 2, 0, 1, 2, 3]))
+        self.assert_numpy_arrays_equal(polygons.offsets, np.array([0, 3, 3, 7]))
+        self.assertEqual(len(polygons), 3)
+        self.assertEqual(polygons.tolist(), self.faces)
+        self.assertEqual(polygons[2], [0, 1, 2, 3])
+        self.assertEqual(list(polygons), self.faces)
+
+    def test_from_array(self):
+        polygons = SvPolygons.from_array(np.array([[0, 1, 2], [2, 3, 0]]))
+        self.assertEqual(polygons.tolist(), [[0, 1, 2], [2, 3, 0]])
+        self.assert_numpy_arrays_equal(np.asarray(polygons), np.array([[0, 1, 2], [2, 3, 0]]))
+
+    def test_concatenate(self):
+        polygons = SvPolygons.concatenate([self.faces, [[0, 1, 2]]], [0, 5])
+        self.assertEqual(polygons.tolist(), self.faces + [[5, 6, 7]])
+
+    def test_edges(self):
+        polygons = SvPolygons.from_list(self.faces)
+        edges = polygons.edges()
+        self.assertEqual(edges.tolist(), [[0, 1], [0, 3], [1, 2], [1, 4], [2, 3], [2, 4]])
+
+    def test_triangulate(self):
+        polygons = SvPolygons.from_list(self.faces)
+        triangles, face_index = polygons.triangulate(return_face_index=True)
+        self.assertEqual(triangles.tolist(), [[1, 4, 2], [0, 1, 2], [0, 2, 3]])
+        self.assert_numpy_arrays_equal(face_index, np.array([0, 2, 2]))
+
+    def test_reductions(self):
+        polygons = SvPolygons.from_list(self.faces)
+        self.assert_numpy_arrays_equal(polygons.areas(self.verts), np.array([0.5, 0.0, 1.0]), precision=8)
+        self.assert_numpy_arrays_equal(polygons.normals(self.verts),
+                np.array([[0,0,1], [0,0,0], [0,0,1]], dtype=np.float64), precision=8)
+        self.assert_numpy_arrays_equal(polygons.centers(self.verts),
+                np.array([[4/3, 1/3, 0], [0,0,0], [0.5, 0.5, 0]]), precision=8)
+
+    def test_by_size(self):
+        polygons = SvPolygons.from_list(self.faces)
+        groups = {array.shape[1]: (mask.tolist(), array.tolist()) for mask, array in polygons.by_size()}
+        self.assertEqual(groups[3], ([True, False, False], [[1, 4, 2]]))
+        self.assertEqual(groups[4], ([False, False, True], [[0, 1, 2, 3]]))
@@ -0,0 +1,87 @@
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.raycast import SvRayCaster, SvNearestFinder, triangulate_polygons, closest_points_on_triangles
+
+class RaycastTests(SverchokTestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(3)
+        super().setUp()
+
+    def test_triangulate(self):
+        triangles, face_idxs = triangulate_polygons([[0, 1, 2], [3, 4, 5, 6], [7, 8, 9, 10, 11]])
+        self.assertEqual(triangles.tolist(), [[0, 1, 2], [3, 4, 5], [3, 5, 6], [7, 8, 9], [7, 9, 10], [7, 10, 11]])
+        self.assertEqual(face_idxs.tolist(), [0, 1, 1, 2, 2, 2])
+
+    def test_grid(self):
+        n = 10
+        xs, ys = np.meshgrid(np.arange(n), np.arange(n))
+        vertices = np.stack((xs.ravel(), ys.ravel(), np.zeros(n*n)), axis=1)
+        i = np.arange(n - 1)
+        rows, cols = np.meshgrid(i, i)
+        corners = (rows * n + cols).ravel()
+        faces = np.stack((corners, corners + 1, corners + n + 1, corners + n), axis=1)
+        caster = SvRayCaster(vertices, faces)
+
+        origins = np.array([[0.5, 0.5, 1.0], [3.5, 7.5, 2.0], [3.5, 7.5, -2.0], [20.0, 0.5, 1.0], [4.5, 4.5, 1.0]])
+        directions = np.array([[0, 0, -1], [0, 0, -2], [0, 0, -1], [0, 0, -1], [0, 0, 1]])
+        hits = caster.ray_cast(origins, directions)
+        self.assertEqual(hits.hit.tolist(), [True, True, False, False, False])
+        self.assertEqual(hits.indices.tolist(), [0, 3*9 + 7, -1, -1, -1])
+        self.assert_numpy_arrays_equal(hits.distances, np.array([1.0, 2.0, 0, 0, 0]), precision=10)
+        self.assert_numpy_arrays_equal(hits.locations[1], np.array([3.5, 7.5, 0.0]), precision=10)
+        self.assert_numpy_arrays_equal(np.abs(hits.normals[0]), np.array([0.0, 0.0, 1.0]), precision=10)
+
+        hits = caster.ray_cast(origins, directions, max_distance=1.5)
+        self.assertEqual(hits.hit.tolist(), [True, False, False, False, False])
+
+    def test_brute_force(self):
+        vertices = self.rng.uniform(-5, 5, (600, 3))
+        faces = self.rng.integers(0, 600, (200, 3))
+        caster = SvRayCaster(vertices, faces)
+        origins = self.rng.uniform(-6, 6, (500, 3))
+        directions = self.rng.normal(size=(500, 3))
+        hits = caster.ray_cast(origins, directions)
+
+        units = directions / np.linalg.norm(directions, axis=1)[:, np.newaxis]
+        tris = np.arange(len(faces))
+        ts = caster._intersect_triangles(np.repeat(origins, len(tris), axis=0),
+                    np.repeat(units, len(tris), axis=0),
+                    np.tile(tris, len(origins)), 0.0).reshape((len(origins), len(tris)))
+        expected_hit = np.isfinite(ts.min(axis=1))
+        self.assertEqual(hits.hit.tolist(), expected_hit.tolist())
+        self.assertEqual(hits.indices[expected_hit].tolist(), ts.argmin(axis=1)[expected_hit].tolist())
+        self.assert_numpy_arrays_equal(hits.distances[expected_hit], ts.min(axis=1)[expected_hit], precision=10)
+        self.assertEqual(caster.any_hit(origins, directions).tolist(), expected_hit.tolist())
+
+    def test_empty(self):
+        caster = SvRayCaster(np.zeros((0, 3)), [])
+        hits = caster.ray_cast([[0, 0, 0]], [[0, 0, 1]])
+        self.assertEqual(hits.hit.tolist(), [False])
+
+    def test_nearest_brute_force(self):
+        vertices = self.rng.uniform(-5, 5, (300, 3))
+        faces = self.rng.integers(0, 300, (100, 3))
+        finder = SvNearestFinder(vertices, faces)
+        points = self.rng.uniform(-6, 6, (200, 3))
+        hits = finder.find_nearest(points)
+
+        n_points, n_tris = len(points), len(finder.triangles)
+        tris = np.tile(np.arange(n_tris), n_points)
+        nearest = closest_points_on_triangles(np.repeat(points, n_tris, axis=0),
+                    finder.v0[tris], finder.edge1[tris], finder.edge2[tris])
+        distances = np.linalg.norm(nearest - np.repeat(points, n_tris, axis=0), axis=1).reshape((n_points, n_tris))
+        self.assertTrue(hits.hit.all())
+        self.assert_numpy_arrays_equal(hits.distances, distances.min(axis=1), precision=10)
+
+        hits = finder.find_nearest(points, max_distance=0.5)
+        self.assertEqual(hits.hit.tolist(), (distances.min(axis=1) <= 0.5).tolist())
+
+    def test_closest_points(self):
+        v0 = np.zeros((4, 3))
+        edge1 = np.tile([1.0, 0.0, 0.0], (4, 1))
+        edge2 = np.tile([0.0, 1.0, 0.0], (4, 1))
+        points = np.array([[0.2, 0.2, 1.0], [-1.0, -1.0, 0.0], [2.0, 0.5, 0.0], [1.0, 1.0, 0.0]])
+        expected = np.array([[0.2, 0.2, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.5, 0.5, 0.0]])
+        self.assert_numpy_arrays_equal(closest_points_on_triangles(points, v0, edge1, edge2), expected, precision=10)
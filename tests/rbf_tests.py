@@ -0,0 +1,75 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase, requires
+from sverchok.utils.rbf import SvRbfInterpolator, GLOBAL, LOCAL
+from sverchok.dependencies import scipy
+
+class RbfInterpolatorTests(SverchokTestCase):
+    def _samples(self, n, seed=1):
+        rng = np.random.default_rng(seed)
+        points = rng.uniform(-1.0, 1.0, size=(n, 3))
+        xs, ys, zs = points.T
+        values = np.sin(2*xs) + ys*zs
+        return points, values
+
+    @requires(scipy)
+    def test_global_interpolation(self):
+        points, values = self._samples(50)
+        for function in ['multiquadric', 'gaussian', 'thin_plate']:
+            with self.subTest(function=function):
+                rbf = SvRbfInterpolator(points, values, function=function)
+                self.assert_numpy_arrays_equal(rbf.evaluate(points), values, precision=6)
+
+    @requires(scipy)
+    def test_same_as_scipy(self):
+        from scipy.interpolate import Rbf
+        points, values = self._samples(40)
+        xs, ys, zs = points.T
+        expected_rbf = Rbf(xs, ys, zs, values, function='cubic', smooth=0.1)
+        rbf = SvRbfInterpolator(points, values, function='cubic', smooth=0.1)
+        test_points = points[:10] * 0.5
+        tx, ty, tz = test_points.T
+        self.assert_numpy_arrays_equal(rbf(tx, ty, tz), expected_rbf(tx, ty, tz), precision=6)
+
+    @requires(scipy)
+    def test_compact_interpolation(self):
+        points, values = self._samples(300)
+        for function in ['wendland_c0', 'wendland_c2', 'wendland_c4']:
+            with self.subTest(function=function):
+                rbf = SvRbfInterpolator(points, values, function=function)
+                self.assert_numpy_arrays_equal(rbf.evaluate(points), values, precision=6)
+                # far from samples, the linear trend is extrapolated instead of zero
+                far = rbf.evaluate(np.array([[10.0, 10.0, 10.0]]))
+                self.assertTrue(np.isfinite(far).all())
+
+    @requires(scipy)
+    def test_local_mode(self):
+        points, values = self._samples(2000)
+        rbf = SvRbfInterpolator(points, values, function='thin_plate', mode=LOCAL, points_per_patch=64)
+        self.assert_numpy_arrays_equal(rbf.evaluate(points), values, precision=3)
+        test_points = np.random.default_rng(2).uniform(-0.8, 0.8, size=(100, 3))
+        xs, ys, zs = test_points.T
+        expected = np.sin(2*xs) + ys*zs
+        error = np.abs(rbf.evaluate(test_points) - expected).max()
+        self.assertLess(error, 0.05)
+
+    @requires(scipy)
+    def test_vector_values(self):
+        points, values = self._samples(30)
+        vectors = np.stack((values, 2*values, points[:,0]), axis=1)
+        for mode in [GLOBAL, LOCAL]:
+            with self.subTest(mode=mode):
+                rbf = SvRbfInterpolator(points, vectors, function='wendland_c2', mode=mode)
+                xs, ys, zs = points.T
+                result = rbf(xs, ys, zs)
+                self.assertEqual(result.shape, (30, 3))
+                self.assert_numpy_arrays_equal(result, vectors, precision=5)
+
+    @requires(scipy)
+    def test_chunked_evaluation(self):
+        points, values = self._samples(100)
+        rbf = SvRbfInterpolator(points, values, function='gaussian')
+        expected = rbf.evaluate(points)
+        rbf.memory_limit = 1024
+        self.assert_numpy_arrays_equal(rbf.evaluate(points), expected, precision=10)
+
@@ -0,0 +1,54 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase, requires
+from sverchok.dependencies import scipy
+from sverchok.utils.relax_mesh import NONE, NORMAL, BVH, LINEAR, AVERAGE
+from sverchok.utils.relax_mesh_np import SvMeshRelaxation, lloyd_relax_np, edges_relax_np
+
+def grid(n):
+    xs, ys = np.meshgrid(np.arange(n, dtype=np.float64), np.arange(n, dtype=np.float64))
+    verts = np.stack((xs.ravel(), ys.ravel(), np.zeros(n*n)), axis=1)
+    faces = [[j*n + i, j*n + i + 1, (j+1)*n + i + 1, (j+1)*n + i] for j in range(n-1) for i in range(n-1)]
+    return verts, faces
+
+class RelaxMeshNpTests(SverchokTestCase):
+    @requires(scipy)
+    def test_boundary(self):
+        verts, faces = grid(4)
+        relaxation = SvMeshRelaxation(verts, None, faces)
+        self.assertEqual(np.where(~relaxation.boundary)[0].tolist(), [5, 6, 9, 10])
+        self.assertEqual(len(relaxation.edges), 24)
+
+    @requires(scipy)
+    def test_regular_grid_is_relaxed(self):
+        # regular grid is a fixed point of all algorithms
+        verts, faces = grid(5)
+        for method in [NONE, LINEAR, NORMAL, BVH]:
+            result = lloyd_relax_np(verts, faces, 3, method=method)
+            self.assert_numpy_arrays_equal(np.array(result), verts, precision=8)
+        result = edges_relax_np(verts, [], faces, 3, 0.5)
+        self.assert_numpy_arrays_equal(np.array(result), verts, precision=8)
+
+    @requires(scipy)
+    def test_lloyd_step(self):
+        verts, faces = grid(3)
+        verts[4] = (0.6, 1.2, 0.5)
+        relaxation = SvMeshRelaxation(verts, None, faces)
+        result = relaxation.lloyd_step(verts, NONE)
+        # center vertex moves to the mean of face centers
+        expected = verts.copy()
+        expected[4] = (relaxation.face_centers_op @ verts).mean(axis=0)
+        self.assert_numpy_arrays_equal(result, expected, precision=8)
+        # tangent method keeps the vertex in the plane orthogonal to its normal
+        result = relaxation.lloyd_step(verts, NORMAL)
+        normal = relaxation.vertex_normals(verts)[4]
+        self.assertAlmostEqual(np.dot(result[4] - verts[4], normal), 0.0)
+
+    @requires(scipy)
+    def test_mask_and_axes(self):
+        verts, faces = grid(4)
+        verts[[5, 6, 9, 10]] += np.array([[0.2, 0.1, 0.3]])
+        result = np.array(lloyd_relax_np(verts, faces, 1, mask=[0, 0, 0, 0, 0, 1, 0], method=NONE, use_axes={0, 2}))
+        moved = np.where((result != verts).any(axis=1))[0]
+        self.assertEqual(moved.tolist(), [5])
+        self.assertEqual(result[5][1], verts[5][1])
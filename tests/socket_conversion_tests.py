@@ -45,6 +45,48 @@ class SocketConversionTests(EmptyTreeTestCase):
 
         self.assert_sverchok_data_equal(data, expected_data, precision=8)
 
+    def test_conversion_cache(self):
+        """
+        Test that converted data is reused until the source socket gets new data.
+        """
+        ngon = create_node("SvNGonNode")
+        matrix_apply_1 = create_node("MatrixApplyNode")
+        matrix_apply_2 = create_node("MatrixApplyNode")
+        self.tree.links.new(ngon.outputs['Vertices'], matrix_apply_1.inputs['Matrixes'])
+        self.tree.links.new(ngon.outputs['Vertices'], matrix_apply_2.inputs['Matrixes'])
+
+        ngon.process()
+        prepare_input_data([ngon.outputs['Vertices']], [matrix_apply_1.inputs['Matrixes']])
+        prepare_input_data([ngon.outputs['Vertices']], [matrix_apply_2.inputs['Matrixes']])
+        data_1 = matrix_apply_1.inputs['Matrixes'].sv_get(deepcopy=False)
+        data_2 = matrix_apply_2.inputs['Matrixes'].sv_get(deepcopy=False)
+        self.assertIsNot(data_1, data_2)
+        self.assertEqual(data_1, data_2)
+
+        # Each consumer gets its own copy of converted data,
+        # so changing it in place does not affect other consumers
+        data_1[0][0][3] = 100.0
+        prepare_input_data([ngon.outputs['Vertices']], [matrix_apply_2.inputs['Matrixes']])
+        self.assertEqual(matrix_apply_2.inputs['Matrixes'].sv_get(deepcopy=False), data_2)
+        self.assertNotEqual(data_1, data_2)
+
+        ngon.process()
+        prepare_input_data([ngon.outputs['Vertices']], [matrix_apply_1.inputs['Matrixes']])
+        self.assertIsNot(matrix_apply_1.inputs['Matrixes'].sv_get(deepcopy=False), data_1)
+
+    def test_quaternions_to_matrices(self):
+        """
+        Test that vectorized quaternion -> matrix conversion gives the same
+        result as mathutils.
+        """
+        from mathutils import Quaternion
+        from sverchok.core.socket_conversions import quaternions_to_matrices
+        quaternions = [[(1.0, 0.0, 0.0, 0.0), (0.5, 0.5, -0.5, 0.5), (0.9, 0.1, 0.3, -0.2)]]
+        matrices = quaternions_to_matrices(quaternions)
+        expected = [Quaternion(q).to_matrix().to_4x4() for q in quaternions[0]]
+        self.assert_sverchok_data_equal([[row[:] for row in m] for m in matrices],
+                                        [[row[:] for row in m] for m in expected], precision=6)
+
     # def test_no_edges_to_verts(self):
     #     """
     #     Test that edges -> vertices conversion raises an exception.
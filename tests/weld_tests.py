@@ -0,0 +1,73 @@
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.mesh.weld import find_close_pairs, seed_labels, weld_mesh
+
+class WeldTests(SverchokTestCase):
+    def test_close_pairs(self):
+        points = np.random.RandomState(3).uniform(0.0, 1.0, size=(500, 3))
+        distance = 0.05
+        pairs = find_close_pairs(points, distance)
+        expected = set()
+        for i in range(len(points)):
+            for j in range(i+1, len(points)):
+                if np.linalg.norm(points[i] - points[j]) <= distance:
+                    expected.add((i, j))
+        self.assertEqual(set(map(tuple, pairs.tolist())), expected)
+
+    def test_seed_labels(self):
+        pairs = np.array([[3, 4], [1, 3], [5, 6], [0, 2]])
+        labels = seed_labels(7, pairs)
+        self.assert_numpy_arrays_equal(labels, np.array([0, 1, 0, 1, 4, 5, 5]))
+
+    def test_seed_labels_greedy(self):
+        # Same result as sequential greedy clustering, as bmesh does it
+        points = np.random.RandomState(5).uniform(0.0, 1.0, size=(2000, 3))
+        distance = 0.06
+        pairs = find_close_pairs(points, distance)
+        labels = seed_labels(len(points), pairs)
+        expected = np.full(len(points), -1)
+        for i in range(len(points)):
+            if expected[i] >= 0:
+                continue
+            expected[i] = i
+            close = np.linalg.norm(points - points[i], axis=1) <= distance
+            expected[close & (expected < 0)] = i
+        self.assert_numpy_arrays_equal(labels, expected)
+
+    def test_weld_chain(self):
+        # Each vertex is closer than the distance to the next one only;
+        # every other vertex is merged into the previous one.
+        verts = [[0.9 * i, 0, 0] for i in range(1000)]
+        edges = [[i, i+1] for i in range(999)]
+        result = weld_mesh(verts, edges, [], 1.0)
+        self.assertEqual(len(result.verts), 500)
+        self.assert_numpy_arrays_equal(result.vert_init_index, np.arange(0, 1000, 2))
+        self.assert_numpy_arrays_equal(result.vert_map, np.arange(1000) // 2)
+        self.assertEqual(len(result.edges), 499)
+
+    def test_weld_quads(self):
+        verts = [[0,0,0], [1,0,0], [1,1,0], [0,1,0], [1,0,0], [2,0,0], [2,1,0], [1,1,0.00001]]
+        faces = [[0,1,2,3], [4,5,6,7], [3,2,1,0]]
+        result = weld_mesh(verts, [], faces, 0.001)
+        self.assertEqual(result.verts.tolist(), [[0,0,0], [1,0,0], [1,1,0], [0,1,0], [2,0,0], [2,1,0]])
+        self.assertEqual(result.faces, [[0,1,2,3], [1,4,5,2]])
+        self.assert_numpy_arrays_equal(result.vert_init_index, np.array([0, 1, 2, 3, 5, 6]))
+        self.assert_numpy_arrays_equal(result.face_init_index, np.array([0, 1]))
+
+    def test_degenerate(self):
+        verts = [[0,0,0], [1,0,0], [1,0.0001,0], [0,1,0]]
+        faces = [[0,1,2], [0,2,3]]
+        edges = [[1,2], [2,3]]
+        result = weld_mesh(verts, edges, faces, 0.001)
+        self.assertEqual(result.faces, [[0,1,2]])
+        self.assertEqual(result.edges.tolist(), [[1,2]])
+        self.assert_numpy_arrays_equal(result.edge_init_index, np.array([1]))
+
+    def test_mask(self):
+        verts = [[0,0,0], [0,0,0], [1,0,0], [1,0,0]]
+        result = weld_mesh(verts, [], [], 0.001, mask=[False, False, True])
+        self.assertEqual(result.verts.tolist(), [[0,0,0], [0,0,0], [1,0,0]])
+        self.assert_numpy_arrays_equal(result.doubles_mask, np.array([False, False, False, True]))
+
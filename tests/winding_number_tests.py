@@ -0,0 +1,61 @@
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.winding_number import SvWindingNumber, triangle_solid_angles
+
+def cube(size=1.0):
+    verts = [(-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+             (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)]
+    faces = [[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4],
+             [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
+    return np.array(verts, dtype=np.float64) * size, faces
+
+def sphere(n_u, n_v):
+    us = np.linspace(0, 2*np.pi, n_u, endpoint=False)
+    vs = np.linspace(0, np.pi, n_v + 1)[1:-1]
+    us, vs = np.meshgrid(us, vs)
+    verts = np.stack((np.sin(vs)*np.cos(us), np.sin(vs)*np.sin(us), np.cos(vs)), axis=-1).reshape((-1, 3))
+    top, bottom = len(verts), len(verts) + 1
+    verts = np.vstack((verts, [[0, 0, 1], [0, 0, -1]]))
+    faces = []
+    for j in range(n_v - 2):
+        for i in range(n_u):
+            a, b = j*n_u + i, j*n_u + (i+1) % n_u
+            faces.append([a, a + n_u, b + n_u, b])
+    last = (n_v - 2) * n_u
+    for i in range(n_u):
+        faces.append([top, i, (i+1) % n_u])
+        faces.append([bottom, last + (i+1) % n_u, last + i])
+    return verts, faces
+
+class WindingNumberTests(SverchokTestCase):
+    def test_cube(self):
+        verts, faces = cube()
+        points = np.array([[0, 0, 0], [0.9, 0.9, -0.9], [2, 0, 0], [0, 0, 1.5], [5, 5, 5]])
+        winding = SvWindingNumber(verts, faces).winding_numbers(points)
+        self.assert_numpy_arrays_equal(winding, np.array([1.0, 1.0, 0.0, 0.0, 0.0]), precision=2)
+
+    def test_sphere(self):
+        verts, faces = sphere(60, 30)
+        points = np.random.default_rng(5).uniform(-1.5, 1.5, (3000, 3))
+        winding = SvWindingNumber(verts, faces)
+        radii = np.linalg.norm(points, axis=1)
+        # vertices of polygonal sphere are on the unit sphere, so faces are slightly inside it
+        certain = (radii < 0.99) | (radii > 1.0)
+        inside = winding.are_inside(points)
+        self.assertEqual(inside[certain].tolist(), (radii < 1.0)[certain].tolist())
+
+        # compare with exact sum of solid angles
+        tris = winding.triangles
+        exact = np.array([triangle_solid_angles(np.repeat(p[np.newaxis], len(tris), axis=0),
+                                verts[tris[:,0]], verts[tris[:,1]], verts[tris[:,2]]).sum()
+                          for p in points[:50]]) / (4*np.pi)
+        precise = SvWindingNumber(verts, faces, accuracy=4.0).winding_numbers(points[:50])
+        self.assertLess(np.abs(precise - exact).max(), 0.01)
+
+    def test_open_mesh(self):
+        # cube without one face: points inside are still classified correctly
+        verts, faces = cube()
+        winding = SvWindingNumber(verts, faces[1:])
+        self.assertEqual(winding.are_inside([[0, 0, 0.5], [0, 0, 3]]).tolist(), [True, False])
@@ -17,7 +17,7 @@ except ImportError:
 from sverchok.utils.logging import info, exception
 from sverchok.utils.surface import SvSurface
 from sverchok.utils.geom_2d.merge_mesh import crop_mesh_delaunay
-from sverchok.utils.voronoi import computeDelaunayTriangulation, Site
+from sverchok.utils.delaunay2d import delaunay_2d
 
 GAUSS = 'gauss'
 MAXIMUM = 'max'
@@ -38,6 +38,23 @@ class PopulationData(object):
             self._points = self.surface.evaluate_array(self.us, self.vs).reshape((self.samples_u, self.samples_v, 3))
         return self._points
 
+def calc_curvatures(surface, us, vs, curvature_type=MAXIMUM, curvature_clip=100):
+    """
+    Absolute values of surface curvature of specified type at points (us, vs).
+    """
+    if curvature_type == GAUSS:
+        curvatures = abs(surface.gauss_curvature_array(us, vs))
+    elif curvature_type == MAXIMUM:
+        curvatures_1, curvatures_2 = surface.principal_curvature_values_array(us, vs, order=False)
+        curvatures = abs(np.vstack((curvatures_1, curvatures_2))).max(axis=0)
+    elif curvature_type == MEAN:
+        curvatures = abs(surface.mean_curvature_array(us, vs))
+    else:
+        raise Exception("Unsupported curvature type:" + curvature_type)
+    if curvature_clip:
+        curvatures = curvatures.clip(0, curvature_clip)
+    return curvatures
+
 def populate_surface_uv(surface, samples_u, samples_v, by_curvature=True, curvature_type = MAXIMUM, curvature_clip = 100, by_area=True, min_ppf=1, max_ppf=5, seed=1):
     u_min, u_max = surface.get_u_min(), surface.get_u_max()
     v_min, v_max = surface.get_v_min(), surface.get_v_max()
@@ -59,17 +76,7 @@ def populate_surface_uv(surface, samples_u, samples_v, by_curvature=True, curvat
     data.samples_v = samples_v
 
     if by_curvature:
-        if curvature_type == GAUSS:
-            curvatures = abs(surface.gauss_curvature_array(us, vs))
-        elif curvature_type == MAXIMUM:
-            curvatures_1, curvatures_2 = surface.principal_curvature_values_array(us, vs, order=False)
-            curvatures = abs(np.vstack((curvatures_1, curvatures_2))).max(axis=0)
-        elif curvature_type == MEAN:
-            curvatures = abs(surface.mean_curvature_array(us, vs))
-        else:
-            raise Exception("Unsupported curvature type:" + curvature_type)
-        if curvature_clip:
-            curvatures = curvatures.clip(0, curvature_clip)
+        curvatures = calc_curvatures(surface, us, vs, curvature_type, curvature_clip)
         curvatures = curvatures.reshape((samples_u, samples_v))
 
         curvatures_0 = curvatures[:-1, :-1]
@@ -209,9 +216,8 @@ def make_outer_edges(samples_u, samples_v):
 
 def delaunay_triangulatrion(samples_u, samples_v, us_list, vs_list, u_coeff, v_coeff, epsilon):
     if delaunay_2d_cdt is None:
-        # Pure-python implementation
-        points_uv = [Site(u * u_coeff, v * v_coeff) for u, v in zip(us_list, vs_list)]
-        faces = computeDelaunayTriangulation(points_uv)
+        points_uv = np.stack((np.asarray(us_list) * u_coeff, np.asarray(vs_list) * v_coeff), axis=1)
+        faces = delaunay_2d(points_uv).tolist()
         return faces
     else:
         points_scaled = [(u*u_coeff, v*v_coeff) for u,v in zip(us_list, vs_list)]
@@ -262,3 +268,178 @@ def adaptive_subdivide(surface, samples_u, samples_v, by_curvature=True, curvatu
 
     return np.array(us_list), np.array(vs_list), faces
 
+def grid_triangles(samples_u, samples_v):
+    """
+    Triangulation of regular grid of samples_u x samples_v points, numbered
+    as in populate_surface_uv (index = i * samples_v + j); np.array of shape
+    (2 * (samples_u - 1) * (samples_v - 1), 3).
+    """
+    i, j = np.meshgrid(np.arange(samples_u - 1), np.arange(samples_v - 1), indexing='ij')
+    a = (i * samples_v + j).ravel()
+    b = a + samples_v
+    c = b + 1
+    d = a + 1
+    return np.concatenate((np.stack((a, b, c), axis=1), np.stack((a, c, d), axis=1)))
+
+def _triangle_edges(triangles, n_verts):
+    # unique edges of triangles, and indexes of edges of each triangle
+    starts = triangles.ravel()
+    ends = np.roll(triangles, -1, axis=1).ravel()
+    keys = np.minimum(starts, ends) * n_verts + np.maximum(starts, ends)
+    keys, inverse = np.unique(keys, return_inverse=True)
+    edges = np.stack(np.divmod(keys, n_verts), axis=1)
+    return edges, inverse.reshape((-1, 3))
+
+def _rotate(array, shifts):
+    # roll each row of (n, 3) array to the left by shifts[i]
+    idxs = (np.arange(3)[np.newaxis, :] + shifts[:, np.newaxis]) % 3
+    return np.take_along_axis(array, idxs, axis=1)
+
+def split_triangles(triangles, mids, points):
+    """
+    Split triangles by midpoints of their edges, keeping the triangulation
+    conforming (an edge is split for both triangles adjacent to it).
+
+    Args:
+        triangles: np.array of shape (n, 3).
+        mids: np.array of shape (n, 3): index of new vertex at the middle of
+            edge (triangles[:,k], triangles[:,k+1]), or -1 if the edge is not split.
+        points: coordinates of all vertices, including new ones; used to
+            select shorter diagonal when two edges of a triangle are split.
+
+    Returns:
+        np.array of shape (m, 3).
+    """
+    split = mids >= 0
+    counts = split.sum(axis=1)
+    result = [triangles[counts == 0]]
+
+    # one edge: rotate it to the position 0, then bisect
+    sel = counts == 1
+    t = _rotate(triangles[sel], np.argmax(split[sel], axis=1))
+    m = _rotate(mids[sel], np.argmax(split[sel], axis=1))
+    result.append(np.stack((t[:,0], m[:,0], t[:,2]), axis=1))
+    result.append(np.stack((m[:,0], t[:,1], t[:,2]), axis=1))
+
+    # two edges: rotate the edge which is not split to the position 2
+    sel = counts == 2
+    shifts = (np.argmin(split[sel], axis=1) + 1) % 3
+    t = _rotate(triangles[sel], shifts)
+    m = _rotate(mids[sel], shifts)
+    result.append(np.stack((m[:,0], t[:,1], m[:,1]), axis=1))
+    diagonal_1 = np.linalg.norm(points[t[:,0]] - points[m[:,1]], axis=1)
+    diagonal_2 = np.linalg.norm(points[m[:,0]] - points[t[:,2]], axis=1)
+    first = diagonal_1 <= diagonal_2
+    result.append(np.where(first[:, np.newaxis],
+                    np.stack((t[:,0], m[:,0], m[:,1]), axis=1),
+                    np.stack((t[:,0], m[:,0], t[:,2]), axis=1)))
+    result.append(np.where(first[:, np.newaxis],
+                    np.stack((t[:,0], m[:,1], t[:,2]), axis=1),
+                    np.stack((m[:,0], m[:,1], t[:,2]), axis=1)))
+
+    # three edges: four similar triangles
+    sel = counts == 3
+    t, m = triangles[sel], mids[sel]
+    result.append(np.stack((t[:,0], m[:,0], m[:,2]), axis=1))
+    result.append(np.stack((m[:,0], t[:,1], m[:,1]), axis=1))
+    result.append(np.stack((m[:,2], m[:,1], t[:,2]), axis=1))
+    result.append(m)
+
+    return np.concatenate(result)
+
+def _triangle_areas(points, triangles):
+    p0 = points[triangles[:,0]]
+    return np.linalg.norm(np.cross(points[triangles[:,1]] - p0, points[triangles[:,2]] - p0), axis=1) / 2.0
+
+def adaptive_refine(surface, samples_u, samples_v, by_curvature=True, curvature_type=MAXIMUM, curvature_clip=100, by_area=True, tolerance=0.01, max_level=5, add_points=None, trim_curve=None, samples_t=100, trim_mode='inner', epsilon=1e-4):
+    """
+    Adaptive tessellation of the surface by refinement of regular grid.
+
+    The surface is sampled at samples_u x samples_v grid, which is split into
+    triangles. Then, up to max_level times, all edges with error above
+    tolerance are split at their middle points (in UV space), and triangles
+    are subdivided accordingly. Error of an edge is the distance between the
+    surface and the middle of the edge; with by_curvature, it is also
+    estimated as k * L^2 / 8 (height of circular arc of curvature k over
+    chord of length L), where k is the maximum curvature of the grid cell;
+    this catches bends which are not visible at middle points. With by_area,
+    triangles with area bigger than average area of triangles of the grid
+    have their longest edge split as well. Everything is done on numpy arrays.
+
+    Returns:
+        tuple: np.arrays of U and V parameters of vertices, and list of faces.
+    """
+    u_min, u_max = surface.get_u_min(), surface.get_u_max()
+    v_min, v_max = surface.get_v_min(), surface.get_v_max()
+    us_range = np.linspace(u_min, u_max, num=samples_u)
+    vs_range = np.linspace(v_min, v_max, num=samples_v)
+    us, vs = np.meshgrid(us_range, vs_range, indexing='ij')
+    us = us.flatten()
+    vs = vs.flatten()
+    points = surface.evaluate_array(us, vs)
+    grid_points = points.reshape((samples_u, samples_v, 3))
+    triangles = grid_triangles(samples_u, samples_v)
+
+    if by_curvature:
+        curvatures = calc_curvatures(surface, us, vs, curvature_type, curvature_clip).reshape((samples_u, samples_v))
+        curvatures[np.isnan(curvatures)] = 0
+        cell_curvatures = np.max([curvatures[:-1, :-1], curvatures[1:, :-1], curvatures[:-1, 1:], curvatures[1:, 1:]], axis=0)
+
+    if by_area:
+        max_area = _triangle_areas(points, triangles).mean()
+
+    for level in range(max_level):
+        edges, triangle_edges = _triangle_edges(triangles, len(us))
+        p0, p1 = points[edges[:,0]], points[edges[:,1]]
+        mid_us = (us[edges[:,0]] + us[edges[:,1]]) / 2.0
+        mid_vs = (vs[edges[:,0]] + vs[edges[:,1]]) / 2.0
+        mid_points = surface.evaluate_array(mid_us, mid_vs)
+        errors = np.linalg.norm(mid_points - (p0 + p1) / 2.0, axis=1)
+        if by_curvature:
+            i = np.clip(np.searchsorted(us_range, mid_us, side='right') - 1, 0, samples_u - 2)
+            j = np.clip(np.searchsorted(vs_range, mid_vs, side='right') - 1, 0, samples_v - 2)
+            lengths = np.linalg.norm(p1 - p0, axis=1)
+            errors = np.maximum(errors, cell_curvatures[i, j] * lengths * lengths / 8.0)
+        marked = errors > tolerance
+        if by_area:
+            big = _triangle_areas(points, triangles) > max_area
+            if big.any():
+                edge_lengths = np.linalg.norm(p1 - p0, axis=1)[triangle_edges[big]]
+                marked[triangle_edges[big][np.arange(big.sum()), np.argmax(edge_lengths, axis=1)]] = True
+
+        n_marked = marked.sum()
+        if n_marked == 0:
+            break
+        new_idxs = np.full(len(edges), -1, dtype=np.int64)
+        new_idxs[marked] = len(us) + np.arange(n_marked)
+        us = np.concatenate((us, mid_us[marked]))
+        vs = np.concatenate((vs, mid_vs[marked]))
+        points = np.concatenate((points, mid_points[marked]))
+        triangles = split_triangles(triangles, new_idxs[triangle_edges], points)
+
+    if add_points is not None and len(add_points) > 0 and len(add_points[0]) > 0:
+        # additional points can not be inserted into existing triangles
+        # consistently, so all points are triangulated again
+        add_points = np.asarray(add_points, dtype=np.float64)
+        us = np.concatenate((us, add_points[:,0]))
+        vs = np.concatenate((vs, add_points[:,1]))
+        target_u_length, target_v_length = calc_sizes(grid_points, samples_u, samples_v)
+        u_coeff = target_u_length / (u_max - u_min)
+        v_coeff = target_v_length / (v_max - v_min)
+        faces = delaunay_triangulatrion(samples_u, samples_v, us, vs, u_coeff, v_coeff, epsilon)
+    else:
+        faces = triangles.tolist()
+
+    if trim_curve is not None:
+        target_u_length, target_v_length = calc_sizes(grid_points, samples_u, samples_v)
+        u_coeff = target_u_length / (u_max - u_min)
+        v_coeff = target_v_length / (v_max - v_min)
+        curve_verts, curve_edges, curve_faces = tessellate_curve(trim_curve, samples_t)
+        curve_verts_scaled = [(u * u_coeff, v * v_coeff, 0) for u, v, _ in curve_verts]
+        triangulation_verts_scaled = np.stack((us * u_coeff, vs * v_coeff, np.zeros(len(us))), axis=1).tolist()
+        xy_verts, faces, _ = crop_mesh_delaunay(triangulation_verts_scaled, faces, curve_verts_scaled, curve_faces, trim_mode, epsilon)
+        xy_verts = np.asarray(xy_verts)
+        us = xy_verts[:,0] / u_coeff
+        vs = xy_verts[:,1] / v_coeff
+
+    return us, vs, faces
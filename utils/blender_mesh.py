@@ -16,53 +16,223 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+from collections import defaultdict
+
 import numpy as np
+
 # taken from here https://blenderartists.org/t/efficient-copying-of-vertex-coords-to-and-from-numpy-arrays/661467/3
 def read_verts(blender_mesh, output_numpy=False):
-    mverts_co = np.zeros((len(blender_mesh.vertices)*3), dtype=np.float)
+    mverts_co = np.zeros((len(blender_mesh.vertices)*3), dtype=np.float64)
     blender_mesh.vertices.foreach_get("co", mverts_co)
     if output_numpy:
         return np.reshape(mverts_co, (len(blender_mesh.vertices), 3))
     return np.reshape(mverts_co, (len(blender_mesh.vertices), 3)).tolist()
 
 def read_verts_normal(blender_mesh, output_numpy=False):
-    mverts_normals = np.zeros((len(blender_mesh.vertices)*3), dtype=np.float)
+    mverts_normals = np.zeros((len(blender_mesh.vertices)*3), dtype=np.float64)
     blender_mesh.vertices.foreach_get("normal", mverts_normals)
     if output_numpy:
         return np.reshape(mverts_normals, (len(blender_mesh.vertices), 3))
     return np.reshape(mverts_normals, (len(blender_mesh.vertices), 3)).tolist()
 
 def read_face_normal(blender_mesh, output_numpy=False):
-    mface_normals = np.zeros((len(blender_mesh.polygons)*3), dtype=np.float)
+    mface_normals = np.zeros((len(blender_mesh.polygons)*3), dtype=np.float64)
     blender_mesh.polygons.foreach_get("normal", mface_normals)
     if output_numpy:
         return np.reshape(mface_normals, (len(blender_mesh.polygons), 3))
     return np.reshape(mface_normals, (len(blender_mesh.polygons), 3)).tolist()
 
 def read_face_center(blender_mesh, output_numpy=False):
-    centers = np.zeros((len(blender_mesh.polygons)*3), dtype=np.float)
+    centers = np.zeros((len(blender_mesh.polygons)*3), dtype=np.float64)
     blender_mesh.polygons.foreach_get("center", centers)
     if output_numpy:
         return np.reshape(centers, (len(blender_mesh.polygons), 3))
     return np.reshape(centers, (len(blender_mesh.polygons), 3)).tolist()
 
 def read_face_area(blender_mesh, output_numpy=False):
-    areas = np.zeros((len(blender_mesh.polygons)), dtype=np.float)
+    areas = np.zeros((len(blender_mesh.polygons)), dtype=np.float64)
     blender_mesh.polygons.foreach_get("area", areas)
     if output_numpy:
         return areas
     return areas.tolist()
 
 def read_edges(blender_mesh, output_numpy=False):
-    fastedges = np.zeros((len(blender_mesh.edges)*2), dtype=np.int)
+    fastedges = np.zeros((len(blender_mesh.edges)*2), dtype=np.int64)
     blender_mesh.edges.foreach_get("vertices", fastedges)
     if output_numpy:
         return np.reshape(fastedges, (len(blender_mesh.edges), 2))
     return np.reshape(fastedges, (len(blender_mesh.edges), 2)).tolist()
 
 def read_materials_idx(blender_mesh, output_numpy=False):
-    material_index = np.zeros((len(blender_mesh.polygons)), dtype=np.float)
+    material_index = np.zeros((len(blender_mesh.polygons)), dtype=np.float64)
     blender_mesh.polygons.foreach_get("material_index", material_index)
     if output_numpy:
         return material_index
     return material_index.tolist()
+
+def read_loops(blender_mesh):
+    """
+    Polygons of the mesh as flat arrays: number of vertices of each polygon
+    (loop totals) and vertex indices of all polygons one after another.
+    """
+    loop_totals = np.zeros(len(blender_mesh.polygons), dtype=np.int64)
+    blender_mesh.polygons.foreach_get("loop_total", loop_totals)
+    loop_verts = np.zeros(len(blender_mesh.loops), dtype=np.int64)
+    blender_mesh.loops.foreach_get("vertex_index", loop_verts)
+    return loop_totals, loop_verts
+
+def loops_from_polygons(polygons):
+    loop_totals = np.array([len(p) for p in polygons], dtype=np.int64)
+    if not polygons:
+        return loop_totals, np.zeros(0, dtype=np.int64)
+    return loop_totals, np.concatenate(polygons).astype(np.int64)
+
+def polygons_from_loops(loop_totals, loop_verts):
+    """
+    Inverse of read_loops: list of polygons (lists of vertex indices).
+    """
+    if len(loop_totals) == 0:
+        return []
+    if (loop_totals == loop_totals[0]).all():
+        return loop_verts.reshape((-1, loop_totals[0])).tolist()
+    flat = loop_verts.tolist()
+    ends = np.cumsum(loop_totals).tolist()
+    starts = [0] + ends[:-1]
+    return [flat[start:end] for start, end in zip(starts, ends)]
+
+def read_polygons(blender_mesh):
+    return polygons_from_loops(*read_loops(blender_mesh))
+
+def _loop_sums(values, loop_totals):
+    # sums of values (one per loop) over each polygon
+    starts = np.cumsum(loop_totals) - loop_totals
+    return np.add.reduceat(values, starts, axis=0)
+
+def calc_polygon_centers(verts, loop_totals, loop_verts):
+    """
+    Median centers of polygons, same as BMFace.calc_center_median().
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    if len(loop_totals) == 0:
+        return np.zeros((0, 3))
+    return _loop_sums(verts[loop_verts], loop_totals) / loop_totals[:, np.newaxis]
+
+def calc_polygon_normals(verts, loop_totals, loop_verts):
+    """
+    Unit normals of polygons (Newell's method, as in Blender) and their areas.
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    if len(loop_totals) == 0:
+        return np.zeros((0, 3)), np.zeros(0)
+    starts = np.cumsum(loop_totals) - loop_totals
+    nexts = np.arange(len(loop_verts)) + 1
+    nexts[starts + loop_totals - 1] = starts
+    crosses = np.cross(verts[loop_verts], verts[loop_verts[nexts]])
+    normals = _loop_sums(crosses, loop_totals)
+    norms = np.linalg.norm(normals, axis=1)
+    normals /= np.where(norms > 0, norms, 1.0)[:, np.newaxis]
+    return normals, 0.5 * norms
+
+# Number of depsgraph updates of geometry of each ID, by (id_type, name_full);
+# updated by a depsgraph_update_post handler (see core/handlers.py).
+_geometry_revisions = defaultdict(int)
+# Changed when revisions can not be trusted anymore (new file, undo).
+_generation = [0]
+
+def tag_geometry_updates(depsgraph):
+    """
+    Record which objects and meshes had their geometry changed.
+    """
+    for update in depsgraph.updates:
+        if update.is_updated_geometry:
+            data = update.id.original
+            _geometry_revisions[(data.id_type, data.name_full)] += 1
+
+def reset_geometry_revisions():
+    """
+    Invalidate all revisions; to be called when a file is loaded, or on undo.
+    """
+    _geometry_revisions.clear()
+    _generation[0] += 1
+
+def geometry_revision(obj):
+    """
+    Value which changes when depsgraph updates geometry of the object or its data.
+    """
+    data = obj.data
+    data_revision = _geometry_revisions[(data.id_type, data.name_full)] if data is not None else 0
+    return (_generation[0], _geometry_revisions[('OBJECT', obj.name_full)], data_revision)
+
+def may_change_with_frame(obj, modifiers=False):
+    """
+    Whether the geometry of the object can be different on other frame without
+    depsgraph geometry updates: the object or its data are animated, or
+    (if modifiers are applied) the object has modifiers, which can depend on
+    animated objects or on the frame itself (physics, armatures and so on).
+    """
+    if obj.animation_data is not None:
+        return True
+    data = obj.data
+    if data is not None:
+        if data.animation_data is not None:
+            return True
+        shape_keys = getattr(data, 'shape_keys', None)
+        if shape_keys is not None and shape_keys.animation_data is not None:
+            return True
+    return modifiers and len(obj.modifiers) > 0
+
+def output_cached_array(data, output_numpy=False):
+    """
+    Data for an output socket from an array kept in SvObjectDataCache: a copy
+    of the array, or a list. Cached arrays themselves are never passed to
+    outputs, so a node changing its input in place can not spoil the cache.
+    """
+    if output_numpy:
+        return data.copy()
+    return data.tolist()
+
+class SvObjectDataCache(object):
+    """
+    Data extracted from Blender objects, kept between updates of the tree,
+    as numpy arrays (see output_cached_array()).
+    Each entry is stored together with a "stamp" (see stamp()); if the stamp
+    of an object is the same on the next update, the object was not changed,
+    and the data can be reused.
+    """
+    def __init__(self):
+        self._entries = {}
+
+    @staticmethod
+    def stamp(obj, frame, modifiers=False):
+        """
+        Key describing the state of the object: its geometry revision, current
+        frame (only if the object may change with frame), and whether
+        modifiers are applied.
+        """
+        frame_key = frame if may_change_with_frame(obj, modifiers) else None
+        return (geometry_revision(obj), frame_key, modifiers)
+
+    def get(self, name, stamp):
+        """
+        Dictionary of data cached for the object. If the stamp changed,
+        cached data is dropped and an empty dictionary is returned; the caller
+        is expected to fill it.
+        """
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != stamp:
+            entry = (stamp, dict())
+            self._entries[name] = entry
+        return entry[1]
+
+    def drop(self, name):
+        self._entries.pop(name, None)
+
+    def retain(self, names):
+        """
+        Forget objects which are not in names.
+        """
+        for name in set(self._entries) - set(names):
+            del self._entries[name]
+
+    def clear(self):
+        self._entries.clear()
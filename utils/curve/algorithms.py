@@ -22,7 +22,9 @@ from sverchok.utils.geom import PlaneEquation, LineEquation, Spline, LinearSplin
 from sverchok.utils.geom import autorotate_householder, autorotate_track, autorotate_diff
 from sverchok.utils.math import (
     ZERO, FRENET, HOUSEHOLDER, TRACK, DIFF, TRACK_NORMAL,
-    NORMAL_DIR, NONE
+    NORMAL_DIR, NONE,
+    np_dot, np_multiply_matrices_vectors,
+    np_matrices_to_quaternions, np_quaternions_to_matrices, np_quaternions_slerp
 )
 from sverchok.utils.logging import info
 
@@ -113,17 +115,289 @@ class SvCurveLengthSolver(object):
         spline_verts = self._reverse_spline.eval(input_lengths)
         return spline_verts[:,1]
 
+class SvCurveQuadratureLengthSolver(SvCurveLengthSolver):
+    """
+    Curve length solver, which integrates the curve's speed |C'(t)| with
+    Gauss-Legendre quadrature.
+
+    The curve's T range is split into spans: a uniform grid of `resolution`
+    points, plus all distinct knots for NURBS-like curves, so that no span
+    contains a point where the curve is not smooth. Each span is subdivided
+    adaptively, only while the difference between quadrature over the whole
+    span and over its halves is higher than the tolerance; spans are
+    processed in batches, with one call to the curve's tangent_array() per
+    subdivision level.
+
+    Inverse problem (T by length) is solved by linear interpolation between
+    span bounds, refined by safeguarded Newton iterations in SPL mode.
+    """
+
+    def __init__(self, curve, order=5):
+        self.curve = curve
+        self.order = order
+        self.mode = 'SPL'
+        self._nodes, self._weights = np.polynomial.legendre.leggauss(order)
+        self._use_curve_tangents = type(curve).tangent_array is not SvCurve.tangent_array
+        self._tknots = None
+        self._length_params = None
+        self._tolerance = None
+
+    max_depth = 20
+    newton_iterations = 5
+
+    def _calc_speeds(self, ts):
+        if self._use_curve_tangents:
+            tangents = self.curve.tangent_array(ts)
+        else:
+            # central differences instead of SvCurve's one-sided default
+            t_min, t_max = self.curve.get_u_bounds()
+            h = 1e-6 * (t_max - t_min)
+            ts_plus = np.minimum(ts + h, t_max)
+            ts_minus = np.maximum(ts - h, t_min)
+            points = self.curve.evaluate_array(np.concatenate((ts_plus, ts_minus)))
+            n = len(ts)
+            tangents = (points[:n] - points[n:]) / (ts_plus - ts_minus)[:, np.newaxis]
+        return np.linalg.norm(tangents, axis=1)
+
+    def _quadrature_ts(self, t1s, t2s):
+        half = (t2s - t1s)[:, np.newaxis] * 0.5
+        return ((t1s + t2s)[:, np.newaxis] * 0.5 + half * self._nodes).ravel()
+
+    def _integrate_speeds(self, t1s, t2s, speeds):
+        speeds = speeds.reshape((len(t1s), self.order))
+        return (t2s - t1s) * 0.5 * (speeds @ self._weights)
+
+    def _quadrature(self, t1s, t2s):
+        """Length of curve segments [t1s[i], t2s[i]]."""
+        if len(t1s) == 0:
+            return np.zeros(0)
+        speeds = self._calc_speeds(self._quadrature_ts(t1s, t2s))
+        return self._integrate_speeds(t1s, t2s, speeds)
+
+    def _calc_breakpoints(self, resolution):
+        t_min, t_max = self.curve.get_u_bounds()
+        breaks = np.linspace(t_min, t_max, num=max(resolution, 2))
+        if hasattr(self.curve, 'get_knotvector'):
+            knots = np.unique(self.curve.get_knotvector())
+            knots = knots[(knots > t_min) & (knots < t_max)]
+            breaks = np.union1d(breaks, knots)
+        return breaks
+
+    def _integrate(self, resolution, tolerance):
+        t_min, t_max = self.curve.get_u_bounds()
+        breaks = self._calc_breakpoints(resolution)
+        t1s, t2s = breaks[:-1], breaks[1:]
+        wholes = self._quadrature(t1s, t2s)
+        if tolerance is None:
+            tolerance = 1e-6 * max(wholes.sum(), 1e-12)
+        self._tolerance = tolerance
+        t_range = t_max - t_min
+
+        done_t1s, done_t2s, done_lengths = [], [], []
+        for depth in range(self.max_depth):
+            mids = (t1s + t2s) * 0.5
+            speeds = self._calc_speeds(np.concatenate((self._quadrature_ts(t1s, mids), self._quadrature_ts(mids, t2s))))
+            n = len(t1s) * self.order
+            lefts = self._integrate_speeds(t1s, mids, speeds[:n])
+            rights = self._integrate_speeds(mids, t2s, speeds[n:])
+            good = abs(wholes - (lefts + rights)) <= tolerance * (t2s - t1s) / t_range
+            if depth == self.max_depth - 1:
+                good[:] = True
+            done_t1s.extend([t1s[good], mids[good]])
+            done_t2s.extend([mids[good], t2s[good]])
+            done_lengths.extend([lefts[good], rights[good]])
+            bad = ~good
+            if not bad.any():
+                break
+            t1s, t2s = np.concatenate((t1s[bad], mids[bad])), np.concatenate((mids[bad], t2s[bad]))
+            wholes = np.concatenate((lefts[bad], rights[bad]))
+
+        t1s = np.concatenate(done_t1s)
+        order = np.argsort(t1s)
+        t2s = np.concatenate(done_t2s)[order]
+        lengths = np.concatenate(done_lengths)[order]
+        tknots = np.insert(t2s, 0, t1s[order[0]])
+        length_params = np.insert(np.cumsum(lengths), 0, 0.0)
+        return tknots, length_params
+
+    def prepare(self, mode, resolution=50, tolerance=None):
+        self.mode = mode
+        self._tknots, self._length_params = self._integrate(resolution, tolerance)
+
+    def _check_prepared(self):
+        if self._tknots is None:
+            raise Exception("You have to call solver.prepare() first")
+
+    def get_total_length(self):
+        self._check_prepared()
+        return self._length_params[-1]
+
+    def _find_spans(self, ts):
+        n = len(self._tknots) - 1
+        return np.clip(np.searchsorted(self._tknots, ts, side='right') - 1, 0, n - 1)
+
+    def calc_length_params(self, ts):
+        self._check_prepared()
+        ts = np.asarray(ts, dtype=np.float64)
+        idxs = self._find_spans(ts)
+        t1s = self._tknots[idxs]
+        return self._length_params[idxs] + self._quadrature(t1s, ts)
+
+    def calc_length(self, t_min, t_max):
+        lengths = self.calc_length_params(np.array([t_min, t_max]))
+        return lengths[1] - lengths[0]
+
+    def _initial_guess(self, input_lengths):
+        """Per input length: span index, T bracket and linear interpolation of T."""
+        tknots, length_params = self._tknots, self._length_params
+        n = len(tknots) - 1
+        input_lengths = np.clip(input_lengths, 0.0, length_params[-1])
+        idxs = np.clip(np.searchsorted(length_params, input_lengths, side='right') - 1, 0, n - 1)
+        t1s, t2s = tknots[idxs], tknots[idxs + 1]
+        l1s, l2s = length_params[idxs], length_params[idxs + 1]
+        dls = l2s - l1s
+        fracs = np.divide(input_lengths - l1s, dls, out=np.zeros_like(dls), where=dls > 0)
+        return input_lengths, idxs, t1s, t2s, t1s + fracs * (t2s - t1s)
+
+    def _newton_step(self, input_lengths, idxs, span_t1s, ts, los, his, speeds):
+        """One safeguarded Newton iteration; speeds are evaluated at
+        quadrature points of [span_t1s, ts] followed by ts themselves."""
+        n = len(ts) * self.order
+        residuals = self._length_params[idxs] + self._integrate_speeds(span_t1s, ts, speeds[:n]) - input_lengths
+        ts_speeds = speeds[n:]
+        active = abs(residuals) > self._tolerance * 1e-3
+        his = np.where(active & (residuals > 0), ts, his)
+        los = np.where(active & (residuals < 0), ts, los)
+        steps = np.divide(residuals, ts_speeds, out=np.zeros_like(residuals), where=ts_speeds > 0)
+        new_ts = ts - steps
+        outside = (new_ts <= los) | (new_ts >= his)
+        new_ts = np.where(outside, (los + his) * 0.5, new_ts)
+        return np.where(active, new_ts, ts), los, his, active.any()
+
+    def _newton_ts(self, span_t1s, ts):
+        return np.concatenate((self._quadrature_ts(span_t1s, ts), ts))
+
+    def solve(self, input_lengths, mode=None):
+        self._check_prepared()
+        if mode is None:
+            mode = self.mode
+        input_lengths = np.asarray(input_lengths, dtype=np.float64)
+        input_lengths, idxs, los, his, ts = self._initial_guess(input_lengths)
+        if mode == 'LIN' or len(ts) == 0:
+            return ts
+        span_t1s = los
+        for i in range(self.newton_iterations):
+            speeds = self._calc_speeds(self._newton_ts(span_t1s, ts))
+            ts, los, his, active = self._newton_step(input_lengths, idxs, span_t1s, ts, los, his, speeds)
+            if not active:
+                break
+        return ts
+
+def _householder_matrices(vectors):
+    """
+    Reflection matrices I - 2 v v^T / (v, v) for each of vectors;
+    identity for zero vectors.
+    input: np.array of shape (n, 3)
+    output: np.array of shape (n, 3, 3)
+    """
+    sq_norms = (vectors * vectors).sum(axis=1)
+    good = sq_norms > 1e-16
+    coeffs = np.zeros_like(sq_norms)
+    coeffs[good] = 2.0 / sq_norms[good]
+    outer = vectors[:, :, np.newaxis] * vectors[:, np.newaxis, :]
+    return np.eye(3) - coeffs[:, np.newaxis, np.newaxis] * outer
+
+def _prefix_matrix_products(matrices):
+    """
+    Cumulative products M[i] @ M[i-1] @ ... @ M[0] for all i.
+    Calculated with log2(n) batched matrix multiplications
+    (Hillis-Steele scan) instead of n sequential ones.
+    input: np.array of shape (n, 3, 3)
+    output: np.array of shape (n, 3, 3)
+    """
+    result = matrices.copy()
+    n = len(result)
+    step = 1
+    while step < n:
+        result[step:] = result[step:] @ result[:-step]
+        step *= 2
+    return result
+
+def _align_z_axes(matrices, tangents):
+    """
+    Rotate each frame by the minimal rotation which takes its Z axis (third
+    column) to the direction of corresponding tangent. Frames with zero
+    tangents are left as is.
+    input:
+        * matrices: np.array of shape (n, 3, 3)
+        * tangents: np.array of shape (n, 3)
+    output: np.array of shape (n, 3, 3)
+    """
+    norms = np.linalg.norm(tangents, axis=1)
+    good = norms > 1e-12
+    tangents = tangents[good] / norms[good][:, np.newaxis]
+    zs = matrices[good, :, 2]
+    axes = np.cross(zs, tangents)
+    cos = np_dot(zs, tangents)
+    # Rodrigues formula: R = I + [a]x + [a]x^2 / (1 + cos), with a = z x t
+    cross = np.zeros((len(axes), 3, 3))
+    cross[:, 0, 1], cross[:, 0, 2] = -axes[:, 2], axes[:, 1]
+    cross[:, 1, 0], cross[:, 1, 2] = axes[:, 2], -axes[:, 0]
+    cross[:, 2, 0], cross[:, 2, 1] = -axes[:, 1], axes[:, 0]
+    coeffs = 1.0 / np.maximum(1.0 + cos, 1e-12)
+    rotations = np.eye(3) + cross + coeffs[:, np.newaxis, np.newaxis] * (cross @ cross)
+    result = matrices.copy()
+    result[good] = rotations @ matrices[good]
+    return result
+
+def rotation_minimizing_frames(points, tangents, normal):
+    """
+    Calculate rotation minimizing frames along the curve by the "double reflection" method
+    (W. Wang, B. Juttler, D. Zheng, Y. Liu. Computation of Rotation Minimizing Frames, 2008).
+
+    All reflections are calculated at once; the normal is then propagated
+    along the curve by cumulative products of reflection matrices.
+
+    input:
+        * points: np.array of shape (n, 3) - points of the curve
+        * tangents: np.array of shape (n, 3) - unit tangent vectors at these points
+        * normal: np.array of shape (3,) - unit normal at the first point,
+          orthogonal to tangents[0]
+    output: tuple of np.arrays of shape (n, 3): normals and binormals.
+    """
+    points = np.asarray(points)
+    tangents = np.asarray(tangents)
+    normal = np.asarray(normal)
+    if len(points) > 1:
+        v1s = points[1:] - points[:-1]
+        h1s = _householder_matrices(v1s)
+        reflected_tangents = np_multiply_matrices_vectors(h1s, tangents[:-1])
+        h2s = _householder_matrices(tangents[1:] - reflected_tangents)
+        steps = _prefix_matrix_products(h2s @ h1s)
+        normals = np.concatenate((normal[np.newaxis], steps @ normal))
+    else:
+        normals = normal[np.newaxis].copy()
+
+    # Suppress accumulated numerical errors
+    normals -= np_dot(normals, tangents)[:, np.newaxis] * tangents
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    binormals = np.cross(tangents, normals)
+    return normals, binormals
+
 class SvNormalTrack(object):
+    """
+    Curve frames calculated by tracking rotation minimizing normal
+    along the curve. Frames are calculated at `resolution` points;
+    between them, they are interpolated by quaternion slerp.
+    """
     def __init__(self, curve, resolution):
         self.curve = curve
         self.resolution = resolution
         self._pre_calc()
 
     def _make_quats(self, points, tangents, normals, binormals):
-        matrices = np.dstack((normals, binormals, tangents))
-        matrices = np.transpose(matrices, axes=(0,2,1))
-        matrices = np.linalg.inv(matrices)
-        return [Matrix(m).to_quaternion() for m in matrices]
+        matrices = np.stack((normals, binormals, tangents), axis=2)
+        return np_matrices_to_quaternions(matrices)
 
     def _pre_calc(self):
         curve = self.curve
@@ -136,28 +410,12 @@ class SvNormalTrack(object):
 
         normal = normals[0]
         if np.linalg.norm(normal) > 1e-4:
-            binormal = binormals[0]
-            binormal /= np.linalg.norm(binormal)
+            normal = normal / np.linalg.norm(normal)
         else:
-            tangent = tangents[0]
-            normal = Vector(tangent).orthogonal()
-            normal = np.array(normal)
-            binormal = np.cross(tangent, normal)
-            binormal /= np.linalg.norm(binormal)
-
-        out_normals = [normal]
-        out_binormals = [binormal]
-
-        for point, tangent in zip(points[1:], tangents[1:]):
-            plane = PlaneEquation.from_normal_and_point(Vector(tangent), Vector(point))
-            normal = plane.projection_of_vector(Vector(point), Vector(point + normal))
-            normal = np.array(normal.normalized())
-            binormal = np.cross(tangent, normal)
-            binormal /= np.linalg.norm(binormal)
-            out_normals.append(normal)
-            out_binormals.append(binormal)
-
-        self.quats = self._make_quats(points, tangents, np.array(out_normals), np.array(out_binormals))
+            normal = np.array(Vector(tangents[0]).orthogonal().normalized())
+
+        out_normals, out_binormals = rotation_minimizing_frames(points, tangents, normal)
+        self.quats = self._make_quats(points, tangents, out_normals, out_binormals)
         self.tknots = ts
 
     def evaluate_array(self, ts):
@@ -165,29 +423,22 @@ class SvNormalTrack(object):
         input: ts - np.array of snape (n,) or list of floats
         output: np.array of shape (n, 3, 3)
         """
-        ts = np.array(ts)
+        ts = np.asarray(ts, dtype=np.float64)
         tknots, quats = self.tknots, self.quats
         base_indexes = tknots.searchsorted(ts, side='left')-1
+        base_indexes = np.clip(base_indexes, 0, len(tknots) - 2)
         t1s, t2s = tknots[base_indexes], tknots[base_indexes+1]
-        dts = (ts - t1s) / (t2s - t1s)
-        #dts = np.clip(dts, 0.0, 1.0) # Just in case...
-        matrix_out = []
-        # TODO: ideally this shoulld be vectorized with numpy;
-        # but that would require implementation of quaternion
-        # interpolation in numpy.
-        for dt, base_index in zip(dts, base_indexes):
-            q1, q2 = quats[base_index], quats[base_index+1]
-            # spherical linear interpolation.
-            # TODO: implement `squad`.
-            if dt < 0:
-                q = q1
-            elif dt > 1.0:
-                q = q2
-            else:
-                q = q1.slerp(q2, dt)
-            matrix = np.array(q.to_matrix())
-            matrix_out.append(matrix)
-        return np.array(matrix_out)
+        dts = np.clip((ts - t1s) / (t2s - t1s), 0.0, 1.0)
+        # spherical linear interpolation.
+        # TODO: implement `squad`.
+        qs = np_quaternions_slerp(quats[base_indexes], quats[base_indexes+1], dts)
+        matrices = np_quaternions_to_matrices(qs)
+        # Slerp between frames calculated at tknots rotates the Z axis along
+        # a great circle, which deviates from the curve tangent between tknots
+        # (by about curvature * knot step^2). Rotate each frame by the minimal
+        # rotation which takes its Z axis to the tangent.
+        tangents = self.curve.tangent_array(ts)
+        return _align_z_axes(matrices, tangents)
 
 class MathutilsRotationCalculator(object):
 
@@ -723,7 +974,7 @@ class SvLengthRebuiltCurve(SvCurve):
         else:
             self.tangent_delta = 0.001
         self.mode = mode
-        self.solver = SvCurveLengthSolver(curve)
+        self.solver = SvCurveQuadratureLengthSolver(curve)
         self.solver.prepare(self.mode, resolution, tolerance=tolerance)
         self.u_bounds = (0.0, self.solver.get_total_length())
         self.__description__ = "{} rebuilt".format(curve)
@@ -732,11 +983,11 @@ class SvLengthRebuiltCurve(SvCurve):
         return self.u_bounds
 
     def evaluate(self, t):
-        c_ts = self.solver.solve(np.array([t]))
+        c_ts = self.solver.solve(np.array([t]), mode=self.mode)
         return self.curve.evaluate(c_ts[0])
 
     def evaluate_array(self, ts):
-        c_ts = self.solver.solve(ts)
+        c_ts = self.solver.solve(ts, mode=self.mode)
         return self.curve.evaluate_array(c_ts)
 
 def curve_frame_on_surface_array(surface, uv_curve, us, w_axis=2, on_zero_curvature=SvCurve.ASIS):
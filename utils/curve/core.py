@@ -16,6 +16,7 @@ from sverchok.utils.logging import info, error
 from sverchok.utils.math import binomial, binomial_array
 from sverchok.utils.nurbs_common import SvNurbsMaths, from_homogenous
 from sverchok.utils.curve import knotvector as sv_knotvector
+from sverchok.utils.evaluation_cache import install_evaluation_cache
 
 class ZeroCurvatureException(Exception):
     def __init__(self, ts, mask=None):
@@ -37,7 +38,15 @@ class UnsupportedCurveTypeException(TypeError):
 
 DEFAULT_TANGENT_DELTA = 0.001
 
+# Methods whose results are memoized when evaluation cache is enabled
+CACHED_CURVE_METHODS = ['evaluate_array', 'tangent_array', 'second_derivative_array',
+                        'third_derivative_array', 'derivatives_array']
+
 class SvCurve(object):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        install_evaluation_cache(cls, CACHED_CURVE_METHODS)
+
     def __repr__(self):
         if hasattr(self, '__description__'):
             description = self.__description__
@@ -380,6 +389,8 @@ class SvCurve(object):
         return np.array([])
         #raise Exception("Curve of type type `{}' does not have control points".format(type(self)))
 
+install_evaluation_cache(SvCurve, CACHED_CURVE_METHODS)
+
 class SvScalarFunctionCurve(SvCurve):
     __description__ = "Function"
 
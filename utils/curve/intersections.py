@@ -0,0 +1,380 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Batched intersection of NURBS curves by Bezier clipping.
+
+All curves are decomposed into Bezier segments (homogenous control points,
+elevated to common degree). Then:
+
+* Broad phase: bounding boxes of all segments are compared at once, to find
+  candidate pairs of segments.
+* Narrow phase: for all candidate pairs at once, parameter intervals are
+  narrowed by Bezier clipping. In 3D, a "fat line" is replaced by two "fat
+  planes", i.e. two slabs containing one of segments; the other segment is
+  clipped by the convex hull of its distance function. When clipping does not
+  narrow an interval enough, the pair is subdivided.
+* Refinement: Gauss-Newton iterations for all remaining pairs at once.
+
+Each stage operates on numpy arrays holding all pairs, so the number of
+Python-level operations does not depend on the number of curves.
+"""
+
+import numpy as np
+
+from sverchok.utils.math import binomial
+from sverchok.utils.nurbs_common import refine_knotvector, elevate_bezier_degree
+from sverchok.utils.curve import knotvector as sv_knotvector
+
+def bezier_decomposition(curve):
+    """
+    Split NURBS curve into Bezier segments.
+
+    Returns:
+        tuple:
+        * homogenous control points of segments, np.array of shape (k, p+1, 4);
+        * parameter bounds of segments, np.array of shape (k, 2).
+    """
+    p = curve.get_degree()
+    kv = curve.get_knotvector()
+    if not sv_knotvector.is_clamped(kv, p):
+        segments = curve.to_bezier_segments(to_bezier_class=False)
+        points = np.array([s.get_homogenous_control_points() for s in segments])
+        bounds = np.array([s.get_u_bounds() for s in segments])
+        return points, bounds
+    pairs = sv_knotvector.to_multiplicity(kv)
+    new_knots = [u for u, count in pairs[1:-1] for i in range(p - count)]
+    kv, points = refine_knotvector(p, kv, curve.get_homogenous_control_points(), new_knots)
+    n = (len(points) - 1) // p
+    idxs = np.arange(n)[:, np.newaxis] * p + np.arange(p+1)[np.newaxis, :]
+    knots = np.array([u for u, _ in pairs])
+    return points[idxs], np.stack((knots[:-1], knots[1:]), axis=1)
+
+def _bernstein(degree, ts):
+    # Bernstein basis, np.array of shape (n, degree+1)
+    ts = ts[:, np.newaxis]
+    ks = np.arange(degree+1)
+    coeffs = np.array([binomial(degree, k) for k in ks])
+    return coeffs * ts**ks * (1.0 - ts)**(degree - ks)
+
+def _from_homogenous(points):
+    return points[..., :3] / points[..., 3:]
+
+def bezier_evaluate(points, ts):
+    """
+    Evaluate rational Bezier segments (one parameter value per segment).
+
+    Args:
+        points: homogenous control points, np.array of shape (n, p+1, 4).
+        ts: np.array of shape (n,).
+
+    Returns:
+        points and first derivatives, np.arrays of shape (n, 3).
+    """
+    p = points.shape[1] - 1
+    h = np.einsum('ni,nid->nd', _bernstein(p, ts), points)
+    dh = p * np.einsum('ni,nid->nd', _bernstein(p-1, ts), points[:, 1:] - points[:, :-1])
+    pts = h[:, :3] / h[:, 3:]
+    derivs = (dh[:, :3] - pts * dh[:, 3:]) / h[:, 3:]
+    return pts, derivs
+
+def _split(points, ts):
+    # De Casteljau subdivision of n segments at ts[i] each
+    ts = ts[:, np.newaxis, np.newaxis]
+    left = [points[:, 0]]
+    right = [points[:, -1]]
+    q = points
+    for r in range(points.shape[1] - 1):
+        q = (1.0 - ts) * q[:, :-1] + ts * q[:, 1:]
+        left.append(q[:, 0])
+        right.append(q[:, -1])
+    return np.stack(left, axis=1), np.stack(right[::-1], axis=1)
+
+def bezier_cut(points, t0, t1):
+    """
+    Control points of pieces [t0[i], t1[i]] of Bezier segments.
+    """
+    left, _ = _split(points, t1)
+    s = np.where(t1 > 0, t0 / np.where(t1 > 0, t1, 1.0), 0.0)
+    _, result = _split(left, s)
+    return result
+
+def _hull_interval(values):
+    """
+    Given coefficients of n polynomials in Bernstein form, np.array of
+    shape (n, q+1), find intervals [lo, hi] outside of which the convex hull
+    of control polygon is negative. lo > hi means that the polynomial is
+    negative on the whole [0, 1].
+    """
+    q = values.shape[1] - 1
+    ts = np.linspace(0.0, 1.0, q+1)
+    positive = values >= 0
+    lo = np.where(positive, ts, np.inf).min(axis=1)
+    hi = np.where(positive, ts, -np.inf).max(axis=1)
+    # Edges of the convex hull are among segments connecting all pairs of
+    # control points; their crossings with zero bound the hull's part above zero.
+    vi = values[:, :, np.newaxis]
+    vj = values[:, np.newaxis, :]
+    crossing = positive[:, :, np.newaxis] & ~positive[:, np.newaxis, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = ts[:, np.newaxis] + (ts[np.newaxis, :] - ts[:, np.newaxis]) * vi / (vi - vj)
+    lo = np.minimum(lo, np.where(crossing, t, np.inf).min(axis=(1, 2)))
+    hi = np.maximum(hi, np.where(crossing, t, -np.inf).max(axis=(1, 2)))
+    return lo, hi
+
+def _slab_normals(points):
+    # Two unit normals of planes containing the chord of each segment
+    chord = points[:, -1] - points[:, 0]
+    farthest = np.linalg.norm(points - points[:, :1], axis=2).argmax(axis=1)
+    fallback = points[np.arange(len(points)), farthest] - points[:, 0]
+    short = np.linalg.norm(chord, axis=1) < 1e-12
+    chord[short] = fallback[short]
+    norms = np.linalg.norm(chord, axis=1)
+    chord[norms < 1e-12] = [1.0, 0.0, 0.0]
+    chord /= np.linalg.norm(chord, axis=1)[:, np.newaxis]
+    axis = np.eye(3)[np.abs(chord).argmin(axis=1)]
+    n1 = np.cross(chord, axis)
+    n1 /= np.linalg.norm(n1, axis=1)[:, np.newaxis]
+    n2 = np.cross(chord, n1)
+    return n1, n2
+
+def bezier_clip(clipping, clipped, slack=0.0):
+    """
+    Bezier clipping step.
+
+    Args:
+        clipping: homogenous control points of segments defining fat planes,
+            np.array of shape (n, p+1, 4).
+        clipped: homogenous control points of segments to be clipped,
+            np.array of shape (n, q+1, 4).
+        slack: additional thickness of fat planes.
+
+    Returns:
+        tuple of np.arrays lo, hi of shape (n,): parts of clipped segments
+        outside of [lo, hi] can not intersect clipping segments. lo > hi
+        means there is no intersection at all.
+    """
+    cpts = _from_homogenous(clipping)
+    dpts = _from_homogenous(clipped)
+    weights = clipped[:, :, 3]
+    lo = np.zeros(len(clipping))
+    hi = np.ones(len(clipping))
+    for normal in _slab_normals(cpts):
+        dc = np.einsum('nid,nd->ni', cpts, normal)
+        dd = np.einsum('nid,nd->ni', dpts, normal)
+        d_min = dc.min(axis=1)[:, np.newaxis] - slack
+        d_max = dc.max(axis=1)[:, np.newaxis] + slack
+        # weights are positive, so the sign of rational distance function
+        # is the sign of polynomial with these coefficients
+        lo1, hi1 = _hull_interval(weights * (dd - d_min))
+        lo2, hi2 = _hull_interval(weights * (d_max - dd))
+        lo = np.maximum(lo, np.maximum(lo1, lo2))
+        hi = np.minimum(hi, np.minimum(hi1, hi2))
+    return lo, hi
+
+def _boxes(points, tolerance):
+    pts = _from_homogenous(points)
+    return pts.min(axis=1) - tolerance, pts.max(axis=1) + tolerance
+
+def _boxes_intersect(min1, max1, min2, max2):
+    return ((min1 <= max2) & (max1 >= min2)).all(axis=-1)
+
+class _SegmentSet(object):
+    def __init__(self, curves, degree):
+        points = []
+        bounds = []
+        curve_idxs = []
+        for i, curve in enumerate(curves):
+            pts, bs = bezier_decomposition(curve)
+            p = pts.shape[1] - 1
+            if p < degree:
+                pts = elevate_bezier_degree(p, pts, delta=degree - p)
+            points.append(pts)
+            bounds.append(bs)
+            curve_idxs.append(np.full(len(pts), i))
+        self.points = np.concatenate(points)
+        self.bounds = np.concatenate(bounds)
+        self.curve_idxs = np.concatenate(curve_idxs)
+        counts = np.array([len(pts) for pts in points])
+        self.starts = np.cumsum(counts) - counts
+        self.counts = counts
+
+def _broad_phase(set1, set2, pairs, self_intersect, tolerance, chunk_size=512):
+    min1, max1 = _boxes(set1.points, tolerance)
+    min2, max2 = _boxes(set2.points, tolerance)
+    if pairs is None:
+        idx1 = []
+        idx2 = []
+        for start in range(0, len(min1), chunk_size):
+            ok = _boxes_intersect(min1[start:start+chunk_size, np.newaxis], max1[start:start+chunk_size, np.newaxis],
+                        min2[np.newaxis], max2[np.newaxis])
+            i, j = np.where(ok)
+            idx1.append(i + start)
+            idx2.append(j)
+        idx1 = np.concatenate(idx1)
+        idx2 = np.concatenate(idx2)
+        if self_intersect:
+            good = set1.curve_idxs[idx1] < set2.curve_idxs[idx2]
+            idx1, idx2 = idx1[good], idx2[good]
+        return idx1, idx2
+
+    pairs = np.asarray(pairs, dtype=np.int64).reshape((-1, 2))
+    c1, c2 = pairs[:,0], pairs[:,1]
+    n1, n2 = set1.counts[c1], set2.counts[c2]
+    totals = n1 * n2
+    pair_idx = np.repeat(np.arange(len(pairs)), totals)
+    local = np.arange(totals.sum()) - np.repeat(np.cumsum(totals) - totals, totals)
+    idx1 = set1.starts[c1][pair_idx] + local // n2[pair_idx]
+    idx2 = set2.starts[c2][pair_idx] + local % n2[pair_idx]
+    good = _boxes_intersect(min1[idx1], max1[idx1], min2[idx2], max2[idx2])
+    return idx1[good], idx2[good]
+
+def _newton(points1, points2, ts1, ts2, iterations):
+    for i in range(iterations):
+        p1, d1 = bezier_evaluate(points1, ts1)
+        p2, d2 = bezier_evaluate(points2, ts2)
+        r = p1 - p2
+        a = (d1 * d1).sum(axis=1)
+        b = -(d1 * d2).sum(axis=1)
+        c = (d2 * d2).sum(axis=1)
+        g1 = (d1 * r).sum(axis=1)
+        g2 = -(d2 * r).sum(axis=1)
+        det = a * c - b * b
+        # at tangent intersections the system is degenerate; such pairs
+        # keep the values found by clipping
+        good = np.abs(det) > 1e-12 * np.maximum(a * c, 1e-300)
+        det = np.where(good, det, 1.0)
+        ts1 = np.where(good, np.clip(ts1 - (c * g1 - b * g2) / det, 0.0, 1.0), ts1)
+        ts2 = np.where(good, np.clip(ts2 - (a * g2 - b * g1) / det, 0.0, 1.0), ts2)
+    p1, _ = bezier_evaluate(points1, ts1)
+    p2, _ = bezier_evaluate(points2, ts2)
+    return ts1, ts2, p1, p2
+
+def intersect_nurbs_curves_batch(curves1, curves2=None, pairs=None, precision=0.001,
+            max_iterations=64, newton_iterations=8):
+    """
+    Find intersections of many pairs of NURBS curves at once.
+
+    Args:
+        curves1: list of SvNurbsCurve.
+        curves2: list of SvNurbsCurve. If None, curves from curves1 are
+            intersected with each other (each pair of different curves is
+            checked once; self-intersections are not searched for).
+        pairs: optional list of pairs (i, j) of indices in curves1 and
+            curves2; if not provided, all pairs are checked.
+        precision: maximum distance between curves at intersection point.
+        max_iterations: maximum number of clipping iterations.
+        newton_iterations: number of Gauss-Newton iterations used to refine
+            the found points.
+
+    Returns:
+        dictionary: (i, j) -> list of tuples (t1, t2, point), sorted by t1;
+        only pairs of curves which do intersect are listed.
+    """
+    self_intersect = curves2 is None
+    if self_intersect:
+        curves2 = curves1
+    if not curves1 or not curves2:
+        return dict()
+    degree = max(curve.get_degree() for curve in list(curves1) + list(curves2))
+    set1 = _SegmentSet(curves1, degree)
+    set2 = set1 if self_intersect else _SegmentSet(curves2, degree)
+
+    seg1, seg2 = _broad_phase(set1, set2, pairs, self_intersect, precision)
+    n = len(seg1)
+    a0, a1 = np.zeros(n), np.ones(n)
+    b0, b1 = np.zeros(n), np.ones(n)
+    done1, done2, done_a, done_b = [], [], [], []
+    slack = 0.01 * precision
+
+    for iteration in range(max_iterations):
+        if len(seg1) == 0:
+            break
+        pts1 = bezier_cut(set1.points[seg1], a0, a1)
+        pts2 = bezier_cut(set2.points[seg2], b0, b1)
+
+        min1, max1 = _boxes(pts1, 0.0)
+        min2, max2 = _boxes(pts2, 0.0)
+        good = _boxes_intersect(min1 - precision, max1, min2, max2 + precision)
+        size1 = np.linalg.norm(max1 - min1, axis=1)
+        size2 = np.linalg.norm(max2 - min2, axis=1)
+        converged = good & (size1 < precision) & (size2 < precision)
+        done1.append(seg1[converged]); done2.append(seg2[converged])
+        done_a.append(0.5 * (a0 + a1)[converged]); done_b.append(0.5 * (b0 + b1)[converged])
+        keep = good & ~converged
+        seg1, seg2, a0, a1, b0, b1 = [v[keep] for v in (seg1, seg2, a0, a1, b0, b1)]
+        pts1, pts2 = pts1[keep], pts2[keep]
+        if len(seg1) == 0:
+            break
+        old_a, old_b = a1 - a0, b1 - b0
+
+        # clip second segments by first ones, then first by second ones
+        lo, hi = bezier_clip(pts1, pts2, slack)
+        good = lo <= hi
+        lo, hi = np.clip(lo, 0.0, 1.0), np.clip(hi, 0.0, 1.0)
+        b0, b1 = b0 + old_b * lo, b0 + old_b * hi
+        pts2 = bezier_cut(pts2, lo, hi)
+        lo, hi = bezier_clip(pts2, pts1, slack)
+        good &= lo <= hi
+        lo, hi = np.clip(lo, 0.0, 1.0), np.clip(hi, 0.0, 1.0)
+        a0, a1 = a0 + old_a * lo, a0 + old_a * hi
+
+        seg1, seg2, a0, a1, b0, b1, old_a, old_b = [v[good] for v in (seg1, seg2, a0, a1, b0, b1, old_a, old_b)]
+
+        # Where clipping did not help much (several intersections, or
+        # tangency), split the segment with longer interval in two.
+        slow = ((a1 - a0) > 0.8 * old_a) & ((b1 - b0) > 0.8 * old_b)
+        split_a = slow & ((a1 - a0) >= (b1 - b0))
+        split_b = slow & ~split_a
+        mid_a = 0.5 * (a0 + a1)
+        mid_b = 0.5 * (b0 + b1)
+        seg1 = np.concatenate((seg1, seg1[slow]))
+        seg2 = np.concatenate((seg2, seg2[slow]))
+        new_a0 = np.where(split_a, mid_a, a0)[slow]
+        new_b0 = np.where(split_b, mid_b, b0)[slow]
+        new_a1, new_b1 = a1[slow], b1[slow]
+        a1 = np.where(split_a, mid_a, a1)
+        b1 = np.where(split_b, mid_b, b1)
+        a0 = np.concatenate((a0, new_a0)); a1 = np.concatenate((a1, new_a1))
+        b0 = np.concatenate((b0, new_b0)); b1 = np.concatenate((b1, new_b1))
+
+    # Pairs which did not converge in max_iterations are refined as well;
+    # Newton iterations decide if they are real intersections.
+    done1.append(seg1); done2.append(seg2)
+    done_a.append(0.5 * (a0 + a1)); done_b.append(0.5 * (b0 + b1))
+    seg1, seg2 = np.concatenate(done1).astype(np.int64), np.concatenate(done2).astype(np.int64)
+    ts1, ts2 = np.concatenate(done_a), np.concatenate(done_b)
+
+    result = dict()
+    if len(seg1) == 0:
+        return result
+
+    ts1, ts2, p1, p2 = _newton(set1.points[seg1], set2.points[seg2], ts1, ts2, newton_iterations)
+    ok = np.linalg.norm(p1 - p2, axis=1) < precision
+    seg1, seg2, ts1, ts2 = seg1[ok], seg2[ok], ts1[ok], ts2[ok]
+    points = 0.5 * (p1[ok] + p2[ok])
+    bounds1, bounds2 = set1.bounds[seg1], set2.bounds[seg2]
+    us1 = bounds1[:,0] + ts1 * (bounds1[:,1] - bounds1[:,0])
+    us2 = bounds2[:,0] + ts2 * (bounds2[:,1] - bounds2[:,0])
+    curve1, curve2 = set1.curve_idxs[seg1], set2.curve_idxs[seg2]
+
+    order = np.lexsort((us1, curve2, curve1))
+    curve1, curve2 = curve1[order], curve2[order]
+    us1, us2, points = us1[order], us2[order], points[order]
+    keys = np.stack((curve1, curve2), axis=1)
+    starts = np.where(np.concatenate(([True], (keys[1:] != keys[:-1]).any(axis=1))))[0]
+    ends = np.append(starts[1:], len(keys))
+    for start, end in zip(starts, ends):
+        # the same intersection can be found from several pairs of
+        # segments, for example at the common endpoint of two segments
+        kept = []
+        for k in range(start, end):
+            if kept and np.linalg.norm(points[kept] - points[k], axis=1).min() < precision:
+                continue
+            kept.append(k)
+        result[(int(curve1[start]), int(curve2[start]))] = [(us1[k], us2[k], points[k]) for k in kept]
+    return result
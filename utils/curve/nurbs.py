@@ -19,6 +19,7 @@ from sverchok.utils.curve.nurbs_algorithms import interpolate_nurbs_curve, unify
 from sverchok.utils.nurbs_common import (
         SvNurbsMaths,SvNurbsBasisFunctions,
         nurbs_divide, elevate_bezier_degree, from_homogenous,
+        refine_knotvector, remove_knot_once, elevate_degree,
         CantInsertKnotException, CantRemoveKnotException
     )
 from sverchok.utils.surface.nurbs import SvNativeNurbsSurface, SvGeomdlSurface
@@ -348,6 +349,12 @@ class SvNurbsCurve(SvCurve):
             knotvector = sv_knotvector.elevate_degree(knotvector, delta)
             return SvNurbsCurve.build(self.get_nurbs_implementation(),
                     degree+delta, knotvector, control_points, weights)
+        elif sv_knotvector.is_clamped(self.get_knotvector(), degree):
+            knotvector, control_points = elevate_degree(degree, self.get_knotvector(),
+                                            self.get_homogenous_control_points(), delta)
+            control_points, weights = from_homogenous(control_points)
+            return SvNurbsCurve.build(self.get_nurbs_implementation(),
+                    degree+delta, knotvector, control_points, weights)
         else:
             src_t_min, src_t_max = self.get_u_bounds()
             segments = self.to_bezier_segments(to_bezier_class=False)
@@ -1069,16 +1076,11 @@ class SvNativeNurbsCurve(SvNurbsCurve):
         return SvNurbsCurve.NATIVE
 
     def insert_knot(self, u_bar, count=1, if_possible=False):
-        # "The NURBS book", 2nd edition, p.5.2, eq. 5.11
-        N = len(self.control_points)
+        # "The NURBS book", 2nd edition, p.5.2, eq. 5.11;
+        # all insertions are done in one pass by knot refinement (p.5.3).
         u = self.get_knotvector()
         s = sv_knotvector.find_multiplicity(u, u_bar)
-        #print(f"I: kv {len(u)}{u}, u_bar {u_bar} => s {s}")
-        #k = np.searchsorted(u, u_bar, side='right')-1
-        k = sv_knotvector.find_span(u, N, u_bar)
         p = self.get_degree()
-        new_knotvector = sv_knotvector.insert(u, u_bar, count)
-        control_points = self.get_homogenous_control_points()
 
         if (u_bar == u[0] or u_bar == u[-1]):
             if s+count > p+1:
@@ -1093,28 +1095,10 @@ class SvNativeNurbsCurve(SvNurbsCurve):
                 else:
                     raise CantInsertKnotException(f"Can't insert knot t={u_bar} for {count} times")
 
-        for r in range(1, count+1):
-            prev_control_points = control_points
-            control_points = []
-            for i in range(N+1):
-                #print(f"I: i {i}, k {k}, p {p}, r {r}, s {s}, k-p+r-1 {k-p+r-1}, k-s {k-s}")
-                if i <= k-p+r-1:
-                    point = prev_control_points[i]
-                    #print(f"P[{r},{i}] := {i}{prev_control_points[i]}")
-                elif k - p + r <= i <= k - s:
-                    denominator = u[i+p-r+1] - u[i]
-                    if abs(denominator) < 1e-6:
-                        raise Exception(f"Can't insert the knot t={u_bar} for {i}th time: u[i+p-r+1]={u[i+p-r+1]}, u[i]={u[i]}, denom={denominator}")
-                    alpha = (u_bar - u[i]) / denominator
-                    point = alpha * prev_control_points[i] + (1.0 - alpha) * prev_control_points[i-1]
-                    #print(f"P[{r},{i}]: alpha {alpha}, pts {i}{prev_control_points[i]}, {i-1}{prev_control_points[i-1]} => {point}")
-                else:
-                    point = prev_control_points[i-1]
-                    #print(f"P[{r},{i}] := {i-1}{prev_control_points[i-1]}")
-                control_points.append(point)
-            N += 1
-
-        control_points, weights = from_homogenous(np.array(control_points))
+        new_knotvector, control_points = refine_knotvector(p, u,
+                                            self.get_homogenous_control_points(),
+                                            [u_bar] * max(count, 0))
+        control_points, weights = from_homogenous(control_points)
         curve = SvNativeNurbsCurve(self.degree, new_knotvector,
                     control_points, weights)
         return curve
@@ -1135,7 +1119,6 @@ class SvNativeNurbsCurve(SvNurbsCurve):
             count = orig_multiplicity - target
 
         degree = self.get_degree()
-        order = degree+1
 
         if not if_possible and (count > orig_multiplicity):
             raise CantRemoveKnotException(f"Asked to remove knot t={u} for {count} times, but it's multiplicity is only {orig_multiplicity}")
@@ -1144,121 +1127,15 @@ class SvNativeNurbsCurve(SvNurbsCurve):
         if count < 1:
             return self
 
-        def knot_removal_alpha_i(u, knotvector, idx):
-            return (u - knotvector[idx]) / (knotvector[idx + order] - knotvector[idx])
-
-        def knot_removal_alpha_j(u, knotvector, idx):
-            return (u - knotvector[idx]) / (knotvector[idx + order] - knotvector[idx])
-
-        def point_distance(p1, p2):
-            return np.linalg.norm(p1 - p2)
-            #return np.linalg.norm(np.array(p1) - np.array(p2))
-
         def remove_one_knot(curve):
-            ctrlpts = curve.get_homogenous_control_points()
-            N = len(ctrlpts)
-            knotvector = curve.get_knotvector()
-            orig_multiplicity = sv_knotvector.find_multiplicity(knotvector, u)
-            knot_span = sv_knotvector.find_span(knotvector, N, u)
-
-            # Initialize variables
-            first = knot_span - degree
-            last = knot_span - orig_multiplicity
-
-            # Don't change input variables, prepare new ones for updating
-            ctrlpts_new = deepcopy(ctrlpts)
-
-            # Initialize temp array for storing new control points
-            temp_i = np.zeros((2*degree+1, 4))
-            temp_j = np.zeros((2*degree+1, 4))
-
-            removed_count = 0
-            # Loop for Eqs 5.28 & 5.29
-            t = 0
-            offset = first - 1 # difference in index between `temp` and ctrlpts
-            temp_i[0] = ctrlpts[offset]
-            temp_j[last + 1 - offset] = ctrlpts[last + 1]
-            i = first
-            j = last
-            ii = 1
-            jj = last - offset
-            can_remove = False
-
-            # Compute control points for one removal step
-            while j - i > t:
-                alpha_i = knot_removal_alpha_i(u, knotvector, i)
-                alpha_j = knot_removal_alpha_j(u, knotvector, j)
-                
-                temp_i[ii] = (ctrlpts[i] - (1.0 - alpha_i)*temp_i[ii - 1]) / alpha_i
-                temp_j[jj] = (ctrlpts[j] - alpha_j*temp_j[jj + 1]) / (1.0 - alpha_j)
-                
-                i += 1
-                j -= 1
-                ii += 1
-                jj -= 1
-
-            # Check if the knot is removable
-            if j - i < t:
-                dist = point_distance(temp_i[ii - 1], temp_j[jj + 1]) 
-                if dist <= tolerance:
-                    can_remove = True
-                else:
-                    if logger is not None:
-                        logger.debug(f"remove_knot: stop, distance={dist}")
-            else:
-                alpha_i = knot_removal_alpha_i(u, knotvector, i)
-                ptn = alpha_i * temp_j[ii + t + 1] + (1.0 - alpha_i)*temp_i[ii - 1]
-                dist = point_distance(ctrlpts[i], ptn) 
-                if dist <= tolerance:
-                    can_remove = True
-                else:
-                    if logger is not None:
-                        logger.debug(f"remove_knot: stop, distance={dist}")
-
-            # Check if we can remove the knot and update new control points array
-            if can_remove:
-                i = first
-                j = last
-                while j - i > t:
-                    ctrlpts_new[i] = temp_i[i - offset]
-                    ctrlpts_new[j] = temp_j[j - offset]
-                    i += 1
-                    j -= 1
-                # Update indices
-                first -= 1
-                last += 1
-                removed_count += 1
-
-            else:
-                raise CantRemoveKnotException()
-
-            new_kv = np.copy(curve.get_knotvector())
-
-            if removed_count > 0:
-                m = N + degree + 1
-                for k in range(knot_span+1, m):
-                    new_kv[k-removed_count] = new_kv[k]
-                new_kv = new_kv[:m-removed_count]
-                #new_kv = np.delete(curve.get_knotvector(), np.s_[(r-t+1):(r+1)])
-
-                # Shift control points (refer to p.183 of The NURBS Book, 2nd Edition)
-                j = int((2*knot_span - orig_multiplicity - degree) / 2)  # first control point out
-                i = j
-                for k in range(1, removed_count):
-                    if k % 2 == 1:
-                        i += 1
-                    else:
-                        j -= 1
-                for k in range(i+1, N):
-                    ctrlpts_new[j] = ctrlpts_new[k]
-                    j += 1
-
-                # Slice to get the new control points
-                ctrlpts_new = ctrlpts_new[0:-removed_count]
-            
-            ctrlpts_new = np.array(ctrlpts_new)
+            try:
+                new_kv, ctrlpts_new = remove_knot_once(degree, curve.get_knotvector(),
+                                        curve.get_homogenous_control_points(), u, tolerance)
+            except CantRemoveKnotException as e:
+                if logger is not None:
+                    logger.debug(f"remove_knot: stop, {e}")
+                raise
             control_points, weights = from_homogenous(ctrlpts_new)
-
             return curve.copy(knotvector = new_kv, control_points = control_points, weights = weights)
 
         curve = self
@@ -14,7 +14,10 @@ import mathutils.geometry
 
 from sverchok.utils.math import distribute_int
 from sverchok.utils.geom import Spline, linear_approximation, intersect_segment_segment
-from sverchok.utils.nurbs_common import SvNurbsBasisFunctions, SvNurbsMaths, from_homogenous, CantInsertKnotException
+from sverchok.utils.nurbs_common import (
+        SvNurbsBasisFunctions, SvNurbsMaths, from_homogenous,
+        refine_knotvector, CantInsertKnotException
+    )
 from sverchok.utils.curve import knotvector as sv_knotvector
 from sverchok.utils.curve.algorithms import unify_curves_degree, SvCurveLengthSolver
 from sverchok.utils.decorators import deprecated
@@ -96,37 +99,42 @@ def unify_curves(curves, method='UNIFY', accuracy=6):
             for u, count in m:
                 dst_knots.update(i, u, count)
 
-        result = []
-#     for i, curve1 in enumerate(curves):
-#         for j, curve2 in enumerate(curves):
-#             if i != j:
-#                 curve1 = curve1.to_knotvector(curve2)
-#         result.append(curve1)
-
+        # Curves having the same degree and knotvector (for example, loft
+        # sections) need the same knots to be inserted, so they are
+        # refined at once.
+        groups = defaultdict(list)
         for idx, curve in enumerate(curves):
-            diffs = []
-            #kv = np.round(curve.get_knotvector(), accuracy)
-            #curve = curve.copy(knotvector = kv)
-            #print('next curve', curve.get_knotvector())
-            ms = dict(sv_knotvector.to_multiplicity(curve.get_knotvector(), tolerance**2))
+            key = (curve.get_nurbs_implementation(), curve.get_degree(),
+                    np.asarray(curve.get_knotvector()).tobytes())
+            groups[key].append(idx)
+
+        result = [None] * len(curves)
+        for idxs in groups.values():
+            curve = curves[idxs[0]]
+            degree = curve.get_degree()
+            knotvector = curve.get_knotvector()
+            ms = dict(sv_knotvector.to_multiplicity(knotvector, tolerance**2))
+            new_knots = []
             for dst_u, dst_multiplicity in dst_knots.items():
                 src_multiplicity = ms.get(dst_u, 0)
                 diff = dst_multiplicity - src_multiplicity
                 #print(f"C#{idx}: U = {dst_u}, was = {src_multiplicity}, need = {dst_multiplicity}, diff = {diff}")
-                diffs.append((dst_u, diff))
-            #print(f"Src {ms}, dst {dst_knots} => diff {diffs}")
-
-            for u, diff in diffs:
                 if diff > 0:
-                    curve = curve.insert_knot(u, diff)
-#                     if u in dst_knots.skip_insertions[idx]:
-#                         pass
-#                         print(f"C: skip insertion T = {u}")
-#                     else:
-#                         #kv = curve.get_knotvector()
-#                         print(f"C: Insert T = {u} x {diff}")
-#                         curve = curve.insert_knot(u, diff)
-            result.append(curve)
+                    if dst_multiplicity > degree and knotvector[0] < dst_u < knotvector[-1]:
+                        raise CantInsertKnotException(f"Can't insert knot t={dst_u} for {diff} times")
+                    new_knots.extend([dst_u] * diff)
+
+            if not new_knots:
+                for idx in idxs:
+                    result[idx] = curves[idx]
+                continue
+
+            control_points = np.array([curves[idx].get_homogenous_control_points() for idx in idxs])
+            new_knotvector, control_points = refine_knotvector(degree, knotvector, control_points, new_knots)
+            for idx, curve_points in zip(idxs, control_points):
+                curve_points, weights = from_homogenous(curve_points)
+                result[idx] = curves[idx].copy(knotvector = new_knotvector,
+                                    control_points = curve_points, weights = weights)
             
         return result
 
@@ -0,0 +1,185 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Centroidal Voronoi tessellation (Lloyd's relaxation) by sampling.
+
+Instead of building Voronoi diagram on each iteration and calculating
+centroids of its regions geometrically, the domain is represented by a
+dense set of sample points (optionally with density weights). On each
+iteration, every sample is assigned to the nearest site by a KD-tree query,
+and the new position of a site is the weighted mean of its samples,
+calculated with np.bincount. This is an approximation, which becomes more
+precise with more samples, but it works the same for any domain which can
+be sampled: a box, a ball, the volume or the surface of a mesh.
+"""
+
+import numpy as np
+
+from sverchok.dependencies import scipy
+from sverchok.utils.raycast import triangulate_polygons, _cross
+from sverchok.utils.winding_number import SvWindingNumber
+
+if scipy is not None:
+    from scipy.spatial import cKDTree
+
+DEFAULT_SAMPLES_PER_SITE = 50
+
+def field_density(field, samples):
+    """
+    Values of scalar field at samples, to be used as density weights.
+    Negative values are replaced with zeros.
+    """
+    weights = field.evaluate_grid(samples[:,0], samples[:,1], samples[:,2])
+    return np.maximum(np.asarray(weights, dtype=np.float64), 0.0)
+
+def box_samples(min_point, max_point, count, seed=0):
+    """
+    Uniformly distributed random points in a box, np.array of shape (count, 3).
+    """
+    rng = np.random.default_rng(seed)
+    min_point = np.asarray(min_point, dtype=np.float64)
+    max_point = np.asarray(max_point, dtype=np.float64)
+    return min_point + rng.random((count, len(min_point))) * (max_point - min_point)
+
+def ball_samples(center, radius, count, seed=0):
+    """
+    Uniformly distributed random points in a ball, np.array of shape (count, 3).
+    """
+    rng = np.random.default_rng(seed)
+    directions = rng.normal(size=(count, 3))
+    directions /= np.linalg.norm(directions, axis=1)[:, np.newaxis]
+    radiuses = radius * np.cbrt(rng.random(count))
+    return np.asarray(center, dtype=np.float64) + radiuses[:, np.newaxis] * directions
+
+def mesh_surface_samples(verts, faces, count, seed=0):
+    """
+    Uniformly distributed random points on the surface of a mesh,
+    np.array of shape (count, 3).
+    """
+    rng = np.random.default_rng(seed)
+    verts = np.asarray(verts, dtype=np.float64)
+    triangles, _ = triangulate_polygons(faces)
+    v0, v1, v2 = verts[triangles[:,0]], verts[triangles[:,1]], verts[triangles[:,2]]
+    areas = np.linalg.norm(_cross(v1 - v0, v2 - v0), axis=1)
+    if areas.sum() == 0:
+        raise Exception("Mesh has zero area")
+    idxs = rng.choice(len(triangles), size=count, p=areas / areas.sum())
+    u, v = rng.random(count), rng.random(count)
+    flip = u + v > 1
+    u[flip], v[flip] = 1 - u[flip], 1 - v[flip]
+    v0 = v0[idxs]
+    return v0 + u[:, np.newaxis] * (v1[idxs] - v0) + v[:, np.newaxis] * (v2[idxs] - v0)
+
+def mesh_volume_samples(verts, faces, count, seed=0, max_rounds=20, winding=None):
+    """
+    Uniformly distributed random points inside a closed mesh, np.array of
+    shape (count, 3). Points are generated within the bounding box and
+    filtered by winding number of the mesh; an existing SvWindingNumber
+    instance for the mesh can be passed.
+    """
+    rng = np.random.default_rng(seed)
+    verts = np.asarray(verts, dtype=np.float64)
+    min_point, max_point = verts.min(axis=0), verts.max(axis=0)
+    if winding is None:
+        winding = SvWindingNumber(verts, faces)
+    result = []
+    found = 0
+    batch = count
+    for i in range(max_rounds):
+        points = min_point + rng.random((batch, 3)) * (max_point - min_point)
+        inside = points[winding.are_inside(points)]
+        result.append(inside)
+        found += len(inside)
+        if found >= count:
+            break
+        # estimate the share of the bounding box occupied by the mesh
+        ratio = max(found / ((i + 1) * batch), 0.01)
+        batch = int(1.2 * (count - found) / ratio) + 16
+    if found == 0:
+        raise Exception("Can not generate points inside the mesh; is it closed?")
+    return np.concatenate(result)[:count]
+
+class SvSampledCVT(object):
+    """
+    Lloyd's relaxation of sites over a domain represented by samples.
+
+    Args:
+        samples: np.array of shape (n, dim).
+        weights: optional density values at samples, np.array of shape (n,).
+    """
+    def __init__(self, samples, weights=None):
+        if scipy is None:
+            raise Exception("SvSampledCVT requires scipy")
+        self.samples = np.asarray(samples, dtype=np.float64)
+        if weights is None:
+            self.weights = None
+        else:
+            self.weights = np.asarray(weights, dtype=np.float64)
+        self.iterations = 0
+
+    def centroids(self, sites):
+        """
+        Weighted centroids of Voronoi regions of sites, estimated by samples.
+        Sites whose regions do not contain any samples (or have zero total
+        weight) are returned unchanged.
+
+        Returns:
+            tuple: np.array of the same shape as sites, and np.array with
+            total weight (mass) of each region.
+        """
+        sites = np.asarray(sites, dtype=np.float64)
+        n, dim = sites.shape
+        _, idxs = cKDTree(sites).query(self.samples)
+        masses = np.bincount(idxs, weights=self.weights, minlength=n)
+        if self.weights is None:
+            weighted = self.samples
+        else:
+            weighted = self.samples * self.weights[:, np.newaxis]
+        sums = np.stack([np.bincount(idxs, weights=weighted[:,k], minlength=n) for k in range(dim)], axis=1)
+        result = sites.copy()
+        good = masses > 0
+        result[good] = sums[good] / masses[good][:, np.newaxis]
+        return result, masses
+
+    def relax(self, sites, n_iterations, tolerance=0.0, restrict=None):
+        """
+        Perform up to n_iterations of Lloyd's algorithm.
+
+        Args:
+            sites: initial positions, np.array of shape (m, dim).
+            n_iterations: maximum number of iterations.
+            tolerance: stop when no site moves more than this distance
+                in one iteration.
+            restrict: optional function, which is applied to new positions
+                of sites after each iteration (for example, to project them
+                back onto a surface).
+
+        Returns:
+            np.array of shape (m, dim). Number of iterations actually done
+            is stored in self.iterations.
+        """
+        sites = np.asarray(sites, dtype=np.float64)
+        self.iterations = 0
+        if len(sites) == 0:
+            return sites
+        for i in range(n_iterations):
+            new_sites, _ = self.centroids(sites)
+            if restrict is not None:
+                new_sites = np.asarray(restrict(new_sites), dtype=np.float64)
+            movement = np.linalg.norm(new_sites - sites, axis=1).max()
+            sites = new_sites
+            self.iterations += 1
+            if movement < tolerance:
+                break
+        return sites
+
+def lloyd_by_samples(samples, sites, n_iterations, weights=None, tolerance=0.0, restrict=None):
+    """
+    Shortcut for SvSampledCVT(samples, weights).relax(...).
+    """
+    return SvSampledCVT(samples, weights).relax(sites, n_iterations, tolerance=tolerance, restrict=restrict)
@@ -0,0 +1,592 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Backends for 2D Delaunay triangulation and Voronoi diagram.
+
+Three implementations are available:
+
+* SCIPY - Qhull, via scipy.spatial.Delaunay / scipy.spatial.Voronoi.
+  Used by default when SciPy is installed.
+* NUMPY - incremental Bowyer-Watson triangulation over plain numpy arrays,
+  with spatially sorted insertion order and walking point location.
+  The kernel is a per-point loop, which is meant to be compiled with Numba
+  (see utils/decorators_compilation.py). Without Numba it still works, but
+  as plain Python it is too slow for large point sets, so AUTO uses this
+  backend only when Numba is available.
+* FORTUNE - pure-python Fortune's sweep from utils/voronoi.py. Used by AUTO
+  when neither SciPy nor Numba is installed.
+
+The API is batched: delaunay_2d_multi() takes a list of point sets and
+triangulates all of them in one call. Voronoi diagrams are returned in the
+same format as utils.voronoi.Context, so that code written for the old
+pure-python Fortune implementation can use them directly.
+"""
+
+import numpy as np
+
+from sverchok.utils.decorators_compilation import njit
+from sverchok.dependencies import scipy, numba
+
+if scipy is not None:
+    from scipy.spatial import Delaunay, Voronoi
+    from scipy.spatial import QhullError
+
+AUTO = 'AUTO'
+SCIPY = 'SCIPY'
+NUMPY = 'NUMPY'
+FORTUNE = 'FORTUNE'
+
+def get_delaunay_backends():
+    """
+    Return list of names of backends that are available in current environment.
+    """
+    backends = []
+    if scipy is not None:
+        backends.append(SCIPY)
+    backends.append(NUMPY)
+    backends.append(FORTUNE)
+    return backends
+
+def _resolve_backend(backend):
+    if backend == AUTO:
+        if scipy is not None:
+            return SCIPY
+        if numba is not None:
+            return NUMPY
+        return FORTUNE
+    if backend == SCIPY and scipy is None:
+        raise Exception("SciPy backend was requested for Delaunay triangulation, but SciPy is not available")
+    if backend not in (SCIPY, NUMPY, FORTUNE):
+        raise Exception(f"Unsupported Delaunay triangulation backend: {backend}")
+    return backend
+
+def _as_points_2d(points):
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or len(points) == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.ascontiguousarray(points[:, :2])
+
+def _make_ccw(points, tris):
+    """
+    Flip clockwise triangles, so that all of them have upward normals.
+    """
+    if len(tris) == 0:
+        return tris
+    a = points[tris[:,0]]
+    b = points[tris[:,1]]
+    c = points[tris[:,2]]
+    orient = (b[:,0] - a[:,0]) * (c[:,1] - a[:,1]) - (b[:,1] - a[:,1]) * (c[:,0] - a[:,0])
+    cw = orient < 0
+    tris = tris.copy()
+    tris[cw, 1], tris[cw, 2] = tris[cw, 2], tris[cw, 1].copy()
+    return tris
+
+###################
+# NumPy / Numba kernel
+###################
+
+def _insertion_order(points):
+    """
+    Sort points into snake order over a sqrt(N) x sqrt(N) grid of buckets.
+    Consequent points are close to each other, so the point location walk
+    starting from the last created triangle has only a few steps to do.
+    """
+    n = len(points)
+    if n == 0:
+        return np.empty((0,), dtype=np.int64)
+    n_cells = max(1, int(np.sqrt(n / 2.0)))
+    p_min = points.min(axis=0)
+    size = points.max(axis=0) - p_min
+    size[size == 0] = 1.0
+    cells = ((points - p_min) / size * (n_cells - 1e-9)).astype(np.int64)
+    rows = cells[:,1]
+    cols = np.where(rows % 2 == 0, cells[:,0], n_cells - 1 - cells[:,0])
+    return np.lexsort((cols, rows)).astype(np.int64)
+
+@njit(cache=True)
+def _orient(ax, ay, bx, by, cx, cy):
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+@njit(cache=True)
+def _in_circle(ax, ay, bx, by, cx, cy, px, py):
+    # > 0 when P is strictly inside of circumcircle of counterclockwise ABC
+    adx = ax - px
+    ady = ay - py
+    bdx = bx - px
+    bdy = by - py
+    cdx = cx - px
+    cdy = cy - py
+    alift = adx*adx + ady*ady
+    blift = bdx*bdx + bdy*bdy
+    clift = cdx*cdx + cdy*cdy
+    return adx * (bdy*clift - cdy*blift) - ady * (bdx*clift - cdx*blift) + alift * (bdx*cdy - bdy*cdx)
+
+@njit(cache=True)
+def _ghost_index(tri, t, g):
+    # Position of the ghost vertex in triangle T, or -1 for real triangles.
+    for i in range(3):
+        if tri[t, i] == g:
+            return i
+    return -1
+
+@njit(cache=True)
+def _in_conflict(px, py, tri, t, g, x, y):
+    """
+    Whether P is strictly inside of circumcircle of triangle T.
+    For a ghost triangle (U, V, ghost) the "circumcircle" is the open
+    half-plane beyond hull edge UV, plus the open segment UV itself.
+    """
+    j = _ghost_index(tri, t, g)
+    if j < 0:
+        a, b, c = tri[t, 0], tri[t, 1], tri[t, 2]
+        return _in_circle(px[a], py[a], px[b], py[b], px[c], py[c], x, y) > 0
+    u = tri[t, (j+1) % 3]
+    v = tri[t, (j+2) % 3]
+    o = _orient(px[v], py[v], px[u], py[u], x, y)
+    if o < 0:
+        return True
+    if o > 0:
+        return False
+    return ((x - px[u]) * (px[v] - px[u]) + (y - py[u]) * (py[v] - py[u]) > 0 and
+            (x - px[v]) * (px[u] - px[v]) + (y - py[v]) * (py[u] - py[v]) > 0)
+
+@njit(cache=True)
+def _bowyer_watson(xs, ys, order, out):
+    """
+    Triangulate one set of points, which are expected to be normalized
+    into [-0.5; 0.5] square. Triangles are written into `out`;
+    number of triangles is returned.
+
+    Instead of a finite super triangle, a single "ghost" vertex at infinity
+    is used: each convex hull edge UV has a ghost triangle (U, V, ghost)
+    attached, so triangles near the hull are never lost because the
+    super triangle was too small.
+    """
+    n = len(xs)
+    g = n
+    px = np.zeros(n + 1)
+    py = np.zeros(n + 1)
+    px[:n] = xs
+    py[:n] = ys
+
+    # Initial triangle: the first three non-collinear points in insertion order.
+    i_a = order[0] if n > 0 else -1
+    i_b = -1
+    i_c = -1
+    for k in range(1, n):
+        p = order[k]
+        if i_b < 0:
+            dx = px[p] - px[i_a]
+            dy = py[p] - py[i_a]
+            if dx*dx + dy*dy >= 1e-24:
+                i_b = p
+        elif _orient(px[i_a], py[i_a], px[i_b], py[i_b], px[p], py[p]) != 0:
+            i_c = p
+            break
+    if i_c < 0:
+        # Less than three points, or all of them are collinear.
+        return 0
+    if _orient(px[i_a], py[i_a], px[i_b], py[i_b], px[i_c], py[i_c]) < 0:
+        i_b, i_c = i_c, i_b
+
+    max_tris = 2 * (n + 3) + 8
+    tri = np.full((max_tris, 3), -1, dtype=np.int64)
+    nbr = np.full((max_tris, 3), -1, dtype=np.int64)
+    alive = np.zeros(max_tris, dtype=np.bool_)
+    mark = np.full(max_tris, -1, dtype=np.int64)
+    free = np.empty(max_tris, dtype=np.int64)
+    n_free = 0
+    n_used = 4
+
+    tri[0, 0], tri[0, 1], tri[0, 2] = i_a, i_b, i_c
+    tri[1, 0], tri[1, 1], tri[1, 2] = i_b, i_a, g
+    tri[2, 0], tri[2, 1], tri[2, 2] = i_c, i_b, g
+    tri[3, 0], tri[3, 1], tri[3, 2] = i_a, i_c, g
+    for t1 in range(4):
+        alive[t1] = True
+        for i in range(3):
+            u = tri[t1, (i+1) % 3]
+            v = tri[t1, (i+2) % 3]
+            for t2 in range(4):
+                for j in range(3):
+                    if tri[t2, (j+1) % 3] == v and tri[t2, (j+2) % 3] == u:
+                        nbr[t1, i] = t2
+
+    stack = np.empty(max_tris, dtype=np.int64)
+    bad = np.empty(max_tris, dtype=np.int64)
+    bnd_u = np.empty(max_tris, dtype=np.int64)
+    bnd_v = np.empty(max_tris, dtype=np.int64)
+    bnd_nb = np.empty(max_tris, dtype=np.int64)
+    new_tris = np.empty(max_tris, dtype=np.int64)
+    start_tri = np.full(n + 1, -1, dtype=np.int64)
+    end_tri = np.full(n + 1, -1, dtype=np.int64)
+
+    last = 0
+    for k in range(n):
+        p = order[k]
+        if p == i_a or p == i_b or p == i_c:
+            continue
+        x = px[p]
+        y = py[p]
+
+        # Locate a triangle in conflict with P by walking from the last one:
+        # either the real triangle containing P, or a ghost triangle of a
+        # hull edge which P lies beyond.
+        t = last
+        steps = 0
+        while True:
+            moved = False
+            j = _ghost_index(tri, t, g)
+            if j >= 0:
+                if _in_conflict(px, py, tri, t, g, x, y):
+                    break
+                t = nbr[t, j]
+                moved = True
+            else:
+                for i in range(3):
+                    u = tri[t, (i+1) % 3]
+                    v = tri[t, (i+2) % 3]
+                    if _orient(px[u], py[u], px[v], py[v], x, y) < 0:
+                        t = nbr[t, i]
+                        moved = True
+                        break
+            if not moved:
+                break
+            steps += 1
+            if steps > n_used + 3:
+                # Walk is cycling because of round-off; do a brute-force search.
+                for t2 in range(n_used):
+                    if not alive[t2]:
+                        continue
+                    if _ghost_index(tri, t2, g) >= 0:
+                        if _in_conflict(px, py, tri, t2, g, x, y):
+                            t = t2
+                            break
+                        continue
+                    a, b, c = tri[t2, 0], tri[t2, 1], tri[t2, 2]
+                    if (_orient(px[a], py[a], px[b], py[b], x, y) >= 0 and
+                            _orient(px[b], py[b], px[c], py[c], x, y) >= 0 and
+                            _orient(px[c], py[c], px[a], py[a], x, y) >= 0):
+                        t = t2
+                        break
+                break
+
+        # Skip duplicate points.
+        duplicate = False
+        for i in range(3):
+            w = tri[t, i]
+            if w == g:
+                continue
+            dx = px[w] - x
+            dy = py[w] - y
+            if dx*dx + dy*dy < 1e-24:
+                duplicate = True
+        if duplicate:
+            continue
+
+        # Collect the cavity: all triangles whose circumcircle contains P.
+        n_bad = 0
+        n_stack = 1
+        stack[0] = t
+        mark[t] = k
+        while n_stack > 0:
+            n_stack -= 1
+            s = stack[n_stack]
+            bad[n_bad] = s
+            n_bad += 1
+            for i in range(3):
+                nb = nbr[s, i]
+                if nb < 0 or mark[nb] == k:
+                    continue
+                if _in_conflict(px, py, tri, nb, g, x, y):
+                    mark[nb] = k
+                    stack[n_stack] = nb
+                    n_stack += 1
+
+        # Cavity boundary edges, oriented counterclockwise around P.
+        n_bnd = 0
+        for j in range(n_bad):
+            s = bad[j]
+            for i in range(3):
+                nb = nbr[s, i]
+                if nb >= 0 and mark[nb] == k:
+                    continue
+                bnd_u[n_bnd] = tri[s, (i+1) % 3]
+                bnd_v[n_bnd] = tri[s, (i+2) % 3]
+                bnd_nb[n_bnd] = nb
+                n_bnd += 1
+
+        for j in range(n_bad):
+            s = bad[j]
+            alive[s] = False
+            mark[s] = -1
+            free[n_free] = s
+            n_free += 1
+
+        # Fan of new triangles (U, V, P); those with the ghost vertex
+        # are attached to new hull edges.
+        for j in range(n_bnd):
+            if n_free > 0:
+                n_free -= 1
+                t_new = free[n_free]
+            else:
+                t_new = n_used
+                n_used += 1
+            u = bnd_u[j]
+            v = bnd_v[j]
+            nb = bnd_nb[j]
+            tri[t_new, 0], tri[t_new, 1], tri[t_new, 2] = u, v, p
+            nbr[t_new, 2] = nb
+            alive[t_new] = True
+            if nb >= 0:
+                for i in range(3):
+                    w = tri[nb, i]
+                    if w != u and w != v:
+                        nbr[nb, i] = t_new
+                        break
+            start_tri[u] = t_new
+            end_tri[v] = t_new
+            new_tris[j] = t_new
+
+        for j in range(n_bnd):
+            t_new = new_tris[j]
+            u = tri[t_new, 0]
+            v = tri[t_new, 1]
+            nbr[t_new, 0] = start_tri[v]
+            nbr[t_new, 1] = end_tri[u]
+        last = new_tris[0]
+
+    count = 0
+    for t in range(n_used):
+        if not alive[t]:
+            continue
+        if tri[t, 0] == g or tri[t, 1] == g or tri[t, 2] == g:
+            continue
+        out[count, 0] = tri[t, 0]
+        out[count, 1] = tri[t, 1]
+        out[count, 2] = tri[t, 2]
+        count += 1
+    return count
+
+@njit(cache=True)
+def _bowyer_watson_batch(xs, ys, orders, offsets):
+    n_sets = len(offsets) - 1
+    total = 0
+    for i in range(n_sets):
+        total += 2 * (offsets[i+1] - offsets[i]) + 1
+    tris = np.empty((total, 3), dtype=np.int64)
+    tri_offsets = np.zeros(n_sets + 1, dtype=np.int64)
+    for i in range(n_sets):
+        start, end = offsets[i], offsets[i+1]
+        out = tris[tri_offsets[i]:]
+        count = _bowyer_watson(xs[start:end], ys[start:end], orders[start:end], out)
+        tri_offsets[i+1] = tri_offsets[i] + count
+    return tris, tri_offsets
+
+def _delaunay_numpy_multi(point_sets):
+    point_sets = [_as_points_2d(points) for points in point_sets]
+    counts = np.array([len(points) for points in point_sets], dtype=np.int64)
+    offsets = np.zeros(len(point_sets) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    normalized = []
+    orders = []
+    for points in point_sets:
+        if len(points) == 0:
+            normalized.append(points)
+            orders.append(np.empty((0,), dtype=np.int64))
+            continue
+        p_min = points.min(axis=0)
+        p_max = points.max(axis=0)
+        scale = (p_max - p_min).max()
+        if scale == 0:
+            scale = 1.0
+        normalized.append((points - (p_min + p_max) / 2.0) / scale)
+        orders.append(_insertion_order(points))
+
+    all_points = np.concatenate(normalized) if normalized else np.empty((0, 2))
+    all_orders = np.concatenate(orders) if orders else np.empty((0,), dtype=np.int64)
+    xs = np.ascontiguousarray(all_points[:,0])
+    ys = np.ascontiguousarray(all_points[:,1])
+    tris, tri_offsets = _bowyer_watson_batch(xs, ys, all_orders, offsets)
+    return [tris[tri_offsets[i] : tri_offsets[i+1]].copy() for i in range(len(point_sets))]
+
+def _delaunay_scipy(points):
+    points = _as_points_2d(points)
+    if len(points) < 3:
+        return np.empty((0, 3), dtype=np.int64)
+    try:
+        tris = Delaunay(points).simplices.astype(np.int64)
+    except QhullError:
+        # All points are collinear, for example.
+        return np.empty((0, 3), dtype=np.int64)
+    return _make_ccw(points, tris)
+
+def _fortune_sites(points):
+    # utils.voronoi imports this module
+    from sverchok.utils.voronoi import Site
+    return [Site(x, y) for x, y in points.tolist()]
+
+def _delaunay_fortune(points):
+    from sverchok.utils.voronoi import computeDelaunayTriangulation
+    points = _as_points_2d(points)
+    if len(points) < 3:
+        return np.empty((0, 3), dtype=np.int64)
+    tris = [tri for tri in computeDelaunayTriangulation(_fortune_sites(points)) if -1 not in tri]
+    if not tris:
+        return np.empty((0, 3), dtype=np.int64)
+    return _make_ccw(points, np.array(tris, dtype=np.int64))
+
+###################
+# Public API
+###################
+
+def delaunay_2d_multi(point_sets, backend=AUTO):
+    """
+    Triangulate several sets of points at once.
+
+    Args:
+        point_sets: list of arrays of shape (n_i, 2) or (n_i, 3); only X and Y
+            coordinates are used.
+        backend: AUTO, SCIPY, NUMPY or FORTUNE.
+
+    Returns:
+        list of np.array of shape (k_i, 3): indices of counterclockwise triangles.
+    """
+    backend = _resolve_backend(backend)
+    if backend == SCIPY:
+        return [_delaunay_scipy(points) for points in point_sets]
+    elif backend == FORTUNE:
+        return [_delaunay_fortune(points) for points in point_sets]
+    else:
+        return _delaunay_numpy_multi(point_sets)
+
+def delaunay_2d(points, backend=AUTO):
+    """
+    Triangulate one set of points; see delaunay_2d_multi().
+    """
+    return delaunay_2d_multi([points], backend=backend)[0]
+
+class SvVoronoi2DData(object):
+    """
+    Voronoi diagram data in the format of utils.voronoi.Context:
+
+    * vertices: list of (x, y) tuples - diagram vertices;
+    * lines: list of (a, b, c) tuples - equations a*x + b*y = c of diagram lines;
+    * edges: list of (line index, vertex 1 index, vertex 2 index) tuples;
+      vertex index of -1 means that the edge extends to infinity;
+    * polygons: dict {site index: list of edges}.
+    """
+    def __init__(self, vertices, lines, edges, polygons):
+        self.vertices = vertices
+        self.lines = lines
+        self.edges = edges
+        self.polygons = polygons
+
+def _bisectors(points, site_pairs):
+    # Same normalization of line equations as in utils.voronoi.Edge.bisect
+    s1 = points[site_pairs[:,0]]
+    s2 = points[site_pairs[:,1]]
+    d = s2 - s1
+    c = (s1 * d).sum(axis=1) + (d * d).sum(axis=1) * 0.5
+    x_major = abs(d[:,0]) > abs(d[:,1])
+    dx = np.where(d[:,0] == 0, 1.0, d[:,0])
+    dy = np.where(d[:,1] == 0, 1.0, d[:,1])
+    a = np.where(x_major, 1.0, d[:,0] / dy)
+    b = np.where(x_major, d[:,1] / dx, 1.0)
+    c = np.where(x_major, c / dx, c / dy)
+    return np.stack((a, b, c), axis=1)
+
+def _make_voronoi_data(points, vertices, site_pairs, edge_verts):
+    if (site_pairs[:,0] == site_pairs[:,1]).any():
+        raise Exception("Can't build Voronoi diagram: some points are coinciding")
+    lines = _bisectors(points, site_pairs)
+    edges = [(i, int(v1), int(v2)) for i, (v1, v2) in enumerate(edge_verts.tolist())]
+    polygons = dict()
+    for edge, (s1, s2) in zip(edges, site_pairs.tolist()):
+        polygons.setdefault(s1, []).append(edge)
+        polygons.setdefault(s2, []).append(edge)
+    return SvVoronoi2DData([tuple(v) for v in vertices.tolist()],
+                [tuple(l) for l in lines.tolist()],
+                edges, polygons)
+
+def _voronoi_scipy(points):
+    try:
+        vor = Voronoi(points)
+    except QhullError:
+        return None
+    return _make_voronoi_data(points, vor.vertices,
+                np.asarray(vor.ridge_points, dtype=np.int64),
+                np.asarray(vor.ridge_vertices, dtype=np.int64))
+
+def _voronoi_from_delaunay(points, tris):
+    """
+    Build Voronoi diagram as a dual of Delaunay triangulation.
+    """
+    if len(tris) == 0:
+        return None
+    a = points[tris[:,0]]
+    b = points[tris[:,1]]
+    c = points[tris[:,2]]
+    ab = b - a
+    ac = c - a
+    d = 2.0 * (ab[:,0] * ac[:,1] - ab[:,1] * ac[:,0])
+    ab2 = (ab * ab).sum(axis=1)
+    ac2 = (ac * ac).sum(axis=1)
+    cx = (ac[:,1] * ab2 - ab[:,1] * ac2) / d
+    cy = (ab[:,0] * ac2 - ac[:,0] * ab2) / d
+    centers = a + np.stack((cx, cy), axis=1)
+
+    # Cocircular points (regular grids, for example) produce several
+    # coinciding circumcenters; weld them into one diagram vertex.
+    scale = max((points.max(axis=0) - points.min(axis=0)).max(), 1e-12)
+    keys = np.round(centers / (scale * 1e-9)).astype(np.int64)
+    _, first, vert_index = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    vert_index = vert_index.ravel()
+    vertices = centers[first]
+
+    # Triangle edges: edge i of triangle t is opposite to vertex i.
+    n_tris = len(tris)
+    half_edges = np.concatenate((tris[:,[1,2]], tris[:,[2,0]], tris[:,[0,1]]))
+    half_tris = np.tile(np.arange(n_tris), 3)
+    half_edges.sort(axis=1)
+    edges, inverse, counts = np.unique(half_edges, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    n_edges = len(edges)
+    order = np.argsort(inverse, kind='stable')
+    starts = np.zeros(n_edges + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+    edge_verts = np.full((n_edges, 2), -1, dtype=np.int64)
+    edge_verts[:,0] = vert_index[half_tris[order[starts[:-1]]]]
+    inner = counts == 2
+    edge_verts[inner,1] = vert_index[half_tris[order[starts[:-1][inner] + 1]]]
+    good = edge_verts[:,0] != edge_verts[:,1]
+    return _make_voronoi_data(points, vertices, edges[good], edge_verts[good])
+
+def voronoi_2d(points, backend=AUTO):
+    """
+    Build Voronoi diagram for a set of points in XOY plane.
+
+    Returns:
+        SvVoronoi2DData instance (utils.voronoi.Context for FORTUNE backend),
+        or None if the diagram can not be built by this backend (less than
+        three points, or all points collinear).
+    """
+    backend = _resolve_backend(backend)
+    points = _as_points_2d(points)
+    if len(points) < 3:
+        return None
+    if backend == SCIPY:
+        return _voronoi_scipy(points)
+    elif backend == FORTUNE:
+        from sverchok.utils.voronoi import computeVoronoiDiagram
+        return computeVoronoiDiagram(_fortune_sites(points), raise_exception=True)
+    else:
+        tris = delaunay_2d(points, backend=NUMPY)
+        return _voronoi_from_delaunay(points, tris)
+
@@ -0,0 +1,204 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Shared cache of curve and surface evaluation results.
+
+Curve and surface objects are passed between nodes by reference, so several
+nodes often evaluate the same object at the same parameter values. When the
+cache is enabled (see Sverchok preferences), results of methods like
+evaluate_array() are memoized. The key is the identity of the object, name
+of the method and a digest of arguments; entries of an object are dropped
+when the object is garbage-collected. Total size of cached arrays is limited,
+least recently used entries are evicted first.
+
+The cache relies on curve and surface objects being immutable after they
+were passed to other nodes, which is the convention for Sverchok curves and
+surfaces.
+"""
+
+import copy
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+class _Uncacheable(Exception):
+    pass
+
+def _digest_argument(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        digest = hashlib.blake2b(data.view(np.uint8), digest_size=16).digest()
+        return (data.shape, data.dtype.str, digest)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (tuple, list)):
+        return tuple(_digest_argument(v) for v in value)
+    raise _Uncacheable()
+
+def _copy_result(value):
+    """
+    Returns copy of result, and total size of numpy arrays in it.
+    """
+    if isinstance(value, np.ndarray):
+        return value.copy(), value.nbytes
+    if isinstance(value, (tuple, list)):
+        items = [_copy_result(v) for v in value]
+        return type(value)(v for v, _ in items), sum(size for _, size in items)
+    if hasattr(value, '__dict__'):
+        # Objects like SurfaceDerivativesData
+        result = copy.copy(value)
+        size = 0
+        for name, v in vars(value).items():
+            if isinstance(v, np.ndarray):
+                setattr(result, name, v.copy())
+                size += v.nbytes
+        return result, size
+    return value, 0
+
+class SvEvaluationCache(object):
+    """
+    LRU cache of evaluation results.
+
+    Args:
+        max_memory: maximum total size of cached arrays, in bytes.
+    """
+    def __init__(self, max_memory=256*1024*1024):
+        self.enabled = False
+        self.max_memory = max_memory
+        self._entries = OrderedDict()
+        self._object_keys = dict()
+        self._memory = 0
+        self._lock = threading.RLock()
+        self.reset_statistics()
+
+    def configure(self, enabled, max_memory=None):
+        with self._lock:
+            self.enabled = enabled
+            if max_memory is not None:
+                self.max_memory = max_memory
+            if not enabled:
+                self.clear()
+            else:
+                self._evict()
+
+    def reset_statistics(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_statistics(self):
+        total = self.hits + self.misses
+        return dict(hits = self.hits,
+                    misses = self.misses,
+                    evictions = self.evictions,
+                    hit_rate = self.hits / total if total else 0.0,
+                    entries = len(self._entries),
+                    memory = self._memory)
+
+    def clear(self):
+        with self._lock:
+            for finalizer, _ in self._object_keys.values():
+                finalizer.detach()
+            self._entries.clear()
+            self._object_keys.clear()
+            self._memory = 0
+
+    def _forget(self, object_id):
+        with self._lock:
+            item = self._object_keys.pop(object_id, None)
+            if item is None:
+                return
+            for key in item[1]:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._memory -= entry[1]
+
+    def _remove(self, key):
+        value, size = self._entries.pop(key)
+        self._memory -= size
+        item = self._object_keys.get(key[0])
+        if item is not None:
+            item[1].discard(key)
+
+    def _evict(self):
+        while self._memory > self.max_memory and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def call(self, obj, name, method, args, kwargs):
+        """
+        Call obj.method(*args, **kwargs), or take the result from the cache.
+        """
+        try:
+            key = (id(obj), name, _digest_argument(args), _digest_argument(tuple(sorted(kwargs.items()))))
+        except _Uncacheable:
+            return method(obj, *args, **kwargs)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_result(entry[0])[0]
+            self.misses += 1
+
+        result = method(obj, *args, **kwargs)
+        stored, size = _copy_result(result)
+        if size > self.max_memory:
+            return result
+
+        with self._lock:
+            if key[0] not in self._object_keys:
+                try:
+                    finalizer = weakref.finalize(obj, self._forget, key[0])
+                except TypeError:
+                    return result
+                self._object_keys[key[0]] = (finalizer, set())
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (stored, size)
+            self._object_keys[key[0]][1].add(key)
+            self._memory += size
+            self._evict()
+        return result
+
+evaluation_cache = SvEvaluationCache()
+
+def _cached(name, method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not evaluation_cache.enabled:
+            return method(self, *args, **kwargs)
+        return evaluation_cache.call(self, name, method, args, kwargs)
+    wrapper._sv_evaluation_cache = True
+    return wrapper
+
+def install_evaluation_cache(cls, method_names):
+    """
+    Wrap listed methods defined in class cls, so that their results are
+    memoized in evaluation_cache when it is enabled. SvCurve and SvSurface
+    call this for each subclass.
+    """
+    for name in method_names:
+        method = cls.__dict__.get(name)
+        if method is None or not callable(method) or getattr(method, '_sv_evaluation_cache', False):
+            continue
+        setattr(cls, name, _cached(name, method))
+
+def update_evaluation_cache():
+    from sverchok import settings
+    enabled, size = settings.get_params({'evaluation_cache_enabled': False,
+                                         'evaluation_cache_size': 256}, direct=True)
+    evaluation_cache.configure(enabled, size * 1024 * 1024)
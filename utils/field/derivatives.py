@@ -0,0 +1,429 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Derivatives of fields.
+
+SvJet is a forward-mode automatic differentiation value: function values at
+n points together with gradients and (optionally) Hessian matrices with
+respect to X, Y, Z. Arithmetic operators, NumPy ufuncs and functions from
+`jet_functions` apply the chain rule, so that evaluating a formula with jets
+of coordinates instead of coordinate arrays gives exact derivatives of the
+formula.
+
+Fields which can calculate their derivatives analytically implement
+jet_grid() method (see SvScalarField and SvVectorField); for other fields,
+finite differences from this module are used.
+"""
+
+from math import log as math_log, erf as math_erf, pi, sqrt as math_sqrt
+
+import numpy as np
+
+def _outer(g1, g2):
+    return g1[:, :, np.newaxis] * g2[:, np.newaxis, :]
+
+class SvJet(object):
+    """
+    Values of a function of (x, y, z) at n points with derivatives.
+
+    * value: np.array of shape (n,);
+    * gradient: np.array of shape (n, 3);
+    * hessian: np.array of shape (n, 3, 3), or None if only first
+      derivatives are calculated (order = 1).
+    """
+    def __init__(self, value, gradient, hessian=None):
+        self.value = value
+        self.gradient = gradient
+        self.hessian = hessian
+
+    @property
+    def order(self):
+        return 1 if self.hessian is None else 2
+
+    def __len__(self):
+        return len(self.value)
+
+    def __repr__(self):
+        return f"<SvJet of order {self.order} at {len(self)} points>"
+
+    @staticmethod
+    def coordinates(xs, ys, zs, order=2):
+        """
+        Jets of coordinate functions X, Y and Z.
+        """
+        n = len(xs)
+        result = []
+        for i, values in enumerate((xs, ys, zs)):
+            gradient = np.zeros((n, 3))
+            gradient[:, i] = 1.0
+            hessian = np.zeros((n, 3, 3)) if order > 1 else None
+            result.append(SvJet(np.asarray(values, dtype=np.float64), gradient, hessian))
+        return tuple(result)
+
+    @staticmethod
+    def constant(value, n, order=2):
+        value = np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)).copy()
+        hessian = np.zeros((n, 3, 3)) if order > 1 else None
+        return SvJet(value, np.zeros((n, 3)), hessian)
+
+    @staticmethod
+    def lift(value, n, order=2):
+        """
+        Return value if it is a jet, or a jet of constant function otherwise.
+        """
+        if isinstance(value, SvJet):
+            return value
+        return SvJet.constant(value, n, order)
+
+    def unary(self, value, d1, d2=None):
+        """
+        Jet of f(self), where value = f(self.value), d1 = f'(self.value)
+        and d2 = f''(self.value).
+        """
+        gradient = d1[:, np.newaxis] * self.gradient
+        hessian = None
+        if self.hessian is not None:
+            hessian = d1[:, np.newaxis, np.newaxis] * self.hessian
+            if d2 is not None:
+                hessian += d2[:, np.newaxis, np.newaxis] * _outer(self.gradient, self.gradient)
+        return SvJet(value, gradient, hessian)
+
+    def binary(self, other, value, fa, fb, faa=None, fab=None, fbb=None):
+        """
+        Jet of f(self, other), given f and its partial derivatives
+        calculated at (self.value, other.value); second derivatives
+        which are not given are supposed to be zero.
+        """
+        gradient = fa[:, np.newaxis] * self.gradient + fb[:, np.newaxis] * other.gradient
+        hessian = None
+        if self.hessian is not None and other.hessian is not None:
+            hessian = fa[:, np.newaxis, np.newaxis] * self.hessian + fb[:, np.newaxis, np.newaxis] * other.hessian
+            if faa is not None:
+                hessian += faa[:, np.newaxis, np.newaxis] * _outer(self.gradient, self.gradient)
+            if fab is not None:
+                mixed = _outer(self.gradient, other.gradient)
+                hessian += fab[:, np.newaxis, np.newaxis] * (mixed + np.transpose(mixed, axes=(0, 2, 1)))
+            if fbb is not None:
+                hessian += fbb[:, np.newaxis, np.newaxis] * _outer(other.gradient, other.gradient)
+        return SvJet(value, gradient, hessian)
+
+    def _scale(self, c, shift=0.0):
+        # c * self + shift, where c and shift are constants
+        c = np.asarray(c, dtype=np.float64)
+        cg = c[..., np.newaxis] if c.ndim else c
+        hessian = None
+        if self.hessian is not None:
+            hessian = (c[..., np.newaxis, np.newaxis] if c.ndim else c) * self.hessian
+        return SvJet(c * self.value + shift, cg * self.gradient, hessian)
+
+    def _lift_other(self, other):
+        return SvJet.lift(other, len(self), self.order)
+
+    def __add__(self, other):
+        if not isinstance(other, SvJet):
+            return self._scale(1.0, other)
+        hessian = None
+        if self.hessian is not None and other.hessian is not None:
+            hessian = self.hessian + other.hessian
+        return SvJet(self.value + other.value, self.gradient + other.gradient, hessian)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return self._scale(-1.0)
+
+    def __pos__(self):
+        return self
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if not isinstance(other, SvJet):
+            return self._scale(other)
+        one = np.ones(len(self))
+        return self.binary(other, self.value * other.value, other.value, self.value, fab=one)
+
+    __rmul__ = __mul__
+
+    def reciprocal(self):
+        r = 1.0 / self.value
+        return self.unary(r, -r*r, 2*r*r*r)
+
+    def __truediv__(self, other):
+        if not isinstance(other, SvJet):
+            return self._scale(1.0 / np.asarray(other, dtype=np.float64))
+        return self * other.reciprocal()
+
+    def __rtruediv__(self, other):
+        return self.reciprocal() * other
+
+    def __pow__(self, other):
+        if isinstance(other, SvJet):
+            return exp(other * log(self))
+        p = np.asarray(other, dtype=np.float64)
+        v = self.value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.unary(v ** p, p * v ** (p - 1), p * (p - 1) * v ** (p - 2))
+
+    def __rpow__(self, other):
+        return exp(self * log(np.asarray(other, dtype=np.float64)))
+
+    def __abs__(self):
+        return self.unary(np.abs(self.value), np.sign(self.value), np.zeros(len(self)))
+
+    @staticmethod
+    def where(condition, jet1, jet2):
+        """
+        Select jet1 where condition is True and jet2 elsewhere.
+        """
+        hessian = None
+        if jet1.hessian is not None and jet2.hessian is not None:
+            hessian = np.where(condition[:, np.newaxis, np.newaxis], jet1.hessian, jet2.hessian)
+        return SvJet(np.where(condition, jet1.value, jet2.value),
+                    np.where(condition[:, np.newaxis], jet1.gradient, jet2.gradient),
+                    hessian)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # Allows to call numpy functions, such as np.sin, on jets.
+        if method != '__call__' or kwargs:
+            return NotImplemented
+        name = _UFUNC_NAMES.get(ufunc)
+        if name is None:
+            return NotImplemented
+        return jet_functions[name](*inputs)
+
+def _erf(values):
+    return np.vectorize(math_erf, otypes=[np.float64])(values)
+
+# Unary functions: name -> (function, derivative, second derivative),
+# each taking value of the argument.
+_UNARY = {
+    'sin': (np.sin, np.cos, lambda v: -np.sin(v)),
+    'cos': (np.cos, lambda v: -np.sin(v), lambda v: -np.cos(v)),
+    'tan': (np.tan, lambda v: 1 + np.tan(v)**2, lambda v: 2*np.tan(v)*(1 + np.tan(v)**2)),
+    'asin': (np.arcsin, lambda v: 1/np.sqrt(1 - v*v), lambda v: v/(1 - v*v)**1.5),
+    'acos': (np.arccos, lambda v: -1/np.sqrt(1 - v*v), lambda v: -v/(1 - v*v)**1.5),
+    'atan': (np.arctan, lambda v: 1/(1 + v*v), lambda v: -2*v/(1 + v*v)**2),
+    'sinh': (np.sinh, np.cosh, np.sinh),
+    'cosh': (np.cosh, np.sinh, np.cosh),
+    'tanh': (np.tanh, lambda v: 1 - np.tanh(v)**2, lambda v: -2*np.tanh(v)*(1 - np.tanh(v)**2)),
+    'asinh': (np.arcsinh, lambda v: 1/np.sqrt(v*v + 1), lambda v: -v/(v*v + 1)**1.5),
+    'acosh': (np.arccosh, lambda v: 1/np.sqrt(v*v - 1), lambda v: -v/(v*v - 1)**1.5),
+    'atanh': (np.arctanh, lambda v: 1/(1 - v*v), lambda v: 2*v/(1 - v*v)**2),
+    'exp': (np.exp, np.exp, np.exp),
+    'expm1': (np.expm1, np.exp, np.exp),
+    'log': (np.log, lambda v: 1/v, lambda v: -1/(v*v)),
+    'log10': (np.log10, lambda v: 1/(v*math_log(10)), lambda v: -1/(v*v*math_log(10))),
+    'log2': (np.log2, lambda v: 1/(v*math_log(2)), lambda v: -1/(v*v*math_log(2))),
+    'log1p': (np.log1p, lambda v: 1/(1 + v), lambda v: -1/(1 + v)**2),
+    'sqrt': (np.sqrt, lambda v: 0.5/np.sqrt(v), lambda v: -0.25/(v*np.sqrt(v))),
+    'abs': (np.abs, np.sign, np.zeros_like),
+    'fabs': (np.fabs, np.sign, np.zeros_like),
+    'sign': (np.sign, np.zeros_like, np.zeros_like),
+    'floor': (np.floor, np.zeros_like, np.zeros_like),
+    'ceil': (np.ceil, np.zeros_like, np.zeros_like),
+    'trunc': (np.trunc, np.zeros_like, np.zeros_like),
+    'radians': (np.radians, lambda v: np.full_like(v, pi/180), np.zeros_like),
+    'degrees': (np.degrees, lambda v: np.full_like(v, 180/pi), np.zeros_like),
+    'erf': (_erf, lambda v: 2/math_sqrt(pi)*np.exp(-v*v), lambda v: -4*v/math_sqrt(pi)*np.exp(-v*v)),
+}
+
+def _make_unary(name):
+    function, d1, d2 = _UNARY[name]
+    def jet_function(a):
+        if not isinstance(a, SvJet):
+            return function(a)
+        v = a.value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return a.unary(function(v), d1(v), d2(v) if a.hessian is not None else None)
+    jet_function.__name__ = name
+    return jet_function
+
+def _lift_pair(a, b):
+    if isinstance(a, SvJet):
+        return a, a._lift_other(b)
+    return b._lift_other(a), b
+
+def add(a, b):
+    return a + b if isinstance(a, SvJet) else b + a
+
+def sub(a, b):
+    return a - b if isinstance(a, SvJet) else b.__rsub__(a)
+
+def mul(a, b):
+    return a * b if isinstance(a, SvJet) else b * a
+
+def div(a, b):
+    return a / b if isinstance(a, SvJet) else b.__rtruediv__(a)
+
+def power(a, b, mod=None):
+    if mod is not None:
+        raise TypeError("pow() with modulo is not supported for derivatives")
+    return a ** b if isinstance(a, SvJet) else b.__rpow__(a)
+
+def atan2(y, x):
+    if not isinstance(y, SvJet) and not isinstance(x, SvJet):
+        return np.arctan2(y, x)
+    y, x = _lift_pair(y, x)
+    r2 = x.value**2 + y.value**2
+    xv, yv = x.value, y.value
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return y.binary(x, np.arctan2(yv, xv), xv/r2, -yv/r2,
+                    faa = -2*xv*yv/r2**2, fab = (yv*yv - xv*xv)/r2**2, fbb = 2*xv*yv/r2**2)
+
+def hypot(a, b):
+    if not isinstance(a, SvJet) and not isinstance(b, SvJet):
+        return np.hypot(a, b)
+    return sqrt(a*a + b*b)
+
+def minimum(a, b):
+    if not isinstance(a, SvJet) and not isinstance(b, SvJet):
+        return np.minimum(a, b)
+    a, b = _lift_pair(a, b)
+    return SvJet.where(a.value <= b.value, a, b)
+
+def maximum(a, b):
+    if not isinstance(a, SvJet) and not isinstance(b, SvJet):
+        return np.maximum(a, b)
+    a, b = _lift_pair(a, b)
+    return SvJet.where(a.value >= b.value, a, b)
+
+def square(a):
+    return a * a
+
+jet_functions = {name : _make_unary(name) for name in _UNARY}
+jet_functions.update(add=add, sub=sub, mul=mul, div=div, pow=power,
+                    atan2=atan2, hypot=hypot, minimum=minimum, maximum=maximum,
+                    square=square, neg=lambda a: -a)
+
+sqrt = jet_functions['sqrt']
+exp = jet_functions['exp']
+log = jet_functions['log']
+
+_UFUNC_NAMES = {
+    np.add: 'add', np.subtract: 'sub', np.multiply: 'mul', np.true_divide: 'div',
+    np.power: 'pow', np.negative: 'neg', np.absolute: 'abs', np.fabs: 'fabs',
+    np.sign: 'sign', np.floor: 'floor', np.ceil: 'ceil', np.trunc: 'trunc',
+    np.sin: 'sin', np.cos: 'cos', np.tan: 'tan',
+    np.arcsin: 'asin', np.arccos: 'acos', np.arctan: 'atan', np.arctan2: 'atan2',
+    np.sinh: 'sinh', np.cosh: 'cosh', np.tanh: 'tanh',
+    np.arcsinh: 'asinh', np.arccosh: 'acosh', np.arctanh: 'atanh',
+    np.exp: 'exp', np.expm1: 'expm1', np.log: 'log', np.log10: 'log10',
+    np.log2: 'log2', np.log1p: 'log1p', np.sqrt: 'sqrt', np.square: 'square',
+    np.hypot: 'hypot', np.minimum: 'minimum', np.maximum: 'maximum',
+    np.radians: 'radians', np.degrees: 'degrees',
+    np.deg2rad: 'radians', np.rad2deg: 'degrees',
+}
+
+def jet_formula_names(names):
+    """
+    Copy of names dictionary for formula evaluation (such as
+    script_importhelper.safe_names_np), in which mathematical functions
+    are replaced with versions accepting jets.
+    """
+    result = dict(names)
+    for name in ['sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'sinh', 'cosh', 'tanh',
+                    'asinh', 'acosh', 'atanh', 'exp', 'expm1', 'log', 'log10', 'log2',
+                    'log1p', 'sqrt', 'fabs', 'sign', 'floor', 'ceil', 'trunc',
+                    'radians', 'degrees', 'erf', 'atan2', 'hypot']:
+        result[name] = jet_functions[name]
+    result['pow'] = power
+    return result
+
+def jet_to_cylindrical(x, y, z):
+    return sqrt(x*x + y*y), atan2(y, x), z
+
+def jet_to_spherical(x, y, z):
+    rho = sqrt(x*x + y*y + z*z)
+    return rho, atan2(y, x), jet_functions['acos'](z / rho)
+
+def jet_compose(outer, inner):
+    """
+    Jet of composition f(g(p)), where outer is the jet of f calculated
+    at points g(p), and inner is a tuple of three jets of components of g.
+    """
+    J = np.stack([jet.gradient for jet in inner], axis=1) # (n, 3 components, 3 variables)
+    gradient = np.einsum('nk,nkj->nj', outer.gradient, J)
+    hessian = None
+    if outer.hessian is not None and all(jet.hessian is not None for jet in inner):
+        hessian = np.einsum('nki,nkl,nlj->nij', J, outer.hessian, J)
+        for k, jet in enumerate(inner):
+            hessian += outer.gradient[:, k, np.newaxis, np.newaxis] * jet.hessian
+    return SvJet(outer.value, gradient, hessian)
+
+def falloff_jet(falloff, distance, step=1e-5):
+    """
+    Jet of falloff(distance). Falloff functions are arbitrary callables,
+    so their derivatives are calculated with one-dimensional central
+    differences.
+    """
+    if falloff is None:
+        return distance
+    r = distance.value
+    value = falloff(r)
+    plus = falloff(r + step)
+    minus = falloff(r - step)
+    d1 = (plus - minus) / (2*step)
+    d2 = (plus - 2*value + minus) / (step*step)
+    return distance.unary(value, d1, d2)
+
+def finite_difference_jet(field, xs, ys, zs, step=0.001, order=2):
+    """
+    Derivatives of a scalar field calculated with finite differences.
+    Gradient and second derivatives along axes are calculated with
+    central differences, mixed derivatives with the central four-point
+    stencil.
+    """
+    v0 = field.evaluate_grid(xs, ys, zs)
+    plus = [field.evaluate_grid(xs+step, ys, zs),
+            field.evaluate_grid(xs, ys+step, zs),
+            field.evaluate_grid(xs, ys, zs+step)]
+    minus = [field.evaluate_grid(xs-step, ys, zs),
+            field.evaluate_grid(xs, ys-step, zs),
+            field.evaluate_grid(xs, ys, zs-step)]
+    n = len(v0)
+    gradient = np.empty((n, 3))
+    for i in range(3):
+        gradient[:, i] = (plus[i] - minus[i]) / (2*step)
+    if order < 2:
+        return SvJet(v0, gradient)
+
+    step2 = step*step
+    hessian = np.empty((n, 3, 3))
+    for i in range(3):
+        hessian[:, i, i] = (plus[i] - 2*v0 + minus[i]) / step2
+    coords = (xs, ys, zs)
+    for i, j in [(0, 1), (1, 2), (0, 2)]:
+        def shifted(si, sj):
+            points = list(coords)
+            points[i] = points[i] + si*step
+            points[j] = points[j] + sj*step
+            return field.evaluate_grid(*points)
+        v_pp, v_pm = shifted(1, 1), shifted(1, -1)
+        v_mp, v_mm = shifted(-1, 1), shifted(-1, -1)
+        hessian[:, i, j] = hessian[:, j, i] = (v_pp - v_pm - v_mp + v_mm) / (4*step2)
+    return SvJet(v0, gradient, hessian)
+
+def finite_difference_jacobian(field, xs, ys, zs, step=0.001):
+    """
+    Jacobian matrices of a vector field calculated with central differences.
+    Returns np.array of shape (n, 3, 3); J[:, i, j] = d v_i / d x_j.
+    """
+    n = len(xs)
+    jacobian = np.empty((n, 3, 3))
+    shifts = [(step, 0, 0), (0, step, 0), (0, 0, step)]
+    for j, (dx, dy, dz) in enumerate(shifts):
+        plus = field.evaluate_grid(xs+dx, ys+dy, zs+dz)
+        minus = field.evaluate_grid(xs-dx, ys-dy, zs-dz)
+        for i in range(3):
+            jacobian[:, i, j] = (plus[i] - minus[i]) / (2*step)
+    return jacobian
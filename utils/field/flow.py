@@ -0,0 +1,291 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Integration of vector field lines (trajectories of points moved by a vector
+field). All points are advanced at once: each stage of the integration
+method makes one evaluate_grid() call for all lines which are still active.
+"""
+
+import numpy as np
+
+EULER = 'EULER'
+RK4 = 'RK4'
+RK45 = 'RK45'
+
+integration_methods = [
+    (EULER, "Euler", "Explicit Euler method: one field evaluation per step", 0),
+    (RK4, "Runge-Kutta 4", "Classic 4th order Runge-Kutta method: four field evaluations per step", 1),
+    (RK45, "Adaptive RK45", "Dormand-Prince method with step size control; steps are subdivided where the field changes quickly", 2)
+]
+
+# Dormand-Prince coefficients
+_DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84]
+]
+# difference between 5th order and 4th order weights
+_DP_E = np.array([35/384 - 5179/57600, 0.0, 500/1113 - 7571/16695, 125/192 - 393/640,
+                -2187/6784 + 92097/339200, 11/84 - 187/2100, -1/40])
+
+class SvFieldLines(object):
+    """
+    Result of integration.
+
+    * points: np.array of shape (n, max_points, 3); points of i'th line
+      are points[i, :counts[i]].
+    * counts: number of points in each line.
+    * lengths: length of each line.
+    """
+    def __init__(self, points, counts, lengths):
+        self.points = points
+        self.counts = counts
+        self.lengths = lengths
+
+    def get_lines(self):
+        """
+        List of np.arrays of shape (count, 3).
+        """
+        return [points[:count] for points, count in zip(self.points, self.counts)]
+
+    def get_edges(self):
+        """
+        List of np.arrays of shape (count-1, 2) with edges of each line.
+        """
+        return [line_edges(count) for count in self.counts]
+
+    def get_final_points(self):
+        """
+        Last point of each line, np.array of shape (n, 3).
+        """
+        if self.points.shape[1] == 0:
+            raise Exception("No points were calculated")
+        return self.points[:, -1]
+
+def line_edges(count):
+    idxs = np.arange(count - 1) if count > 1 else np.zeros(0, dtype=np.int64)
+    return np.stack((idxs, idxs + 1), axis=1)
+
+def join_lines(lines):
+    """
+    Join lines into single mesh: returns vertices as np.array of shape (n, 3)
+    and edges as np.array of shape (m, 2).
+    """
+    lines = [line for line in lines if len(line)]
+    if not lines:
+        return np.zeros((0, 3)), np.zeros((0, 2), dtype=np.int64)
+    offsets = np.cumsum([0] + [len(line) for line in lines[:-1]])
+    edges = [line_edges(len(line)) + offset for line, offset in zip(lines, offsets)]
+    return np.concatenate(lines), np.concatenate(edges)
+
+class SvFieldIntegrator(object):
+    """
+    Integrator of vector field lines.
+
+    Args:
+        field: SvVectorField.
+        method: EULER, RK4 or RK45.
+        normalize: if True, integrate the field of unit vectors
+            VF(X) / |VF(X)|, so that each step has length equal to step size.
+        tolerance: allowed local error of one step, for RK45 method.
+        bounds: optional tuple (min_point, max_point) of bounding box;
+            a line stops when it leaves the box.
+        max_length: optional maximum length of a line.
+        stagnation: with RK4 and RK45 methods, a line stops when norm of the
+            field vector becomes less than this value, or when the field
+            is not finite. EULER lines always have the requested number of
+            points, as in earlier versions of Vector Field Lines node; a
+            point where the field is too small stays in place.
+    """
+    def __init__(self, field, method=RK4, normalize=True, tolerance=1e-4,
+                    bounds=None, max_length=None, stagnation=1e-8):
+        self.field = field
+        self.method = method
+        self.normalize = normalize
+        self.tolerance = tolerance
+        self.bounds = bounds
+        self.max_length = max_length
+        self.stagnation = stagnation
+        self.evaluations = 0
+
+    # maximum number of adaptive substeps per one step of RK45 method
+    max_substeps = 1000
+
+    def _vectors(self, points):
+        """
+        Right side of the ODE at points. Returns vectors and mask of points
+        at which the field is too small.
+        """
+        self.evaluations += 1
+        xs, ys, zs = self.field.evaluate_grid(points[:,0], points[:,1], points[:,2])
+        vectors = np.stack((xs, ys, zs), axis=1)
+        norms = np.linalg.norm(vectors, axis=1)
+        stagnated = norms < self.stagnation
+        if self.normalize:
+            vectors = vectors / np.where(stagnated, 1.0, norms)[:, np.newaxis]
+            vectors[stagnated] = 0.0
+        return vectors, stagnated
+
+    def _euler_step(self, points, steps):
+        k1, stagnated = self._vectors(points)
+        return points + steps * k1, stagnated
+
+    def _rk4_step(self, points, steps):
+        k1, stagnated = self._vectors(points)
+        k2, _ = self._vectors(points + 0.5 * steps * k1)
+        k3, _ = self._vectors(points + 0.5 * steps * k2)
+        k4, _ = self._vectors(points + steps * k3)
+        return points + steps * (k1 + 2*k2 + 2*k3 + k4) / 6.0, stagnated
+
+    def _dormand_prince(self, points, k1, h):
+        # One Dormand-Prince step; returns new points, vectors at new points
+        # (they are reused as the first stage of the next step), and error estimates
+        ks = [k1]
+        for a in _DP_A[1:6]:
+            y = points + h * sum(c * k for c, k in zip(a, ks))
+            ks.append(self._vectors(y)[0])
+        new_points = points + h * sum(c * k for c, k in zip(_DP_A[6], ks))
+        k7, stagnated = self._vectors(new_points)
+        ks.append(k7)
+        error = np.abs(h[:,0]) * np.linalg.norm(sum(e * k for e, k in zip(_DP_E, ks) if e != 0.0), axis=1)
+        return new_points, k7, stagnated, error
+
+    def _rk45_step(self, points, steps, state, k1, stagnated):
+        """
+        Advance points by parameter interval steps, making as many
+        adaptive Dormand-Prince substeps as needed. k1 and stagnated are
+        the field vectors at points (see _vectors); the same values for
+        new points are returned. Lines where the field is not finite, or
+        which need more than max_substeps substeps, get NaN points, so that
+        integrate() stops them.
+        """
+        k1 = k1.copy()
+        new_stagnated = stagnated.copy()
+        signs = np.sign(steps[:,0])
+        remaining = np.abs(steps[:,0])
+        # state keeps the size of the last successful substep of each line
+        h = np.minimum(state, remaining)
+        min_h = remaining * 1e-4
+        current = points.copy()
+        todo = ~stagnated & (remaining > 0)
+        for i in range(self.max_substeps):
+            idx = np.where(todo)[0]
+            if len(idx) == 0:
+                break
+            hs = np.minimum(h[idx], remaining[idx])
+            new_points, k7, k7_stagnated, error = self._dormand_prince(current[idx], k1[idx], (signs[idx] * hs)[:, np.newaxis])
+            failed = ~np.isfinite(error) | ~np.isfinite(new_points).all(axis=1)
+            if failed.any():
+                current[idx[failed]] = np.nan
+                todo[idx[failed]] = False
+                idx, hs, new_points, k7, k7_stagnated, error = [a[~failed] for a in (idx, hs, new_points, k7, k7_stagnated, error)]
+            accept = (error <= self.tolerance) | (hs <= min_h[idx])
+            acc = idx[accept]
+            current[acc] = new_points[accept]
+            k1[acc] = k7[accept]
+            new_stagnated[acc] = k7_stagnated[accept]
+            remaining[acc] -= hs[accept]
+            factor = 0.9 * (self.tolerance / np.maximum(error, 1e-16)) ** 0.2
+            h[idx] = np.maximum(hs * np.clip(factor, 0.2, 5.0), min_h[idx])
+            todo[acc] = remaining[acc] > min_h[acc] * 1e-3
+        current[todo] = np.nan
+        state[:] = np.where(np.isfinite(h) & (h > 0), h, state)
+        return current, stagnated, k1, new_stagnated
+
+    def integrate(self, vertices, iterations, step):
+        """
+        Calculate field lines starting at vertices.
+
+        Args:
+            vertices: np.array of shape (n, 3).
+            iterations: maximum number of steps.
+            step: step size, a number or np.array of shape (n,).
+
+        Returns:
+            SvFieldLines instance. Points of each line do not include
+            the starting point.
+        """
+        vertices = np.asarray(vertices, dtype=np.float64)
+        n = len(vertices)
+        steps = np.broadcast_to(np.asarray(step, dtype=np.float64), (n,)).copy()
+        points = np.empty((n, iterations, 3))
+        counts = np.zeros(n, dtype=np.int64)
+        lengths = np.zeros(n)
+        active = np.ones(n, dtype=bool)
+        current = vertices.copy()
+        # current step size of adaptive method, per line
+        rk45_state = np.abs(steps).copy()
+        rk45_vectors = rk45_stagnated = None
+
+        for i in range(iterations):
+            idx = np.where(active)[0]
+            if len(idx) == 0:
+                break
+            hs = steps[idx][:, np.newaxis]
+            if self.method == EULER:
+                new_points, stagnated = self._euler_step(current[idx], hs)
+            elif self.method == RK4:
+                new_points, stagnated = self._rk4_step(current[idx], hs)
+            elif self.method == RK45:
+                if rk45_vectors is None:
+                    rk45_vectors, rk45_stagnated = self._vectors(current)
+                state = rk45_state[idx]
+                new_points, stagnated, k1, k1_stagnated = self._rk45_step(current[idx], hs, state,
+                                        rk45_vectors[idx], rk45_stagnated[idx])
+                rk45_state[idx] = state
+                rk45_vectors[idx] = k1
+                rk45_stagnated[idx] = k1_stagnated
+            else:
+                raise Exception(f"Unsupported integration method: {self.method}")
+
+            if self.method == EULER:
+                ok = np.ones(len(idx), dtype=bool)
+            else:
+                ok = ~stagnated & np.isfinite(new_points).all(axis=1)
+            segment_lengths = np.linalg.norm(new_points - current[idx], axis=1)
+            if self.bounds is not None:
+                min_point, max_point = self.bounds
+                ok &= ((new_points >= min_point) & (new_points <= max_point)).all(axis=1)
+            if self.max_length is not None:
+                ok &= lengths[idx] + segment_lengths <= self.max_length
+
+            good = idx[ok]
+            current[good] = new_points[ok]
+            points[good, i] = new_points[ok]
+            counts[good] += 1
+            lengths[good] += segment_lengths[ok]
+            active[idx[~ok]] = False
+
+        if iterations == 0:
+            return SvFieldLines(points, counts, lengths)
+        # Stopped lines are padded with their last point
+        last = points[np.arange(n), np.maximum(counts - 1, 0)]
+        last[counts == 0] = vertices[counts == 0]
+        padding = np.arange(iterations)[np.newaxis, :] >= counts[:, np.newaxis]
+        points = np.where(padding[:, :, np.newaxis], last[:, np.newaxis, :], points)
+        return SvFieldLines(points, counts, lengths)
+
+def integrate_field_lines(field, vertices, iterations, step, method=RK4, normalize=True, **kwargs):
+    """
+    Shortcut for SvFieldIntegrator(...).integrate(...).
+    """
+    integrator = SvFieldIntegrator(field, method=method, normalize=normalize, **kwargs)
+    return integrator.integrate(vertices, iterations, step)
+
+def advect(field, vertices, iterations, step, method=RK4, normalize=False, **kwargs):
+    """
+    Move points along the field lines by specified number of steps; returns
+    final positions, np.array of shape (n, 3). Points which were stopped
+    (see SvFieldIntegrator) stay at the last position they reached.
+    """
+    lines = integrate_field_lines(field, vertices, iterations, step, method=method, normalize=normalize, **kwargs)
+    return lines.get_final_points()
@@ -0,0 +1,587 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Expression graph compiler for composed scalar and vector fields.
+
+Field math nodes build trees of field objects (SvScalarFieldBinOp,
+SvMergedScalarField, SvVectorFieldsLerp and so on). Evaluating such a tree
+directly allocates full-size intermediate arrays at each level, and a
+sub-field which is used in several places is evaluated several times.
+
+compile_field() flattens such tree into a DAG of elementary operations on
+scalar arrays (vector fields are split into three components):
+
+* identical sub-expressions (the same field object evaluated at the same
+  points, or the same operation on the same arguments) become one node;
+* operations on constants are folded;
+* fields which the compiler does not know about are kept as opaque nodes,
+  which call their own evaluate_grid();
+* the graph is evaluated by chunks of points, so that temporary arrays stay
+  small; intermediate buffers are released (or reused for in-place
+  operations) as soon as the last operation which needs them is done.
+
+Optionally, when Numba is available, graphs which consist of elementary
+operations only (opaque fields being allowed only directly on input
+coordinates) are compiled into a single loop, which does not allocate any
+temporary arrays at all.
+"""
+
+import hashlib
+import math
+
+import numpy as np
+
+from sverchok.dependencies import numba
+from sverchok.utils.decorators_compilation import njit
+from sverchok.utils.field.scalar import (SvScalarField,
+            SvConstantScalarField, SvCoordinateScalarField, SvScalarFieldBinOp,
+            SvScalarFieldVectorizedFunction, SvNegatedScalarField, SvAbsScalarField,
+            SvVectorFieldsScalarProduct, SvVectorFieldNorm, SvMergedScalarField,
+            SvVectorScalarFieldComposition, SvVectorFieldDecomposed, SvScalarFieldLambda)
+from sverchok.utils.field.vector import (SvVectorField,
+            SvConstantVectorField, SvComposedVectorField, SvAbsoluteVectorField,
+            SvRelativeVectorField, SvVectorFieldBinOp, SvAverageVectorField,
+            SvVectorFieldCrossProduct, SvVectorFieldMultipliedByScalar,
+            SvVectorFieldsLerp, SvVectorFieldComposition, SvVectorFieldLambda)
+
+DEFAULT_CHUNK_SIZE = 1 << 14
+
+# Elementary operations: kind -> (NumPy ufunc, expression template for generated code)
+ELEMENTARY_OPS = {
+    'add': (np.add, '({0} + {1})'),
+    'sub': (np.subtract, '({0} - {1})'),
+    'mul': (np.multiply, '({0} * {1})'),
+    'div': (np.true_divide, '({0} / {1})'),
+    'pow': (np.power, '({0} ** {1})'),
+    'min': (np.minimum, 'min({0}, {1})'),
+    'max': (np.maximum, 'max({0}, {1})'),
+    'atan2': (np.arctan2, 'atan2({0}, {1})'),
+    'neg': (np.negative, '(-{0})'),
+    'abs': (np.abs, 'abs({0})'),
+    'sqrt': (np.sqrt, 'sqrt({0})'),
+    'sin': (np.sin, 'sin({0})'),
+    'cos': (np.cos, 'cos({0})'),
+    'tan': (np.tan, 'tan({0})'),
+    'asin': (np.arcsin, 'asin({0})'),
+    'acos': (np.arccos, 'acos({0})'),
+    'atan': (np.arctan, 'atan({0})'),
+    'exp': (np.exp, 'exp({0})'),
+    'log': (np.log, 'log({0})'),
+    'sinh': (np.sinh, 'sinh({0})'),
+    'cosh': (np.cosh, 'cosh({0})'),
+    'tanh': (np.tanh, 'tanh({0})'),
+    'asinh': (np.arcsinh, 'asinh({0})'),
+    'acosh': (np.arccosh, 'acosh({0})'),
+    'atanh': (np.arctanh, 'atanh({0})'),
+}
+
+# Operation identifiers of Scalar Field Math node
+_SCALAR_BINARY_OPS = {'ADD': 'add', 'SUB': 'sub', 'MUL': 'mul', 'DIV': 'div',
+                        'POW': 'pow', 'MIN': 'min', 'MAX': 'max'}
+_SCALAR_UNARY_OPS = {'SIN': 'sin', 'COS': 'cos', 'TAN': 'tan', 'ASIN': 'asin',
+                        'ACOS': 'acos', 'ATAN': 'atan', 'EXP': 'exp', 'LOG': 'log',
+                        'SINH': 'sinh', 'COSH': 'cosh', 'TANH': 'tanh', 'ASINH': 'asinh',
+                        'ACOSH': 'acosh', 'ATANH': 'atanh', 'SQRT': 'sqrt',
+                        'NEG': 'neg', 'ABS': 'abs'}
+
+# Nodes which call arbitrary Python code; single-output and three-output ones.
+OPAQUE_SCALAR = {'leaf', 'call'}
+OPAQUE_VECTOR = {'vleaf', 'vcall'}
+
+_KERNEL_GLOBALS = dict(sqrt=math.sqrt, sin=math.sin, cos=math.cos, tan=math.tan,
+                        asin=math.asin, acos=math.acos, atan=math.atan, atan2=math.atan2,
+                        exp=math.exp, log=math.log, sinh=math.sinh, cosh=math.cosh,
+                        tanh=math.tanh, asinh=math.asinh, acosh=math.acosh, atanh=math.atanh,
+                        inf=math.inf, nan=math.nan)
+
+def _minimal_diff(*values):
+    v1, v2 = np.partition(np.array(values), 1, axis=0)[0:2]
+    return abs(v1 - v2)
+
+def _as_array(value, n):
+    return np.ascontiguousarray(np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)))
+
+class SvFieldGraph(object):
+    """
+    DAG of operations on scalar arrays. Nodes are stored as tuples
+    (kind, inputs, payload) in topological order; first three nodes are
+    input X, Y and Z coordinates.
+    """
+    def __init__(self):
+        self.nodes = []
+        self.outputs = []
+        self._index = dict()
+        self._fields = dict()
+        self._live = None
+        self.coords = tuple(self.add('input', (), i) for i in range(3))
+
+    def add(self, kind, inputs, payload=None):
+        """
+        Add a node and return its index. If the same node already exists,
+        return index of the existing one.
+        """
+        inputs = tuple(inputs)
+        if kind == 'const':
+            payload = float(payload)
+        elif kind in ELEMENTARY_OPS and all(self.nodes[i][0] == 'const' for i in inputs):
+            function = ELEMENTARY_OPS[kind][0]
+            with np.errstate(all='ignore'):
+                value = function(*[self.nodes[i][2] for i in inputs])
+            return self.add('const', (), value)
+        try:
+            key = (kind, inputs, payload)
+            hash(key)
+        except TypeError:
+            key = (kind, inputs, id(payload))
+        idx = self._index.get(key)
+        if idx is None:
+            idx = len(self.nodes)
+            self.nodes.append((kind, inputs, payload))
+            self._index[key] = idx
+        return idx
+
+    def const(self, value):
+        return self.add('const', (), value)
+
+    def op(self, kind, *inputs):
+        return self.add(kind, inputs)
+
+    def sum(self, items):
+        result = items[0]
+        for item in items[1:]:
+            result = self.op('add', result, item)
+        return result
+
+    def _components(self, node):
+        return tuple(self.add('item', (node,), i) for i in range(3))
+
+    def scalar(self, field, coords):
+        """
+        Add nodes calculating scalar field at points with given coordinate
+        nodes; return index of the resulting node.
+        """
+        key = (id(field), coords)
+        if key not in self._fields:
+            self._fields[key] = (field, self._scalar(field, coords))
+        return self._fields[key][1]
+
+    def vector(self, field, coords):
+        """
+        Add nodes calculating vector field at points with given coordinate
+        nodes; return tuple of indexes of three component nodes.
+        """
+        key = (id(field), coords)
+        if key not in self._fields:
+            self._fields[key] = (field, self._vector(field, coords))
+        return self._fields[key][1]
+
+    def _scalar(self, field, coords):
+        x, y, z = coords
+        op = self.op
+        if isinstance(field, SvConstantScalarField):
+            return self.const(field.value)
+        elif isinstance(field, SvCoordinateScalarField):
+            c = field.coordinate
+            if c in {'X', 'Y', 'Z'}:
+                return coords['XYZ'.index(c)]
+            elif c == 'CYL_RHO':
+                return op('sqrt', op('add', op('mul', x, x), op('mul', y, y)))
+            elif c == 'PHI':
+                return op('atan2', y, x)
+            rho = op('sqrt', self.sum([op('mul', x, x), op('mul', y, y), op('mul', z, z)]))
+            if c == 'SPH_RHO':
+                return rho
+            elif c == 'SPH_THETA':
+                return op('acos', op('div', z, rho))
+        elif isinstance(field, SvScalarFieldBinOp):
+            a = self.scalar(field.field1, coords)
+            b = self.scalar(field.field2, coords)
+            kind = getattr(field, 'op', None)
+            if kind in _SCALAR_BINARY_OPS:
+                return op(_SCALAR_BINARY_OPS[kind], a, b)
+            elif kind == 'AVG':
+                return op('div', op('add', a, b), self.const(2.0))
+            return self.add('call', (a, b), field.function)
+        elif isinstance(field, SvScalarFieldVectorizedFunction):
+            a = self.scalar(field.field, coords)
+            kind = getattr(field, 'op', None)
+            if kind in _SCALAR_UNARY_OPS:
+                return op(_SCALAR_UNARY_OPS[kind], a)
+            elif kind == 'SQR':
+                return op('mul', a, a)
+            elif kind == 'INV':
+                return op('div', self.const(1.0), a)
+            elif kind == 'GAUSS':
+                return op('exp', op('div', op('neg', op('mul', a, a)), self.const(2.0)))
+            return self.add('call', (a,), field.function)
+        elif isinstance(field, SvNegatedScalarField):
+            return op('neg', self.scalar(field.field, coords))
+        elif isinstance(field, SvAbsScalarField):
+            return op('abs', self.scalar(field.field, coords))
+        elif isinstance(field, SvVectorFieldsScalarProduct):
+            v1 = self.vector(field.field1, coords)
+            v2 = self.vector(field.field2, coords)
+            return self.sum([op('mul', a, b) for a, b in zip(v1, v2)])
+        elif isinstance(field, SvVectorFieldNorm):
+            v = self.vector(field.field, coords)
+            return op('sqrt', self.sum([op('mul', a, a) for a in v]))
+        elif isinstance(field, SvMergedScalarField):
+            values = [self.scalar(f, coords) for f in field.fields]
+            if field.mode in {'MIN', 'MAX'}:
+                result = values[0]
+                for value in values[1:]:
+                    result = op(field.mode.lower(), result, value)
+                return result
+            elif field.mode == 'SUM':
+                return self.sum(values)
+            elif field.mode == 'AVG':
+                return op('div', self.sum(values), self.const(len(values)))
+            elif field.mode == 'MINDIFF':
+                return self.add('call', values, _minimal_diff)
+        elif isinstance(field, SvVectorScalarFieldComposition):
+            return self.scalar(field.sfield, self.vector(field.vfield, coords))
+        elif isinstance(field, SvVectorFieldDecomposed) and field.coords == 'XYZ':
+            return self.vector(field.vfield, coords)[field.axis]
+        elif isinstance(field, SvScalarFieldLambda) and field.in_field is not None and field.function_numpy is not None:
+            v = self.scalar(field.in_field, coords)
+            return self.add('call', coords + (v,), field.function_numpy)
+        elif isinstance(field, SvCompiledScalarField):
+            return self.scalar(field.field, coords)
+        return self.add('leaf', coords, field)
+
+    def _vector(self, field, coords):
+        x, y, z = coords
+        op = self.op
+        if isinstance(field, SvConstantVectorField):
+            return tuple(self.const(c) for c in field.vector)
+        elif isinstance(field, SvComposedVectorField):
+            v1 = self.scalar(field.sfield1, coords)
+            v2 = self.scalar(field.sfield2, coords)
+            v3 = self.scalar(field.sfield3, coords)
+            if field.coords == 'XYZ':
+                return v1, v2, v3
+            elif field.coords == 'CYL':
+                rho, phi, z = v1, v2, v3
+                return op('mul', rho, op('cos', phi)), op('mul', rho, op('sin', phi)), z
+            else: # SPH
+                rho, phi, theta = v1, v2, v3
+                r = op('mul', rho, op('sin', theta))
+                return op('mul', r, op('cos', phi)), op('mul', r, op('sin', phi)), op('mul', rho, op('cos', theta))
+        elif isinstance(field, SvAbsoluteVectorField):
+            v = self.vector(field.field, coords)
+            return tuple(op('add', a, c) for a, c in zip(v, coords))
+        elif isinstance(field, SvRelativeVectorField):
+            v = self.vector(field.field, coords)
+            return tuple(op('sub', a, c) for a, c in zip(v, coords))
+        elif isinstance(field, SvVectorFieldBinOp):
+            v1 = self.vector(field.field1, coords)
+            v2 = self.vector(field.field2, coords)
+            kind = getattr(field, 'op', None)
+            if kind in {'ADD', 'SUB'}:
+                return tuple(op(kind.lower(), a, b) for a, b in zip(v1, v2))
+            elif kind == 'AVG':
+                two = self.const(2.0)
+                return tuple(op('div', op('add', a, b), two) for a, b in zip(v1, v2))
+            function = field.function
+            def call(x1, y1, z1, x2, y2, z2):
+                return function(np.array([x1, y1, z1]), np.array([x2, y2, z2]))
+            return self._components(self.add('vcall', v1 + v2, call))
+        elif isinstance(field, SvAverageVectorField):
+            vectors = [self.vector(f, coords) for f in field.fields]
+            count = self.const(len(vectors))
+            return tuple(op('div', self.sum(list(cs)), count) for cs in zip(*vectors))
+        elif isinstance(field, SvVectorFieldCrossProduct):
+            x1, y1, z1 = self.vector(field.field1, coords)
+            x2, y2, z2 = self.vector(field.field2, coords)
+            return (op('sub', op('mul', y1, z2), op('mul', z1, y2)),
+                    op('sub', op('mul', z1, x2), op('mul', x1, z2)),
+                    op('sub', op('mul', x1, y2), op('mul', y1, x2)))
+        elif isinstance(field, SvVectorFieldMultipliedByScalar):
+            s = self.scalar(field.scalar_field, coords)
+            v = self.vector(field.vector_field, coords)
+            return tuple(op('mul', s, a) for a in v)
+        elif isinstance(field, SvVectorFieldsLerp):
+            s = self.scalar(field.scalar_field, coords)
+            v1 = self.vector(field.vfield1, coords)
+            v2 = self.vector(field.vfield2, coords)
+            t = op('sub', self.const(1.0), s)
+            return tuple(op('add', op('mul', t, a), op('mul', s, b)) for a, b in zip(v1, v2))
+        elif isinstance(field, SvVectorFieldComposition):
+            return self.vector(field.field2, self.vector(field.field1, coords))
+        elif isinstance(field, SvVectorFieldLambda) and field.in_field is not None and field.function_numpy is not None:
+            v = self.vector(field.in_field, coords)
+            function = field.function_numpy
+            def call(xs, ys, zs, vx, vy, vz):
+                return function(xs, ys, zs, np.array([vx, vy, vz]))
+            return self._components(self.add('vcall', coords + v, call))
+        elif isinstance(field, SvCompiledVectorField):
+            return self.vector(field.field, coords)
+        return self._components(self.add('vleaf', coords, field))
+
+    def live_nodes(self):
+        """
+        Indexes of nodes which are needed to calculate outputs, in topological order.
+        """
+        key = (tuple(self.outputs), len(self.nodes))
+        if self._live is None or self._live[0] != key:
+            live = set(self.outputs)
+            for idx in range(len(self.nodes)-1, -1, -1):
+                if idx in live:
+                    live.update(self.nodes[idx][1])
+            self._live = (key, sorted(live))
+        return self._live[1]
+
+    def is_trivial(self):
+        """
+        True if the graph is just one opaque field evaluated at input points,
+        so compiling it does not make sense.
+        """
+        live = [idx for idx in self.live_nodes() if self.nodes[idx][0] not in {'input', 'item'}]
+        return len(live) == 1 and self.nodes[live[0]][0] in {'leaf', 'vleaf'}
+
+    def evaluate_chunk(self, xs, ys, zs):
+        """
+        Evaluate graph outputs at points given by three arrays.
+        Returns list of values of output nodes.
+        """
+        n = len(xs)
+        nodes = self.nodes
+        live = self.live_nodes()
+        last_use = dict()
+        for idx in live:
+            for i in nodes[idx][1]:
+                last_use[i] = idx
+        for idx in self.outputs:
+            last_use[idx] = len(nodes)
+
+        values = dict()
+        owned = set()
+        inputs = (xs, ys, zs)
+        for idx in live:
+            kind, args, payload = nodes[idx]
+            if kind == 'input':
+                value = inputs[payload]
+            elif kind == 'const':
+                value = payload
+            elif kind == 'item':
+                value = values[args[0]][payload]
+            elif kind in ELEMENTARY_OPS:
+                function = ELEMENTARY_OPS[kind][0]
+                arrays = [values[i] for i in args]
+                first = args[0]
+                if first in owned and last_use[first] == idx and all(np.shape(a) in {(), (n,)} for a in arrays):
+                    # The buffer of the first argument is not needed anymore; reuse it
+                    value = function(*arrays, out=arrays[0])
+                    owned.discard(first)
+                    owned.add(idx)
+                else:
+                    value = function(*arrays)
+                    if isinstance(value, np.ndarray) and value.shape == (n,) and value.dtype == np.float64:
+                        owned.add(idx)
+            elif kind in {'leaf', 'vleaf'}:
+                value = payload.evaluate_grid(*[_as_array(values[i], n) for i in args])
+            else: # call, vcall
+                value = payload(*[_as_array(values[i], n) for i in args])
+            values[idx] = value
+            for i in set(args):
+                if last_use.get(i) == idx:
+                    del values[i]
+        return [values[idx] for idx in self.outputs]
+
+    def kernel_source(self, name=None):
+        """
+        Python source code of a function, which evaluates the graph for
+        each point in one loop, or None if the graph contains opaque
+        nodes which depend on anything but input coordinates.
+
+        The generated function has signature
+        (n, xs, ys, zs, a0, a1, ..., out0, out1, ...), where a_i are
+        precalculated values of opaque nodes (see opaque_nodes()).
+        """
+        nodes = self.nodes
+        live = self.live_nodes()
+        if self.opaque_nodes() is None:
+            return None
+        arrays = {idx : k for k, idx in enumerate(self.kernel_arrays())}
+
+        def ref(idx):
+            kind, _, payload = nodes[idx]
+            if kind == 'const':
+                return '(' + repr(payload) + ')'
+            return 'v' + str(idx)
+
+        lines = []
+        for idx in live:
+            kind, args, payload = nodes[idx]
+            if kind == 'input':
+                lines.append(f"v{idx} = {'xyz'[payload]}s[i]")
+            elif idx in arrays:
+                lines.append(f"v{idx} = a{arrays[idx]}[i]")
+            elif kind in ELEMENTARY_OPS:
+                template = ELEMENTARY_OPS[kind][1]
+                lines.append(f"v{idx} = " + template.format(*[ref(i) for i in args]))
+        for k, idx in enumerate(self.outputs):
+            lines.append(f"out{k}[i] = {ref(idx)}")
+
+        params = ['n', 'xs', 'ys', 'zs'] + [f"a{k}" for k in range(len(arrays))] + [f"out{k}" for k in range(len(self.outputs))]
+        body = "\n".join("        " + line for line in lines)
+        if name is None:
+            name = "_sv_fused_" + hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]
+        return f"def {name}({', '.join(params)}):\n    for i in range(n):\n{body}\n"
+
+    def opaque_nodes(self):
+        """
+        Opaque nodes which have to be evaluated before calling the generated
+        kernel, or None if some of them depend on calculated values.
+        """
+        nodes = self.nodes
+        result = []
+        for idx in self.live_nodes():
+            kind, args, _ = nodes[idx]
+            if kind in OPAQUE_SCALAR or kind in OPAQUE_VECTOR:
+                if any(nodes[i][0] not in {'input', 'const'} for i in args):
+                    return None
+                result.append(idx)
+        return result
+
+    def kernel_arrays(self):
+        """
+        Nodes, values of which are passed to the generated kernel as arrays:
+        opaque scalar nodes and used components of opaque vector nodes.
+        """
+        nodes = self.nodes
+        result = []
+        for idx in self.live_nodes():
+            kind, args, _ = nodes[idx]
+            if kind in OPAQUE_SCALAR or (kind == 'item' and nodes[args[0]][0] in OPAQUE_VECTOR):
+                result.append(idx)
+        return result
+
+    def build_kernel(self):
+        """
+        Compile the generated kernel with Numba (when Numba is not available,
+        the kernel is returned as a plain Python function).
+        Returns None if the graph can not be compiled into one loop.
+        """
+        source = self.kernel_source()
+        if source is None:
+            return None
+        namespace = dict(_KERNEL_GLOBALS)
+        exec(source, namespace)
+        name = source[4 : source.index('(')]
+        return njit(nogil=True, error_model='numpy')(namespace[name])
+
+    def evaluate_chunk_kernel(self, kernel, xs, ys, zs, outs):
+        """
+        Evaluate the graph with compiled kernel; results are written into outs.
+        """
+        n = len(xs)
+        nodes = self.nodes
+        inputs = (xs, ys, zs)
+        values = dict()
+        for idx in self.opaque_nodes():
+            kind, args, payload = nodes[idx]
+            args = [inputs[nodes[i][2]] if nodes[i][0] == 'input' else _as_array(nodes[i][2], n) for i in args]
+            if kind in {'leaf', 'vleaf'}:
+                values[idx] = payload.evaluate_grid(*args)
+            else:
+                values[idx] = payload(*args)
+        arrays = []
+        for idx in self.kernel_arrays():
+            kind, args, payload = nodes[idx]
+            if kind == 'item':
+                arrays.append(_as_array(values[args[0]][payload], n))
+            else:
+                arrays.append(_as_array(values[idx], n))
+        kernel(n, xs, ys, zs, *arrays, *outs)
+
+def _evaluate(graph, kernel, chunk_size, xs, ys, zs):
+    xs, ys, zs = np.broadcast_arrays(xs, ys, zs)
+    shape = xs.shape
+    xs, ys, zs = [np.ascontiguousarray(a, dtype=np.float64).ravel() for a in (xs, ys, zs)]
+    n = len(xs)
+    outs = [np.empty(n) for _ in graph.outputs]
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        if kernel is not None:
+            graph.evaluate_chunk_kernel(kernel, xs[start:end], ys[start:end], zs[start:end],
+                        [out[start:end] for out in outs])
+        else:
+            results = graph.evaluate_chunk(xs[start:end], ys[start:end], zs[start:end])
+            for out, result in zip(outs, results):
+                out[start:end] = result
+    return [out.reshape(shape) for out in outs]
+
+class SvCompiledScalarField(SvScalarField):
+    """
+    Scalar field, evaluated by compiled expression graph. Use compile_field() to create.
+    """
+    def __init__(self, field, graph, chunk_size=DEFAULT_CHUNK_SIZE, kernel=None):
+        self.field = field
+        self.graph = graph
+        self.chunk_size = chunk_size
+        self.kernel = kernel
+        self.__description__ = "Compiled({})".format(field)
+
+    def evaluate(self, x, y, z):
+        return self.field.evaluate(x, y, z)
+
+    def evaluate_grid(self, xs, ys, zs):
+        return _evaluate(self.graph, self.kernel, self.chunk_size, xs, ys, zs)[0]
+
+class SvCompiledVectorField(SvVectorField):
+    """
+    Vector field, evaluated by compiled expression graph. Use compile_field() to create.
+    """
+    def __init__(self, field, graph, chunk_size=DEFAULT_CHUNK_SIZE, kernel=None):
+        self.field = field
+        self.graph = graph
+        self.chunk_size = chunk_size
+        self.kernel = kernel
+        self.__description__ = "Compiled({})".format(field)
+
+    def evaluate(self, x, y, z):
+        return self.field.evaluate(x, y, z)
+
+    def evaluate_grid(self, xs, ys, zs):
+        rxs, rys, rzs = _evaluate(self.graph, self.kernel, self.chunk_size, xs, ys, zs)
+        return rxs, rys, rzs
+
+def compile_field(field, chunk_size=DEFAULT_CHUNK_SIZE, jit=False):
+    """
+    Compile scalar or vector field into an expression graph, see module
+    description.
+
+    Args:
+        field: SvScalarField or SvVectorField.
+        chunk_size: number of points to be evaluated at once.
+        jit: if True and Numba is available, compile the graph into one
+            Numba function, if possible.
+
+    Returns:
+        SvCompiledScalarField or SvCompiledVectorField; the field itself if
+        it is already compiled, or if there is nothing to optimize in it.
+    """
+    if isinstance(field, (SvCompiledScalarField, SvCompiledVectorField)):
+        return field
+    graph = SvFieldGraph()
+    if isinstance(field, SvScalarField):
+        graph.outputs = [graph.scalar(field, graph.coords)]
+        compiled_class = SvCompiledScalarField
+    elif isinstance(field, SvVectorField):
+        graph.outputs = list(graph.vector(field, graph.coords))
+        compiled_class = SvCompiledVectorField
+    else:
+        raise TypeError(f"Unsupported field type: {type(field)}")
+    if graph.is_trivial():
+        return field
+    kernel = None
+    if jit and numba is not None:
+        kernel = graph.build_kernel()
+    return compiled_class(field, graph, chunk_size=chunk_size, kernel=kernel)
+
@@ -10,10 +10,7 @@ from mathutils import Matrix, Vector
 
 from sverchok.utils.field.scalar import SvScalarField
 from sverchok.utils.field.vector import SvVectorField
-from sverchok.dependencies import scipy
-
-if scipy is not None:
-    from scipy.interpolate import Rbf
+from sverchok.utils.rbf import SvRbfInterpolator, GLOBAL
 
 ##################
 #                #
@@ -22,9 +19,21 @@ if scipy is not None:
 ##################
 
 class SvRbfScalarField(SvScalarField):
+    """
+    Scalar field defined by RBF interpolator: SvRbfInterpolator
+    (see utils/rbf.py) or scipy.interpolate.Rbf in 1-D mode.
+    """
     def __init__(self, rbf):
         self.rbf = rbf
 
+    @classmethod
+    def from_points(cls, points, values, **kwargs):
+        """
+        Build the field interpolating values in points.
+        Keyword arguments are passed to SvRbfInterpolator.
+        """
+        return SvRbfScalarField(SvRbfInterpolator(points, values, **kwargs))
+
     def evaluate(self, x, y, z):
         return self.rbf(x, y, z)
 
@@ -39,10 +48,28 @@ class SvRbfScalarField(SvScalarField):
 ##################
 
 class SvRbfVectorField(SvVectorField):
+    """
+    Vector field defined by RBF interpolator: SvRbfInterpolator
+    (see utils/rbf.py) or scipy.interpolate.Rbf in N-D mode.
+    If relative is True, the interpolator defines where points
+    are moved to, and the field value is the difference.
+    """
     def __init__(self, rbf, relative = True):
         self.rbf = rbf
         self.relative = relative
 
+    @classmethod
+    def from_points(cls, points, vectors, relative=True, **kwargs):
+        """
+        Build the field interpolating vectors in points.
+        Keyword arguments are passed to SvRbfInterpolator.
+        """
+        points = np.asarray(points)
+        vectors = np.asarray(vectors)
+        if relative:
+            vectors = points + vectors
+        return SvRbfVectorField(SvRbfInterpolator(points, vectors, **kwargs), relative=relative)
+
     def evaluate(self, x, y, z):
         v = self.rbf(x, y, z) 
         if self.relative:
@@ -76,15 +103,16 @@ class SvBvhRbfNormalVectorField(SvVectorField):
             nearest, normal, idx, distance = self.bvh.find_nearest(v)
             if nearest is None:
                 raise Exception("No nearest point on mesh found for vertex %s" % v)
-            x0, y0, z0 = nearest
-            return self.rbf(x0, y0, z0)
+            return tuple(nearest)
 
         points = np.stack((xs, ys, zs)).T
-        vectors = np.vectorize(find, signature='(3)->(3)')(points)
+        nearest = np.array([find(v) for v in points.tolist()])
+        # Interpolate at all nearest points at once
+        vectors = self.rbf(nearest[:,0], nearest[:,1], nearest[:,2])
         R = vectors.T
         return R[0], R[1], R[2]
 
-def mesh_field(bm, function, smooth, epsilon, scale, use_verts=True, use_edges=False, use_faces=False):
+def mesh_field(bm, function, smooth, epsilon, scale, use_verts=True, use_edges=False, use_faces=False, radius=None, mode=GLOBAL):
     src_points = []
     dst_values = []
     if use_verts:
@@ -116,15 +144,12 @@ def mesh_field(bm, function, smooth, epsilon, scale, use_verts=True, use_edges=F
     src_points = np.array(src_points)
     dst_values = np.array(dst_values)
 
-    xs_from = src_points[:,0]
-    ys_from = src_points[:,1]
-    zs_from = src_points[:,2]
-
-    rbf = Rbf(xs_from, ys_from, zs_from, dst_values,
+    rbf = SvRbfInterpolator(src_points, dst_values,
             function = function,
             smooth = smooth,
             epsilon = epsilon,
-            mode = '1-D')
+            radius = radius,
+            mode = mode)
 
     return SvRbfScalarField(rbf)
 
@@ -15,6 +15,8 @@ from mathutils import bvhtree
 from sverchok.utils.math import from_cylindrical, from_spherical, to_cylindrical, to_spherical
 from sverchok.utils.geom import LineEquation, CircleEquation3D
 from sverchok.utils.kdtree import SvKdTree
+from sverchok.utils.field.derivatives import (SvJet, jet_functions, jet_compose,
+            falloff_jet, finite_difference_jet)
 
 ##################
 #                #
@@ -22,6 +24,30 @@ from sverchok.utils.kdtree import SvKdTree
 #                #
 ##################
 
+# Operations of Scalar Field Math node, applied to jets (see utils.field.derivatives)
+_JET_BINARY_OPS = {
+    'ADD': lambda a, b: a + b,
+    'SUB': lambda a, b: a - b,
+    'MUL': lambda a, b: a * b,
+    'DIV': lambda a, b: a / b,
+    'POW': lambda a, b: a ** b,
+    'MIN': jet_functions['minimum'],
+    'MAX': jet_functions['maximum'],
+    'AVG': lambda a, b: (a + b) / 2.0,
+}
+
+_JET_UNARY_OPS = {op : jet_functions[name] for op, name in [
+        ('SIN', 'sin'), ('COS', 'cos'), ('TAN', 'tan'), ('ASIN', 'asin'),
+        ('ACOS', 'acos'), ('ATAN', 'atan'), ('EXP', 'exp'), ('LOG', 'log'),
+        ('SINH', 'sinh'), ('COSH', 'cosh'), ('TANH', 'tanh'), ('ASINH', 'asinh'),
+        ('ACOSH', 'acosh'), ('ATANH', 'atanh'), ('SQRT', 'sqrt'), ('ABS', 'abs')]}
+_JET_UNARY_OPS.update({
+    'NEG': lambda a: -a,
+    'SQR': lambda a: a * a,
+    'INV': lambda a: a.reciprocal(),
+    'GAUSS': lambda a: jet_functions['exp'](-a*a/2.0),
+})
+
 class SvScalarField(object):
 
     def __repr__(self):
@@ -51,7 +77,43 @@ class SvScalarField(object):
         dv_dz = (v_dz_plus - v_dz_minus) / (2*step)
         return np.array([dv_dx, dv_dy, dv_dz])
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        """
+        Values of the field with analytically calculated derivatives.
+
+        Args:
+            xs, ys, zs: coordinates of points, arrays of shape (n,).
+            order: 1 to calculate only gradients, 2 to calculate also
+                Hessian matrices.
+
+        Returns:
+            SvJet instance, or None if the field can not calculate its
+            derivatives analytically.
+        """
+        return None
+
+    def derivatives_grid(self, xs, ys, zs, step=0.001, order=2):
+        """
+        Values of the field with derivatives, as SvJet instance. Derivatives
+        are calculated analytically if the field supports it (see jet_grid),
+        otherwise with finite differences with specified step.
+        """
+        jet = self.jet_grid(xs, ys, zs, order=order)
+        if jet is None:
+            jet = finite_difference_jet(self, xs, ys, zs, step=step, order=order)
+        return jet
+
+    def hessian_grid(self, xs, ys, zs, step=0.001):
+        """
+        Hessian matrices of the field, as np.array of shape (n, 3, 3).
+        """
+        return self.derivatives_grid(xs, ys, zs, step=step, order=2).hessian
+
     def gradient_grid(self, xs, ys, zs, step=0.001):
+        jet = self.jet_grid(xs, ys, zs, order=1)
+        if jet is not None:
+            return jet.gradient[:,0], jet.gradient[:,1], jet.gradient[:,2]
+
         v_dx_plus = self.evaluate_grid(xs+step, ys,zs)
         v_dx_minus = self.evaluate_grid(xs-step,ys,zs)
         v_dy_plus = self.evaluate_grid(xs, ys+step, zs)
@@ -78,6 +140,9 @@ class SvConstantScalarField(SvScalarField):
         result = np.full_like(xs, self.value, dtype=np.float64)
         return result
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        return SvJet.constant(self.value, len(xs), order)
+
 class SvVectorFieldDecomposed(SvScalarField):
     def __init__(self, vfield, coords, axis):
         self.vfield = vfield
@@ -112,12 +177,33 @@ class SvVectorFieldDecomposed(SvScalarField):
 class SvScalarFieldLambda(SvScalarField):
     __description__ = "Formula"
 
-    def __init__(self, function, variables, in_field, function_numpy = None):
+    def __init__(self, function, variables, in_field, function_numpy = None, function_jet = None):
         self.function = function
         self.function_numpy = function_numpy
+        # Version of the function which accepts SvJet instances, to calculate derivatives
+        self.function_jet = function_jet
         self.variables = variables
         self.in_field = in_field
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        if self.function_jet is None:
+            return None
+        n = len(xs)
+        if self.in_field is None:
+            V = np.zeros(n)
+        else:
+            V = self.in_field.jet_grid(xs, ys, zs, order=order)
+            if V is None:
+                return None
+        x, y, z = SvJet.coordinates(xs, ys, zs, order)
+        try:
+            result = self.function_jet(x, y, z, V)
+        except Exception:
+            # The formula uses something that does not support derivatives
+            # (comparisons, builtin min/max and so on); finite differences will be used.
+            return None
+        return SvJet.lift(result, n, order)
+
     def evaluate_grid(self, xs, ys, zs):
         if self.in_field is None:
             Vs = np.zeros(xs.shape[0])
@@ -182,9 +268,24 @@ class SvScalarFieldPointDistance(SvScalarField):
         else:
             return norm
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        x, y, z = SvJet.coordinates(xs, ys, zs, order)
+        x0, y0, z0 = tuple(self.center)
+        dx, dy, dz = x - x0, y - y0, z - z0
+        if self.metric == 'EUCLIDEAN':
+            norms = jet_functions['sqrt'](dx*dx + dy*dy + dz*dz)
+        elif self.metric == 'MANHATTAN':
+            norms = abs(dx) + abs(dy) + abs(dz)
+        else:
+            return None
+        return falloff_jet(self.falloff, norms)
+
 class SvScalarFieldBinOp(SvScalarField):
-    def __init__(self, field1, field2, function):
+    def __init__(self, field1, field2, function, op=None):
         self.function = function
+        # Optional identifier of the operation (see Scalar Field Math node);
+        # it allows utils.field.graph to compile the operation.
+        self.op = op
         self.field1 = field1
         self.field2 = field2
 
@@ -193,12 +294,24 @@ class SvScalarFieldBinOp(SvScalarField):
 
     def evaluate_grid(self, xs, ys, zs):
         return self.function(self.field1.evaluate_grid(xs, ys, zs), self.field2.evaluate_grid(xs, ys, zs))
+
+    def jet_grid(self, xs, ys, zs, order=2):
+        if self.op not in _JET_BINARY_OPS:
+            return None
+        jet1 = self.field1.jet_grid(xs, ys, zs, order=order)
+        if jet1 is None:
+            return None
+        jet2 = self.field2.jet_grid(xs, ys, zs, order=order)
+        if jet2 is None:
+            return None
+        return _JET_BINARY_OPS[self.op](jet1, jet2)
         #func = lambda xs, ys, zs : self.function(self.field1.evaluate_grid(xs, ys, zs), self.field2.evaluate_grid(xs, ys, zs))
         #return np.vectorize(func, signature="(m),(m),(m)->(m)")(xs, ys, zs)
 
 class SvScalarFieldVectorizedFunction(SvScalarField):
-    def __init__(self, field, function):
+    def __init__(self, field, function, op=None):
         self.function = function
+        self.op = op
         self.field = field
         self.__description__ = function.__name__
 
@@ -208,6 +321,14 @@ class SvScalarFieldVectorizedFunction(SvScalarField):
     def evaluate_grid(self, xs, ys, zs):
         return self.function(self.field.evaluate_grid(xs,ys,zs))
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        if self.op not in _JET_UNARY_OPS:
+            return None
+        jet = self.field.jet_grid(xs, ys, zs, order=order)
+        if jet is None:
+            return None
+        return _JET_UNARY_OPS[self.op](jet)
+
 class SvCoordinateScalarField(SvScalarField):
     def __init__(self, coordinate):
         self.coordinate = coordinate
@@ -251,6 +372,26 @@ class SvCoordinateScalarField(SvScalarField):
         else:
             raise Exception("Unknown variable: " + self.coordinate)
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        x, y, z = SvJet.coordinates(xs, ys, zs, order)
+        sqrt = jet_functions['sqrt']
+        if self.coordinate == 'X':
+            return x
+        elif self.coordinate == 'Y':
+            return y
+        elif self.coordinate == 'Z':
+            return z
+        elif self.coordinate == 'CYL_RHO':
+            return sqrt(x*x + y*y)
+        elif self.coordinate == 'PHI':
+            return jet_functions['atan2'](y, x)
+        elif self.coordinate == 'SPH_RHO':
+            return sqrt(x*x + y*y + z*z)
+        elif self.coordinate == 'SPH_THETA':
+            return jet_functions['acos'](z / sqrt(x*x + y*y + z*z))
+        else:
+            raise Exception("Unknown variable: " + self.coordinate)
+
 class SvNegatedScalarField(SvScalarField):
     def __init__(self, field):
         self.field = field
@@ -263,6 +404,12 @@ class SvNegatedScalarField(SvScalarField):
     def evaluate_grid(self, xs, ys, zs):
         return (- self.field.evaluate_grid(xs, ys, zs))
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        jet = self.field.jet_grid(xs, ys, zs, order=order)
+        if jet is None:
+            return None
+        return -jet
+
 class SvAbsScalarField(SvScalarField):
     def __init__(self, field):
         self.field = field
@@ -275,6 +422,12 @@ class SvAbsScalarField(SvScalarField):
     def evaluate_grid(self, xs, ys, zs):
         return np.abs(self.field.evaluate_grid(xs, ys, zs))
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        jet = self.field.jet_grid(xs, ys, zs, order=order)
+        if jet is None:
+            return None
+        return abs(jet)
+
 class SvVectorFieldsScalarProduct(SvScalarField):
     def __init__(self, field1, field2):
         self.field1 = field1
@@ -351,6 +504,28 @@ class SvMergedScalarField(SvScalarField):
             raise Exception("unsupported operation")
         return value
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        if self.mode not in {'MIN', 'MAX', 'SUM', 'AVG'}:
+            return None
+        jets = []
+        for field in self.fields:
+            jet = field.jet_grid(xs, ys, zs, order=order)
+            if jet is None:
+                return None
+            jets.append(jet)
+        if self.mode == 'MIN':
+            function = jet_functions['minimum']
+        elif self.mode == 'MAX':
+            function = jet_functions['maximum']
+        else:
+            function = jet_functions['add']
+        result = jets[0]
+        for jet in jets[1:]:
+            result = function(result, jet)
+        if self.mode == 'AVG':
+            result = result / len(jets)
+        return result
+
 class SvKdtScalarField(SvScalarField):
     __description__ = "KDT"
 
@@ -380,6 +555,18 @@ class SvKdtScalarField(SvScalarField):
         else:
             return distances
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        if self.kdt.power != 2:
+            return None
+        points = np.stack((xs, ys, zs)).T
+        locs, idxs, distances = self.kdt.query_array(points)
+        # Distance to the nearest vertex; it is constant within Voronoi cell.
+        locs = np.asarray(locs)
+        x, y, z = SvJet.coordinates(xs, ys, zs, order)
+        dx, dy, dz = x - locs[:,0], y - locs[:,1], z - locs[:,2]
+        norms = jet_functions['sqrt'](dx*dx + dy*dy + dz*dz)
+        return falloff_jet(self.falloff, norms)
+
 class SvLineAttractorScalarField(SvScalarField):
     __description__ = "Line Attractor"
 
@@ -412,6 +599,16 @@ class SvLineAttractorScalarField(SvScalarField):
         else:
             return norms
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        direction = np.asarray(self.direction) / np.linalg.norm(self.direction)
+        x, y, z = SvJet.coordinates(xs, ys, zs, order)
+        cx, cy, cz = tuple(self.center)
+        dx, dy, dz = x - cx, y - cy, z - cz
+        dot = dx*direction[0] + dy*direction[1] + dz*direction[2]
+        vx, vy, vz = dx - dot*direction[0], dy - dot*direction[1], dz - dot*direction[2]
+        norms = jet_functions['sqrt'](vx*vx + vy*vy + vz*vz)
+        return falloff_jet(self.falloff, norms)
+
 class SvPlaneAttractorScalarField(SvScalarField):
     __description__ = "Plane Attractor"
 
@@ -444,6 +641,13 @@ class SvPlaneAttractorScalarField(SvScalarField):
         else:
             return norms
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        direction = np.asarray(self.direction) / np.linalg.norm(self.direction)
+        x, y, z = SvJet.coordinates(xs, ys, zs, order)
+        cx, cy, cz = tuple(self.center)
+        dot = (x - cx)*direction[0] + (y - cy)*direction[1] + (z - cz)*direction[2]
+        return falloff_jet(self.falloff, abs(dot))
+
 class SvCircleAttractorScalarField(SvScalarField):
     __description__ = "Circle Attractor"
 
@@ -469,6 +673,19 @@ class SvCircleAttractorScalarField(SvScalarField):
         else:
             return distances
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        sqrt = jet_functions['sqrt']
+        circle = self.circle
+        normal = np.asarray(circle.normal) / np.linalg.norm(circle.normal)
+        x, y, z = SvJet.coordinates(xs, ys, zs, order)
+        cx, cy, cz = tuple(circle.center)
+        dx, dy, dz = x - cx, y - cy, z - cz
+        height = dx*normal[0] + dy*normal[1] + dz*normal[2]
+        px, py, pz = dx - height*normal[0], dy - height*normal[1], dz - height*normal[2]
+        rho = sqrt(px*px + py*py + pz*pz)
+        distances = sqrt((rho - circle.radius)**2 + height*height)
+        return falloff_jet(self.falloff, distances)
+
 class SvBvhAttractorScalarField(SvScalarField):
     __description__ = "BVH Attractor"
 
@@ -598,6 +815,16 @@ class SvVectorScalarFieldComposition(SvScalarField):
         vx1, vy1, vz1 = self.vfield.evaluate_grid(xs, ys, zs)
         return self.sfield.evaluate_grid(vx1, vy1, vz1)
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        inner = self.vfield.jet_grid(xs, ys, zs, order=order)
+        if inner is None:
+            return None
+        vx, vy, vz = [jet.value for jet in inner]
+        outer = self.sfield.jet_grid(vx, vy, vz, order=order)
+        if outer is None:
+            return None
+        return jet_compose(outer, inner)
+
 class SvVectorFieldDivergence(SvScalarField):
     def __init__(self, field, step):
         self.field = field
@@ -620,19 +847,8 @@ class SvVectorFieldDivergence(SvScalarField):
         return dx_dx + dy_dy + dz_dz
     
     def evaluate_grid(self, xs, ys, zs):
-        step = self.step
-        xs_dx_plus, _, _ = self.field.evaluate_grid(xs+step, ys,zs)
-        xs_dx_minus, _, _ = self.field.evaluate_grid(xs-step,ys,zs)
-        _, ys_dy_plus, _ = self.field.evaluate_grid(xs, ys+step, zs)
-        _, ys_dy_minus, _ = self.field.evaluate_grid(xs, ys-step, zs)
-        _, _, zs_dz_plus = self.field.evaluate_grid(xs, ys, zs+step)
-        _, _, zs_dz_minus = self.field.evaluate_grid(xs, ys, zs-step)
-
-        dx_dx = (xs_dx_plus - xs_dx_minus) / (2*step)
-        dy_dy = (ys_dy_plus - ys_dy_minus) / (2*step)
-        dz_dz = (zs_dz_plus - zs_dz_minus) / (2*step)
-
-        return dx_dx + dy_dy + dz_dz
+        jacobian = self.field.jacobian_grid(xs, ys, zs, step=self.step)
+        return np.trace(jacobian, axis1=1, axis2=2)
 
 class SvScalarFieldLaplacian(SvScalarField):
     def __init__(self, field, step):
@@ -641,32 +857,11 @@ class SvScalarFieldLaplacian(SvScalarField):
         self.__description__ = "Laplace({})".format(field)
 
     def evaluate(self, x, y, z):
-        step = self.step
-        v_dx_plus = self.field.evaluate(x+step,y,z)
-        v_dx_minus = self.field.evaluate(x-step,y,z)
-        v_dy_plus = self.field.evaluate(x, y+step, z)
-        v_dy_minus = self.field.evaluate(x, y-step, z)
-        v_dz_plus = self.field.evaluate(x, y, z+step)
-        v_dz_minus = self.field.evaluate(x, y, z-step)
-        v0 = self.field.evaluate(x, y, z)
-
-        sides = v_dx_plus + v_dx_minus + v_dy_plus + v_dy_minus + v_dz_plus + v_dz_minus
-        result = (sides - 6*v0) / (8 * step * step * step)
-        return result
-    
+        return self.evaluate_grid(np.array([x]), np.array([y]), np.array([z]))[0]
+
     def evaluate_grid(self, xs, ys, zs):
-        step = self.step
-        v_dx_plus = self.field.evaluate_grid(xs+step, ys,zs)
-        v_dx_minus = self.field.evaluate_grid(xs-step,ys,zs)
-        v_dy_plus = self.field.evaluate_grid(xs, ys+step, zs)
-        v_dy_minus = self.field.evaluate_grid(xs, ys-step, zs)
-        v_dz_plus = self.field.evaluate_grid(xs, ys, zs+step)
-        v_dz_minus = self.field.evaluate_grid(xs, ys, zs-step)
-        v0 = self.field.evaluate_grid(xs, ys, zs)
-
-        sides = v_dx_plus + v_dx_minus + v_dy_plus + v_dy_minus + v_dz_plus + v_dz_minus
-        result = (sides - 6*v0) / (8 * step * step * step)
-        return result
+        hessian = self.field.hessian_grid(xs, ys, zs, step=self.step)
+        return np.trace(hessian, axis1=1, axis2=2)
 
 class ScalarFieldCurvatureCalculator(object):
     # Ref.: Curvature formulas for implicit curves and surfaces // Ron Goldman // doi:10.1016/j.cagd.2005.06.005
@@ -675,40 +870,28 @@ class ScalarFieldCurvatureCalculator(object):
         self.step = step
         self.prev_xs = self.prev_ys = self.prev_zs = None
 
-    def prepare(self, xs, ys, zs):
-        #if (xs == self.prev_xs).all() and (ys == self.prev_ys).all() and (zs == self.prev_zs).all():
-        #    return
-        self.prev_xs = xs
-        self.prev_ys = ys
-        self.prev_zs = zs
+    def _is_prepared(self, xs, ys, zs):
+        if self.prev_xs is None:
+            return False
+        return all(np.array_equal(prev, new) for prev, new in
+                    zip((self.prev_xs, self.prev_ys, self.prev_zs), (xs, ys, zs)))
 
-        step = self.step
-        step2 = step*step
-        n = self.n = len(xs)
-        v_dx_plus = self.field.evaluate_grid(xs+step, ys,zs)
-        v_dx_minus = self.field.evaluate_grid(xs-step,ys,zs)
-        v_dy_plus = self.field.evaluate_grid(xs, ys+step, zs)
-        v_dy_minus = self.field.evaluate_grid(xs, ys-step, zs)
-        v_dz_plus = self.field.evaluate_grid(xs, ys, zs+step)
-        v_dz_minus = self.field.evaluate_grid(xs, ys, zs-step)
-
-        v_dxy_plus = self.field.evaluate_grid(xs+step, ys+step, zs)
-        v_dyz_plus = self.field.evaluate_grid(xs, ys+step, zs+step)
-        v_dxz_plus = self.field.evaluate_grid(xs+step, ys, zs+step)
-
-        v0 = self.v0 = self.field.evaluate_grid(xs, ys, zs)
-
-        self.dx = (v_dx_plus - v0) / step
-        self.dy = (v_dy_plus - v0) / step
-        self.dz = (v_dz_plus - v0) / step
-
-        self.dxx = (v_dx_plus - 2*v0 + v_dx_minus) / step2
-        self.dyy = (v_dy_plus - 2*v0 + v_dy_minus) / step2
-        self.dzz = (v_dz_plus - 2*v0 + v_dz_minus) / step2
-
-        self.dxy = (v_dxy_plus - v_dx_plus - v_dy_plus + v0) / step2
-        self.dyz = (v_dyz_plus - v_dy_plus - v_dz_plus + v0) / step2
-        self.dxz = (v_dxz_plus - v_dx_plus - v_dz_plus + v0) / step2
+    def prepare(self, xs, ys, zs):
+        # Gauss, mean and principal curvature fields share one calculator;
+        # do not calculate derivatives again for the same points.
+        if self._is_prepared(xs, ys, zs):
+            return
+        self.prev_xs = np.array(xs)
+        self.prev_ys = np.array(ys)
+        self.prev_zs = np.array(zs)
+
+        self.n = len(xs)
+        jet = self.field.derivatives_grid(xs, ys, zs, step=self.step, order=2)
+        self.v0 = jet.value
+        self.dx, self.dy, self.dz = jet.gradient.T
+        H = jet.hessian
+        self.dxx, self.dyy, self.dzz = H[:,0,0], H[:,1,1], H[:,2,2]
+        self.dxy, self.dyz, self.dxz = H[:,0,1], H[:,1,2], H[:,0,2]
 
     def gauss(self):
         n = self.n
@@ -12,11 +12,14 @@ from mathutils import Vector
 from mathutils import bvhtree
 from mathutils import kdtree
 from mathutils import noise
-from sverchok.utils.curve import SvCurveLengthSolver, SvNormalTrack, MathutilsRotationCalculator
+from sverchok.utils.curve import SvCurveLengthSolver, MathutilsRotationCalculator, DifferentialRotationCalculator
 from sverchok.utils.geom import LineEquation, CircleEquation3D
 from sverchok.utils.math import from_cylindrical, from_spherical, np_dot
 from sverchok.utils.kdtree import SvKdTree
 from sverchok.utils.field.voronoi import SvVoronoiFieldData
+from sverchok.utils.sv_noise_np import get_noise
+from sverchok.utils.field.derivatives import (SvJet, jet_functions, jet_compose,
+            finite_difference_jacobian)
 
 ##################
 #                #
@@ -38,6 +41,27 @@ class SvVectorField(object):
     def evaluate_grid(self, xs, ys, zs):
         raise Exception("not implemented")
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        """
+        Components of the field with analytically calculated derivatives.
+
+        Returns:
+            tuple of three SvJet instances, or None if the field can not
+            calculate its derivatives analytically.
+        """
+        return None
+
+    def jacobian_grid(self, xs, ys, zs, step=0.001):
+        """
+        Jacobian matrices of the field, as np.array of shape (n, 3, 3);
+        J[:, i, j] = d v_i / d x_j. Calculated analytically if the field
+        supports it (see jet_grid), otherwise with finite differences.
+        """
+        jets = self.jet_grid(xs, ys, zs, order=1)
+        if jets is None:
+            return finite_difference_jacobian(self, xs, ys, zs, step=step)
+        return np.stack([jet.gradient for jet in jets], axis=1)
+
 class SvMatrixVectorField(SvVectorField):
 
     def __init__(self, matrix):
@@ -56,6 +80,12 @@ class SvMatrixVectorField(SvVectorField):
         R = np.apply_along_axis(lambda v : matrix @ v + translation - v, 1, points).T
         return R[0], R[1], R[2]
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        matrix = np.array(self.matrix.to_3x3()) - np.eye(3)
+        translation = np.array(self.matrix.translation)
+        x, y, z = SvJet.coordinates(xs, ys, zs, order)
+        return tuple(x*matrix[i,0] + y*matrix[i,1] + z*matrix[i,2] + translation[i] for i in range(3))
+
 class SvConstantVectorField(SvVectorField):
 
     def __init__(self, vector):
@@ -72,6 +102,10 @@ class SvConstantVectorField(SvVectorField):
         rz = np.full_like(zs, z)
         return rx, ry, rz
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        n = len(xs)
+        return tuple(SvJet.constant(c, n, order) for c in self.vector)
+
 class SvComposedVectorField(SvVectorField):
     def __init__(self, coords, sfield1, sfield2, sfield3):
         self.coords = coords
@@ -106,6 +140,23 @@ class SvComposedVectorField(SvVectorField):
             vectors = np.apply_along_axis(lambda v: np.array(from_spherical(*tuple(v), mode='radians')), 1, vectors).T
             return vectors[0], vectors[1], vectors[2]
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        jets = []
+        for field in [self.sfield1, self.sfield2, self.sfield3]:
+            jet = field.jet_grid(xs, ys, zs, order=order)
+            if jet is None:
+                return None
+            jets.append(jet)
+        v1, v2, v3 = jets
+        sin, cos = jet_functions['sin'], jet_functions['cos']
+        if self.coords == 'XYZ':
+            return v1, v2, v3
+        elif self.coords == 'CYL':
+            return v1*cos(v2), v1*sin(v2), v3
+        else: # SPH
+            rho_sin = v1*sin(v3)
+            return rho_sin*cos(v2), rho_sin*sin(v2), v1*cos(v3)
+
 class SvAbsoluteVectorField(SvVectorField):
     def __init__(self, field):
         self.field = field
@@ -119,6 +170,13 @@ class SvAbsoluteVectorField(SvVectorField):
         rxs, rys, rzs = self.field.evaluate_grid(xs, ys, zs)
         return rxs + xs, rys + ys, rzs + zs
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        jets = self.field.jet_grid(xs, ys, zs, order=order)
+        if jets is None:
+            return None
+        coords = SvJet.coordinates(xs, ys, zs, order)
+        return tuple(jet + c for jet, c in zip(jets, coords))
+
 class SvRelativeVectorField(SvVectorField):
     def __init__(self, field):
         self.field = field
@@ -132,16 +190,44 @@ class SvRelativeVectorField(SvVectorField):
         rxs, rys, rzs = self.field.evaluate_grid(xs, ys, zs)
         return rxs - xs, rys - ys, rzs - zs
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        jets = self.field.jet_grid(xs, ys, zs, order=order)
+        if jets is None:
+            return None
+        coords = SvJet.coordinates(xs, ys, zs, order)
+        return tuple(jet - c for jet, c in zip(jets, coords))
+
 class SvVectorFieldLambda(SvVectorField):
 
     __description__ = "Formula"
 
-    def __init__(self, function, variables, in_field, function_numpy = None):
+    def __init__(self, function, variables, in_field, function_numpy = None, function_jet = None):
         self.function = function
         self.function_numpy = function_numpy
+        # Version of the function which accepts SvJet instances, to calculate derivatives
+        self.function_jet = function_jet
         self.variables = variables
         self.in_field = in_field
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        if self.function_jet is None:
+            return None
+        n = len(xs)
+        if self.in_field is None:
+            V = np.zeros((3, n))
+        else:
+            V = self.in_field.jet_grid(xs, ys, zs, order=order)
+            if V is None:
+                return None
+        x, y, z = SvJet.coordinates(xs, ys, zs, order)
+        try:
+            result = self.function_jet(x, y, z, V)
+        except Exception:
+            # The formula uses something that does not support derivatives;
+            # finite differences will be used.
+            return None
+        return tuple(SvJet.lift(r, n, order) for r in result)
+
     def evaluate_grid(self, xs, ys, zs):
         if self.in_field is None:
             Vs = np.zeros(xs.shape[0])
@@ -163,8 +249,11 @@ class SvVectorFieldLambda(SvVectorField):
         return np.array(self.function(x, y, z, V))
 
 class SvVectorFieldBinOp(SvVectorField):
-    def __init__(self, field1, field2, function):
+    def __init__(self, field1, field2, function, op=None):
         self.function = function
+        # Optional identifier of the operation (see Vector Field Math node);
+        # it allows utils.field.graph to compile the operation.
+        self.op = op
         self.field1 = field1
         self.field2 = field2
         self.__description__ = f"<BinOp ({field1}, {field2})>"
@@ -265,17 +354,25 @@ class SvVectorFieldsLerp(SvVectorField):
             return R[0], R[1], R[2]
 
 class SvNoiseVectorField(SvVectorField):
-    def __init__(self, noise_type, seed):
+    def __init__(self, noise_type, seed, implementation='MATHUTILS'):
         self.noise_type = noise_type
         self.seed = seed
+        # 'MATHUTILS' or 'NUMPY' (see utils.sv_noise_np)
+        self.implementation = implementation
         self.__description__ = "{} noise".format(noise_type)
 
     def evaluate(self, x, y, z):
+        if self.implementation == 'NUMPY':
+            return get_noise(self.seed).noise_vector(np.array([[x, y, z]]), self.noise_type)[0]
         noise.seed_set(self.seed)
         v = noise.noise_vector((x, y, z), noise_basis=self.noise_type)
         return np.array(v)
 
     def evaluate_grid(self, xs, ys, zs):
+        if self.implementation == 'NUMPY':
+            points = np.stack((xs, ys, zs)).T
+            vectors = get_noise(self.seed).noise_vector(points, self.noise_type)
+            return vectors[:,0], vectors[:,1], vectors[:,2]
         noise.seed_set(self.seed)
         def mk_noise(v):
             r = noise.noise_vector(v, noise_basis=self.noise_type)
@@ -776,6 +873,16 @@ class SvVectorFieldComposition(SvVectorField):
         vx1, vy1, vz1 = r
         return self.field2.evaluate_grid(vx1, vy1, vz1)
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        inner = self.field1.jet_grid(xs, ys, zs, order=order)
+        if inner is None:
+            return None
+        vx, vy, vz = [jet.value for jet in inner]
+        outer = self.field2.jet_grid(vx, vy, vz, order=order)
+        if outer is None:
+            return None
+        return tuple(jet_compose(jet, inner) for jet in outer)
+
 class SvScalarFieldGradient(SvVectorField):
     def __init__(self, field, step):
         self.field = field
@@ -788,6 +895,16 @@ class SvScalarFieldGradient(SvVectorField):
     def evaluate_grid(self, xs, ys, zs):
         return self.field.gradient_grid(xs, ys, zs, step=self.step)
 
+    def jet_grid(self, xs, ys, zs, order=2):
+        # Derivatives of the gradient are the Hessian of the scalar field;
+        # third derivatives are not available.
+        if order > 1:
+            return None
+        jet = self.field.jet_grid(xs, ys, zs, order=2)
+        if jet is None:
+            return None
+        return tuple(SvJet(jet.gradient[:,i], jet.hessian[:,i,:]) for i in range(3))
+
 class SvVectorFieldRotor(SvVectorField):
     def __init__(self, field, step):
         self.field = field
@@ -817,26 +934,11 @@ class SvVectorFieldRotor(SvVectorField):
         return np.array([rx, ry, rz])
 
     def evaluate_grid(self, xs, ys, zs):
-        step = self.step
-        _, y_dx_plus, z_dx_plus = self.field.evaluate_grid(xs+step,ys,zs)
-        _, y_dx_minus, z_dx_minus = self.field.evaluate_grid(xs-step,ys,zs)
-        x_dy_plus, _, z_dy_plus = self.field.evaluate_grid(xs, ys+step, zs)
-        x_dy_minus, _, z_dy_minus = self.field.evaluate_grid(xs, ys-step, zs)
-        x_dz_plus, y_dz_plus, _ = self.field.evaluate_grid(xs, ys, zs+step)
-        x_dz_minus, y_dz_minus, _ = self.field.evaluate_grid(xs, ys, zs-step)
-
-        dy_dx = (y_dx_plus - y_dx_minus) / (2*step)
-        dz_dx = (z_dx_plus - z_dx_minus) / (2*step)
-        dx_dy = (x_dy_plus - x_dy_minus) / (2*step)
-        dz_dy = (z_dy_plus - z_dy_minus) / (2*step)
-        dx_dz = (x_dz_plus - x_dz_minus) / (2*step)
-        dy_dz = (y_dz_plus - y_dz_minus) / (2*step)
-
-        rx = dz_dy - dy_dz
-        ry = - (dz_dx - dx_dz)
-        rz = dy_dx - dx_dy
-        R = np.stack((rx, ry, rz))
-        return R[0], R[1], R[2]
+        J = self.field.jacobian_grid(xs, ys, zs, step=self.step)
+        rx = J[:,2,1] - J[:,1,2]
+        ry = J[:,0,2] - J[:,2,0]
+        rz = J[:,1,0] - J[:,0,1]
+        return rx, ry, rz
 
 class SvBendAlongCurveField(SvVectorField):
 
@@ -856,10 +958,8 @@ class SvBendAlongCurveField(SvVectorField):
         self.scale_all = scale_all
         self.up_axis = up_axis
         self.length_mode = length_mode
-        if algorithm == SvBendAlongCurveField.ZERO:
-            self.curve.pre_calc_torsion_integral(resolution)
-        elif algorithm == SvBendAlongCurveField.TRACK_NORMAL:
-            self.normal_tracker = SvNormalTrack(curve, resolution)
+        if algorithm in {SvBendAlongCurveField.FRENET, SvBendAlongCurveField.ZERO, SvBendAlongCurveField.TRACK_NORMAL}:
+            self.calculator = DifferentialRotationCalculator(curve, algorithm, resolution)
         if length_mode == 'L':
             self.length_solver = SvCurveLengthSolver(curve)
             self.length_solver.prepare('SPL', resolution)
@@ -870,7 +970,6 @@ class SvBendAlongCurveField(SvVectorField):
                     self.algorithm, self.scale_all, self.up_axis)
 
     def get_matrices(self, ts, scale):
-        n = len(ts)
         if self.scale_all:
             scale_matrix = np.array([
                 [scale, 0, 0],
@@ -883,22 +982,8 @@ class SvBendAlongCurveField(SvVectorField):
                 [0, 1, 0],
                 [0, 0, 1/scale]
             ])
-        if self.algorithm == SvBendAlongCurveField.FRENET:
-            frenet, _ , _ = self.curve.frame_array(ts)
-            return frenet @ scale_matrix
-        elif self.algorithm == SvBendAlongCurveField.ZERO:
-            frenet, _ , _ = self.curve.frame_array(ts)
-            angles = - self.curve.torsion_integral(ts)
-            zeros = np.zeros((n,))
-            ones = np.ones((n,))
-            row1 = np.stack((np.cos(angles), np.sin(angles), zeros)).T # (n, 3)
-            row2 = np.stack((-np.sin(angles), np.cos(angles), zeros)).T # (n, 3)
-            row3 = np.stack((zeros, zeros, ones)).T # (n, 3)
-            rotation_matrices = np.dstack((row1, row2, row3))
-            return frenet @ rotation_matrices @ scale_matrix
-        elif self.algorithm == SvBendAlongCurveField.TRACK_NORMAL:
-            matrices = self.normal_tracker.evaluate_array(ts)
-            return matrices @ scale_matrix
+        if self.algorithm in {SvBendAlongCurveField.FRENET, SvBendAlongCurveField.ZERO, SvBendAlongCurveField.TRACK_NORMAL}:
+            return self.calculator.get_matrices(ts) @ scale_matrix
         else:
             raise Exception("Unsupported algorithm")
 
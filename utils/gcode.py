@@ -0,0 +1,266 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+G-code generation backend for the Export Gcode node.
+
+Segment lengths, extrusion amounts and Z-hop heights are calculated with
+NumPy for each layer (input curve) at once; G-code lines are formatted in
+chunks with a single string formatting operation per chunk and written
+through a buffered writer.
+"""
+
+import hashlib
+from math import pi
+
+import numpy as np
+
+CONTINUOUS = 'CONT'
+RETRACTION = 'RETR'
+
+FEED_MOVE_FORMAT = 'G1 X%.4f Y%.4f Z%.4f F%.0f\n'
+EXTRUDE_MOVE_FORMAT = 'G1 X%.4f Y%.4f Z%.4f E%.4f\n'
+
+class GcodeSettings(object):
+    """
+    Printing parameters, as they are set up in the Export Gcode node.
+    """
+    def __init__(self, mode=CONTINUOUS,
+                    feed=1000, feed_vertical=500, feed_horizontal=2000,
+                    pull=5.0, push=5.0, dz=2.0,
+                    nozzle=0.4, filament=1.75,
+                    auto_sort=True, close_all=False):
+        self.mode = mode
+        self.feed = feed
+        self.feed_vertical = feed_vertical
+        self.feed_horizontal = feed_horizontal
+        self.pull = pull
+        self.push = push
+        self.dz = dz
+        self.nozzle = nozzle
+        self.filament = filament
+        self.auto_sort = auto_sort
+        self.close_all = close_all
+
+    def as_tuple(self):
+        return (self.mode, self.feed, self.feed_vertical, self.feed_horizontal,
+                self.pull, self.push, self.dz, self.nozzle, self.filament,
+                self.auto_sort, self.close_all)
+
+class GcodeResult(object):
+    """
+    Statistics and preview mesh of exported G-code.
+    """
+    def __init__(self, e, path_length, verts, printed_edges, travel_edges):
+        self.e = e
+        self.path_length = path_length
+        self.verts = verts
+        self.printed_edges = printed_edges
+        self.travel_edges = travel_edges
+
+class SvGcodeWriter(object):
+    """
+    Buffered text writer. Lines are accumulated in memory and passed
+    to the underlying stream in chunks of at least `buffer_size` characters.
+    """
+    def __init__(self, stream, buffer_size=1 << 20, chunk_size=1 << 16):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.chunk_size = chunk_size
+        self._pending = []
+        self._pending_size = 0
+
+    def write(self, text):
+        if not text:
+            return
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self.buffer_size:
+            self.flush()
+
+    def write_moves(self, points, values, line_format):
+        """
+        Write one line per point.
+
+        Args:
+            points: np.array of shape (n, 3).
+            values: np.array of shape (n,) - value of the fourth field (E or F).
+            line_format: %-style format string for one line with four fields.
+        """
+        data = np.empty((len(points), 4))
+        data[:, :3] = points
+        data[:, 3] = values
+        for start in range(0, len(data), self.chunk_size):
+            chunk = data[start : start + self.chunk_size]
+            self.write((line_format * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+    def flush(self):
+        if self._pending:
+            self.stream.write(''.join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+def _per_vertex(values, n):
+    """
+    Flatten per-vertex values and repeat the last one up to length n.
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if len(values) == 0:
+        return np.ones(n)
+    if len(values) >= n:
+        return values[:n]
+    return np.concatenate((values, np.full(n - len(values), values[-1])))
+
+def extrusion_coefficients(layer_heights, flow_mults, nozzle, filament):
+    """
+    Amount of filament to be extruded per unit of path length.
+    The section of extruded line is approximated as rectangle plus circle.
+    """
+    area = layer_heights * nozzle + pi * (layer_heights / 2.0)**2
+    cylinder = pi * (filament / 2.0)**2
+    return flow_mults * area / cylinder
+
+def sort_layers(curves):
+    """
+    Indices of curves in the order of increasing mean Z coordinate.
+    """
+    mean_zs = np.array([curve[:,2].mean() if len(curve) else 0.0 for curve in curves])
+    return np.argsort(mean_zs, kind='stable')
+
+def gcode_inputs_hash(curves, flow_mults, layer_heights, settings, start_code='', end_code=''):
+    """
+    Hash of everything that affects the G-code text.
+    """
+    digest = hashlib.sha1()
+    digest.update(repr(settings.as_tuple()).encode('utf-8'))
+    digest.update(start_code.encode('utf-8'))
+    digest.update(end_code.encode('utf-8'))
+    for curve, flow, layer in zip(curves, flow_mults, layer_heights):
+        for values in (curve, flow, layer):
+            values = np.ascontiguousarray(values, dtype=np.float64)
+            digest.update(str(values.shape).encode('utf-8'))
+            digest.update(values.tobytes())
+    return digest.hexdigest()
+
+def write_gcode(stream, curves, flow_mults, layer_heights, settings, start_code='', end_code=''):
+    """
+    Write G-code for a list of curves (layers) into text stream.
+
+    Args:
+        stream: text stream (for example, an opened file).
+        curves: list of np.arrays of shape (n_i, 3).
+        flow_mults: list of per-vertex flow multipliers; the last value is
+            repeated if the list is shorter than the curve.
+        layer_heights: list of per-vertex layer heights; the same as flow_mults.
+        settings: GcodeSettings instance.
+        start_code, end_code: text to be written at the beginning / at the end.
+
+    Returns:
+        GcodeResult instance.
+    """
+    retraction = settings.mode == RETRACTION
+    if retraction and settings.auto_sort:
+        order = sort_layers(curves)
+        curves = [curves[i] for i in order]
+        flow_mults = [flow_mults[i] for i in order]
+        layer_heights = [layer_heights[i] for i in order]
+
+    writer = SvGcodeWriter(stream)
+    writer.write(start_code)
+
+    e = 0.0
+    maxz = 0.0
+    path_length = 0.0
+    n_verts = 0
+    verts = []
+    printed_edges = []
+    travel_edges = []
+    last_point = None
+    n_curves = len(curves)
+
+    def add_verts(points):
+        nonlocal n_verts
+        verts.append(points)
+        n_verts += len(points)
+        return n_verts - len(points)
+
+    def add_travel(first_idx, count):
+        idxs = np.arange(first_idx, first_idx + count)
+        travel_edges.append(np.stack((idxs[1:], idxs[:-1]), axis=1))
+
+    for i, (curve, flow, layer) in enumerate(zip(curves, flow_mults, layer_heights)):
+        curve = np.asarray(curve, dtype=np.float64)
+        n = len(curve)
+        if n == 0:
+            continue
+        coeffs = extrusion_coefficients(_per_vertex(layer, n), _per_vertex(flow, n),
+                        settings.nozzle, settings.filament)
+        # Running maximum of Z, as of each vertex of this curve
+        zs_max = np.maximum.accumulate(np.maximum(curve[:,2], maxz))
+
+        if last_point is None:
+            writer.write('G92 E0 \n')
+            writer.write_moves(curve[:1], [settings.feed], FEED_MOVE_FORMAT)
+            first_idx = add_verts(curve[:1])
+            points, prev_points, coeffs = curve[1:], curve[:-1], coeffs[1:]
+        elif retraction:
+            hop = zs_max[0] + settings.dz
+            lifted = np.array([[curve[0,0], curve[0,1], hop]])
+            e += settings.push
+            writer.write_moves(lifted, [settings.feed_horizontal], FEED_MOVE_FORMAT)
+            writer.write_moves(curve[:1], [settings.feed_vertical], FEED_MOVE_FORMAT)
+            writer.write('G1 E' + format(e, '.4f') + '\n')
+            add_travel(add_verts(lifted) - 1, 2)
+            first_idx = add_verts(curve[:1])
+            add_travel(first_idx - 1, 2)
+            points, prev_points, coeffs = curve[1:], curve[:-1], coeffs[1:]
+        else:
+            # Continuous mode: extrude all the way from the end of previous curve.
+            first_idx = n_verts
+            points, prev_points = curve, np.concatenate((last_point[np.newaxis], curve[:-1]))
+
+        if len(points):
+            dists = np.linalg.norm(points - prev_points, axis=1)
+            es = e + np.cumsum(dists * coeffs)
+            e = es[-1]
+            path_length += dists.sum()
+            writer.write_moves(points, es, EXTRUDE_MOVE_FORMAT)
+            start = add_verts(points)
+            idxs = np.arange(start, start + len(points))
+            printed_edges.append(np.stack((idxs, idxs - 1), axis=1))
+
+        maxz = zs_max[-1]
+        last_point = curve[-1]
+
+        if retraction:
+            # A single-point curve has nothing to close
+            if settings.close_all and n > 1:
+                dist = np.linalg.norm(curve[0] - curve[-1])
+                e += dist * coeffs[-1]
+                path_length += dist
+                writer.write_moves(curve[:1], [e], EXTRUDE_MOVE_FORMAT)
+                printed_edges.append(np.array([[n_verts - 1, first_idx]]))
+                last_point = curve[0]
+            if i < n_curves - 1:
+                e -= settings.pull
+                writer.write('G0 E' + format(e, '.4f') + '\n')
+                lifted = np.array([[last_point[0], last_point[1], maxz + settings.dz]])
+                writer.write_moves(lifted, [settings.feed_vertical], FEED_MOVE_FORMAT)
+                add_travel(add_verts(np.stack((last_point, lifted[0]))), 2)
+
+    writer.write(end_code)
+    writer.flush()
+
+    def concat(arrays, shape):
+        if arrays:
+            return np.concatenate(arrays)
+        return np.empty(shape)
+
+    return GcodeResult(e, path_length,
+                concat(verts, (0, 3)),
+                concat(printed_edges, (0, 2)).astype(np.int64),
+                concat(travel_edges, (0, 2)).astype(np.int64))
@@ -0,0 +1,295 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Clipping of meshes by sets of half-spaces, implemented with NumPy.
+
+This is used to cut a mesh into cells of 3D Voronoi diagram: each cell is an
+intersection of the mesh with half-spaces bounded by ridge planes of the
+diagram. Faces are stored as arrays of directed edges (face, start, end), so
+one plane cuts all faces at once. The cut is closed by a new "cap" face; this
+is only correct when the mesh is convex, so filling is supported for convex
+closed meshes only (see is_convex_mesh). Without filling, any mesh with
+convex faces can be clipped.
+
+Cells are independent of each other, so clip_cells() processes them in a
+thread pool.
+"""
+
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+class MeshClipError(Exception):
+    """
+    Raised when the mesh can not be clipped by this module (for example,
+    a non-convex face is crossed by a plane more than once). The caller is
+    expected to use another method (e.g. bmesh bisect) for such meshes.
+    """
+    pass
+
+def _face_planes(verts, faces):
+    # Newell normals and centers of faces
+    normals = np.zeros((len(faces), 3))
+    centers = np.zeros((len(faces), 3))
+    for i, face in enumerate(faces):
+        vs = verts[face]
+        nexts = np.roll(vs, -1, axis=0)
+        normals[i] = np.cross(vs, nexts).sum(axis=0)
+        centers[i] = vs.mean(axis=0)
+    norms = np.linalg.norm(normals, axis=1)
+    good = norms > 0
+    normals[good] /= norms[good][:, np.newaxis]
+    return normals, centers, good
+
+def is_convex_mesh(verts, faces, precision=1e-6, closed=True):
+    """
+    Check that the mesh is convex: all vertices are on one side of the plane
+    of each face. If closed is True, also check that each edge is shared by
+    exactly two faces.
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    if len(verts) == 0 or len(faces) == 0:
+        return False
+    if closed:
+        edges = np.array([(a, b) for face in faces for a, b in zip(face, face[1:] + face[:1])])
+        edges.sort(axis=1)
+        _, counts = np.unique(edges, axis=0, return_counts=True)
+        if (counts != 2).any():
+            return False
+    normals, centers, good = _face_planes(verts, faces)
+    if not good.all():
+        return False
+    size = np.linalg.norm(verts.max(axis=0) - verts.min(axis=0))
+    tolerance = precision * max(size, 1.0)
+    offsets = (normals * centers).sum(axis=1)
+    # limit size of (faces x vertices) matrix
+    step = max(1, (1 << 20) // len(verts))
+    for i in range(0, len(faces), step):
+        distances = normals[i:i+step] @ verts.T - offsets[i:i+step][:, np.newaxis]
+        positive = (distances > tolerance).any(axis=1)
+        negative = (distances < -tolerance).any(axis=1)
+        if (positive & negative).any():
+            return False
+    return True
+
+class SvHalfSpaceClipper(object):
+    """
+    Clipper of one mesh by sets of half-spaces.
+
+    Args:
+        verts: vertices of the mesh, list or np.array of shape (n, 3).
+        faces: faces of the mesh, list of lists of indices.
+        fill: whether to close cuts by new faces. This requires the mesh
+            to be convex and closed.
+        precision: vertices closer to the cutting plane than this distance
+            are considered to lie on the plane.
+    """
+    def __init__(self, verts, faces, fill=True, precision=1e-8):
+        self.verts = np.asarray(verts, dtype=np.float64).reshape((-1, 3))
+        self.fill = fill
+        self.precision = precision
+        faces = [list(face) for face in faces if len(face) >= 3]
+        sizes = np.array([len(face) for face in faces], dtype=np.int64)
+        self.n_faces = len(faces)
+        if self.n_faces == 0:
+            self.edge_face = self.edge_start = self.edge_end = np.zeros(0, dtype=np.int64)
+            return
+        self.edge_face = np.repeat(np.arange(self.n_faces), sizes)
+        self.edge_start = np.concatenate(faces).astype(np.int64)
+        starts = np.cumsum(sizes) - sizes
+        nexts = np.arange(len(self.edge_start)) + 1
+        nexts[starts + sizes - 1] = starts
+        self.edge_end = self.edge_start[nexts]
+
+    def _cap(self, verts, points, normal):
+        # Order points of the cap face counterclockwise around the normal
+        # (the cap is convex, since the mesh is convex)
+        x, y, z = normal
+        if abs(x) < 0.9:
+            u = np.array((0.0, z, -y))
+        else:
+            u = np.array((-z, 0.0, x))
+        v = np.array((y*u[2] - z*u[1], z*u[0] - x*u[2], x*u[1] - y*u[0]))
+        vectors = verts[points]
+        vectors = vectors - vectors.mean(axis=0)
+        angles = np.arctan2(vectors @ v, vectors @ u)
+        return points[np.argsort(angles)]
+
+    def _clip_plane(self, state, normal, offset):
+        """
+        Clip by one half-space {X: normal . X <= offset}. Returns new state,
+        or None if nothing is left; and a flag whether the plane cut anything.
+        """
+        verts, e_face, e_a, e_b, n_faces, caps = state
+        d = verts @ normal - offset
+        d[np.abs(d) <= self.precision] = 0.0
+        da, db = d[e_a], d[e_b]
+        if (da <= 0).all():
+            return state, False
+        if (da >= 0).all():
+            return None, True
+
+        in_a, in_b = da <= 0, db <= 0
+        keep = in_a & in_b
+        exits = in_a & ~in_b
+        entries = ~in_a & in_b
+
+        # New vertices at intersections of the plane with crossing edges;
+        # an edge is shared by two faces, so pairs of vertices are made unique
+        crossing = ((da < 0) & (db > 0)) | ((da > 0) & (db < 0))
+        cross_id = np.full(len(e_a), -1, dtype=np.int64)
+        if crossing.any():
+            i0, i1 = e_a[crossing], e_b[crossing]
+            keys, inverse = np.unique(np.minimum(i0, i1) * len(verts) + np.maximum(i0, i1), return_inverse=True)
+            i0, i1 = np.divmod(keys, len(verts))
+            d0, d1 = d[i0], d[i1]
+            t = (d0 / (d0 - d1))[:, np.newaxis]
+            p0 = verts[i0]
+            cross_id[crossing] = len(verts) + inverse.ravel()
+            verts = np.concatenate((verts, p0 + t * (verts[i1] - p0)))
+
+        exit_faces = e_face[exits]
+        exit_points = np.where(da == 0, e_a, cross_id)[exits]
+        # A convex face has at most one exit and one entry point
+        entry_at = np.full(n_faces, -1, dtype=np.int64)
+        entry_at[e_face[entries]] = np.where(db == 0, e_b, cross_id)[entries]
+        entry_points = entry_at[exit_faces]
+        if len(exit_faces) != entries.sum() or len(np.unique(exit_faces)) != len(exit_faces) or (entry_points < 0).any():
+            raise MeshClipError("Face is crossed by the plane more than once")
+
+        # Each cut face gets a new edge from exit point to entry point
+        exits_a = exits & (da < 0)
+        entries_b = entries & (db < 0)
+        closing = exit_points != entry_points
+        new_face = [e_face[keep], e_face[exits_a], e_face[entries_b], exit_faces[closing]]
+        new_a = [e_a[keep], e_a[exits_a], cross_id[entries_b], exit_points[closing]]
+        new_b = [e_b[keep], cross_id[exits_a], e_b[entries_b], entry_points[closing]]
+
+        if self.fill:
+            points = np.unique(np.concatenate((exit_points, entry_points)))
+            # If some face lies in the plane, it is the cap already
+            off_plane = np.bincount(e_face, weights=(da != 0), minlength=n_faces)
+            in_plane = (np.bincount(e_face, minlength=n_faces) > 0) & (off_plane == 0)
+            if len(points) >= 3 and not in_plane.any():
+                cap = self._cap(verts, points, normal)
+                new_face.append(np.full(len(cap), n_faces, dtype=np.int64))
+                new_a.append(cap)
+                new_b.append(np.roll(cap, -1))
+                caps = caps + [n_faces]
+                n_faces += 1
+
+        e_face = np.concatenate(new_face)
+        e_a = np.concatenate(new_a)
+        e_b = np.concatenate(new_b)
+        if len(e_a) == 0:
+            return None, True
+
+        # Drop vertices which are not used anymore
+        used = np.zeros(len(verts), dtype=bool)
+        used[e_a] = True
+        if not used[e_b].all():
+            raise MeshClipError("Face is not closed after clipping")
+        index = np.cumsum(used) - 1
+        return (verts[used], e_face, index[e_a], index[e_b], n_faces, caps), True
+
+    def _to_pydata(self, state):
+        verts, e_face, e_a, e_b, n_faces, caps = state
+        successors = defaultdict(dict)
+        for f, a, b in zip(e_face.tolist(), e_a.tolist(), e_b.tolist()):
+            successors[f][a] = b
+        caps = set(caps)
+        faces = []
+        for f in sorted(successors):
+            if not self.fill and f in caps:
+                continue
+            successor = successors[f]
+            if len(successor) < 3:
+                continue
+            start = next(iter(successor))
+            face = [start]
+            v = successor[start]
+            while v != start:
+                face.append(v)
+                v = successor.get(v)
+                if v is None or len(face) > len(successor):
+                    raise MeshClipError("Face is not a single loop after clipping")
+            faces.append(face)
+        if not faces:
+            return [], [], []
+
+        used = np.unique(np.concatenate(faces))
+        index = np.full(len(verts), -1, dtype=np.int64)
+        index[used] = np.arange(len(used))
+        faces = [index[face].tolist() for face in faces]
+        edges = np.array([(a, b) for face in faces for a, b in zip(face, face[1:] + face[:1])])
+        edges = np.unique(np.sort(edges, axis=1), axis=0)
+        return verts[used].tolist(), edges.tolist(), faces
+
+    def clip(self, normals, offsets):
+        """
+        Clip the mesh by half-spaces {X: normals[i] . X <= offsets[i]}.
+
+        Args:
+            normals: unit normals of planes, np.array of shape (n, 3).
+            offsets: np.array of shape (n,).
+
+        Returns:
+            tuple (verts, edges, faces) of lists; or None if none of the
+            planes cut the mesh.
+        """
+        state = (self.verts, self.edge_face, self.edge_start, self.edge_end, self.n_faces, [])
+        if self.n_faces == 0:
+            return None
+        n_cuts = 0
+        for normal, offset in zip(normals, offsets):
+            state, cut = self._clip_plane(state, normal, offset)
+            n_cuts += cut
+            if state is None:
+                return [], [], []
+        if n_cuts == 0:
+            return None
+        return self._to_pydata(state)
+
+def clip_cells(clipper, cells, workers=None, fallback=None):
+    """
+    Clip the mesh by several sets of half-spaces in a thread pool.
+
+    Args:
+        clipper: SvHalfSpaceClipper instance.
+        cells: list of tuples (normals, offsets), see SvHalfSpaceClipper.clip.
+        workers: number of threads; by default - number of CPUs.
+        fallback: function to be called with the index of a cell when the
+            clipper raises MeshClipError for it; it is called in the calling
+            thread, after all other cells were clipped. If not provided,
+            the exception is propagated.
+
+    Returns:
+        list of results of SvHalfSpaceClipper.clip, in the order of cells.
+    """
+    def clip(cell):
+        try:
+            return clipper.clip(*cell)
+        except MeshClipError as e:
+            if fallback is None:
+                raise
+            return e
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(cells) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(cells))) as executor:
+            results = list(executor.map(clip, cells))
+    else:
+        results = [clip(cell) for cell in cells]
+
+    for i, result in enumerate(results):
+        if isinstance(result, MeshClipError):
+            results[i] = fallback(i)
+    return results
@@ -12,11 +12,105 @@ from sverchok.dependencies import scipy
 
 if scipy is not None:
     from scipy.optimize import root_scalar, root, minimize_scalar, minimize
+    from scipy.spatial import cKDTree
 
 SKIP = 'skip'
 FAIL = 'fail'
 RETURN_NONE = 'none'
 
+# Batched Newton-type method for nearest_point_on_curve / nearest_point_on_surface
+NEWTON = 'NEWTON'
+
+def _nearest_samples(sample_points, src_points):
+    """
+    For each of src_points, return index of the nearest of sample_points.
+    """
+    src_points = np.asarray(src_points).reshape((-1, 3))
+    if len(src_points) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if scipy is not None:
+        _, idxs = cKDTree(sample_points).query(src_points)
+        return idxs
+    kdt = kdtree.KDTree(len(sample_points))
+    for i, v in enumerate(sample_points.tolist()):
+        kdt.insert(v, i)
+    kdt.balance()
+    return np.array([kdt.find(p)[1] for p in src_points])
+
+def project_to_manifold(evaluate, jacobian, src_points, params, lower, upper, second_derivatives=None, tolerance=1e-6, maxiter=50):
+    """
+    Find the nearest points on a curve or surface for many source points at
+    once, by Levenberg-Marquardt iterations. All points which are not
+    converged yet are processed together at each iteration.
+
+    inputs:
+    * evaluate: function (n, k) parameters -> (n, 3) points
+    * jacobian: function (n, k) parameters -> (n, 3, k) derivatives
+    * src_points: np.array of shape (n, 3)
+    * params: initial guess, np.array of shape (n, k)
+    * lower, upper: bounds of parameters, np.arrays of shape (k,)
+    * second_derivatives: optional function (n, k) parameters -> (n, 3, k, k)
+      second derivatives. If provided, Newton steps are made; otherwise,
+      Gauss-Newton steps are made, which converge slowly for points which
+      are far from the manifold.
+    * tolerance: iterations for a point stop when its step is less than this value
+    * maxiter: maximum number of iterations
+
+    output: parameters, np.array of shape (n, k), and points, np.array of shape (n, 3).
+    """
+    params = np.array(params, dtype=np.float64)
+    n, k = params.shape
+    if n == 0:
+        return params, np.zeros((0, 3))
+    points = evaluate(params)
+    lam = np.full(n, 1e-3)
+    active = np.ones(n, dtype=bool)
+    eye = np.eye(k)
+    for i in range(maxiter):
+        idx = np.where(active)[0]
+        if len(idx) == 0:
+            break
+        x = params[idx]
+        r = points[idx] - src_points[idx]
+        J = jacobian(x)
+        JTJ = np.einsum('nik,nil->nkl', J, J)
+        if second_derivatives is not None:
+            JTJ = JTJ + np.einsum('ni,nikl->nkl', r, second_derivatives(x))
+        g = np.einsum('nik,ni->nk', J, r)
+        # Parameters which are at the boundary, with the gradient pointing
+        # outside, are excluded from the step.
+        fixed = ((x <= lower) & (g > 0)) | ((x >= upper) & (g < 0))
+        free = (~fixed).astype(np.float64)
+        JTJ = JTJ * free[:, :, np.newaxis] * free[:, np.newaxis, :]
+        g = g * free
+        diag = np.abs(np.einsum('nkk->nk', JTJ))
+        A = JTJ + (lam[idx][:, np.newaxis] * diag + 1e-12 + fixed)[:, :, np.newaxis] * eye
+        dx = -np.linalg.solve(A, g[:, :, np.newaxis])[:, :, 0]
+        new_x = np.clip(x + dx, lower, upper)
+        new_points = evaluate(new_x)
+        old_distance = (r * r).sum(axis=1)
+        new_r = new_points - src_points[idx]
+        new_distance = (new_r * new_r).sum(axis=1)
+
+        accept = new_distance <= old_distance
+        acc = idx[accept]
+        params[acc] = new_x[accept]
+        step = np.linalg.norm(new_points - points[idx], axis=1)
+        points[acc] = new_points[accept]
+        lam[acc] /= 3.0
+        lam[idx[~accept]] *= 4.0
+
+        # A point is done when it is at the source point, or when the
+        # residual is orthogonal to the manifold (gradient is zero), or when
+        # no step decreasing the distance can be found (precision limit is reached).
+        r_norm = np.sqrt(old_distance)
+        g_norm = np.linalg.norm(g, axis=1)
+        J_norm = np.sqrt((J * J).sum(axis=(1, 2)))
+        orthogonal = g_norm <= tolerance * J_norm * np.maximum(r_norm, 1.0)
+        done = (r_norm < tolerance) | (orthogonal & (step < tolerance)) | (lam[idx] > 1e10)
+        active[idx[done]] = False
+    return params, points
+
 class CurveProjectionResult(object):
     def __init__(self, us, points, source):
         self.us = us
@@ -104,23 +198,9 @@ def nearest_point_on_curve(src_points, curve, samples=10, precise=True, method='
 
     def init_guess(curve, points_from):
         us = np.linspace(t_min, t_max, num=samples)
-
-        points = curve.evaluate_array(us).tolist()
-        #print("P:", points)
-
-        kdt = kdtree.KDTree(len(us))
-        for i, v in enumerate(points):
-            kdt.insert(v, i)
-        kdt.balance()
-
-        us_out = []
-        nearest_out = []
-        for point_from in points_from:
-            nearest, i, distance = kdt.find(point_from)
-            us_out.append(us[i])
-            nearest_out.append(tuple(nearest))
-
-        return us_out, np.array(nearest_out)
+        points = curve.evaluate_array(us)
+        idxs = _nearest_samples(points, np.asarray(points_from))
+        return us[idxs].tolist(), points[idxs]
 
     def goal(t):
         dv = curve.evaluate(t) - np.array(src_point)
@@ -128,7 +208,20 @@ def nearest_point_on_curve(src_points, curve, samples=10, precise=True, method='
 
     init_ts, init_points = init_guess(curve, src_points)
     result_ts = []
-    if precise:
+    if precise and method == NEWTON:
+        ts, points = project_to_manifold(
+                        lambda ts: curve.evaluate_array(ts[:,0]),
+                        lambda ts: curve.tangent_array(ts[:,0])[:, :, np.newaxis],
+                        np.asarray(src_points, dtype=np.float64).reshape((-1, 3)),
+                        np.array(init_ts).reshape((-1, 1)),
+                        np.array([t_min]), np.array([t_max]),
+                        second_derivatives = lambda ts: curve.second_derivative_array(ts[:,0])[:, :, np.newaxis, np.newaxis])
+        result_ts = ts[:,0].tolist()
+        if output_points:
+            return list(zip(result_ts, points))
+        else:
+            return result_ts
+    elif precise:
         for src_point, init_t, init_point in zip(src_points, init_ts, init_points):
             delta_t = (t_max - t_min) / samples
             logger.debug("T_min %s, T_max %s, init_t %s, delta_t %s", t_min, t_max, init_t, delta_t)
@@ -661,23 +754,25 @@ def nearest_point_on_surface(points_from, surface, init_samples=50, precise=True
         us = us.flatten()
         vs = vs.flatten()
 
-        points = surface.evaluate_array(us, vs).tolist()
-
-        kdt = kdtree.KDTree(len(us))
-        for i, v in enumerate(points):
-            kdt.insert(v, i)
-        kdt.balance()
-
-        us_out = []
-        vs_out = []
-        nearest_out = []
-        for point_from in points_from:
-            nearest, i, distance = kdt.find(point_from)
-            us_out.append(us[i])
-            vs_out.append(vs[i])
-            nearest_out.append(tuple(nearest))
-
-        return us_out, vs_out, nearest_out
+        points = surface.evaluate_array(us, vs)
+        idxs = _nearest_samples(points, np.asarray(points_from))
+        return us[idxs].tolist(), vs[idxs].tolist(), points[idxs].tolist()
+
+    def jacobian(uvs):
+        data = surface.derivatives_data_array(uvs[:,0], uvs[:,1])
+        return np.stack((data.du, data.dv), axis=2)
+
+    def second_derivatives(uvs):
+        # finite differences of first derivatives
+        h = 1e-6 * max(u_max - u_min, v_max - v_min)
+        h_u = np.where(uvs[:,0] + h > u_max, -h, h)
+        h_v = np.where(uvs[:,1] + h > v_max, -h, h)
+        zeros = np.zeros(len(uvs))
+        J = jacobian(uvs)
+        J_u = jacobian(uvs + np.stack((h_u, zeros), axis=1))
+        J_v = jacobian(uvs + np.stack((zeros, h_v), axis=1))
+        return np.stack(((J_u - J) / h_u[:, np.newaxis, np.newaxis],
+                         (J_v - J) / h_v[:, np.newaxis, np.newaxis]), axis=3)
 
     def goal(point_from):
         def distance(p):
@@ -686,6 +781,19 @@ def nearest_point_on_surface(points_from, surface, init_samples=50, precise=True
         return distance
 
     init_us, init_vs, init_points = init_guess()
+    if precise and method == NEWTON:
+        uvs, points = project_to_manifold(
+                        lambda uvs: surface.evaluate_array(uvs[:,0], uvs[:,1]),
+                        jacobian,
+                        np.asarray(points_from, dtype=np.float64).reshape((-1, 3)),
+                        np.array([init_us, init_vs]).T.reshape((-1, 2)),
+                        np.array([u_min, v_min]), np.array([u_max, v_max]),
+                        second_derivatives = second_derivatives)
+        if output_points:
+            return uvs[:,0].tolist(), uvs[:,1].tolist(), points.tolist()
+        else:
+            return uvs[:,0].tolist(), uvs[:,1].tolist()
+
     result_us = []
     result_vs = []
     result_points = []
@@ -73,6 +73,13 @@ rbf_functions = [
     ('thin_plate', "Thin Plate", "Thin Plate", 5)
 ]
 
+# Compactly supported RBF functions, see utils/rbf.py
+compact_rbf_functions = [
+    ('wendland_c0', "Wendland C0", "Compactly supported Wendland function, C0 continuous", 6),
+    ('wendland_c2', "Wendland C2", "Compactly supported Wendland function, C2 continuous", 7),
+    ('wendland_c4', "Wendland C4", "Compactly supported Wendland function, C4 continuous", 8)
+]
+
 supported_metrics = [
         ('MANHATTAN', 'Manhattan', "Manhattan distance metric", 0),
         ('DISTANCE', 'Euclidan', "Eudlcian distance metric", 1),
@@ -351,6 +358,85 @@ def np_multiply_matrices_vectors(matrices, vectors):
     r = matrices @ vectors
     return r[:,:,0]
 
+def np_matrices_to_quaternions(matrices):
+    """
+    Convert rotation matrices to unit quaternions (Shepperd's method).
+
+    input: np.array of shape (n, 3, 3)
+    output: np.array of shape (n, 4), quaternions in (w, x, y, z) order.
+    """
+    m = matrices
+    m00, m01, m02 = m[:,0,0], m[:,0,1], m[:,0,2]
+    m10, m11, m12 = m[:,1,0], m[:,1,1], m[:,1,2]
+    m20, m21, m22 = m[:,2,0], m[:,2,1], m[:,2,2]
+    trace = m00 + m11 + m22
+    # pick the biggest of 4w^2, 4x^2, 4y^2, 4z^2 (minus 1) for numerical stability
+    candidates = (trace, m00 - m11 - m22, m11 - m00 - m22, m22 - m00 - m11)
+    case = np.argmax(np.stack(candidates), axis=0)
+    diagonal = np.choose(case, candidates)
+    s = 2.0 * np.sqrt(np.maximum(1.0 + diagonal, 1e-16))
+    quats = np.empty((len(m), 4))
+    quats[:,0] = np.choose(case, (s/4, (m21 - m12)/s, (m02 - m20)/s, (m10 - m01)/s))
+    quats[:,1] = np.choose(case, ((m21 - m12)/s, s/4, (m01 + m10)/s, (m02 + m20)/s))
+    quats[:,2] = np.choose(case, ((m02 - m20)/s, (m01 + m10)/s, s/4, (m12 + m21)/s))
+    quats[:,3] = np.choose(case, ((m10 - m01)/s, (m02 + m20)/s, (m12 + m21)/s, s/4))
+    return quats
+
+def np_quaternions_to_matrices(quats):
+    """
+    Convert quaternions to rotation matrices; the same formula as in
+    mathutils.Quaternion.to_matrix(), quaternions are not normalized.
+
+    input: np.array of shape (n, 4), quaternions in (w, x, y, z) order.
+    output: np.array of shape (n, 3, 3)
+    """
+    w, x, y, z = quats[:,0], quats[:,1], quats[:,2], quats[:,3]
+    matrices = np.empty((len(quats), 3, 3))
+    matrices[:, 0, 0] = 1.0 - 2.0 * (y*y + z*z)
+    matrices[:, 0, 1] = 2.0 * (x*y - w*z)
+    matrices[:, 0, 2] = 2.0 * (x*z + w*y)
+    matrices[:, 1, 0] = 2.0 * (x*y + w*z)
+    matrices[:, 1, 1] = 1.0 - 2.0 * (x*x + z*z)
+    matrices[:, 1, 2] = 2.0 * (y*z - w*x)
+    matrices[:, 2, 0] = 2.0 * (x*z - w*y)
+    matrices[:, 2, 1] = 2.0 * (y*z + w*x)
+    matrices[:, 2, 2] = 1.0 - 2.0 * (x*x + y*y)
+    return matrices
+
+def np_quaternions_nlerp(q1s, q2s, ts):
+    """
+    Normalized linear interpolation of unit quaternions, along the shortest arc.
+
+    input: q1s, q2s - np.arrays of shape (n, 4); ts - np.array of shape (n,)
+    output: np.array of shape (n, 4)
+    """
+    signs = np.where(np_dot(q1s, q2s) < 0, -1.0, 1.0)
+    ts = ts[:, np.newaxis]
+    result = (1.0 - ts) * q1s + ts * signs[:, np.newaxis] * q2s
+    return np_normalize_vectors(result)
+
+def np_quaternions_slerp(q1s, q2s, ts):
+    """
+    Spherical linear interpolation of unit quaternions, along the shortest arc.
+    Falls back to nlerp for (almost) equal quaternions.
+
+    input: q1s, q2s - np.arrays of shape (n, 4); ts - np.array of shape (n,)
+    output: np.array of shape (n, 4)
+    """
+    dots = np_dot(q1s, q2s)
+    q2s = np.where((dots < 0)[:, np.newaxis], -q2s, q2s)
+    dots = np.clip(np.abs(dots), 0.0, 1.0)
+    thetas = np.arccos(dots)
+    sin_thetas = np.sin(thetas)
+    good = sin_thetas > 1e-6
+    result = np_quaternions_nlerp(q1s, q2s, ts)
+    if good.any():
+        theta, sin_theta, t = thetas[good], sin_thetas[good], ts[good]
+        c1 = np.sin((1.0 - t) * theta) / sin_theta
+        c2 = np.sin(t * theta) / sin_theta
+        result[good] = c1[:, np.newaxis] * q1s[good] + c2[:, np.newaxis] * q2s[good]
+    return result
+
 def weighted_center(verts, field=None):
     if field is None:
         return np.mean(verts, axis=0)
@@ -0,0 +1,256 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Ragged (CSR) representation of mesh polygons.
+
+Polygons are stored as one flat array of vertex indices plus an array of
+offsets: polygon number i consists of indices[offsets[i] : offsets[i+1]].
+Such object can be passed through Polygons sockets instead of list of
+lists; nodes which know about it can process all polygons with NumPy at
+once, and for other nodes it behaves as a read-only sequence of lists of
+vertex indices (the lists are built lazily, only once).
+
+Instances must be treated as immutable: nodes that modify topology create
+new instances.
+"""
+
+from itertools import chain
+
+import numpy as np
+
+class SvPolygons(object):
+    """
+    Read-only list of polygons stored as flat array of indices plus offsets.
+
+    * indices: np.array of shape (n,) of vertex indices;
+    * offsets: np.array of shape (k+1,); offsets[0] == 0, offsets[-1] == n.
+    """
+    def __init__(self, indices, offsets):
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self._face_ids = None
+        self._list = None
+
+    @classmethod
+    def from_list(cls, polygons):
+        """
+        Build from list of lists of vertex indices.
+        """
+        lengths = np.fromiter(map(len, polygons), dtype=np.int64, count=len(polygons))
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        indices = np.fromiter(chain.from_iterable(polygons), dtype=np.int64, count=offsets[-1])
+        return cls(indices, offsets)
+
+    @classmethod
+    def from_array(cls, polygons):
+        """
+        Build from np.array of shape (k, n) - k polygons with n sides each.
+        """
+        polygons = np.asarray(polygons, dtype=np.int64)
+        if polygons.ndim != 2:
+            raise ValueError(f"Expected array of shape (k, n), got {polygons.shape}")
+        k, n = polygons.shape
+        return cls(polygons.ravel(), np.arange(k + 1, dtype=np.int64) * n)
+
+    @classmethod
+    def from_data(cls, polygons):
+        """
+        Build from any supported representation of polygons:
+        SvPolygons (returned as is), 2D np.array, or list of lists.
+        """
+        if isinstance(polygons, SvPolygons):
+            return polygons
+        if isinstance(polygons, np.ndarray) and polygons.ndim == 2:
+            return cls.from_array(polygons)
+        return cls.from_list(polygons)
+
+    @property
+    def lengths(self):
+        """Number of sides of each polygon."""
+        return np.diff(self.offsets)
+
+    @property
+    def face_ids(self):
+        """For each item of indices, index of polygon it belongs to."""
+        if self._face_ids is None:
+            self._face_ids = np.repeat(np.arange(len(self), dtype=np.int64), self.lengths)
+        return self._face_ids
+
+    @property
+    def next_ids(self):
+        """For each item of indices, position of the next corner of the same polygon."""
+        result = np.arange(1, len(self.indices) + 1, dtype=np.int64)
+        starts, ends = self.offsets[:-1], self.offsets[1:]
+        nonempty = ends > starts
+        result[ends[nonempty] - 1] = starts[nonempty]
+        return result
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def tolist(self):
+        """
+        Polygons as list of lists of ints. The result is cached, so it must not be modified.
+        """
+        if self._list is None:
+            indices = self.indices.tolist()
+            offsets = self.offsets.tolist()
+            self._list = [indices[start : end] for start, end in zip(offsets[:-1], offsets[1:])]
+        return self._list
+
+    def __getitem__(self, idx):
+        return self.tolist()[idx]
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        lengths = self.lengths
+        if len(lengths) and (lengths == lengths[0]).all():
+            result = self.indices.reshape(len(lengths), lengths[0])
+        else:
+            result = np.empty(len(self), dtype=object)
+            result[:] = self.tolist()
+        if dtype is not None:
+            result = result.astype(dtype)
+        return result
+
+    def __repr__(self):
+        return f"<SvPolygons: {len(self)} polygons, {len(self.indices)} corners>"
+
+    def is_uniform(self):
+        """True if all polygons have the same number of sides."""
+        lengths = self.lengths
+        return len(lengths) == 0 or bool((lengths == lengths[0]).all())
+
+    def by_size(self):
+        """
+        Group polygons by number of sides.
+        Yields tuples (mask, array), where mask is a boolean mask of polygons
+        with n sides, and array is np.array of shape (k, n) of their indices.
+        """
+        lengths = self.lengths
+        starts = self.offsets[:-1]
+        for n in np.unique(lengths):
+            mask = lengths == n
+            array = self.indices[starts[mask][:, np.newaxis] + np.arange(n)]
+            yield mask, array
+
+    def shift(self, n):
+        """
+        Same polygons with all vertex indices increased by n.
+        """
+        return SvPolygons(self.indices + n, self.offsets)
+
+    @staticmethod
+    def concatenate(polygon_sets, shifts=None):
+        """
+        Join several sets of polygons into one.
+
+        Args:
+            polygon_sets: list of SvPolygons (or anything SvPolygons.from_data accepts).
+            shifts: optional list of numbers to be added to vertex indices of
+                each set; when joining meshes, this is the total number of
+                vertices in the previous meshes.
+        """
+        polygon_sets = [SvPolygons.from_data(ps) for ps in polygon_sets]
+        if not polygon_sets:
+            return SvPolygons(np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64))
+        if shifts is None:
+            shifts = [0] * len(polygon_sets)
+        indices = np.concatenate([ps.indices + shift for ps, shift in zip(polygon_sets, shifts)])
+        corner_shifts = np.cumsum([0] + [len(ps.indices) for ps in polygon_sets[:-1]])
+        offsets = np.concatenate([polygon_sets[0].offsets[:1]] +
+                    [ps.offsets[1:] + shift for ps, shift in zip(polygon_sets, corner_shifts)])
+        return SvPolygons(indices, offsets)
+
+    def edges(self, unique=True):
+        """
+        Edges of polygons as np.array of shape (n, 2).
+        If unique is True, each edge is listed once, as (smaller index, bigger index).
+        """
+        edges = np.stack((self.indices, self.indices[self.next_ids]), axis=1)
+        if unique:
+            edges = np.unique(np.sort(edges, axis=1), axis=0)
+        return edges
+
+    def triangulate(self, return_face_index=False):
+        """
+        Fan triangulation: polygon (v0, v1, ... vn) is split into triangles
+        (v0, v1, v2), (v0, v2, v3) ... Correct for convex polygons.
+
+        Returns np.array of shape (m, 3); if return_face_index is True, also
+        np.array of shape (m,) with index of the source polygon of each triangle.
+        """
+        counts = np.maximum(self.lengths - 2, 0)
+        face_index = np.repeat(np.arange(len(self), dtype=np.int64), counts)
+        tri_starts = np.cumsum(counts) - counts
+        local = np.arange(len(face_index), dtype=np.int64) - tri_starts[face_index]
+        starts = self.offsets[face_index]
+        triangles = np.stack((self.indices[starts],
+                              self.indices[starts + local + 1],
+                              self.indices[starts + local + 2]), axis=1)
+        if return_face_index:
+            return triangles, face_index
+        return triangles
+
+    def reduce(self, values):
+        """
+        Sum per-corner values over each polygon.
+
+        Args:
+            values: np.array of shape (n, ...) - one value per item of indices.
+
+        Returns:
+            np.array of shape (k, ...); zero for empty polygons.
+        """
+        values = np.asarray(values)
+        result = np.zeros((len(self),) + values.shape[1:], dtype=values.dtype)
+        starts = self.offsets[:-1]
+        nonempty = self.offsets[1:] > starts
+        if nonempty.any():
+            result[nonempty] = np.add.reduceat(values, starts[nonempty], axis=0)
+        return result
+
+    def centers(self, verts):
+        """
+        Median centers (average of vertices) of polygons, as np.array of shape (k, 3).
+        """
+        verts = np.asarray(verts, dtype=np.float64)
+        lengths = self.lengths
+        return self.reduce(verts[self.indices]) / np.maximum(lengths, 1)[:, np.newaxis]
+
+    def vector_areas(self, verts):
+        """
+        Vector area of each polygon (Newell's method): vector along
+        polygon normal, with length equal to polygon area.
+        """
+        verts = np.asarray(verts, dtype=np.float64)
+        corners = verts[self.indices]
+        # relative to the first vertex of polygon, for better precision far from origin
+        corners -= corners[self.offsets[:-1][self.face_ids]]
+        return 0.5 * self.reduce(np.cross(corners, corners[self.next_ids]))
+
+    def normals(self, verts):
+        """
+        Unit normals of polygons, calculated by Newell's method, so that
+        non-planar polygons get averaged normal. Degenerate polygons get zero normal.
+        """
+        normals = self.vector_areas(verts)
+        lengths = np.linalg.norm(normals, axis=1)
+        nonzero = lengths > 0
+        normals[nonzero] /= lengths[nonzero, np.newaxis]
+        return normals
+
+    def areas(self, verts):
+        """
+        Areas of polygons. For non-planar polygons this is the area of
+        their projection to the plane orthogonal to the averaged normal.
+        """
+        return np.linalg.norm(self.vector_areas(verts), axis=1)
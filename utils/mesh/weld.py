@@ -0,0 +1,392 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Vertex welding ("remove doubles") implemented with NumPy.
+
+Vertices are quantized into a grid of cells of size equal to merge distance,
+so that any two vertices closer than that distance lie either in the same
+cell or in neighbouring cells. Candidate pairs from such cells are checked
+for the true distance. Vertices are then clustered the same way as
+bmesh.ops.remove_doubles does it: in index order, a vertex which was not
+merged yet becomes a seed and captures all not merged vertices within the
+distance from it. So each vertex is merged only into a vertex which is
+closer than the distance, and a chain of vertices, each one close to the
+next, is not collapsed into one vertex. Seeds keep their positions.
+Edges and faces are remapped; degenerate and duplicated edges and faces are
+dropped.
+"""
+
+import numpy as np
+
+# Forward half of 3x3x3 neighbourhood; the other half is covered by symmetry.
+_NEIGHBOUR_OFFSETS = np.array([(dx, dy, dz)
+                        for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                        if (dx, dy, dz) > (0, 0, 0)], dtype=np.int64)
+
+class SvWeldResult(object):
+    """
+    Result of weld_mesh().
+
+    * verts: np.array of shape (n, 3);
+    * edges: np.array of shape (m, 2);
+    * faces: list of lists of vertex indices;
+    * vert_init_index, edge_init_index, face_init_index: indexes of the
+      output elements in the original mesh (-1 for edges that did not exist
+      in the original edges list);
+    * vert_map: for each original vertex, index of output vertex it was merged into;
+    * doubles_mask: for each original vertex, True if it was merged into another one.
+    """
+    def __init__(self):
+        self.verts = None
+        self.edges = None
+        self.faces = None
+        self.vert_init_index = None
+        self.edge_init_index = None
+        self.face_init_index = None
+        self.vert_map = None
+        self.doubles_mask = None
+
+def _cell_keys(cells):
+    """
+    Return function calculating integer keys of grid cells, and shifted cells array.
+    """
+    c_min = cells.min(axis=0)
+    cells = cells - c_min + 1
+    dims = cells.max(axis=0) + 2
+    if np.prod(dims.astype(np.float64)) < 2**62:
+        # Linear index; neighbour cells of sorted cells are sorted as well
+        return lambda c: (c[:,0] * dims[1] + c[:,1]) * dims[2] + c[:,2], cells
+    else:
+        # Spatial hash; collisions only produce extra candidate pairs
+        return lambda c: (c[:,0] * 73856093) ^ (c[:,1] * 19349663) ^ (c[:,2] * 83492791), cells
+
+def _expand_ranges(starts, ends):
+    """
+    For ranges [starts[i]; ends[i]), return (range index, position) for each
+    position of each range.
+    """
+    counts = ends - starts
+    counts[counts < 0] = 0
+    total = counts.sum()
+    owners = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.cumsum(counts) - counts
+    positions = np.arange(total) - np.repeat(offsets - starts, counts)
+    return owners, positions
+
+def find_close_pairs(verts, distance):
+    """
+    Find all pairs of vertices closer than `distance` to each other.
+
+    Returns:
+        np.array of shape (k, 2), with i < j in each pair (i, j).
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    n = len(verts)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    if distance <= 0:
+        # Exact duplicates only
+        _, inverse = np.unique(verts, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='stable')
+        same = inverse[order[1:]] == inverse[order[:-1]]
+        pairs = np.stack((order[:-1][same], order[1:][same]), axis=1)
+        pairs.sort(axis=1)
+        return pairs
+
+    cells = np.floor(verts / distance).astype(np.int64)
+    key_fn, cells = _cell_keys(cells)
+    keys = key_fn(cells)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    # Occupied cells, in order of their keys
+    is_first = np.empty(n, dtype=bool)
+    is_first[0] = True
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=is_first[1:])
+    cell_start = np.flatnonzero(is_first)
+    cell_end = np.append(cell_start[1:], n)
+    cell_keys = sorted_keys[cell_start]
+    cell_coords = cells[order[cell_start]]
+    # cell of each vertex, in sorted order
+    point_cell = np.cumsum(is_first) - 1
+    dist2 = distance * distance
+
+    pairs = []
+
+    def check(i, j):
+        d = verts[i] - verts[j]
+        good = np.einsum('ij,ij->i', d, d) <= dist2
+        return np.stack((i[good], j[good]), axis=1)
+
+    # Pairs within the same cell
+    owners, positions = _expand_ranges(np.arange(1, n + 1), cell_end[point_cell])
+    if len(owners):
+        pairs.append(check(order[owners], order[positions]))
+
+    # Pairs in neighbouring cells
+    n_cells = len(cell_keys)
+    for offset in _NEIGHBOUR_OFFSETS:
+        nb_keys = key_fn(cell_coords + offset)
+        idxs = np.searchsorted(cell_keys, nb_keys)
+        idxs[idxs == n_cells] = 0
+        found = cell_keys[idxs] == nb_keys
+        if not found.any():
+            continue
+        nb_start = np.where(found, cell_start[idxs], 0)
+        nb_end = np.where(found, cell_end[idxs], 0)
+        owners, positions = _expand_ranges(nb_start[point_cell], nb_end[point_cell])
+        if len(owners):
+            pairs.append(check(order[owners], order[positions]))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.concatenate(pairs)
+    pairs = pairs[pairs[:,0] != pairs[:,1]]
+    pairs.sort(axis=1)
+    return pairs
+
+def seed_labels(n, pairs):
+    """
+    Greedy clustering of n items in index order: an item which is not
+    merged yet becomes a seed, and all not merged items paired with it are
+    merged into it.
+
+    Seeds are found by vectorized rounds: an item is merged as soon as one
+    of its lower neighbours is a seed, and becomes a seed when all of its
+    lower neighbours are merged. Long dependency chains, for which such
+    rounds decide few items each, are finished by a sequential pass.
+
+    Args:
+        n: number of items.
+        pairs: np.array of shape (k, 2), with i < j in each pair (i, j).
+
+    Returns:
+        np.array of shape (n,): for each item, index of the seed it was
+        merged into (index of the item itself for seeds).
+    """
+    labels = np.arange(n)
+    if len(pairs) == 0:
+        return labels
+    lo, hi = pairs[:,0], pairs[:,1]
+    UNDECIDED, SEED, MERGED = 0, 1, 2
+    state = np.full(n, SEED, dtype=np.int8)
+    state[hi] = UNDECIDED
+    n_undecided = np.count_nonzero(state == UNDECIDED)
+    while n_undecided:
+        captured = hi[(state[lo] == SEED) & (state[hi] == UNDECIDED)]
+        state[captured] = MERGED
+        blocked = np.zeros(n, dtype=bool)
+        blocked[hi[state[lo] != MERGED]] = True
+        state[(state == UNDECIDED) & ~blocked] = SEED
+        remaining = np.count_nonzero(state == UNDECIDED)
+        progress = n_undecided - remaining
+        n_undecided = remaining
+        if progress * 8 < n_undecided:
+            break
+
+    if n_undecided:
+        # Sequential pass; all lower neighbours of each vertex are decided
+        # by the time it is visited.
+        order = np.argsort(hi, kind='stable')
+        sorted_lo, sorted_hi = lo[order], hi[order]
+        rest = np.flatnonzero(state == UNDECIDED)
+        starts = np.searchsorted(sorted_hi, rest, side='left').tolist()
+        ends = np.searchsorted(sorted_hi, rest, side='right').tolist()
+        sorted_lo = sorted_lo.tolist()
+        states = state.tolist()
+        for v, start, end in zip(rest.tolist(), starts, ends):
+            if any(states[u] == SEED for u in sorted_lo[start:end]):
+                states[v] = MERGED
+            else:
+                states[v] = SEED
+        state = np.array(states, dtype=np.int8)
+
+    # Merged vertex goes to the first seed it is close to
+    seed_pairs = state[lo] == SEED
+    labels[state == MERGED] = n
+    np.minimum.at(labels, hi[seed_pairs], lo[seed_pairs])
+    return labels
+
+def weld_vertices(verts, distance, mask=None):
+    """
+    Find clusters of close vertices, see seed_labels().
+
+    Args:
+        verts: np.array of shape (n, 3).
+        distance: merge distance.
+        mask: optional boolean array of shape (n,); only masked vertices are merged.
+
+    Returns:
+        tuple (vert_map, keep): vert_map[i] is index of output vertex for
+        input vertex i; keep is boolean mask of surviving input vertices.
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    n = len(verts)
+    if mask is not None:
+        idxs = np.flatnonzero(mask)
+        pairs = idxs[find_close_pairs(verts[idxs], distance)]
+    else:
+        pairs = find_close_pairs(verts, distance)
+    labels = seed_labels(n, pairs)
+    keep = labels == np.arange(n)
+    new_index = np.cumsum(keep) - 1
+    return new_index[labels], keep
+
+def _unique_rows_first(keys):
+    """
+    Indexes of first occurrences of unique rows, in order of appearance,
+    and for each row - index of its unique row.
+    """
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[inverse]
+
+def faces_to_csr(faces):
+    """
+    Convert list of faces into flat array of indices and array of face lengths.
+    """
+    if isinstance(faces, np.ndarray) and faces.ndim == 2:
+        return faces.ravel().astype(np.int64), np.full(len(faces), faces.shape[1], dtype=np.int64)
+    lens = np.fromiter((len(f) for f in faces), dtype=np.int64, count=len(faces))
+    if len(faces) == 0:
+        return np.empty((0,), dtype=np.int64), lens
+    flat = np.fromiter((i for f in faces for i in f), dtype=np.int64, count=int(lens.sum()))
+    return flat, lens
+
+def csr_to_faces(flat, lens):
+    if len(lens) == 0:
+        return []
+    if (lens == lens[0]).all():
+        return flat.reshape((len(lens), lens[0])).tolist()
+    flat = flat.tolist()
+    ends = np.cumsum(lens).tolist()
+    starts = [0] + ends[:-1]
+    return [flat[s:e] for s, e in zip(starts, ends)]
+
+def _remap_faces(flat, lens, vert_map):
+    """
+    Remap face indices, collapse repeated consecutive vertices and drop
+    faces that became degenerate or duplicated.
+    Returns (flat, lens, face_init_index).
+    """
+    n_faces = len(lens)
+    if n_faces == 0:
+        return flat, lens, np.empty((0,), dtype=np.int64)
+    flat = vert_map[flat]
+    face_ids = np.repeat(np.arange(n_faces), lens)
+    starts = np.cumsum(lens) - lens
+    next_pos = np.arange(len(flat)) + 1
+    ends = starts + lens
+    last = next_pos == np.repeat(ends, lens)
+    next_pos[last] = np.repeat(starts, lens)[last]
+    good_loop = flat != flat[next_pos]
+
+    new_lens = np.bincount(face_ids[good_loop], minlength=n_faces)
+    flat = flat[good_loop]
+    face_ids = face_ids[good_loop]
+
+    # Faces with repeating non-consecutive vertices are not valid either
+    order = np.lexsort((flat, face_ids))
+    sorted_flat, sorted_ids = flat[order], face_ids[order]
+    repeats = (sorted_flat[1:] == sorted_flat[:-1]) & (sorted_ids[1:] == sorted_ids[:-1])
+    bad = np.zeros(n_faces, dtype=bool)
+    bad[sorted_ids[1:][repeats]] = True
+    good_face = (new_lens >= 3) & ~bad
+
+    # Duplicated faces (same set of vertices)
+    good_idxs = np.flatnonzero(good_face)
+    for size in np.unique(new_lens[good_idxs]):
+        same_size = good_idxs[new_lens[good_idxs] == size]
+        if len(same_size) < 2:
+            continue
+        mask = np.isin(sorted_ids, same_size)
+        keys = sorted_flat[mask].reshape((len(same_size), size))
+        first, _ = _unique_rows_first(keys)
+        duplicated = np.ones(len(same_size), dtype=bool)
+        duplicated[first] = False
+        good_face[same_size[duplicated]] = False
+
+    face_init_index = np.flatnonzero(good_face)
+    loop_mask = good_face[face_ids]
+    return flat[loop_mask], new_lens[good_face], face_init_index
+
+def faces_csr_edges(flat, lens):
+    """
+    Edges of faces given in CSR form, in order of face loops (may contain duplicates).
+    """
+    if len(flat) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    starts = np.cumsum(lens) - lens
+    next_pos = np.arange(len(flat)) + 1
+    last = next_pos == np.repeat(starts + lens, lens)
+    next_pos[last] = np.repeat(starts, lens)[last]
+    return np.stack((flat, flat[next_pos]), axis=1)
+
+def weld_mesh(verts, edges, faces, distance, mask=None, add_face_edges=False):
+    """
+    Merge vertices which are closer than `distance` to each other.
+
+    Args:
+        verts: vertices, list or np.array of shape (n, 3).
+        edges: edges, list or np.array of shape (m, 2).
+        faces: faces, list of lists or np.array.
+        distance: merge distance.
+        mask: optional list of booleans; only masked vertices are merged.
+            The last value is repeated if the list is shorter than verts.
+        add_face_edges: if True, output edges will include edges of all faces
+            (as bmesh does), followed by input edges not belonging to any face.
+
+    Returns:
+        SvWeldResult instance.
+    """
+    verts = np.asarray(verts, dtype=np.float64).reshape((-1, 3))
+    n = len(verts)
+    if mask is not None and len(mask):
+        mask = np.asarray(mask, dtype=bool)
+        if len(mask) < n:
+            mask = np.concatenate((mask, np.full(n - len(mask), mask[-1])))
+        mask = mask[:n]
+    else:
+        mask = None
+
+    vert_map, keep = weld_vertices(verts, distance, mask)
+
+    result = SvWeldResult()
+    result.verts = verts[keep]
+    result.vert_init_index = np.flatnonzero(keep)
+    result.vert_map = vert_map
+    result.doubles_mask = ~keep
+
+    flat, lens = faces_to_csr(faces)
+    flat, lens, result.face_init_index = _remap_faces(flat, lens, vert_map)
+    result.faces = csr_to_faces(flat, lens)
+
+    edges = np.asarray(edges, dtype=np.int64).reshape((-1, 2))
+    edge_idxs = np.arange(len(edges))
+    edges = vert_map[edges]
+    if add_face_edges:
+        face_edges = faces_csr_edges(flat, lens)
+        edges = np.concatenate((face_edges, edges))
+        edge_idxs = np.concatenate((np.full(len(face_edges), -1), edge_idxs))
+    good = edges[:,0] != edges[:,1]
+    edges, edge_idxs = edges[good], edge_idxs[good]
+    if len(edges):
+        first, group = _unique_rows_first(np.sort(edges, axis=1))
+        init_index = np.full(len(first), -1, dtype=np.int64)
+        np.maximum.at(init_index, group, edge_idxs)
+        result.edges = edges[first]
+        result.edge_init_index = init_index
+    else:
+        result.edges = np.empty((0, 2), dtype=np.int64)
+        result.edge_init_index = np.empty((0,), dtype=np.int64)
+    return result
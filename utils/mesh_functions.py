@@ -23,6 +23,7 @@ import numpy as np
 
 from mathutils import Matrix, Vector
 from sverchok.utils.modules.matrix_utils import matrix_apply_np
+from sverchok.utils.mesh.ragged import SvPolygons
 
 Vertex = Tuple[float, float, float]
 Edge = Tuple[int, int]
@@ -87,6 +88,8 @@ def apply_matrices(meshes: Iterator[Mesh], matrices: Iterator[List[Matrix]], *,
 def has_element(pol_edge):
     if pol_edge is None:
         return False
+    if isinstance(pol_edge, SvPolygons):
+        return len(pol_edge) > 0 and pol_edge.offsets[1] > 0
     if len(pol_edge) > 0 and len(pol_edge[0]) > 0:
         return True
     return False
@@ -96,7 +99,7 @@ def has_element(pol_edge):
 def join_meshes(meshes: Iterator[PyMesh], *, _mesh_type) -> Iterator[PyMesh]:
     _vertices = []
     joined_edges = []
-    joined_polygons = []
+    polygon_sets = []
     vertexes_number = 0
     for vertices, edges, polygons in meshes:
         if has_element(edges):
@@ -105,12 +108,20 @@ def join_meshes(meshes: Iterator[PyMesh], *, _mesh_type) -> Iterator[PyMesh]:
             else:
                 joined_edges.extend([(e[0] + vertexes_number, e[1] + vertexes_number) for e in edges])
         if has_element(polygons):
-            if isinstance(edges, np.ndarray):
-                joined_polygons.extend((polygons + vertexes_number).tolist())
-            else:
-                joined_polygons.extend([[i + vertexes_number for i in p] for p in polygons])
+            polygon_sets.append((polygons, vertexes_number))
         vertexes_number += len(vertices)
         _vertices.append(vertices)
+    if any(isinstance(polygons, SvPolygons) for polygons, _ in polygon_sets):
+        # keep polygons in CSR form if at least one of the meshes had them so
+        polygons, shifts = zip(*polygon_sets)
+        joined_polygons = SvPolygons.concatenate(polygons, shifts)
+    else:
+        joined_polygons = []
+        for polygons, shift in polygon_sets:
+            if isinstance(polygons, np.ndarray):
+                joined_polygons.extend((polygons + shift).tolist())
+            else:
+                joined_polygons.extend([[i + shift for i in p] for p in polygons])
     implementation = np.concatenate if _mesh_type == 'NP' else lambda vs: [v for _vs in vs for v in _vs]
     joined_vertices = implementation(_vertices)
     yield joined_vertices, joined_edges, joined_polygons
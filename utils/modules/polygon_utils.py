@@ -11,6 +11,7 @@ from mathutils.geometry import area_tri as area
 from mathutils.geometry import tessellate_polygon as tessellate
 from sverchok.data_structure import has_element
 from sverchok.utils.math import np_normalize_vectors
+from sverchok.utils.mesh.ragged import SvPolygons
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 from sverchok.utils.modules.matrix_utils import vectors_center_axis_to_matrix
 from sverchok.utils.modules.vertex_utils import vertex_shell_factor, adjacent_edg_pol, adjacent_edg_pol_idx
@@ -24,7 +25,14 @@ def areas_from_polygons(verts, polygons, sum_faces=False):
     vertices: list as [vertex, vertex, ...], being each vertex [float, float, float].
     faces: list as [polygon, polygon,..], being each polygon [int, int, ...].
     sum_faces if True it will return the sum of the areas as [float]
+    polygons can also be SvPolygons, then areas are calculated with NumPy at once
     '''
+    if isinstance(polygons, SvPolygons):
+        areas = polygons.areas(verts)
+        if sum_faces:
+            return [float(areas.sum())]
+        return areas.tolist()
+
     areas = []
     concat_area = areas.append
 
@@ -276,6 +284,17 @@ def np_tangent_center_orig(v_pols):
 
 
 
+def faces_by_size(np_faces):
+    '''
+    Group polygons of object array by number of sides.
+    Yields (mask, array of shape (k, sides)) tuples.
+    '''
+    np_len = np.vectorize(len)
+    lens = np_len(np_faces)
+    for pol_sides in np.unique(lens):
+        mask = lens == pol_sides
+        yield mask, np.array(np_faces[mask].tolist())
+
 def np_process_polygons(verts, faces, func=None, dims=3, output_numpy=False):
     if not func:
         return
@@ -286,22 +305,21 @@ def np_process_polygons(verts, faces, func=None, dims=3, output_numpy=False):
     else:
         np_verts = np.array(verts)
 
-    if isinstance(faces, np.ndarray):
+    if isinstance(faces, (np.ndarray, SvPolygons)):
         np_faces = faces
     else:
         np_faces = np.array(faces)
 
-    if np_faces.dtype == object:
-        np_len = np.vectorize(len)
-        lens = np_len(np_faces)
-        pol_types = np.unique(lens)
+    if isinstance(np_faces, SvPolygons) or np_faces.dtype == object:
         if dims == 1:
-            vals = np.zeros(np_faces.shape[0], dtype=float)
+            vals = np.zeros(len(np_faces), dtype=float)
+        else:
+            vals = np.zeros((len(np_faces), dims), dtype=float)
+        if isinstance(np_faces, SvPolygons):
+            groups = np_faces.by_size()
         else:
-            vals = np.zeros((np_faces.shape[0], dims), dtype=float)
-        for p in pol_types:
-            mask = lens == p
-            np_faces_g = np.array(np_faces[mask].tolist())
+            groups = faces_by_size(np_faces)
+        for mask, np_faces_g in groups:
             v_pols = np_verts[np_faces_g]
             if dims == 1:
                 vals[mask] = func(v_pols)
@@ -326,6 +344,9 @@ def pols_center(vertices, faces, origin, output_numpy):
     '''
 
     if origin == 'Median Center':
+        if isinstance(faces, SvPolygons) and has_element(vertices):
+            vals = faces.centers(vertices)
+            return vals if output_numpy else vals.tolist()
         centers_func = np_center_median
     elif origin == 'Bounds Center':
         centers_func = np_center_bbox
@@ -19,6 +19,8 @@
 import ast
 from math import *
 
+import numpy as np
+
 from mathutils.geometry import interpolate_bezier
 from mathutils import Vector, Matrix
 
@@ -51,6 +53,23 @@ safe_names = make_functions_dict(
 safe_names['e'] = e
 safe_names['pi'] = pi
 
+# Same names for ArrayInterpreter, which evaluates expressions for numpy
+# arrays of variable values. Functions which do not have numpy counterparts
+# are kept from the math module: they will fail for arrays, and
+# interpretation will fall back to one set of values at a time.
+numpy_safe_names = dict(safe_names)
+numpy_safe_names.update(
+        acos = np.arccos, acosh = np.arccosh, asin = np.arcsin, asinh = np.arcsinh,
+        atan = np.arctan, atan2 = np.arctan2, atanh = np.arctanh, ceil = np.ceil,
+        copysign = np.copysign, cos = np.cos, cosh = np.cosh, degrees = np.degrees,
+        exp = np.exp, expm1 = np.expm1, fabs = np.fabs, floor = np.floor,
+        fmod = np.fmod, hypot = np.hypot, isfinite = np.isfinite, isinf = np.isinf,
+        isnan = np.isnan, log = np.log, log10 = np.log10, log1p = np.log1p,
+        log2 = np.log2, pow = np.power, radians = np.radians, sin = np.sin,
+        sinh = np.sinh, sqrt = np.sqrt, tan = np.tan, tanh = np.tanh, trunc = np.trunc,
+        abs = np.abs
+    )
+
 ##########################################
 # Expression classes
 ##########################################
@@ -59,6 +78,7 @@ class Expression(object):
     def __init__(self, expr, string):
         self.expr = expr
         self.string = string
+        self.code = compile(expr, "<expression>", 'eval')
 
     def __repr__(self):
         return "Expr({})".format(self.string)
@@ -79,12 +99,12 @@ class Expression(object):
             print(string)
             return None
 
-    def eval_(self, variables):
+    def eval_(self, variables, functions=safe_names):
         env = dict()
-        env.update(safe_names)
+        env.update(functions)
         env.update(variables)
         env["__builtins__"] = {}
-        return eval(compile(self.expr, "<expression>", 'eval'), env)
+        return eval(self.code, env)
 
     def get_variables(self):
         result = {node.id for node in ast.walk(self.expr) if isinstance(node, ast.Name)}
@@ -107,7 +127,7 @@ class Const(Expression):
     def __eq__(self, other):
         return isinstance(other,Const) and self.value == other.value
 
-    def eval_(self, variables):
+    def eval_(self, variables, functions=safe_names):
         return self.value
 
     def get_variables(self):
@@ -127,7 +147,7 @@ class Variable(Expression):
     def __eq__(self, other):
         return isinstance(other, Variable) and self.name == other.name
 
-    def eval_(self, variables):
+    def eval_(self, variables, functions=safe_names):
         value = variables.get(self.name, None)
         if value is not None:
             return value
@@ -147,7 +167,7 @@ class NegatedVariable(Variable):
     def from_string(cls, string):
         return NegatedVariable(string)
 
-    def eval_(self, variables):
+    def eval_(self, variables, functions=safe_names):
         value = variables.get(self.name, None)
         if value is not None:
             return -value
@@ -447,8 +467,6 @@ class CurveTo(Statement):
                 self.close == other.close
 
     def interpret(self, interpreter, variables):
-        vec = lambda v: Vector((v[0], v[1], 0))
-
         interpreter.assert_not_closed()
         interpreter.start_new_segment()
 
@@ -489,10 +507,7 @@ class CurveTo(Statement):
             else:
                 r = interpreter.dflt_num_verts
 
-            curve = SvCubicBezierCurve(vec(knot1), vec(handle1), vec(handle2), vec(knot2))
-            interpreter.new_curve(curve, self)
-
-            points = interpolate_bezier(vec(knot1), vec(handle1), vec(handle2), vec(knot2), r)
+            points = interpreter.cubic_bezier(knot1, handle1, handle2, knot2, r, self)
 
             interpreter.new_knot("C#.{}.h1".format(i), *handle1)
             interpreter.new_knot("C#.{}.h2".format(i), *handle2)
@@ -500,8 +515,8 @@ class CurveTo(Statement):
 
             interpreter.prev_bezier_knot = handle2
 
-            for point in points[1:]:
-                v1_index = interpreter.new_vertex(point.x, point.y)
+            for x, y in points[1:]:
+                v1_index = interpreter.new_vertex(x, y)
                 interpreter.new_edge(v0_index, v1_index)
                 v0_index = v1_index
 
@@ -553,8 +568,6 @@ class SmoothCurveTo(Statement):
                 self.close == other.close
 
     def interpret(self, interpreter, variables):
-        vec = lambda v: Vector((v[0], v[1], 0))
-
         interpreter.assert_not_closed()
         interpreter.start_new_segment()
 
@@ -599,10 +612,7 @@ class SmoothCurveTo(Statement):
             else:
                 r = interpreter.dflt_num_verts
 
-            curve = SvCubicBezierCurve(vec(knot1), vec(handle1), vec(handle2), vec(knot2))
-            interpreter.new_curve(curve, self)
-
-            points = interpolate_bezier(vec(knot1), vec(handle1), vec(handle2), vec(knot2), r)
+            points = interpreter.cubic_bezier(knot1, handle1, handle2, knot2, r, self)
 
             interpreter.new_knot("S#.{}.h1".format(i), *handle1)
             interpreter.new_knot("S#.{}.h2".format(i), *handle2)
@@ -610,8 +620,8 @@ class SmoothCurveTo(Statement):
 
             interpreter.prev_bezier_knot = handle2
 
-            for point in points[1:]:
-                v1_index = interpreter.new_vertex(point.x, point.y)
+            for x, y in points[1:]:
+                v1_index = interpreter.new_vertex(x, y)
                 interpreter.new_edge(v0_index, v1_index)
                 v0_index = v1_index
 
@@ -663,8 +673,6 @@ class QuadraticCurveTo(Statement):
                 self.close == other.close
 
     def interpret(self, interpreter, variables):
-        vec = lambda v: Vector((v[0], v[1], 0))
-
         interpreter.assert_not_closed()
         interpreter.start_new_segment()
 
@@ -692,18 +700,15 @@ class QuadraticCurveTo(Statement):
             else:
                 r = interpreter.dflt_num_verts
 
-            curve = SvBezierCurve([vec(knot1), vec(handle), vec(knot2)])
-            interpreter.new_curve(curve, self)
-
-            points = interpolate_quadratic_bezier(vec(knot1), vec(handle), vec(knot2), r)
+            points = interpreter.quadratic_bezier(knot1, handle, knot2, r, self)
 
             interpreter.new_knot("Q#.{}.h".format(i), *handle)
             interpreter.new_knot("Q#.{}.k".format(i), *knot2)
 
             interpreter.prev_quad_bezier_knot = handle
 
-            for point in points[1:]:
-                v1_index = interpreter.new_vertex(point.x, point.y)
+            for x, y in points[1:]:
+                v1_index = interpreter.new_vertex(x, y)
                 interpreter.new_edge(v0_index, v1_index)
                 v0_index = v1_index
 
@@ -751,8 +756,6 @@ class SmoothQuadraticCurveTo(Statement):
                 self.close == other.close
 
     def interpret(self, interpreter, variables):
-        vec = lambda v: Vector((v[0], v[1], 0))
-
         interpreter.assert_not_closed()
         interpreter.start_new_segment()
 
@@ -793,18 +796,15 @@ class SmoothQuadraticCurveTo(Statement):
             else:
                 r = interpreter.dflt_num_verts
 
-            curve = SvBezierCurve([vec(knot1), vec(handle), vec(knot2)])
-            interpreter.new_curve(curve, self)
-
-            points = interpolate_quadratic_bezier(vec(knot1), vec(handle), vec(knot2), r)
+            points = interpreter.quadratic_bezier(knot1, handle, knot2, r, self)
 
             interpreter.new_knot("T#.{}.h".format(i), *handle)
             interpreter.new_knot("T#.{}.k".format(i), *knot2)
 
             interpreter.prev_quad_bezier_knot = handle
 
-            for point in points[1:]:
-                v1_index = interpreter.new_vertex(point.x, point.y)
+            for x, y in points[1:]:
+                v1_index = interpreter.new_vertex(x, y)
                 interpreter.new_edge(v0_index, v1_index)
                 v0_index = v1_index
 
@@ -922,9 +922,7 @@ class CloseAll(Statement):
         v0 = interpreter.vertices[0]
         v1 = interpreter.vertices[-1]
 
-        distance = (Vector(v0) - Vector(v1)).length
-
-        if distance < interpreter.close_threshold:
+        if interpreter.is_close(v0, v1):
             interpreter.pop_last_vertex()
 
         v1_index = interpreter.get_last_vertex()
@@ -956,9 +954,7 @@ class ClosePath(Statement):
         v0 = interpreter.vertices[interpreter.close_first_index]
         v1 = interpreter.vertices[-1]
 
-        distance = (Vector(v0) - Vector(v1)).length
-
-        if distance < interpreter.close_threshold:
+        if interpreter.is_close(v0, v1):
             interpreter.pop_last_vertex()
 
         v1_index = interpreter.get_last_vertex()
@@ -1108,6 +1104,30 @@ class Interpreter(object):
         curve = SvLine.from_two_points(v1, v2)
         self.new_curve(curve, None)
 
+    def cubic_bezier(self, knot1, handle1, handle2, knot2, resolution, statement):
+        """
+        Add cubic Bezier curve, and return list of `resolution` (x, y) points on it.
+        """
+        vec = lambda v: Vector((v[0], v[1], 0))
+        curve = SvCubicBezierCurve(vec(knot1), vec(handle1), vec(handle2), vec(knot2))
+        self.new_curve(curve, statement)
+        points = interpolate_bezier(vec(knot1), vec(handle1), vec(handle2), vec(knot2), resolution)
+        return [(point.x, point.y) for point in points]
+
+    def quadratic_bezier(self, knot1, handle, knot2, resolution, statement):
+        """
+        Add quadratic Bezier curve, and return list of `resolution` (x, y) points on it.
+        """
+        vec = lambda v: Vector((v[0], v[1], 0))
+        curve = SvBezierCurve([vec(knot1), vec(handle), vec(knot2)])
+        self.new_curve(curve, statement)
+        points = interpolate_quadratic_bezier(vec(knot1), vec(handle), vec(knot2), resolution)
+        return [(point.x, point.y) for point in points]
+
+    def is_close(self, v0, v1):
+        distance = (Vector(v0) - Vector(v1)).length
+        return distance < self.close_threshold
+
     def start_new_segment(self):
         self.segment_start_index = self.next_vertex_index
         self.segment_continues_line = self.has_last_vertex
@@ -1144,3 +1164,99 @@ class Interpreter(object):
             debug("Interpret: %s", statement)
             statement.interpret(self, variables)
 
+class NotVectorizable(Exception):
+    pass
+
+class ArrayInterpreter(Interpreter):
+    """
+    Interpreter, which evaluates the profile for many sets of variable
+    values at once. Values of variables are numpy arrays of shape (count,);
+    coordinates of vertices and knots are either numbers or such arrays.
+
+    This works only when the structure of the result (number of vertices,
+    edges and so on) is the same for all sets of values. If it is not, or
+    the profile uses something which does not support arrays (for example,
+    arcs, or conditional expressions), an exception is raised; the caller
+    should then interpret the profile for each set of values separately.
+    Curves are not generated.
+    """
+    def __init__(self, node, input_names, count, z_axis='Z'):
+        super().__init__(node, input_names, z_axis=z_axis)
+        self.count = count
+
+    def eval_(self, expr, variables):
+        variables_ = self.defaults.copy()
+        for name in variables:
+            value = variables[name]
+            if value is not None:
+                variables_[name] = value
+        result = expr.eval_(variables_, numpy_safe_names)
+        if isinstance(result, np.ndarray):
+            if result.shape != (self.count,):
+                raise NotVectorizable(f"Unexpected shape of expression value: {result.shape}")
+            # Values which are the same for all sets, like number of
+            # segments, can be used in conditions
+            if (result == result[0]).all():
+                return result[0].item()
+        return result
+
+    def new_curve(self, curve, statement):
+        pass
+
+    def new_line_segment(self, v1, v2):
+        pass
+
+    def is_close(self, v0, v1):
+        close = np.hypot(v0[0] - v1[0], v0[1] - v1[1]) < self.close_threshold
+        if np.ndim(close) == 0:
+            return bool(close)
+        if close.all():
+            return True
+        if not close.any():
+            return False
+        raise NotVectorizable("Path is closed differently for different values")
+
+    def cubic_bezier(self, knot1, handle1, handle2, knot2, resolution, statement):
+        if np.ndim(resolution) != 0:
+            raise NotVectorizable("Number of points is different for different values")
+        points = []
+        for t in np.linspace(0.0, 1.0, int(resolution)):
+            s = 1.0 - t
+            c0, c1, c2, c3 = s*s*s, 3*s*s*t, 3*s*t*t, t*t*t
+            points.append(tuple(c0*knot1[i] + c1*handle1[i] + c2*handle2[i] + c3*knot2[i] for i in range(2)))
+        return points
+
+    def quadratic_bezier(self, knot1, handle, knot2, resolution, statement):
+        handle1 = tuple(knot1[i] + (2.0/3.0) * (handle[i] - knot1[i]) for i in range(2))
+        handle2 = tuple(handle[i] + (1.0/3.0) * (knot2[i] - handle[i]) for i in range(2))
+        return self.cubic_bezier(knot1, handle1, handle2, knot2, resolution, statement)
+
+    def _stack(self, points):
+        result = np.empty((self.count, len(points), 3))
+        for i, (x, y) in enumerate(points):
+            result[:, i, 0] = x
+            result[:, i, 1] = y
+        result[:, :, 2] = 0.0
+        if self.z_axis == 'X':
+            result = result[:, :, [2, 0, 1]]
+        elif self.z_axis == 'Y':
+            result = result[:, :, [0, 2, 1]]
+        return result
+
+    def get_vertices(self):
+        """
+        Vertices for all sets of values: np.array of shape (count, n, 3).
+        """
+        return self._stack(self.vertices)
+
+    def get_knots(self):
+        """
+        Knots for all sets of values: np.array of shape (count, n, 3).
+        """
+        return self._stack(self.knots)
+
+    def interpret(self, profile, variables):
+        # In scalar interpretation, division by zero and similar raise
+        # exceptions; make numpy do the same instead of producing NaNs
+        with np.errstate(divide='raise', invalid='raise', over='raise'):
+            super().interpret(profile, variables)
@@ -17,6 +17,8 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import re
+import hashlib
+from collections import OrderedDict
 
 from sverchok.utils.parsec import *
 from sverchok.utils.logging import info, debug, warning
@@ -251,3 +253,23 @@ def parse_profile(src):
     debug(profile)
     return profile
 
+# Parsed profiles, by hash of the text. Parsed statements are not modified
+# by the interpreter, so they can be shared between nodes.
+_profile_cache = OrderedDict()
+PROFILE_CACHE_SIZE = 32
+
+def parse_profile_cached(src):
+    """
+    Same as parse_profile(), but remembers results for recently parsed texts.
+    """
+    key = hashlib.blake2b(src.encode('utf-8'), digest_size=16).digest()
+    profile = _profile_cache.get(key)
+    if profile is not None:
+        _profile_cache.move_to_end(key)
+        return profile
+    profile = parse_profile(src)
+    _profile_cache[key] = profile
+    if len(_profile_cache) > PROFILE_CACHE_SIZE:
+        _profile_cache.popitem(last=False)
+    return profile
+
@@ -7,7 +7,8 @@
 
 import random
 import string
-from itertools import cycle
+import zlib
+from itertools import cycle, chain
 from typing import List, Union
 
 import numpy as np
@@ -172,8 +173,33 @@ class BlenderObjects:
                     icon=f"RESTRICT_RENDER_{'OFF' if self.render_objects else 'ON'}")
 
 
+def get_topology_hash(edges, faces) -> str:
+    """
+    Checksum of given edges and faces, to detect changes of mesh topology
+    without comparing the mesh with input data element by element,
+    None is treated as empty list
+    """
+    checksum = 0
+    for elements in (edges, faces):
+        if elements is None:
+            elements = []
+        if isinstance(elements, np.ndarray) and elements.ndim == 2:
+            sizes = np.full(len(elements), elements.shape[1], dtype=np.int64)
+            indexes = np.ascontiguousarray(elements, dtype=np.int64)
+        else:
+            sizes = np.fromiter(map(len, elements), dtype=np.int64, count=len(elements))
+            indexes = np.fromiter(chain.from_iterable(elements), dtype=np.int64, count=int(sizes.sum()))
+        # number of elements keeps edges and faces apart in the checksum
+        checksum = zlib.crc32(np.int64(len(sizes)).tobytes(), checksum)
+        checksum = zlib.crc32(sizes.tobytes(), checksum)
+        checksum = zlib.crc32(indexes.tobytes(), checksum)
+    return f"{checksum:08x}"
+
+
 class SvMeshData(bpy.types.PropertyGroup):
     mesh: bpy.props.PointerProperty(type=bpy.types.Mesh, options={'SKIP_SAVE'})
+    # checksum of edges and faces which were used to build the mesh last time
+    topology_hash: bpy.props.StringProperty(options={'SKIP_SAVE'})
 
     def regenerate_mesh(self, mesh_name: str, verts, edges=None, faces=None, matrix: Matrix = None,
                         make_changes_test=True):
@@ -192,7 +218,9 @@ class SvMeshData(bpy.types.PropertyGroup):
             # new mesh should be created
             self.mesh = bpy.data.meshes.new(name=mesh_name)
 
-        if not make_changes_test or self.is_topology_changed(verts, edges, faces):
+        topology_hash = get_topology_hash(edges, faces) if make_changes_test else ''
+        if not make_changes_test or self.is_topology_changed(verts, edges, faces, topology_hash):
+            self.topology_hash = topology_hash
 
             if self.mesh.is_editmode:
                 with bmesh_from_edit_mesh(self.mesh) as bm:
@@ -231,29 +259,31 @@ class SvMeshData(bpy.types.PropertyGroup):
             is_smooth = np.zeros(len(self.mesh.polygons), dtype=bool)
         self.mesh.polygons.foreach_set('use_smooth', is_smooth)
 
-    def is_topology_changed(self, verts: list, edges: list, faces: list) -> bool:
+    def is_topology_changed(self, verts: list, edges: list, faces: list, topology_hash: str = None) -> bool:
         """
-        Simple and fast test but not 100% robust.
-        If number of vertices and faces are unchanged it assumes that topology is not changed
-        This test is useful if mesh just changed its location.
+        Compares number of elements of the mesh with given data, and checksum of
+        given edges and faces with the one of the data the mesh was built from.
+        If they are unchanged only position of vertices should be updated.
         It is much faster just set new coordinate for each vector then recreate whole object
         """
-        if not faces:
+        if len(faces) == 0:
             # edges can be take in account if mesh does not have polygons
             # because Sverchok edges can exclude edges within polygons
-            return len(self.mesh.vertices) != len(verts) or len(self.mesh.edges) != len(edges)
+            number_is_changed = len(self.mesh.vertices) != len(verts) or len(self.mesh.edges) != len(edges)
         else:
             number_is_changed = len(self.mesh.vertices) != len(verts) or len(self.mesh.polygons) != len(faces)
-            # check several polygons indexes
-            are_polygons_changed = any([list(p.vertices) != f for _, p, f in zip(range(5), self.mesh.polygons, faces)])
-            return number_is_changed or are_polygons_changed
+        if number_is_changed:
+            return True
+        if topology_hash is None:
+            topology_hash = get_topology_hash(edges, faces)
+        return topology_hash != self.topology_hash
 
     def update_vertices(self, verts: Union[list, np.ndarray]):
         """
         Just update position of mesh vertices, order and number of given vertices should be the same as mesh
         numpy array with float32 type will be 10 times faster than any other input data
         """
-        verts = np.array(verts, dtype=np.float32)  # todo will be this fast if it is already array float 32?
+        verts = np.asarray(verts, dtype=np.float32)  # no copy if it is float32 array already
         self.mesh.vertices.foreach_set('co', np.ravel(verts))
 
     def remove_data(self):
@@ -78,25 +78,213 @@ def nurbs_divide(numerator, denominator):
     result[good_num] = numerator[good_num] / denominator[good][np.newaxis].T
     return result
 
-def elevate_bezier_degree(self_degree, control_points, delta=1):
-    # See "The NURBS book" (2nd edition), p.5.5, eq. 5.36
-    t = delta
-    p = self_degree
-    new_points = []
-    P = control_points
+def bezier_elevation_matrix(degree, delta=1):
+    """
+    Matrix E of shape (degree+delta+1, degree+1), such that E @ P are
+    control points of Bezier curve with control points P, elevated by delta.
+    See "The NURBS book" (2nd edition), p.5.5, eq. 5.36.
+    """
+    p, t = degree, delta
+    matrix = np.zeros((p+t+1, p+1))
     for i in range(p+t+1):
-        j0 = max(0, i-t)
-        j1 = min(p, i)
-        js = range(j0, j1+1)
-        c1 = np.array([binomial(p, j) for j in js])
-        c2 = np.array([binomial(t, i-j) for j in js])
-        ps = P[j0:j1+1, :]
-        numerator = (c1 * c2)[np.newaxis].T * ps
         denominator = binomial(p+t, i)
-        #print(f"E: p {p}, i {i}, c1 {c1}, c2 {c2}, denom {denominator}, ps {ps}")
-        point = numerator.sum(axis=0) / denominator
-        new_points.append(point)
-    return np.array(new_points)
+        for j in range(max(0, i-t), min(p, i)+1):
+            matrix[i, j] = binomial(p, j) * binomial(t, i-j) / denominator
+    return matrix
+
+def elevate_bezier_degree(self_degree, control_points, delta=1):
+    """
+    Elevate degree of Bezier curve(s).
+
+    input: control_points - np.array of shape (..., degree+1, D)
+    output: np.array of shape (..., degree+delta+1, D)
+    """
+    return bezier_elevation_matrix(self_degree, delta) @ control_points
+
+def refine_knotvector(degree, knotvector, control_points, new_knots):
+    """
+    Insert several knots at once (knot refinement).
+    See "The NURBS book" (2nd edition), p.5.3, algorithm A5.4.
+
+    Control points of several curves having the same degree and knotvector
+    (for example, rows of NURBS surface control net) are processed at once.
+
+    input:
+        * knotvector: np.array of shape (N+degree+1,)
+        * control_points: homogenous control points, np.array of shape (..., N, D)
+        * new_knots: sorted list or np.array of knots to be inserted;
+          the same value can be listed several times.
+    output: tuple:
+        * new knotvector, np.array of shape (N+degree+1+r,)
+        * new control points, np.array of shape (..., N+r, D)
+    where r = len(new_knots).
+    """
+    U = np.asarray(knotvector, dtype=np.float64)
+    X = np.sort(np.asarray(new_knots, dtype=np.float64))
+    Pw = np.asarray(control_points)
+    r = len(X)
+    if r == 0:
+        return U.copy(), Pw.copy()
+    p = degree
+    N = Pw.shape[-2]
+    n = N - 1
+    m = n + p + 1
+
+    a = sv_knotvector.find_span(U, N, X[0])
+    b = sv_knotvector.find_span(U, N, X[-1]) + 1
+
+    Qw = np.empty(Pw.shape[:-2] + (N + r, Pw.shape[-1]))
+    Ubar = np.empty(m + r + 1)
+    Qw[..., :a-p+1, :] = Pw[..., :a-p+1, :]
+    Qw[..., b-1+r:, :] = Pw[..., b-1:, :]
+    Ubar[:a+1] = U[:a+1]
+    Ubar[b+p+r:] = U[b+p:]
+
+    i = b + p - 1
+    k = b + p + r - 1
+    for j in range(r-1, -1, -1):
+        while X[j] <= U[i] and i > a:
+            Qw[..., k-p-1, :] = Pw[..., i-p-1, :]
+            Ubar[k] = U[i]
+            k -= 1
+            i -= 1
+        Qw[..., k-p-1, :] = Qw[..., k-p, :]
+        for l in range(1, p+1):
+            ind = k - p + l
+            alpha = Ubar[k+l] - X[j]
+            if abs(alpha) == 0.0:
+                Qw[..., ind-1, :] = Qw[..., ind, :]
+            else:
+                alpha = alpha / (Ubar[k+l] - U[i-p+l])
+                Qw[..., ind-1, :] = alpha * Qw[..., ind-1, :] + (1.0 - alpha) * Qw[..., ind, :]
+        Ubar[k] = X[j]
+        k -= 1
+
+    return Ubar, Qw
+
+def remove_knot_once(degree, knotvector, control_points, u, tolerance=1e-6):
+    """
+    Remove one instance of knot u (knot removal).
+    See "The NURBS book" (2nd edition), p.5.4, algorithm A5.8.
+
+    Control points of several curves having the same degree and knotvector
+    are processed at once; the knot is removed only if it can be removed
+    from all of them.
+
+    input:
+        * knotvector: np.array of shape (N+degree+1,)
+        * control_points: homogenous control points, np.array of shape (..., N, D)
+        * u: knot value
+        * tolerance: maximum allowed deviation of control points
+    output: tuple:
+        * new knotvector, np.array of shape (N+degree,)
+        * new control points, np.array of shape (..., N-1, D)
+    Raises CantRemoveKnotException if the knot can not be removed.
+    """
+    knotvector = np.asarray(knotvector)
+    ctrlpts = np.asarray(control_points)
+    N = ctrlpts.shape[-2]
+    p = degree
+    order = p + 1
+    s = sv_knotvector.find_multiplicity(knotvector, u)
+    if s < 1:
+        raise CantRemoveKnotException(f"Knot t={u} is not present in the knotvector")
+    span = sv_knotvector.find_span(knotvector, N, u)
+
+    def alpha(idx):
+        return (u - knotvector[idx]) / (knotvector[idx + order] - knotvector[idx])
+
+    first = span - p
+    last = span - s
+    offset = first - 1
+    temp_i = np.zeros(ctrlpts.shape[:-2] + (2*p+1, ctrlpts.shape[-1]))
+    temp_j = np.zeros_like(temp_i)
+    temp_i[..., 0, :] = ctrlpts[..., offset, :]
+    temp_j[..., last + 1 - offset, :] = ctrlpts[..., last + 1, :]
+    i, j = first, last
+    ii, jj = 1, last - offset
+
+    # Eqs 5.28 & 5.29
+    while j - i > 0:
+        alpha_i, alpha_j = alpha(i), alpha(j)
+        temp_i[..., ii, :] = (ctrlpts[..., i, :] - (1.0 - alpha_i) * temp_i[..., ii-1, :]) / alpha_i
+        temp_j[..., jj, :] = (ctrlpts[..., j, :] - alpha_j * temp_j[..., jj+1, :]) / (1.0 - alpha_j)
+        i += 1
+        j -= 1
+        ii += 1
+        jj -= 1
+
+    if j - i < 0:
+        dist = np.linalg.norm(temp_i[..., ii-1, :] - temp_j[..., jj+1, :], axis=-1)
+    else:
+        alpha_i = alpha(i)
+        ptn = alpha_i * temp_j[..., ii+1, :] + (1.0 - alpha_i) * temp_i[..., ii-1, :]
+        dist = np.linalg.norm(ctrlpts[..., i, :] - ptn, axis=-1)
+    max_dist = np.max(dist)
+    if max_dist > tolerance:
+        raise CantRemoveKnotException(f"Can't remove knot t={u}: distance={max_dist}")
+
+    new_ctrlpts = ctrlpts.copy()
+    i, j = first, last
+    while j - i > 0:
+        new_ctrlpts[..., i, :] = temp_i[..., i - offset, :]
+        new_ctrlpts[..., j, :] = temp_j[..., j - offset, :]
+        i += 1
+        j -= 1
+
+    # Shift control points (refer to p.183 of The NURBS Book, 2nd Edition)
+    out_idx = (2*span - s - p) // 2
+    new_ctrlpts = np.delete(new_ctrlpts, out_idx, axis=-2)
+    new_knotvector = np.delete(knotvector, span)
+    return new_knotvector, new_ctrlpts
+
+def elevate_degree(degree, knotvector, control_points, delta=1, tolerance=1e-6):
+    """
+    Elevate degree of clamped NURBS curve(s).
+    The curve is split into Bezier segments by knot refinement, all
+    segments are elevated at once, and then excessive knots are removed.
+
+    Control points of several curves having the same degree and knotvector
+    are processed at once.
+
+    input:
+        * knotvector: clamped knotvector, np.array of shape (N+degree+1,)
+        * control_points: homogenous control points, np.array of shape (..., N, D)
+        * delta: how much to elevate the degree
+        * tolerance: tolerance for removal of excessive knots
+    output: tuple:
+        * new knotvector
+        * new control points, np.array of shape (..., N', D)
+    """
+    p, t = degree, delta
+    knotvector = np.asarray(knotvector, dtype=np.float64)
+    pairs = sv_knotvector.to_multiplicity(knotvector)
+    internal = pairs[1:-1]
+
+    # Split into Bezier segments
+    new_knots = [u for u, count in internal for _ in range(p - count)]
+    _, bezier_points = refine_knotvector(p, knotvector, control_points, new_knots)
+    n_segments = len(internal) + 1
+    idxs = np.arange(n_segments)[:, np.newaxis] * p + np.arange(p+1)
+    segments = bezier_points[..., idxs, :]  # (..., n_segments, p+1, D)
+    segments = elevate_bezier_degree(p, segments, t)  # (..., n_segments, p+t+1, D)
+
+    shape = segments.shape[:-3]
+    dim = segments.shape[-1]
+    new_points = np.concatenate((segments[..., 0, :1, :],
+                        segments[..., 1:, :].reshape(shape + (n_segments*(p+t), dim))), axis=-2)
+    new_pairs = [(pairs[0][0], p+t+1)] + [(u, p+t) for u, _ in internal] + [(pairs[-1][0], p+t+1)]
+    new_knotvector = sv_knotvector.from_multiplicity(new_pairs)
+
+    # Restore continuity at internal knots
+    for u, count in internal:
+        for _ in range(p - count):
+            try:
+                new_knotvector, new_points = remove_knot_once(p+t, new_knotvector, new_points, u, tolerance)
+            except CantRemoveKnotException:
+                break
+
+    return new_knotvector, new_points
 
 def from_homogenous(control_points):
     if control_points.ndim == 2: # curve
@@ -107,7 +295,7 @@ def from_homogenous(control_points):
     elif control_points.ndim == 3: # surface
         weights = control_points[:,:,3]
         weighted = control_points[:,:,0:3]
-        points = weighted / weights[np.newaxis].T
+        points = weighted / weights[:,:,np.newaxis]
         return points, weights
     else:
         raise Exception(f"control_points have ndim={control_points.ndim}, supported are only 2 and 3")
@@ -0,0 +1,484 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Batched ray casting onto triangulated meshes.
+
+The mesh is stored in a flat bounding volume hierarchy (BVH) made of NumPy
+arrays. Rays are traced all at once: on each step of traversal, all pairs
+(ray, BVH node) which are still alive are tested against node bounding
+boxes in one vectorized operation, and pairs which reached leaf nodes are
+tested against triangles by Möller–Trumbore algorithm. Compared to calling
+mathutils.bvhtree.BVHTree.ray_cast() for each ray, this removes the Python
+interpreter overhead per ray, which dominates when there are thousands of
+rays.
+
+The same BVH is used by SvNearestFinder to find nearest points of the mesh
+for many points at once, similar to BVHTree.find_nearest().
+"""
+
+import numpy as np
+
+def _ramp(counts):
+    """
+    For counts = [2, 3] returns [0, 1, 0, 1, 2].
+    """
+    total = counts.sum()
+    offsets = np.cumsum(counts) - counts
+    return np.arange(total) - np.repeat(offsets, counts)
+
+def triangulate_polygons(polygons):
+    """
+    Fan triangulation of polygons.
+
+    Args:
+        polygons: list of lists of vertex indices, or np.array of shape (n, k).
+
+    Returns:
+        tuple: np.array of shape (m, 3) with triangles, and np.array of
+        shape (m,) with index of the polygon each triangle was made of.
+
+    Note: fan triangulation is correct for convex polygons only.
+    """
+    if isinstance(polygons, np.ndarray) and polygons.ndim == 2:
+        sizes = np.full(len(polygons), polygons.shape[1])
+        flat = polygons.ravel()
+    else:
+        sizes = np.array([len(p) for p in polygons], dtype=np.int64)
+        flat = np.fromiter((i for p in polygons for i in p), dtype=np.int64, count=sizes.sum())
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if (sizes < 3).any():
+        raise Exception("Each polygon must have at least 3 vertices")
+    starts = np.cumsum(sizes) - sizes
+    n_tris = sizes - 2
+    face_idxs = np.repeat(np.arange(len(sizes)), n_tris)
+    firsts = np.repeat(starts, n_tris)
+    seconds = firsts + 1 + _ramp(n_tris)
+    triangles = np.stack((flat[firsts], flat[seconds], flat[seconds + 1]), axis=1)
+    return triangles, face_idxs
+
+def _cross(a, b):
+    # np.cross is slow for many short vectors
+    return np.stack((a[:,1]*b[:,2] - a[:,2]*b[:,1],
+                     a[:,2]*b[:,0] - a[:,0]*b[:,2],
+                     a[:,0]*b[:,1] - a[:,1]*b[:,0]), axis=1)
+
+def _dot(a, b):
+    return np.einsum('ij,ij->i', a, b)
+
+class SvRayHits(object):
+    """
+    Result of SvRayCaster.ray_cast() or SvNearestFinder.find_nearest();
+    in the latter case, "rays" are query points.
+
+    * hit: np.array of bool, shape (n,).
+    * locations: np.array of shape (n, 3); zeros for rays which missed.
+    * normals: unit normals of hit polygons, shape (n, 3); zeros for rays which missed.
+    * indices: indices of hit polygons, shape (n,); -1 for rays which missed.
+    * distances: distances from ray origins to hit locations, shape (n,);
+      zeros for rays which missed.
+    """
+    def __init__(self, hit, locations, normals, indices, distances):
+        self.hit = hit
+        self.locations = locations
+        self.normals = normals
+        self.indices = indices
+        self.distances = distances
+
+class SvTriangleBVH(object):
+    """
+    Triangulated mesh with bounding volume hierarchy over its triangles.
+    Triangles of each BVH node are
+    order[node_start[i] : node_start[i] + node_count[i]];
+    children of inner node i are node_left[i] and node_left[i] + 1, and
+    node_left[i] is -1 for leaf nodes.
+
+    Args:
+        vertices: np.array of shape (n, 3) or list of vertices.
+        polygons: list of polygons (lists of vertex indices), or np.array.
+            Non-triangle polygons are fan-triangulated; face_idxs maps
+            triangles to original polygons.
+        leaf_size: maximum number of triangles in BVH leaf node.
+    """
+    def __init__(self, vertices, polygons, leaf_size=4):
+        self.vertices = np.asarray(vertices, dtype=np.float64).reshape((-1, 3))
+        self.leaf_size = leaf_size
+        if len(polygons) == 0:
+            self.triangles = np.zeros((0, 3), dtype=np.int64)
+            self.face_idxs = np.zeros((0,), dtype=np.int64)
+        else:
+            self.triangles, self.face_idxs = triangulate_polygons(polygons)
+            if self.triangles.max() >= len(self.vertices) or self.triangles.min() < 0:
+                raise Exception(f"Polygon vertex index is out of range, mesh has {len(self.vertices)} vertices")
+        corners = self.vertices[self.triangles]
+        self.v0 = corners[:, 0]
+        self.edge1 = corners[:, 1] - self.v0
+        self.edge2 = corners[:, 2] - self.v0
+        normals = np.cross(self.edge1, self.edge2)
+        norms = np.linalg.norm(normals, axis=1)
+        self.normals = normals / np.where(norms > 0, norms, 1.0)[:, np.newaxis]
+        self._build(corners)
+
+    def _build(self, corners):
+        """
+        Build BVH level by level; on each level, all nodes which have more
+        than leaf_size triangles are split at median of triangle centers,
+        along the longest side of the node's bounding box.
+        """
+        n = len(corners)
+        tri_lo = corners.min(axis=1)
+        tri_hi = corners.max(axis=1)
+        centers = corners.mean(axis=1)
+        order = np.arange(n)
+
+        max_nodes = max(1, 2 * n)
+        node_lo = np.zeros((max_nodes, 3))
+        node_hi = np.zeros((max_nodes, 3))
+        node_left = np.full(max_nodes, -1, dtype=np.int64)
+        node_start = np.zeros(max_nodes, dtype=np.int64)
+        node_count = np.zeros(max_nodes, dtype=np.int64)
+        node_count[0] = n
+        n_nodes = 1
+
+        pending = np.array([0], dtype=np.int64) if n > 0 else np.zeros(0, dtype=np.int64)
+        while len(pending):
+            starts = node_start[pending]
+            counts = node_count[pending]
+            positions = np.repeat(starts, counts) + _ramp(counts)
+            offsets = np.cumsum(counts) - counts
+            tris = order[positions]
+            node_lo[pending] = np.minimum.reduceat(tri_lo[tris], offsets, axis=0)
+            node_hi[pending] = np.maximum.reduceat(tri_hi[tris], offsets, axis=0)
+
+            split = counts > self.leaf_size
+            if not split.any():
+                break
+            pending, starts, counts = pending[split], starts[split], counts[split]
+            positions = np.repeat(starts, counts) + _ramp(counts)
+            offsets = np.cumsum(counts) - counts
+            tris = order[positions]
+            c_lo = np.minimum.reduceat(centers[tris], offsets, axis=0)
+            c_hi = np.maximum.reduceat(centers[tris], offsets, axis=0)
+            axes = np.argmax(c_hi - c_lo, axis=1)
+            segment = np.repeat(np.arange(len(pending)), counts)
+            keys = centers[tris, axes[segment]]
+            permutation = np.lexsort((keys, segment))
+            order[positions] = tris[permutation]
+
+            lefts = n_nodes + 2 * np.arange(len(pending))
+            rights = lefts + 1
+            n_nodes += 2 * len(pending)
+            half = counts // 2
+            node_left[pending] = lefts
+            node_start[lefts] = starts
+            node_count[lefts] = half
+            node_start[rights] = starts + half
+            node_count[rights] = counts - half
+            pending = np.concatenate((lefts, rights))
+
+        self.order = order
+        # Bounds are stored per axis, which is faster to gather
+        self.node_lo = np.ascontiguousarray(node_lo[:n_nodes].T)
+        self.node_hi = np.ascontiguousarray(node_hi[:n_nodes].T)
+        self.node_left = node_left[:n_nodes]
+        self.node_start = node_start[:n_nodes]
+        self.node_count = node_count[:n_nodes]
+
+class SvRayCaster(SvTriangleBVH):
+    """
+    Ray caster for triangulated mesh.
+
+    Args:
+        vertices: np.array of shape (n, 3) or list of vertices.
+        polygons: list of polygons (lists of vertex indices), or np.array.
+            Non-triangle polygons are fan-triangulated; indices of hit
+            polygons are reported in terms of original polygons.
+        leaf_size: maximum number of triangles in BVH leaf node.
+        chunk_size: number of rays traced together; limits memory usage.
+    """
+    def __init__(self, vertices, polygons, leaf_size=4, chunk_size=16384):
+        super().__init__(vertices, polygons, leaf_size=leaf_size)
+        self.chunk_size = chunk_size
+
+    def _intersect_triangles(self, origins, directions, tris, min_distance):
+        # Möller–Trumbore; returns ray parameters, inf where there is no hit
+        edge1 = self.edge1[tris]
+        edge2 = self.edge2[tris]
+        p = _cross(directions, edge2)
+        det = _dot(edge1, p)
+        ok = np.abs(det) > 1e-12
+        inv_det = 1.0 / np.where(ok, det, 1.0)
+        s = origins - self.v0[tris]
+        u = _dot(s, p) * inv_det
+        # most pairs are rejected by u already; do the rest for candidates only
+        idxs = np.where(ok & (u >= 0) & (u <= 1))[0]
+        s, u, inv_det, edge2 = s[idxs], u[idxs], inv_det[idxs], edge2[idxs]
+        q = _cross(s, edge1[idxs])
+        v = _dot(directions[idxs], q) * inv_det
+        t = _dot(edge2, q) * inv_det
+        good = (v >= 0) & (u + v <= 1) & (t >= min_distance)
+        result = np.full(len(tris), np.inf)
+        result[idxs[good]] = t[good]
+        return result
+
+    def _trace(self, origins, directions, max_distance, min_distance, any_hit):
+        n = len(origins)
+        best_t = np.full(n, max_distance, dtype=np.float64)
+        best_tri = np.full(n, -1, dtype=np.int64)
+        if len(self.triangles) == 0 or n == 0:
+            return best_t, best_tri
+
+        # Zero direction components are replaced by tiny numbers, so that
+        # slab test does not produce NaNs
+        tiny = np.where(directions < 0, -1e-300, 1e-300)
+        inv_directions = np.ascontiguousarray((1.0 / np.where(directions == 0, tiny, directions)).T)
+        origins_t = np.ascontiguousarray(origins.T)
+
+        ray_idx = np.where((directions != 0).any(axis=1))[0]
+        node_idx = np.zeros(len(ray_idx), dtype=np.int64)
+        while len(ray_idx):
+            t_near = np.full(len(ray_idx), min_distance)
+            t_far = best_t[ray_idx]
+            for axis in range(3):
+                o = origins_t[axis][ray_idx]
+                inv = inv_directions[axis][ray_idx]
+                t1 = (self.node_lo[axis][node_idx] - o) * inv
+                t2 = (self.node_hi[axis][node_idx] - o) * inv
+                np.maximum(t_near, np.minimum(t1, t2), out=t_near)
+                np.minimum(t_far, np.maximum(t1, t2), out=t_far)
+            alive = t_near <= t_far
+            ray_idx, node_idx = ray_idx[alive], node_idx[alive]
+
+            leaf = self.node_left[node_idx] < 0
+            leaf_rays, leaf_nodes = ray_idx[leaf], node_idx[leaf]
+            if len(leaf_rays):
+                counts = self.node_count[leaf_nodes]
+                rays = np.repeat(leaf_rays, counts)
+                tris = self.order[np.repeat(self.node_start[leaf_nodes], counts) + _ramp(counts)]
+                ts = self._intersect_triangles(origins[rays], directions[rays], tris, min_distance)
+                good = np.isfinite(ts) & (ts <= best_t[rays])
+                rays, tris, ts = rays[good], tris[good], ts[good]
+                np.minimum.at(best_t, rays, ts)
+                winners = ts == best_t[rays]
+                best_tri[rays[winners]] = tris[winners]
+                if any_hit and len(rays):
+                    # this ray is done; kill all its remaining pairs
+                    best_t[rays] = -np.inf
+
+            inner_rays, inner_nodes = ray_idx[~leaf], node_idx[~leaf]
+            lefts = self.node_left[inner_nodes]
+            ray_idx = np.concatenate((inner_rays, inner_rays))
+            node_idx = np.concatenate((lefts, lefts + 1))
+
+        return best_t, best_tri
+
+    def _prepare(self, origins, directions):
+        origins = np.asarray(origins, dtype=np.float64).reshape((-1, 3))
+        directions = np.asarray(directions, dtype=np.float64).reshape((-1, 3))
+        if len(origins) != len(directions):
+            origins, directions = np.broadcast_arrays(origins, directions)
+        # Directions are normalized, so ray parameter is the distance
+        norms = np.linalg.norm(directions, axis=1)
+        directions = directions / np.where(norms > 0, norms, 1.0)[:, np.newaxis]
+        return origins, directions
+
+    def ray_cast(self, origins, directions, max_distance=np.inf, min_distance=0.0):
+        """
+        Find nearest hit of each ray, similar to BVHTree.ray_cast().
+
+        Args:
+            origins: np.array of shape (n, 3); or (1, 3) to use single origin for all rays.
+            directions: np.array of shape (n, 3); or (1, 3) to use single direction
+                for all rays. Directions do not have to be unit vectors.
+            max_distance: hits farther than this are ignored.
+            min_distance: hits nearer than this are ignored; a small positive
+                value is useful when rays start exactly on the mesh surface.
+
+        Returns:
+            SvRayHits instance.
+        """
+        origins, directions = self._prepare(origins, directions)
+        n = len(origins)
+        ts = np.empty(n)
+        tris = np.empty(n, dtype=np.int64)
+        for i in range(0, n, self.chunk_size):
+            chunk = slice(i, i + self.chunk_size)
+            ts[chunk], tris[chunk] = self._trace(origins[chunk], directions[chunk], max_distance, min_distance, False)
+
+        hit = tris >= 0
+        locations = np.zeros((n, 3))
+        normals = np.zeros((n, 3))
+        indices = np.full(n, -1, dtype=np.int64)
+        distances = np.zeros(n)
+        locations[hit] = origins[hit] + ts[hit][:, np.newaxis] * directions[hit]
+        normals[hit] = self.normals[tris[hit]]
+        indices[hit] = self.face_idxs[tris[hit]]
+        distances[hit] = ts[hit]
+        return SvRayHits(hit, locations, normals, indices, distances)
+
+    def any_hit(self, origins, directions, max_distance=np.inf, min_distance=0.0):
+        """
+        Check if each ray hits the mesh at all. This is faster than
+        ray_cast(), because traversal stops at the first hit found, and is
+        enough for shadow / visibility tests.
+
+        Returns:
+            np.array of bool, shape (n,).
+        """
+        origins, directions = self._prepare(origins, directions)
+        n = len(origins)
+        hit = np.zeros(n, dtype=bool)
+        for i in range(0, n, self.chunk_size):
+            chunk = slice(i, i + self.chunk_size)
+            _, tris = self._trace(origins[chunk], directions[chunk], max_distance, min_distance, True)
+            hit[chunk] = tris >= 0
+        return hit
+
+def closest_points_on_triangles(points, v0, edge1, edge2):
+    """
+    Closest points of triangles (v0, v0 + edge1, v0 + edge2) to points, by
+    Ericson's "Real-Time Collision Detection" algorithm. All arguments are
+    np.arrays of shape (n, 3).
+
+    Returns:
+        np.array of shape (n, 3).
+    """
+    ap = points - v0
+    d1, d2 = _dot(edge1, ap), _dot(edge2, ap)
+    bp = ap - edge1
+    d3, d4 = _dot(edge1, bp), _dot(edge2, bp)
+    cp = ap - edge2
+    d5, d6 = _dot(edge1, cp), _dot(edge2, cp)
+    va = d3*d6 - d5*d4
+    vb = d5*d2 - d1*d6
+    vc = d1*d4 - d3*d2
+
+    def ratio(a, b):
+        return a / np.where(b != 0, b, 1.0)
+
+    # barycentric coordinates (v, w) for each Voronoi region of the triangle;
+    # conditions are checked in order, the first one which holds is used
+    zeros, ones = np.zeros(len(points)), np.ones(len(points))
+    inside = ratio(ones, va + vb + vc)
+    bc = ratio(d4 - d3, (d4 - d3) + (d5 - d6))
+    conditions = [
+        (d1 <= 0) & (d2 <= 0),
+        (d3 >= 0) & (d4 <= d3),
+        (vc <= 0) & (d1 >= 0) & (d3 <= 0),
+        (d6 >= 0) & (d5 <= d6),
+        (vb <= 0) & (d2 >= 0) & (d6 <= 0),
+        (va <= 0) & (d4 >= d3) & (d5 >= d6)
+    ]
+    vs = np.select(conditions, [zeros, ones, ratio(d1, d1 - d3), zeros, zeros, 1 - bc], vb * inside)
+    ws = np.select(conditions, [zeros, zeros, zeros, ones, ratio(d2, d2 - d6), bc], vc * inside)
+    return v0 + vs[:, np.newaxis] * edge1 + ws[:, np.newaxis] * edge2
+
+class SvNearestFinder(SvTriangleBVH):
+    """
+    Search of nearest points on triangulated mesh.
+
+    Args:
+        vertices: np.array of shape (n, 3) or list of vertices.
+        polygons: list of polygons (lists of vertex indices), or np.array.
+        leaf_size: maximum number of triangles in BVH leaf node.
+        chunk_size: number of points processed together; limits memory usage.
+    """
+    def __init__(self, vertices, polygons, leaf_size=4, chunk_size=16384):
+        super().__init__(vertices, polygons, leaf_size=leaf_size)
+        self.chunk_size = chunk_size
+
+    def _box_distances2(self, points_t, point_idx, node_idx):
+        result = np.zeros(len(point_idx))
+        for axis in range(3):
+            p = points_t[axis][point_idx]
+            d = np.maximum(np.maximum(self.node_lo[axis][node_idx] - p, p - self.node_hi[axis][node_idx]), 0.0)
+            result += d * d
+        return result
+
+    def _leaf_distances2(self, points, point_idx, node_idx):
+        counts = self.node_count[node_idx]
+        pts = np.repeat(point_idx, counts)
+        tris = self.order[np.repeat(self.node_start[node_idx], counts) + _ramp(counts)]
+        nearest = closest_points_on_triangles(points[pts], self.v0[tris], self.edge1[tris], self.edge2[tris])
+        vectors = nearest - points[pts]
+        return pts, tris, _dot(vectors, vectors)
+
+    def _update(self, best_d2, best_tri, pts, tris, d2):
+        good = d2 <= best_d2[pts]
+        pts, tris, d2 = pts[good], tris[good], d2[good]
+        np.minimum.at(best_d2, pts, d2)
+        winners = d2 == best_d2[pts]
+        best_tri[pts[winners]] = tris[winners]
+
+    def _search(self, points, max_distance):
+        n = len(points)
+        best_d2 = np.full(n, max_distance * max_distance, dtype=np.float64)
+        best_tri = np.full(n, -1, dtype=np.int64)
+        if len(self.triangles) == 0 or n == 0:
+            return best_tri
+        points_t = np.ascontiguousarray(points.T)
+
+        # Greedy descent to the nearest leaf gives an upper bound of the
+        # distance, which lets the full search below cut most of the tree
+        point_idx = np.arange(n)
+        node_idx = np.zeros(n, dtype=np.int64)
+        inner = self.node_left[node_idx] >= 0
+        while inner.any():
+            idx = np.where(inner)[0]
+            lefts = self.node_left[node_idx[idx]]
+            d_left = self._box_distances2(points_t, idx, lefts)
+            d_right = self._box_distances2(points_t, idx, lefts + 1)
+            node_idx[idx] = np.where(d_left <= d_right, lefts, lefts + 1)
+            inner = self.node_left[node_idx] >= 0
+        self._update(best_d2, best_tri, *self._leaf_distances2(points, point_idx, node_idx))
+
+        node_idx = np.zeros(n, dtype=np.int64)
+        while len(point_idx):
+            alive = self._box_distances2(points_t, point_idx, node_idx) <= best_d2[point_idx]
+            point_idx, node_idx = point_idx[alive], node_idx[alive]
+
+            leaf = self.node_left[node_idx] < 0
+            if leaf.any():
+                self._update(best_d2, best_tri, *self._leaf_distances2(points, point_idx[leaf], node_idx[leaf]))
+
+            inner_points, inner_nodes = point_idx[~leaf], node_idx[~leaf]
+            lefts = self.node_left[inner_nodes]
+            point_idx = np.concatenate((inner_points, inner_points))
+            node_idx = np.concatenate((lefts, lefts + 1))
+
+        return best_tri
+
+    def find_nearest(self, points, max_distance=np.inf):
+        """
+        Find nearest points of the mesh, similar to BVHTree.find_nearest().
+
+        Args:
+            points: np.array of shape (n, 3).
+            max_distance: points of the mesh farther than this are not searched.
+
+        Returns:
+            SvRayHits instance; hit is False for points which do not have
+            any point of the mesh within max_distance.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        n = len(points)
+        tris = np.empty(n, dtype=np.int64)
+        for i in range(0, n, self.chunk_size):
+            chunk = slice(i, i + self.chunk_size)
+            tris[chunk] = self._search(points[chunk], max_distance)
+
+        hit = tris >= 0
+        locations = np.zeros((n, 3))
+        normals = np.zeros((n, 3))
+        indices = np.full(n, -1, dtype=np.int64)
+        distances = np.zeros(n)
+        t = tris[hit]
+        locations[hit] = closest_points_on_triangles(points[hit], self.v0[t], self.edge1[t], self.edge2[t])
+        normals[hit] = self.normals[t]
+        indices[hit] = self.face_idxs[t]
+        distances[hit] = np.linalg.norm(locations[hit] - points[hit], axis=1)
+        return SvRayHits(hit, locations, normals, indices, distances)
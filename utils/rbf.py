@@ -0,0 +1,400 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+RBF (radial basis functions) interpolation engine, shared by RBF-based
+field, curve and surface nodes.
+
+SvRbfInterpolator is a drop-in replacement for scipy.interpolate.Rbf
+(it is called the same way, with one array per coordinate), which adds:
+
+* compactly supported Wendland kernels (wendland_c0, wendland_c2, wendland_c4).
+  With these, the interpolation matrix is sparse; it is built with a KD-tree
+  and solved with sparse LU decomposition or, for big systems, with
+  conjugate gradients; evaluation only looks at samples within the support
+  radius. Linear trend of the data is interpolated separately, so that
+  the interpolant does not drop to zero away from samples.
+* LOCAL mode (partition of unity): the domain is covered with overlapping
+  patches, a small RBF interpolant is built for each patch, and results
+  are blended with Wendland weights. This works with any kernel and allows
+  to interpolate tens of thousands of samples.
+* Evaluation in chunks, so that memory used for temporary distance matrices
+  never exceeds `memory_limit` bytes.
+
+For classic (globally supported) kernels in GLOBAL mode the results are the
+same as of scipy.interpolate.Rbf with the same parameters.
+"""
+
+from math import sqrt
+
+import numpy as np
+
+from sverchok.dependencies import scipy
+
+if scipy is not None:
+    from scipy.spatial import cKDTree
+    from scipy.spatial.distance import cdist
+    from scipy.sparse import csr_matrix, csc_matrix, identity
+    from scipy.sparse.linalg import splu
+
+GLOBAL = 'GLOBAL'
+LOCAL = 'LOCAL'
+
+rbf_modes = [
+        (GLOBAL, "Global", "Solve one system of equations for all samples", 0),
+        (LOCAL, "Local", "Partition of unity: blend interpolants built for small overlapping regions; recommended for large numbers of samples", 1)
+    ]
+
+def wendland_c0(r):
+    return np.where(r < 1.0, (1.0 - r)**2, 0.0)
+
+def wendland_c2(r):
+    return np.where(r < 1.0, (1.0 - r)**4 * (4.0*r + 1.0), 0.0)
+
+def wendland_c4(r):
+    return np.where(r < 1.0, (1.0 - r)**6 * (35.0*r*r + 18.0*r + 3.0) / 3.0, 0.0)
+
+compact_kernels = {
+        'wendland_c0': wendland_c0,
+        'wendland_c2': wendland_c2,
+        'wendland_c4': wendland_c4
+    }
+
+def is_compact_function(function):
+    return function in compact_kernels
+
+def _global_kernel(function, r, epsilon):
+    if function == 'multiquadric':
+        return np.sqrt((r/epsilon)**2 + 1)
+    elif function == 'inverse':
+        return 1.0 / np.sqrt((r/epsilon)**2 + 1)
+    elif function == 'gaussian':
+        return np.exp(-(r/epsilon)**2)
+    elif function == 'linear':
+        return r
+    elif function == 'cubic':
+        return r**3
+    elif function == 'quintic':
+        return r**5
+    elif function == 'thin_plate':
+        result = np.zeros_like(r)
+        good = r > 0
+        result[good] = r[good]**2 * np.log(r[good])
+        return result
+    else:
+        raise Exception(f"Unsupported RBF function: {function}")
+
+def _distances(points1, points2):
+    if scipy is not None:
+        return cdist(points1, points2)
+    return np.linalg.norm(points1[:, np.newaxis] - points2[np.newaxis], axis=2)
+
+def _pairs_within(points, tree, radius):
+    """
+    All pairs (i, j) such that distance between points[i] and tree.data[j]
+    is less than radius, as three arrays: i, j, distance.
+    """
+    other = cKDTree(points)
+    pairs = other.sparse_distance_matrix(tree, radius, output_type='ndarray')
+    return pairs['i'], pairs['j'], pairs['v']
+
+# Systems with more equations than this are solved by conjugate gradients
+# instead of sparse LU decomposition, which produces too much fill-in for
+# 3D point clouds.
+SPARSE_DIRECT_LIMIT = 5000
+
+def _conjugate_gradient(matrix, rhs, tolerance=1e-10, max_iterations=None):
+    """
+    Solve sparse symmetric positive definite system by conjugate gradients
+    with Jacobi preconditioner. All columns of rhs are solved at once.
+    """
+    rhs = np.asarray(rhs, dtype=np.float64)
+    single = rhs.ndim == 1
+    if single:
+        rhs = rhs[:, np.newaxis]
+    n = len(rhs)
+    if max_iterations is None:
+        max_iterations = max(100, 10 * int(sqrt(n)))
+    inv_diagonal = 1.0 / matrix.diagonal()
+    x = np.zeros_like(rhs)
+    r = rhs.copy()
+    z = inv_diagonal[:, np.newaxis] * r
+    p = z.copy()
+    rz = (r * z).sum(axis=0)
+    target = tolerance * np.maximum(np.linalg.norm(rhs, axis=0), 1e-300)
+    for _ in range(max_iterations):
+        if (np.linalg.norm(r, axis=0) <= target).all():
+            break
+        ap = matrix @ p
+        pap = (p * ap).sum(axis=0)
+        alpha = np.divide(rz, pap, out=np.zeros_like(rz), where=pap != 0)
+        x += alpha * p
+        r -= alpha * ap
+        z = inv_diagonal[:, np.newaxis] * r
+        rz_new = (r * z).sum(axis=0)
+        beta = np.divide(rz_new, rz, out=np.zeros_like(rz), where=rz != 0)
+        p = z + beta * p
+        rz = rz_new
+    if single:
+        return x[:, 0]
+    return x
+
+def _fit_linear_trend(points, values):
+    matrix = np.concatenate((points, np.ones((len(points), 1))), axis=1)
+    coeffs, _, _, _ = np.linalg.lstsq(matrix, values, rcond=None)
+    return coeffs
+
+def _eval_linear_trend(coeffs, points):
+    return points @ coeffs[:-1] + coeffs[-1]
+
+class SvRbfInterpolator(object):
+    """
+    RBF interpolator. Call it with one array per coordinate, like
+    scipy.interpolate.Rbf, or pass points array to evaluate().
+
+    Args:
+        points: np.array of shape (n, dim) - sample points.
+        values: np.array of shape (n,) or (n, k) - values at sample points.
+        function: one of names from utils.math.rbf_functions or
+            utils.math.compact_rbf_functions.
+        epsilon: shape parameter for multiquadric, inverse and gaussian
+            kernels. Calculated from points bounding box by default, in the
+            same way as in scipy.
+        smooth: smoothing; 0 means exact interpolation.
+        radius: support radius for compact (Wendland) kernels. By default it
+            is selected so that each sample has at least `neighbours` other
+            samples within this radius.
+        mode: GLOBAL or LOCAL.
+        points_per_patch: LOCAL mode only: average number of samples in one region.
+        overlap: LOCAL mode only: how much regions overlap.
+        memory_limit: approximate limit for memory (in bytes) used by
+            temporary arrays during evaluation.
+    """
+    def __init__(self, points, values, function='multiquadric', epsilon=None, smooth=0.0,
+                    radius=None, mode=GLOBAL, neighbours=32,
+                    points_per_patch=64, overlap=1.5,
+                    memory_limit=64*1024*1024):
+        self.points = np.asarray(points, dtype=np.float64)
+        if self.points.ndim == 1:
+            self.points = self.points[:, np.newaxis]
+        self.values = np.asarray(values, dtype=np.float64)
+        if len(self.points) != len(self.values):
+            raise Exception(f"Number of points ({len(self.points)}) does not match number of values ({len(self.values)})")
+        self.function = function
+        self.smooth = smooth
+        self.mode = mode
+        self.memory_limit = memory_limit
+        self.is_compact = is_compact_function(function)
+        if (self.is_compact or mode == LOCAL) and scipy is None:
+            raise Exception("Compact RBF kernels and local RBF mode require SciPy")
+
+        if epsilon is None:
+            epsilon = self._default_epsilon()
+        self.epsilon = epsilon
+
+        if self.is_compact and radius is None:
+            radius = self._default_radius(neighbours)
+        self.radius = radius
+
+        if mode == LOCAL:
+            self._init_patches(points_per_patch, overlap)
+        elif self.is_compact:
+            self._solve_sparse()
+        else:
+            self._solve_dense()
+
+    @property
+    def dim(self):
+        return self.points.shape[1]
+
+    def _default_epsilon(self):
+        # the same as scipy.interpolate.Rbf
+        edges = self.points.max(axis=0) - self.points.min(axis=0)
+        edges = edges[np.nonzero(edges)]
+        if len(edges) == 0:
+            return 1.0
+        return np.power(np.prod(edges) / len(self.points), 1.0 / edges.size)
+
+    def _default_radius(self, neighbours):
+        n = len(self.points)
+        if n < 2:
+            return 1.0
+        k = min(n, neighbours + 1)
+        distances, _ = cKDTree(self.points).query(self.points, k=k)
+        radius = np.percentile(distances[:, -1], 90) * 1.001
+        if radius <= 0:
+            radius = 1.0
+        return radius
+
+    def kernel(self, r):
+        """
+        Values of the radial function at distances r.
+        """
+        if self.is_compact:
+            return compact_kernels[self.function](r / self.radius)
+        else:
+            return _global_kernel(self.function, r, self.epsilon)
+
+    def _solve_dense(self):
+        # The same system as in scipy.interpolate.Rbf
+        matrix = self.kernel(_distances(self.points, self.points))
+        matrix -= np.eye(len(self.points)) * self.smooth
+        self.weights = np.linalg.solve(matrix, self.values)
+
+    def _solve_sparse(self):
+        n = len(self.points)
+        self.tree = cKDTree(self.points)
+        i, j, distances = _pairs_within(self.points, self.tree, self.radius)
+        matrix = csr_matrix((self.kernel(distances), (i, j)), shape=(n, n))
+        if self.smooth:
+            # Wendland kernels are positive definite, so smoothing term is added.
+            matrix = matrix + self.smooth * identity(n, format='csr')
+        # Compactly supported kernels vanish far from samples, so the linear
+        # trend is fitted separately and only residuals are interpolated.
+        self.trend = _fit_linear_trend(self.points, self.values)
+        residuals = self.values - _eval_linear_trend(self.trend, self.points)
+        if n <= SPARSE_DIRECT_LIMIT:
+            self.weights = splu(matrix.tocsc()).solve(residuals)
+        else:
+            self.weights = _conjugate_gradient(matrix, residuals)
+        self._neighbours_per_point = max(1, len(i) // n)
+
+    def _init_patches(self, points_per_patch, overlap):
+        n, dim = self.points.shape
+        self.tree = cKDTree(self.points)
+        p_min = self.points.min(axis=0)
+        extents = self.points.max(axis=0) - p_min
+        active = extents > 1e-9 * max(extents.max(), 1e-12)
+        n_active = int(active.sum())
+
+        if n_active == 0:
+            size = 1.0
+        else:
+            volume = np.prod(extents[active])
+            size = (volume * points_per_patch / n) ** (1.0 / n_active)
+        counts = np.ones(dim, dtype=np.int64)
+        counts[active] = np.maximum(1, np.ceil(extents[active] / size)).astype(np.int64)
+        cell_sizes = np.where(active, extents / counts, 0.0)
+        patch_radius = overlap * 0.5 * sqrt((cell_sizes**2).sum())
+        if patch_radius <= 0:
+            patch_radius = 1.0
+
+        grid = np.meshgrid(*[np.arange(count) for count in counts], indexing='ij')
+        grid = np.stack([g.ravel() for g in grid], axis=1)
+        centers = p_min + (grid + 0.5) * cell_sizes
+        centers[:, ~active] = p_min[~active]
+        n_found = self.tree.query_ball_point(centers, patch_radius, return_length=True)
+        centers = centers[n_found > 0]
+
+        min_points = min(n, max(dim + 2, points_per_patch // 4))
+        patches = []
+        radiuses = []
+        for center in centers:
+            idxs = self.tree.query_ball_point(center, patch_radius)
+            radius = patch_radius
+            if len(idxs) < min_points:
+                distances, idxs = self.tree.query(center, k=min_points)
+                idxs = np.atleast_1d(idxs)
+                radius = max(patch_radius, np.max(distances) * 1.05)
+            idxs = np.asarray(idxs)
+            patch = SvRbfInterpolator(self.points[idxs], self.values[idxs],
+                        function = self.function, epsilon = self.epsilon,
+                        smooth = self.smooth, radius = self.radius,
+                        mode = GLOBAL, memory_limit = self.memory_limit)
+            patches.append(patch)
+            radiuses.append(radius)
+
+        self.patches = patches
+        self.patch_centers = centers
+        self.patch_radiuses = np.array(radiuses)
+        self.patch_tree = cKDTree(centers)
+
+    def _chunk_size(self):
+        if self.mode == LOCAL:
+            per_point = 8 * 4 * 8
+        elif self.is_compact:
+            per_point = 8 * 3 * self._neighbours_per_point
+        else:
+            per_point = 8 * 2 * len(self.points)
+        return max(1, self.memory_limit // per_point)
+
+    def _evaluate_chunk(self, points):
+        if self.mode == LOCAL:
+            return self._evaluate_local(points)
+        elif self.is_compact:
+            i, j, distances = _pairs_within(points, self.tree, self.radius)
+            matrix = csr_matrix((self.kernel(distances), (i, j)), shape=(len(points), len(self.points)))
+            return matrix @ self.weights + _eval_linear_trend(self.trend, points)
+        else:
+            return self.kernel(_distances(points, self.points)) @ self.weights
+
+    def _evaluate_local(self, points):
+        n = len(points)
+        value_shape = self.values.shape[1:]
+        numerator = np.zeros((n,) + value_shape)
+        denominator = np.zeros(n)
+
+        i, j, distances = _pairs_within(points, self.patch_tree, self.patch_radiuses.max())
+        good = distances < self.patch_radiuses[j]
+        i, j, distances = i[good], j[good], distances[good]
+        weights = wendland_c2(distances / self.patch_radiuses[j])
+
+        order = np.argsort(j, kind='stable')
+        i, j, weights = i[order], j[order], weights[order]
+        patch_idxs, starts = np.unique(j, return_index=True)
+        ends = np.append(starts[1:], len(j))
+        for patch_idx, start, end in zip(patch_idxs, starts, ends):
+            point_idxs = i[start:end]
+            patch_weights = weights[start:end]
+            values = self.patches[patch_idx].evaluate(points[point_idxs])
+            if value_shape:
+                patch_weights = patch_weights.reshape((-1,) + (1,) * len(value_shape))
+            np.add.at(numerator, point_idxs, patch_weights * values)
+            np.add.at(denominator, point_idxs, weights[start:end])
+
+        covered = denominator > 0
+        result = np.empty_like(numerator)
+        if value_shape:
+            result[covered] = numerator[covered] / denominator[covered].reshape((-1,) + (1,) * len(value_shape))
+        else:
+            result[covered] = numerator[covered] / denominator[covered]
+
+        # Points outside of all patches: use the nearest one.
+        if not covered.all():
+            outside = np.where(~covered)[0]
+            _, nearest = self.patch_tree.query(points[outside])
+            for patch_idx in np.unique(nearest):
+                point_idxs = outside[nearest == patch_idx]
+                result[point_idxs] = self.patches[patch_idx].evaluate(points[point_idxs])
+        return result
+
+    def evaluate(self, points):
+        """
+        input: np.array of shape (m, dim)
+        output: np.array of shape (m,) or (m, k), depending on shape of values.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim == 1:
+            points = points[:, np.newaxis]
+        m = len(points)
+        chunk_size = self._chunk_size()
+        if m <= chunk_size:
+            return self._evaluate_chunk(points)
+        result = np.empty((m,) + self.values.shape[1:])
+        for start in range(0, m, chunk_size):
+            result[start : start + chunk_size] = self._evaluate_chunk(points[start : start + chunk_size])
+        return result
+
+    def __call__(self, *coords):
+        coords = [np.asarray(c, dtype=np.float64) for c in coords]
+        if len(coords) != self.dim:
+            raise Exception(f"Interpolator expects {self.dim} coordinates, got {len(coords)}")
+        shape = coords[0].shape
+        points = np.stack([c.ravel() for c in coords], axis=1)
+        result = self.evaluate(points)
+        return result.reshape(shape + self.values.shape[1:])
+
@@ -0,0 +1,242 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Vectorized versions of mesh relaxation algorithms from utils/relax_mesh.py.
+
+Mesh topology does not change during relaxation, so all adjacency relations
+(vertex - face, vertex - edge) are built once as scipy.sparse matrices, and
+each iteration is a few sparse matrix - vector products. Vertex normals are
+calculated the same way as in bmesh (face normals weighted by corner angles),
+and projection to the source surface is done for all vertices at once by
+SvNearestFinder.
+"""
+
+import numpy as np
+
+from sverchok.dependencies import scipy
+from sverchok.data_structure import repeat_last_for_length
+from sverchok.utils.raycast import SvNearestFinder, _cross, _dot
+from sverchok.utils.relax_mesh import NONE, BVH, LINEAR, NORMAL, MINIMUM, MAXIMUM, AVERAGE
+
+if scipy is not None:
+    import scipy.sparse
+
+class SvMeshRelaxation(object):
+    """
+    Sparse operators of mesh topology used by relaxation algorithms.
+
+    Args:
+        vertices: initial vertices, list or np.array of shape (n, 3).
+        edges: list of edges; if empty, edges are calculated from faces.
+        faces: list of faces.
+        mask: optional list of flags; vertices with False flags are not moved.
+        skip_boundary: if True, boundary vertices are not moved.
+        use_axes: set of coordinate axes (0, 1, 2) along which vertices can move.
+    """
+    def __init__(self, vertices, edges, faces, mask=None, skip_boundary=True, use_axes={0,1,2}):
+        if scipy is None:
+            raise Exception("SvMeshRelaxation requires scipy")
+        self.src_vertices = np.asarray(vertices, dtype=np.float64)
+        self.faces = faces
+        n = len(self.src_vertices)
+        self.n_verts = n
+        self.use_axes = np.array([axis in use_axes for axis in range(3)])
+        self._finder = None
+
+        sizes = np.array([len(face) for face in faces], dtype=np.int64)
+        n_faces = len(faces)
+        self.corner_face = np.repeat(np.arange(n_faces), sizes)
+        self.corner_vert = np.concatenate(faces).astype(np.int64) if n_faces else np.zeros(0, dtype=np.int64)
+        starts = np.cumsum(sizes) - sizes
+        nexts = np.arange(len(self.corner_vert)) + 1
+        nexts[starts + sizes - 1] = starts
+        prevs = np.arange(len(self.corner_vert)) - 1
+        prevs[starts] = starts + sizes - 1
+        self.corner_next = self.corner_vert[nexts]
+        self.corner_prev = self.corner_vert[prevs]
+        self.n_faces = n_faces
+
+        ones = np.ones(len(self.corner_vert))
+        # (n_faces x n_verts) matrix; averages face vertices
+        self.face_centers_op = scipy.sparse.csr_matrix((ones / sizes[self.corner_face], (self.corner_face, self.corner_vert)), shape=(n_faces, n))
+        # (n_verts x n_faces) corner incidence matrix
+        self.corners_op = scipy.sparse.csr_matrix((ones, (self.corner_vert, self.corner_face)), shape=(n, n_faces))
+        self.n_corners = np.asarray(self.corners_op.sum(axis=1)).ravel()
+        # each face linked to a vertex counts once, as in bmesh link_faces
+        linked = self.corners_op.copy()
+        linked.data[:] = 1.0
+        self.n_linked_faces = np.asarray(linked.sum(axis=1)).ravel()
+        self.linked_faces_op = scipy.sparse.diags(1.0 / np.maximum(self.n_linked_faces, 1)) @ linked
+
+        # Boundary edges are the ones which belong to exactly one face
+        face_edges = np.sort(np.stack((self.corner_vert, self.corner_next), axis=1), axis=1)
+        face_edges, counts = np.unique(face_edges.reshape((-1, 2)), axis=0, return_counts=True)
+        boundary = np.zeros(n, dtype=bool)
+        boundary[face_edges[counts == 1].ravel()] = True
+        self.boundary = boundary
+
+        if edges is None or len(edges) == 0 or len(edges[0]) == 0:
+            self.edges = face_edges
+        else:
+            self.edges = np.array(edges, dtype=np.int64).reshape((-1, 2))
+        # (n_verts x n_edges) matrix; sums edge forces at vertices (with
+        # opposite signs at two ends of an edge) divided by vertex degrees
+        n_edges = len(self.edges)
+        rows = np.concatenate((self.edges[:,0], self.edges[:,1]))
+        cols = np.concatenate((np.arange(n_edges), np.arange(n_edges)))
+        signs = np.concatenate((np.ones(n_edges), -np.ones(n_edges)))
+        degrees = np.bincount(rows, minlength=n)
+        self.edge_forces_op = scipy.sparse.csr_matrix((signs / degrees[rows], (rows, cols)), shape=(n, n_edges))
+
+        movable = np.ones(n, dtype=bool)
+        if skip_boundary:
+            movable &= ~boundary
+        if mask is not None:
+            movable &= np.array(repeat_last_for_length(mask, n), dtype=bool)
+        self.movable = movable
+
+    @property
+    def finder(self):
+        if self._finder is None:
+            self._finder = SvNearestFinder(self.src_vertices, self.faces)
+        return self._finder
+
+    def face_normals(self, verts):
+        """
+        Unit face normals and face areas (Newell's method).
+        """
+        crosses = _cross(verts[self.corner_vert], verts[self.corner_next])
+        normals = np.stack([np.bincount(self.corner_face, weights=crosses[:,k], minlength=self.n_faces) for k in range(3)], axis=1)
+        norms = np.linalg.norm(normals, axis=1)
+        normals /= np.where(norms > 0, norms, 1.0)[:, np.newaxis]
+        return normals, 0.5 * norms
+
+    def vertex_normals(self, verts, face_normals=None):
+        """
+        Vertex normals, as calculated by bmesh: sums of normals of linked faces,
+        weighted by angles of faces at the vertex.
+        """
+        if face_normals is None:
+            face_normals, _ = self.face_normals(verts)
+        co = verts[self.corner_vert]
+        v1 = verts[self.corner_next] - co
+        v2 = verts[self.corner_prev] - co
+        norms = np.linalg.norm(v1, axis=1) * np.linalg.norm(v2, axis=1)
+        cosines = _dot(v1, v2) / np.where(norms > 0, norms, 1.0)
+        angles = np.arccos(np.clip(cosines, -1.0, 1.0))
+        weighted = face_normals[self.corner_face] * angles[:, np.newaxis]
+        normals = np.stack([np.bincount(self.corner_vert, weights=weighted[:,k], minlength=self.n_verts) for k in range(3)], axis=1)
+        norms = np.linalg.norm(normals, axis=1)
+        return normals / np.where(norms > 0, norms, 1.0)[:, np.newaxis]
+
+    def _tangent(self, verts, targets):
+        normals = self.vertex_normals(verts)
+        dv = targets - verts
+        return verts + dv - _dot(dv, normals)[:, np.newaxis] * normals
+
+    def _finish(self, verts, targets):
+        # only movable vertices along allowed axes are changed
+        result = verts.copy()
+        movable = self.movable
+        result[np.ix_(movable, self.use_axes)] = targets[np.ix_(movable, self.use_axes)]
+        return result
+
+    def _preserve_shape(self, verts, targets, method):
+        if method == NONE:
+            return targets
+        elif method == NORMAL:
+            return self._tangent(verts, targets)
+        elif method == BVH:
+            result = targets.copy()
+            idxs = np.where(self.movable)[0]
+            result[idxs] = self.finder.find_nearest(targets[idxs]).locations
+            return result
+        else:
+            raise Exception("Unsupported shape preservation method")
+
+    def _target_value(self, values, target):
+        if target == MINIMUM:
+            return values.min()
+        elif target == MAXIMUM:
+            return values.max()
+        elif target == AVERAGE:
+            return values.mean()
+        else:
+            raise Exception("Unsupported target type")
+
+    def lloyd_step(self, verts, method=NORMAL):
+        face_centers = self.face_centers_op @ verts
+        medians = self.linked_faces_op @ face_centers
+        if method == LINEAR:
+            # Best fitting plane of centers of linked faces: its normal is the
+            # eigenvector of covariance matrix with the smallest eigenvalue
+            products = (face_centers[:, :, np.newaxis] * face_centers[:, np.newaxis, :]).reshape((-1, 9))
+            second = (self.linked_faces_op @ products).reshape((-1, 3, 3))
+            covariance = second - medians[:, :, np.newaxis] * medians[:, np.newaxis, :]
+            _, eigenvectors = np.linalg.eigh(covariance)
+            normals = eigenvectors[:, :, 0]
+            distances = _dot(verts - medians, normals)
+            targets = medians + distances[:, np.newaxis] * normals
+        else:
+            targets = self._preserve_shape(verts, medians, method)
+        # vertices without faces stay where they were
+        targets[self.n_linked_faces == 0] = verts[self.n_linked_faces == 0]
+        return self._finish(verts, targets)
+
+    def edges_step(self, verts, k, method=NONE, target=AVERAGE):
+        v1s, v2s = self.edges[:,0], self.edges[:,1]
+        edge_vecs = verts[v2s] - verts[v1s]
+        edge_lens = np.linalg.norm(edge_vecs, axis=1)
+        target_len = self._target_value(edge_lens, target)
+        forces = ((edge_lens - target_len) / 2.0)[:, np.newaxis] * edge_vecs
+        targets = verts + k * (self.edge_forces_op @ forces)
+        targets = self._preserve_shape(verts, targets, method)
+        return self._finish(verts, targets)
+
+    def faces_step(self, verts, k, method=NONE, target=AVERAGE):
+        _, areas = self.face_normals(verts)
+        target_area = self._target_value(areas, target)
+        scales = np.sqrt(target_area / np.where(areas > 0, areas, 1.0)) - 1.0
+        centers = self.face_centers_op @ verts
+        # sum over corners of (scale - 1) * (vertex - face center)
+        weights = self.corners_op @ scales
+        shifts = self.corners_op @ (scales[:, np.newaxis] * centers)
+        forces = (verts * weights[:, np.newaxis] - shifts) / np.maximum(self.n_corners, 1)[:, np.newaxis]
+        targets = verts + k * forces
+        targets = self._preserve_shape(verts, targets, method)
+        return self._finish(verts, targets)
+
+def lloyd_relax_np(vertices, faces, iterations, mask=None, method=NORMAL, skip_boundary=True, use_axes={0,1,2}):
+    """
+    Vectorized version of relax_mesh.lloyd_relax.
+    """
+    relaxation = SvMeshRelaxation(vertices, None, faces, mask=mask, skip_boundary=skip_boundary, use_axes=use_axes)
+    verts = relaxation.src_vertices
+    for i in range(iterations):
+        verts = relaxation.lloyd_step(verts, method)
+    return verts.tolist()
+
+def edges_relax_np(vertices, edges, faces, iterations, k, mask=None, method=NONE, target=AVERAGE, skip_boundary=True, use_axes={0,1,2}):
+    """
+    Vectorized version of relax_mesh.edges_relax.
+    """
+    relaxation = SvMeshRelaxation(vertices, edges, faces, mask=mask, skip_boundary=skip_boundary, use_axes=use_axes)
+    verts = relaxation.src_vertices
+    for i in range(iterations):
+        verts = relaxation.edges_step(verts, k, method, target)
+    return verts.tolist()
+
+def faces_relax_np(vertices, edges, faces, iterations, k, mask=None, method=NONE, target=AVERAGE, skip_boundary=True, use_axes={0,1,2}):
+    """
+    Vectorized version of relax_mesh.faces_relax.
+    """
+    relaxation = SvMeshRelaxation(vertices, edges, faces, mask=mask, skip_boundary=skip_boundary, use_axes=use_axes)
+    verts = relaxation.src_vertices
+    for i in range(iterations):
+        verts = relaxation.faces_step(verts, k, method, target)
+    return verts.tolist()
@@ -25,7 +25,7 @@ from sverchok.utils.curve import knotvector as sv_knotvector
 from sverchok.utils.curve.algorithms import (
             SvNormalTrack, curve_frame_on_surface_array,
             MathutilsRotationCalculator, DifferentialRotationCalculator,
-            reparametrize_curve
+            SvCurveFrameCalculator, reparametrize_curve
         )
 from sverchok.utils.surface.core import SvSurface, UnsupportedSurfaceTypeException
 from sverchok.utils.surface.nurbs import SvNurbsSurface
@@ -512,6 +512,7 @@ class SvExtrudeCurveFrenetSurface(SvSurface):
         self.extrusion = extrusion
         self.origin = origin
         self.normal_delta = 0.001
+        self.calculator = DifferentialRotationCalculator(extrusion, FRENET)
         self.__description__ = "Extrusion of {}".format(profile)
 
     def evaluate(self, u, v):
@@ -526,7 +527,7 @@ class SvExtrudeCurveFrenetSurface(SvSurface):
         extrusion_start = self.extrusion.evaluate(v_min)
         extrusion_points = self.extrusion.evaluate_array(vs)
         extrusion_vectors = extrusion_points - extrusion_start
-        frenet, _ , _ = self.extrusion.frame_array(vs)
+        frenet = self.calculator.get_matrices(vs)
         profile_vectors = (frenet @ profile_vectors)[:,:,0]
         result = extrusion_vectors + profile_vectors
         if self.origin == EXTRUSION:
@@ -561,7 +562,7 @@ class SvExtrudeCurveZeroTwistSurface(SvSurface):
         self.extrusion = extrusion
         self.origin = origin
         self.normal_delta = 0.001
-        self.extrusion.pre_calc_torsion_integral(resolution)
+        self.calculator = DifferentialRotationCalculator(extrusion, ZERO, resolution)
         self.__description__ = "Extrusion of {}".format(profile)
 
     def evaluate(self, u, v):
@@ -577,18 +578,8 @@ class SvExtrudeCurveZeroTwistSurface(SvSurface):
         extrusion_points = self.extrusion.evaluate_array(vs)
         extrusion_vectors = extrusion_points - extrusion_start
 
-        frenet, _ , _ = self.extrusion.frame_array(vs)
-
-        angles = - self.extrusion.torsion_integral(vs)
-        n = len(us)
-        zeros = np.zeros((n,))
-        ones = np.ones((n,))
-        row1 = np.stack((np.cos(angles), np.sin(angles), zeros)).T # (n, 3)
-        row2 = np.stack((-np.sin(angles), np.cos(angles), zeros)).T # (n, 3)
-        row3 = np.stack((zeros, zeros, ones)).T # (n, 3)
-        rotation_matrices = np.dstack((row1, row2, row3))
-
-        profile_vectors = (frenet @ rotation_matrices @ profile_vectors)[:,:,0]
+        matrices = self.calculator.get_matrices(vs)
+        profile_vectors = (matrices @ profile_vectors)[:,:,0]
         result = extrusion_vectors + profile_vectors
         if self.origin == EXTRUSION:
             result = result + self.extrusion.evaluate(v_min)
@@ -612,7 +603,7 @@ class SvExtrudeCurveTrackNormalSurface(SvSurface):
         self.extrusion = extrusion
         self.origin = origin
         self.normal_delta = 0.001
-        self.tracker = SvNormalTrack(extrusion, resolution)
+        self.calculator = DifferentialRotationCalculator(extrusion, TRACK_NORMAL, resolution)
         self.__description__ = "Extrusion of {}".format(profile)
 
     def get_u_min(self):
@@ -639,7 +630,7 @@ class SvExtrudeCurveTrackNormalSurface(SvSurface):
         extrusion_points = self.extrusion.evaluate_array(vs)
         extrusion_vectors = extrusion_points - extrusion_start
 
-        matrices = self.tracker.evaluate_array(vs)
+        matrices = self.calculator.get_matrices(vs)
         profile_vectors = (matrices @ profile_vectors)[:,:,0]
         result = extrusion_vectors + profile_vectors
         if self.origin == EXTRUSION:
@@ -781,8 +772,7 @@ class SvConstPipeSurface(SvSurface):
         self.algorithm = algorithm
         self.normal_delta = 0.001
         self.u_bounds = self.circle.get_u_bounds()
-        if algorithm in {FRENET, ZERO, TRACK_NORMAL}:
-            self.calculator = DifferentialRotationCalculator(curve, algorithm, resolution)
+        self.calculator = SvCurveFrameCalculator(curve, algorithm, z_axis=2, resolution=resolution)
 
     def get_u_min(self):
         return self.u_bounds[0]
@@ -799,21 +789,10 @@ class SvConstPipeSurface(SvSurface):
     def evaluate(self, u, v):
         return self.evaluate_array(np.array([u]), np.array([v]))[0]
 
-    def get_matrix(self, tangent):
-        return MathutilsRotationCalculator.get_matrix(tangent, scale=1.0,
-                axis=2,
-                algorithm = self.algorithm,
-                scale_all=False)
-
     def get_matrices(self, ts):
-        if self.algorithm in {FRENET, ZERO, TRACK_NORMAL}:
-            return self.calculator.get_matrices(ts)
-        elif self.algorithm in {HOUSEHOLDER, TRACK, DIFF}:
-            tangents = self.curve.tangent_array(ts)
-            matrices = np.vectorize(lambda t : self.get_matrix(t), signature='(3)->(3,3)')(tangents)
-            return matrices
-        else:
+        if self.algorithm not in {FRENET, ZERO, TRACK_NORMAL, HOUSEHOLDER, TRACK, DIFF}:
             raise Exception("Unsupported algorithm")
+        return self.calculator.get_matrices(ts)
 
     def evaluate_array(self, us, vs):
         profile_vectors = self.circle.evaluate_array(us)
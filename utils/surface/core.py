@@ -11,11 +11,19 @@ from collections import defaultdict
 
 from sverchok.utils.logging import info, exception
 from sverchok.utils.surface.data import *
+from sverchok.utils.evaluation_cache import install_evaluation_cache
 
 class UnsupportedSurfaceTypeException(TypeError):
     pass
 
+# Methods whose results are memoized when evaluation cache is enabled
+CACHED_SURFACE_METHODS = ['evaluate_array', 'normal_array', 'derivatives_data_array']
+
 class SvSurface(object):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        install_evaluation_cache(cls, CACHED_SURFACE_METHODS)
+
     def __repr__(self):
         if hasattr(self, '__description__'):
             description = self.__description__
@@ -159,6 +167,8 @@ class SvSurface(object):
         m,M = self.get_v_min(), self.get_v_max()
         return M - m
 
+install_evaluation_cache(SvSurface, CACHED_SURFACE_METHODS)
+
 class SvSurfaceSubdomain(SvSurface):
     def __init__(self, surface, u_bounds, v_bounds):
         self.surface = surface
@@ -6,7 +6,8 @@ from sverchok.utils.geom import Spline
 from sverchok.utils.nurbs_common import (
         SvNurbsMaths, SvNurbsBasisFunctions,
         nurbs_divide, from_homogenous,
-        CantRemoveKnotException
+        refine_knotvector, remove_knot_once, elevate_degree,
+        CantInsertKnotException, CantRemoveKnotException
     )
 from sverchok.utils.curve import knotvector as sv_knotvector
 from sverchok.utils.curve.nurbs_algorithms import interpolate_nurbs_curve, unify_curves, nurbs_curve_to_xoy, nurbs_curve_matrix
@@ -37,6 +38,10 @@ class SvNurbsSurface(SvSurface):
     U = 'U'
     V = 'V'
 
+    # Special values of `count` parameter of remove_knot()
+    ALL = 'ALL'
+    ALL_BUT_ONE = 'ALL_BUT_ONE'
+
     @classmethod
     def build(cls, implementation, degree_u, degree_v, knotvector_u, knotvector_v, control_points, weights=None, normalize_knots=False):
         return SvNurbsMaths.build_surface(implementation,
@@ -122,6 +127,31 @@ class SvNurbsSurface(SvSurface):
 
         implementation = self.get_nurbs_implementation()
 
+        if direction == SvNurbsSurface.U:
+            knotvector = self.get_knotvector_u()
+        else:
+            knotvector = self.get_knotvector_v()
+
+        if sv_knotvector.is_clamped(knotvector, degree):
+            # Elevate all rows (or columns) of control net at once
+            control_points = self.get_homogenous_control_points()
+            if direction == SvNurbsSurface.U:
+                control_points = np.transpose(control_points, axes=(1,0,2))
+            knotvector, control_points = elevate_degree(degree, knotvector, control_points, delta)
+            if direction == SvNurbsSurface.U:
+                control_points = np.transpose(control_points, axes=(1,0,2))
+            control_points, weights = from_homogenous(control_points)
+            if direction == SvNurbsSurface.U:
+                return SvNurbsSurface.build(implementation,
+                        degree+delta, self.get_degree_v(),
+                        knotvector, self.get_knotvector_v(),
+                        control_points, weights)
+            else:
+                return SvNurbsSurface.build(implementation,
+                        self.get_degree_u(), degree+delta,
+                        self.get_knotvector_u(), knotvector,
+                        control_points, weights)
+
         if direction == SvNurbsSurface.U:
             new_points = []
             new_weights = []
@@ -704,176 +734,79 @@ class SvNativeNurbsSurface(SvNurbsSurface):
     def get_nurbs_implementation(cls):
         return SvNurbsSurface.NATIVE
 
-    def insert_knot(self, direction, parameter, count=1, if_possible=False):
-        def get_common_count(curves):
-            if not if_possible:
-                # in this case the first curve.rinsert() call which can't insert the knot
-                # requested number of times will raise an exception, so we do not have to bother
-                return count
-            else:
-                # curve.insert_knot() calls will not raise exceptions, so we have to
-                # select the minimum number of possible knot insertions among all curves
-                min_count = count
-                for curve in curves:
-                    orig_kv = curve.get_knotvector()
-                    orig_multiplicity = sv_knotvector.find_multiplicity(orig_kv, parameter)
-                    if (parameter == orig_kv[0]) or (parameter == orig_kv[-1]):
-                        max_multiplicity = curve.get_degree()+1
-                    else:
-                        max_multiplicity = curve.get_degree()
-                    max_delta = max_multiplicity - orig_multiplicity
-                    min_count = min(min_count, max_delta)
-                return min_count
-
+    def _get_direction_data(self, direction):
+        """
+        Returns degree and knotvector along the direction, and homogenous
+        control points as np.array of shape (M, K, 4), where K is the
+        number of control points along the direction.
+        """
+        control_points = self.get_homogenous_control_points()
         if direction == SvNurbsSurface.U:
-            new_points = []
-            new_weights = []
-            new_u_degree = None
-            fixed_v_curves = []
-
-            for i in range(self.get_control_points().shape[1]):
-                fixed_v_points = self.get_control_points()[:,i]
-                fixed_v_weights = self.get_weights()[:,i]
-                fixed_v_curve = SvNurbsMaths.build_curve(SvNurbsMaths.NATIVE,
-                                    self.degree_u, self.knotvector_u,
-                                    fixed_v_points, fixed_v_weights)
-                fixed_v_curves.append(fixed_v_curve)
-
-            common_count = get_common_count(fixed_v_curves)
-
-            for fixed_v_curve in fixed_v_curves:
-                fixed_v_curve = fixed_v_curve.insert_knot(parameter, common_count, if_possible)
-                fixed_v_knotvector = fixed_v_curve.get_knotvector()
-                new_u_degree = fixed_v_curve.get_degree()
-                fixed_v_points = fixed_v_curve.get_control_points()
-                fixed_v_weights = fixed_v_curve.get_weights()
-                new_points.append(fixed_v_points)
-                new_weights.append(fixed_v_weights)
-
-            new_points = np.transpose(np.array(new_points), axes=(1,0,2))
-            new_weights = np.array(new_weights).T
-
-            return SvNativeNurbsSurface(new_u_degree, self.degree_v,
-                    fixed_v_knotvector, self.knotvector_v,
-                    new_points, new_weights)
-
+            return self.degree_u, self.knotvector_u, np.transpose(control_points, axes=(1,0,2))
         elif direction == SvNurbsSurface.V:
-            new_points = []
-            new_weights = []
-            new_v_degree = None
-            fixed_u_curves = []
-
-            for i in range(self.get_control_points().shape[0]):
-                fixed_u_points = self.get_control_points()[i,:]
-                fixed_u_weights = self.get_weights()[i,:]
-                fixed_u_curve = SvNurbsMaths.build_curve(SvNurbsMaths.NATIVE,
-                                    self.degree_v, self.knotvector_v,
-                                    fixed_u_points, fixed_u_weights)
-                fixed_u_curves.append(fixed_u_curve)
-
-            common_count = get_common_count(fixed_u_curves)
-
-            for fixed_u_curve in fixed_u_curves:
-                fixed_u_curve = fixed_u_curve.insert_knot(parameter, common_count, if_possible)
-                fixed_u_knotvector = fixed_u_curve.get_knotvector()
-                new_v_degree = fixed_u_curve.get_degree()
-                fixed_u_points = fixed_u_curve.get_control_points()
-                fixed_u_weights = fixed_u_curve.get_weights()
-                new_points.append(fixed_u_points)
-                new_weights.append(fixed_u_weights)
-
-            new_points = np.array(new_points)
-            new_weights = np.array(new_weights)
-
-            return SvNativeNurbsSurface(self.degree_u, new_v_degree,
-                    self.knotvector_u, fixed_u_knotvector,
-                    new_points, new_weights)
+            return self.degree_v, self.knotvector_v, control_points
         else:
             raise Exception("Unsupported direction")
 
-    def remove_knot(self, direction, parameter, count=1, if_possible=False, tolerance=1e-6):
-        def get_common_count(curves):
-            if not if_possible:
-                # in this case the first curve.remove_knot() call which can't remove the knot
-                # requested number of times will raise an exception, so we do not have to bother
-                return count
-            else:
-                # curve.remove_knot() calls will not raise exceptions, so we have to
-                # select the minimum number of possible knot removals among all curves
-                min_count = curves[0].get_degree()+1
-                for curve in curves:
-                    orig_kv = curve.get_knotvector()
-                    orig_multiplicity = sv_knotvector.find_multiplicity(orig_kv, parameter)
-                    tmp = curve.remove_knot(parameter, count, if_possible=True, tolerance=tolerance)
-                    new_kv = tmp.get_knotvector()
-                    new_multiplicity = sv_knotvector.find_multiplicity(new_kv, parameter)
-                    delta = orig_multiplicity - new_multiplicity
-                    min_count = min(min_count, delta)
-                return min_count
-
+    def _from_direction_data(self, direction, knotvector, control_points):
         if direction == SvNurbsSurface.U:
-            new_points = []
-            new_weights = []
-            new_u_degree = None
-            fixed_v_curves = []
-            for i in range(self.get_control_points().shape[1]):
-                fixed_v_points = self.get_control_points()[:,i]
-                fixed_v_weights = self.get_weights()[:,i]
-                fixed_v_curve = SvNurbsMaths.build_curve(SvNurbsMaths.NATIVE,
-                                    self.degree_u, self.knotvector_u,
-                                    fixed_v_points, fixed_v_weights)
-                fixed_v_curves.append(fixed_v_curve)
-            
-            common_count = get_common_count(fixed_v_curves)
-
-            for fixed_v_curve in fixed_v_curves:
-                fixed_v_curve = fixed_v_curve.remove_knot(parameter, common_count, if_possible=if_possible, tolerance=tolerance)
-                fixed_v_knotvector = fixed_v_curve.get_knotvector()
-                new_u_degree = fixed_v_curve.get_degree()
-                fixed_v_points = fixed_v_curve.get_control_points()
-                fixed_v_weights = fixed_v_curve.get_weights()
-                new_points.append(fixed_v_points)
-                new_weights.append(fixed_v_weights)
-
-            new_points = np.transpose(np.array(new_points), axes=(1,0,2))
-            new_weights = np.array(new_weights).T
-
-            return SvNativeNurbsSurface(new_u_degree, self.degree_v,
-                    fixed_v_knotvector, self.knotvector_v,
-                    new_points, new_weights)
-
-        elif direction == SvNurbsSurface.V:
-            new_points = []
-            new_weights = []
-            new_v_degree = None
-            fixed_u_curves = []
-            for i in range(self.get_control_points().shape[0]):
-                fixed_u_points = self.get_control_points()[i,:]
-                fixed_u_weights = self.get_weights()[i,:]
-                fixed_u_curve = SvNurbsMaths.build_curve(SvNurbsMaths.NATIVE,
-                                    self.degree_v, self.knotvector_v,
-                                    fixed_u_points, fixed_u_weights)
-                fixed_u_curves.append(fixed_u_curve)
+            control_points = np.transpose(control_points, axes=(1,0,2))
+        control_points, weights = from_homogenous(control_points)
+        if direction == SvNurbsSurface.U:
+            return SvNativeNurbsSurface(self.degree_u, self.degree_v,
+                    knotvector, self.knotvector_v,
+                    control_points, weights)
+        else:
+            return SvNativeNurbsSurface(self.degree_u, self.degree_v,
+                    self.knotvector_u, knotvector,
+                    control_points, weights)
 
-            common_count = get_common_count(fixed_u_curves)
+    def insert_knot(self, direction, parameter, count=1, if_possible=False):
+        degree, knotvector, control_points = self._get_direction_data(direction)
 
-            for fixed_u_curve in fixed_u_curves:
-                fixed_u_curve = fixed_u_curve.remove_knot(parameter, common_count, if_possible=if_possible, tolerance=tolerance)
-                fixed_u_knotvector = fixed_u_curve.get_knotvector()
-                new_v_degree = fixed_u_curve.get_degree()
-                fixed_u_points = fixed_u_curve.get_control_points()
-                fixed_u_weights = fixed_u_curve.get_weights()
-                new_points.append(fixed_u_points)
-                new_weights.append(fixed_u_weights)
+        multiplicity = sv_knotvector.find_multiplicity(knotvector, parameter)
+        if (parameter == knotvector[0]) or (parameter == knotvector[-1]):
+            max_multiplicity = degree+1
+        else:
+            max_multiplicity = degree
+        if multiplicity + count > max_multiplicity:
+            if if_possible:
+                count = max_multiplicity - multiplicity
+            else:
+                raise CantInsertKnotException(f"Can't insert knot t={parameter} for {count} times")
 
-            new_points = np.array(new_points)
-            new_weights = np.array(new_weights)
+        # All rows (or columns) of control net have the same knotvector,
+        # so they are processed at once.
+        knotvector, control_points = refine_knotvector(degree, knotvector, control_points,
+                                        [parameter] * max(count, 0))
+        return self._from_direction_data(direction, knotvector, control_points)
 
-            return SvNativeNurbsSurface(self.degree_u, new_v_degree,
-                    self.knotvector_u, fixed_u_knotvector,
-                    new_points, new_weights)
-        else:
-            raise Exception("Unsupported direction")
+    def remove_knot(self, direction, parameter, count=1, if_possible=False, tolerance=1e-6):
+        degree, knotvector, control_points = self._get_direction_data(direction)
+
+        orig_multiplicity = sv_knotvector.find_multiplicity(knotvector, parameter)
+        if count == SvNurbsSurface.ALL:
+            count = orig_multiplicity
+        elif count == SvNurbsSurface.ALL_BUT_ONE:
+            count = orig_multiplicity - 1
+        if not if_possible and (count > orig_multiplicity):
+            raise CantRemoveKnotException(f"Asked to remove knot t={parameter} for {count} times, but it's multiplicity is only {orig_multiplicity}")
+
+        # The knot is removed from all rows (or columns) of control net
+        # at once, and only if it can be removed from all of them.
+        removed_count = 0
+        for i in range(count):
+            try:
+                knotvector, control_points = remove_knot_once(degree, knotvector, control_points, parameter, tolerance)
+                removed_count += 1
+            except CantRemoveKnotException:
+                break
+
+        if not if_possible and (removed_count < count):
+            raise CantRemoveKnotException(f"Asked to remove knot t={parameter} for {count} times, but could remove it only {removed_count} times")
+        if removed_count == 0:
+            return self
+        return self._from_direction_data(direction, knotvector, control_points)
 
     def get_degree_u(self):
         return self.degree_u
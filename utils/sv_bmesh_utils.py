@@ -30,6 +30,7 @@ import mathutils
 
 from sverchok.data_structure import zip_long_repeat, has_element
 from sverchok.utils.logging import debug
+from sverchok.utils.mesh.weld import weld_mesh
 
 @contextmanager
 def empty_bmesh(use_operators=True):
@@ -380,12 +381,17 @@ def bmesh_join(list_of_bmeshes, normal_update=False):
 
 def remove_doubles(vertices, edges, faces, d, face_data=None, vert_data=None, edge_data=None):
     """
-    This is a wrapper for bmesh.ops.remove_doubles.
+    Merge vertices which are closer than d to each other.
+    This used to be a wrapper for bmesh.ops.remove_doubles; now it uses
+    NumPy-based implementation from utils.mesh.weld, which does not need
+    bmesh round-trip. As bmesh did, it outputs edges of all faces
+    in addition to provided edges.
 
     vertices, edges, faces: standard sverchok formatted description of the mesh.
     d: the threshold for the merge procedure.
     face_data: arbitrary data per mesh face.
     vert_data: arbitrary data per mesh vertex.
+    edge_data: arbitrary data per mesh edge.
 
     output:
         if face_data, vert_data or edge_data was specified, this outputs 4-tuple:
@@ -395,48 +401,43 @@ def remove_doubles(vertices, edges, faces, d, face_data=None, vert_data=None, ed
             * data: a dictionary with following keys:
                 * 'vert_init_index': indexes of the output vertices in the original mesh
                 * 'edge_init_index': indexes of the output edges in the original mesh
+                  (-1 for edges which exist only as sides of faces)
                 * 'face_init_index': indexes of the output faces in the original mesh
                 * 'verts': correctly reordered vert_data (if present)
                 * 'edges': correctly reordered edge_data (if present)
                 * 'faces': correctly reordered face_data (if present)
+        otherwise, it outputs 3-tuple (vertices, edges, faces).
     """
     has_vert_data = bool(vert_data)
     has_edge_data = bool(edge_data)
     has_face_data = bool(face_data)
-    bm = bmesh_from_pydata(vertices, edges, faces, normal_update=True,
-                           markup_face_data=has_face_data,
-                           markup_edge_data=has_edge_data,
-                           markup_vert_data=has_vert_data)
-    bmesh.ops.remove_doubles(bm, verts=bm.verts[:], dist=d)
-    bm.verts.index_update()
-    bm.edges.index_update()
-    bm.faces.index_update()
-    verts, edges, faces = pydata_from_bmesh(bm)
+    result = weld_mesh(vertices,
+                       edges if has_element(edges) else [],
+                       faces if has_element(faces) else [],
+                       d, add_face_edges=True)
+    verts = result.verts.tolist()
+    edges = result.edges.tolist()
+    faces = result.faces
     if not (has_face_data or has_vert_data or has_edge_data):
-        bm.free()
         return verts, edges, faces
 
+    def reorder(items, init_index):
+        n_items = len(items)
+        return [items[idx] if 0 <= idx < n_items else None for idx in init_index]
+
     data = dict()
-    vert_layer = bm.verts.layers.int.get("initial_index")
-    edge_layer = bm.edges.layers.int.get("initial_index")
-    face_layer = bm.faces.layers.int.get("initial_index")
-    if vert_layer:
-        data['vert_init_index'] = [vert[vert_layer] for vert in bm.verts]
-    if edge_layer:
-        data['edge_init_index'] = [edge[edge_layer] for edge in bm.edges]
-    if face_layer:
-        data['face_init_index'] = [face[face_layer] for face in bm.faces]
+    data['vert_init_index'] = result.vert_init_index.tolist()
+    data['edge_init_index'] = result.edge_init_index.tolist()
+    data['face_init_index'] = result.face_init_index.tolist()
     if has_vert_data:
-        data['verts'] = vert_data_from_bmesh_verts(bm, vert_data)
+        data['verts'] = reorder(vert_data, data['vert_init_index'])
     if has_edge_data:
-        data['edges'] = edge_data_from_bmesh_edges(bm, vert_data)
+        data['edges'] = reorder(edge_data, data['edge_init_index'])
     if has_face_data:
-        data['faces'] = face_data_from_bmesh_faces(bm, face_data)
-    bm.free()
+        data['faces'] = reorder(face_data, data['face_init_index'])
     return verts, edges, faces, data
 
 
-
 def dual_mesh(bm, recalc_normals=True):
     # Make vertices of dual mesh by finding
     # centers of original mesh faces.
@@ -23,7 +23,8 @@ from numpy.linalg import norm as np_margnitude
 from sverchok.data_structure import invert_index_list, has_element
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 from sverchok.utils.math import np_normalize_vectors
-from sverchok.utils.modules.polygon_utils import np_faces_normals
+from sverchok.utils.modules.polygon_utils import np_faces_normals, faces_by_size
+from sverchok.utils.mesh.ragged import SvPolygons
 
 from mathutils import Vector
 
@@ -397,7 +398,7 @@ def prepare_arrays(vertices, faces):
     else:
         np_verts = np.array(vertices)
 
-    if isinstance(faces, np.ndarray):
+    if isinstance(faces, (np.ndarray, SvPolygons)):
         np_faces = faces
     else:
         np_faces = np.array(faces)
@@ -515,14 +516,13 @@ def calc_mesh_normals_np(vertices,
         else:
             norm_func = mean_weighted_unequally
 
-    if np_faces.dtype == object:
-        np_len = np.vectorize(len)
-        lens = np_len(np_faces)
-        pol_types = np.unique(lens)
+    if isinstance(np_faces, SvPolygons) or np_faces.dtype == object:
+        if isinstance(np_faces, SvPolygons):
+            groups = np_faces.by_size()
+        else:
+            groups = faces_by_size(np_faces)
         f_normals = np.zeros((len(np_faces), 3), dtype=np.float64)
-        for pol_sides in pol_types:
-            mask = lens == pol_sides
-            np_faces_g = np.array(np_faces[mask].tolist())
+        for mask, np_faces_g in groups:
             v_pols = np_verts[np_faces_g]
             if get_v_normals:
                 f_normal_g, v_normals = norm_func(np_faces_g, v_pols, v_normals, non_planar, v_normal_alg)
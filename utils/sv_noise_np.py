@@ -0,0 +1,436 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+NumPy implementation of Blender noise bases (see mathutils.noise), with
+turbulence and Musgrave fractals.
+
+All functions work on arrays of points of shape (n, 3) instead of single
+vectors. This is a port of Blender's noise code: the same hash, gradient
+and feature point tables (see sv_noise_tables.py) and the same formulas,
+so the values are equal to the ones of mathutils.noise up to round-off
+(Blender calculates in single precision).
+
+As with mathutils.noise.seed_set(), the seed does not change noise bases
+themselves; it defines offsets of the points at which the components of
+vector noise are calculated, and the random vector used by
+utils.sv_seed_funcs to shift the points (see seed_offset()).
+
+Big arrays of points are split into chunks, which are processed in a thread pool.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from sverchok.utils.sv_noise_tables import HASH, HASH_VECTORS, HASH_POINTS
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_PERM = np.concatenate((HASH, HASH))
+
+_CORNERS = np.array([[i, j, k] for k in (0, 1) for j in (0, 1) for i in (0, 1)])
+_NEIGHBOURS = np.array([[i, j, k] for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)])
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+def evaluate_chunked(function, points, chunk_size=DEFAULT_CHUNK_SIZE, threads=None):
+    """
+    Apply function to points (np.array of shape (n, 3)), splitting the array
+    into chunks of chunk_size points, which are processed in a thread pool
+    of specified size (by default - number of CPUs). NumPy releases the GIL
+    in array operations, so chunks are really calculated in parallel.
+    """
+    n = len(points)
+    if n <= chunk_size:
+        return function(points)
+    chunks = [points[i : i + chunk_size] for i in range(0, n, chunk_size)]
+    if threads is None:
+        threads = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=min(threads, len(chunks))) as executor:
+        results = list(executor.map(function, chunks))
+    return np.concatenate(results)
+
+def _s_curve(t):
+    return t * t * (3.0 - 2.0 * t)
+
+def _fade(t):
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+def _lerp_corners(values, weights):
+    # values: list of 8 arrays in _CORNERS order; weights: (n, 3)
+    wx, wy, wz = weights[:,0], weights[:,1], weights[:,2]
+    x00 = values[0] + wx * (values[1] - values[0])
+    x10 = values[2] + wx * (values[3] - values[2])
+    x01 = values[4] + wx * (values[5] - values[4])
+    x11 = values[6] + wx * (values[7] - values[6])
+    y0 = x00 + wy * (x10 - x00)
+    y1 = x01 + wy * (x11 - x01)
+    return y0 + wz * (y1 - y0)
+
+def _hash(cells):
+    # hash[hash[hash[x] + y] + z]
+    cells = cells & 255
+    return _PERM[_PERM[_PERM[cells[:,0]] + cells[:,1]] + cells[:,2]]
+
+def _hash_perlin(cells):
+    # (p[p[x] + y] + z) of noise3_perlin, without the last permutation
+    cells = cells & 255
+    return (_PERM[_PERM[cells[:,0]] + cells[:,1]] + cells[:,2]) & 255
+
+def _hash_zyx(cells):
+    # hash[hash[hash[z] + y] + x], as in HASHPNT macro
+    cells = cells & 255
+    return _PERM[_PERM[_PERM[cells[:,2]] + cells[:,1]] + cells[:,0]]
+
+def _edge_gradients(h, frac):
+    # grad() of Perlin's improved noise: 12 gradients towards cube edges
+    h = h & 15
+    x, y, z = frac[:,0], frac[:,1], frac[:,2]
+    u = np.where(h < 8, x, y)
+    v = np.where(h < 4, y, np.where((h == 12) | (h == 14), x, z))
+    return np.where(h & 1, -u, u) + np.where(h & 2, -v, v)
+
+def _gradient_noise(cells, frac, weights, hash=_hash):
+    values = []
+    for corner in _CORNERS:
+        g = HASH_VECTORS[hash(cells + corner)]
+        values.append(np.einsum('ij,ij->i', g, frac - corner))
+    return _lerp_corners(values, weights(frac))
+
+def _split(points):
+    cells = np.floor(points)
+    return cells.astype(np.int64), points - cells
+
+def _blender(points):
+    # orgBlenderNoise
+    cells, frac = _split(points)
+    return np.clip(0.5 + _gradient_noise(cells, frac, _s_curve), 0.0, 1.0)
+
+def _blender_shifted(points):
+    # BLI_noise_generic_noise adds 1 to coordinates for Blender's original noise
+    return _blender(points + 1.0)
+
+def _perlin_original(points):
+    # noise3_perlin: coordinates are shifted by 10000 in single precision,
+    # which quantizes the fractional part; this is reproduced as well.
+    t = points.astype(np.float32) + np.float32(10000.0)
+    cells = t.astype(np.int64)
+    frac = (t - np.floor(t)).astype(np.float64)
+    return 0.5 + 0.75 * _gradient_noise(cells, frac, _s_curve, hash=_hash_perlin)
+
+def _perlin_new(points):
+    cells, frac = _split(points)
+    values = []
+    for corner in _CORNERS:
+        values.append(_edge_gradients(_hash(cells + corner), frac - corner))
+    n = _lerp_corners(values, _fade(frac))
+    return 0.5 + 0.5 * n
+
+def _voronoi(points):
+    """
+    Distances from points to 4 nearest feature points: np.array of shape (4, n).
+    """
+    cells = np.floor(points).astype(np.int64)
+    distances = np.empty((len(_NEIGHBOURS), len(points)))
+    for i, neighbour in enumerate(_NEIGHBOURS):
+        cell = cells + neighbour
+        features = cell + HASH_POINTS[_hash_zyx(cell)]
+        distances[i] = np.linalg.norm(points - features, axis=1)
+    nearest = np.partition(distances, 3, axis=0)[:4]
+    return np.sort(nearest, axis=0)
+
+def _voronoi_f2f1(points):
+    da = _voronoi(points)
+    return da[1] - da[0]
+
+def _voronoi_crackle(points):
+    da = _voronoi(points)
+    return np.minimum(10.0 * (da[1] - da[0]), 1.0)
+
+def _cell_noise(points):
+    # BLI_noise_cell, with explicit 32-bit unsigned arithmetic
+    points = (points + 0.000001) * 1.00001
+    cells = np.floor(points).astype(np.int64).astype(np.uint64) & _MASK32
+    n = (cells[:,0] + cells[:,1] * np.uint64(1301) + cells[:,2] * np.uint64(314159)) & _MASK32
+    n = (n ^ (n << np.uint64(13))) & _MASK32
+    m = (n * n) & _MASK32
+    m = (m * np.uint64(15731) + np.uint64(789221)) & _MASK32
+    n = (n * m + np.uint64(1376312589)) & _MASK32
+    return n.astype(np.float64) / 4294967296.0
+
+# Unsigned noise bases, as used by BLI_noise_generic_noise.
+# Names are from sv_noise_utils.noise_options.
+BASES = {
+    'BLENDER': _blender_shifted,
+    'PERLIN_ORIGINAL': _perlin_original,
+    'PERLIN_NEW': _perlin_new,
+    'VORONOI_F1': lambda p: _voronoi(p)[0],
+    'VORONOI_F2': lambda p: _voronoi(p)[1],
+    'VORONOI_F3': lambda p: _voronoi(p)[2],
+    'VORONOI_F4': lambda p: _voronoi(p)[3],
+    'VORONOI_F2F1': _voronoi_f2f1,
+    'VORONOI_CRACKLE': _voronoi_crackle,
+    'CELLNOISE': _cell_noise
+}
+
+# Musgrave fractals use signed variants of the same bases;
+# Blender's original noise is not shifted there.
+_FRACTAL_BASES = dict(BASES, BLENDER=_blender)
+
+class SvNoise(object):
+    """
+    Noise generator for the seed (see mathutils.noise.seed_set).
+    Use get_noise(seed) to reuse generators.
+
+    Noise types are the names from sv_noise_utils.noise_options
+    ('BLENDER', 'PERLIN_ORIGINAL', 'VORONOI_F1' and so on).
+    """
+    def __init__(self, seed=0, chunk_size=DEFAULT_CHUNK_SIZE, threads=None):
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.threads = threads
+        # Same Mersenne Twister as mathutils.noise
+        state = np.random.RandomState(seed & 0xFFFFFFFF)
+        # Blender takes offsets for vector noise from the last 9 words
+        # of the generator state, interpreted as signed integers.
+        words = state.get_state()[1][-9:].astype(np.uint32).view(np.int32)
+        self.vector_offsets = (words * (32.0 / 2147483647)).reshape((3, 3))
+        self.random_vector = self._random_unit_vector(state)
+
+    @staticmethod
+    def _random_unit_vector(state):
+        # mathutils.noise.random_unit_vector() right after seed_set()
+        while True:
+            words = state.randint(0, 1 << 32, size=3, dtype=np.uint32)
+            vector = (2.0 * (words.astype(np.float32) / np.float32(4294967296.0)) - 1.0)[::-1]
+            norm = np.linalg.norm(vector)
+            if 0.0 < norm <= 1.0:
+                return vector / norm
+
+    def _basis(self, noise_type, bases=BASES):
+        if noise_type not in bases:
+            raise Exception(f"Unsupported noise type: {noise_type}")
+        return bases[noise_type]
+
+    def _signed(self, noise_type, bases=BASES):
+        basis = self._basis(noise_type, bases)
+        return lambda points: 2.0 * basis(points) - 1.0
+
+    def _vector(self, noise_type):
+        # noise_vector() of mathutils.noise: signed noise at three offset points
+        signed = self._signed(noise_type)
+        offsets = self.vector_offsets.astype(np.float32)
+        def vector(points):
+            # Blender adds the offsets in single precision; this matters for
+            # PERLIN_ORIGINAL, which quantizes coordinates (see _perlin_original).
+            points = points.astype(np.float32)
+            return np.stack([signed((points + offset).astype(np.float64)) for offset in offsets], axis=1)
+        return vector
+
+    def _run(self, function, points):
+        points = np.asarray(points, dtype=np.float64)
+        return evaluate_chunked(function, points, chunk_size=self.chunk_size, threads=self.threads)
+
+    def noise(self, points, noise_type='PERLIN_ORIGINAL', hard=False):
+        """
+        Unsigned noise, like BLI_noise_generic_noise: values of Perlin
+        noises are in range [0, 1], Voronoi noises give distances.
+        """
+        basis = self._basis(noise_type)
+        if hard:
+            function = lambda ps: np.abs(2.0 * basis(ps) - 1.0)
+        else:
+            function = basis
+        return self._run(function, points)
+
+    def signed_noise(self, points, noise_type='PERLIN_ORIGINAL'):
+        """
+        Signed noise, like mathutils.noise.noise: 2*noise - 1.
+        """
+        return self._run(self._signed(noise_type), points)
+
+    def noise_vector(self, points, noise_type='PERLIN_ORIGINAL'):
+        """
+        Vector noise, like mathutils.noise.noise_vector. Returns np.array of shape (n, 3).
+        """
+        vector = self._vector(noise_type)
+        return self._run(vector, points)
+
+    def turbulence(self, points, octaves, hard, noise_type='PERLIN_ORIGINAL', amplitude_scale=0.5, frequency_scale=2.0):
+        """
+        Sum of noises of several frequencies, like mathutils.noise.turbulence.
+        """
+        signed = self._signed(noise_type)
+        def function(ps):
+            return _turbulence(signed, ps, octaves, hard, amplitude_scale, frequency_scale)
+        return self._run(function, points)
+
+    def turbulence_vector(self, points, octaves, hard, noise_type='PERLIN_ORIGINAL', amplitude_scale=0.5, frequency_scale=2.0):
+        """
+        Vector turbulence, like mathutils.noise.turbulence_vector. Returns np.array of shape (n, 3).
+        """
+        vector = self._vector(noise_type)
+        def function(ps):
+            amp = 1.0
+            out = vector(ps)
+            if hard:
+                out = np.abs(out)
+            for i in range(1, int(octaves)):
+                amp *= amplitude_scale
+                ps = ps * frequency_scale
+                t = vector(ps)
+                if hard:
+                    t = np.abs(t)
+                out = out + amp * t
+            return out
+        return self._run(function, points)
+
+    def fractal(self, points, h_factor, lacunarity, octaves, noise_type='PERLIN_ORIGINAL'):
+        """
+        Fractal Brownian motion, like mathutils.noise.fractal.
+        """
+        signed = self._signed(noise_type, _FRACTAL_BASES)
+        def function(ps):
+            pwHL = lacunarity ** (-h_factor)
+            value = np.zeros(len(ps))
+            pwr = 1.0
+            for i in range(int(octaves)):
+                value += signed(ps) * pwr
+                pwr *= pwHL
+                ps = ps * lacunarity
+            rmd = octaves - np.floor(octaves)
+            if rmd != 0.0:
+                value += rmd * signed(ps) * pwr
+            return value
+        return self._run(function, points)
+
+    def multi_fractal(self, points, h_factor, lacunarity, octaves, noise_type='PERLIN_ORIGINAL'):
+        """
+        Multifractal, like mathutils.noise.multi_fractal.
+        """
+        signed = self._signed(noise_type, _FRACTAL_BASES)
+        def function(ps):
+            pwHL = lacunarity ** (-h_factor)
+            value = np.ones(len(ps))
+            pwr = 1.0
+            for i in range(int(octaves)):
+                value *= pwr * signed(ps) + 1.0
+                pwr *= pwHL
+                ps = ps * lacunarity
+            rmd = octaves - np.floor(octaves)
+            if rmd != 0.0:
+                value *= rmd * signed(ps) * pwr + 1.0
+            return value
+        return self._run(function, points)
+
+    def hetero_terrain(self, points, h_factor, lacunarity, octaves, offset, noise_type='PERLIN_ORIGINAL'):
+        """
+        Heterogeneous terrain, like mathutils.noise.hetero_terrain.
+        """
+        signed = self._signed(noise_type, _FRACTAL_BASES)
+        def function(ps):
+            pwHL = lacunarity ** (-h_factor)
+            pwr = pwHL
+            value = offset + signed(ps)
+            ps = ps * lacunarity
+            for i in range(1, int(octaves)):
+                increment = (signed(ps) + offset) * pwr * value
+                value += increment
+                pwr *= pwHL
+                ps = ps * lacunarity
+            rmd = octaves - np.floor(octaves)
+            if rmd != 0.0:
+                increment = (signed(ps) + offset) * pwr * value
+                value += rmd * increment
+            return value
+        return self._run(function, points)
+
+    def hybrid_multi_fractal(self, points, h_factor, lacunarity, octaves, offset, gain, noise_type='PERLIN_ORIGINAL'):
+        """
+        Hybrid multifractal, like mathutils.noise.hybrid_multi_fractal.
+        """
+        signed = self._signed(noise_type, _FRACTAL_BASES)
+        def function(ps):
+            pwHL = lacunarity ** (-h_factor)
+            pwr = np.full(len(ps), pwHL)
+            result = signed(ps) + offset
+            weight = gain * result
+            ps = ps * lacunarity
+            # Blender stops adding octaves at the point as soon as the weight becomes small;
+            # such points keep their scale and power for the remainder term.
+            active = np.ones(len(ps), dtype=bool)
+            for i in range(1, int(octaves)):
+                active &= weight > 0.001
+                if not active.any():
+                    break
+                weight = np.where(active, np.minimum(weight, 1.0), weight)
+                signal = (signed(ps) + offset) * pwr
+                result = np.where(active, result + weight * signal, result)
+                weight = np.where(active, weight * gain * signal, weight)
+                pwr = np.where(active, pwr * pwHL, pwr)
+                ps = np.where(active[:, np.newaxis], ps * lacunarity, ps)
+            rmd = octaves - np.floor(octaves)
+            if rmd != 0.0:
+                result += rmd * ((signed(ps) + offset) * pwr)
+            return result
+        return self._run(function, points)
+
+    def ridged_multi_fractal(self, points, h_factor, lacunarity, octaves, offset, gain, noise_type='PERLIN_ORIGINAL'):
+        """
+        Ridged multifractal, like mathutils.noise.ridged_multi_fractal.
+        """
+        signed = self._signed(noise_type, _FRACTAL_BASES)
+        def function(ps):
+            pwHL = lacunarity ** (-h_factor)
+            pwr = pwHL
+            signal = offset - np.abs(signed(ps))
+            signal *= signal
+            result = signal
+            for i in range(1, int(octaves)):
+                ps = ps * lacunarity
+                weight = np.clip(signal * gain, 0.0, 1.0)
+                signal = offset - np.abs(signed(ps))
+                signal *= signal
+                signal *= weight
+                result = result + signal * pwr
+                pwr *= pwHL
+            return result
+        return self._run(function, points)
+
+def _turbulence(signed, points, octaves, hard, amplitude_scale, frequency_scale):
+    amp = 1.0
+    out = signed(points)
+    if hard:
+        out = np.abs(out)
+    for i in range(1, int(octaves)):
+        amp *= amplitude_scale
+        points = points * frequency_scale
+        t = amp * signed(points)
+        if hard:
+            t = np.abs(t)
+        out = out + t
+    return out
+
+@lru_cache(maxsize=16)
+def get_noise(seed=0):
+    """
+    SvNoise instance for the seed; instances are cached, so offsets
+    are not calculated again on each node update.
+    """
+    return SvNoise(int(seed))
+
+def seed_offset(seed):
+    """
+    NumPy counterpart of utils.sv_seed_funcs.get_offset(): the vector
+    of length 10, by which the points are shifted for nonzero seed.
+    """
+    if seed == 0:
+        return np.zeros(3)
+    return get_noise(seed).random_vector * 10.0
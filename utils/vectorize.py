@@ -6,6 +6,7 @@ import numpy as np
 from mathutils import Matrix
 
 from sverchok.data_structure import levels_of_list_or_np
+from sverchok.utils.mesh.ragged import SvPolygons
 
 
 SvVerts = List[Tuple[float, float, float]]
@@ -232,7 +233,7 @@ class DataWalker:
     def what_is_next(self):
         if self._stack[-1] is DataWalker.EXIT_VALUE:
             return DataWalker.END
-        if isinstance(self._stack[-1], (list, tuple, np.ndarray)):
+        if isinstance(self._stack[-1], (list, tuple, np.ndarray, SvPolygons)):
             nesting = levels_of_list_or_np(self._stack[-1])
         else:
             nesting = 0
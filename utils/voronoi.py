@@ -119,6 +119,7 @@ from sverchok.utils.logging import debug, info, error
 from sverchok.utils.geom import center, LineEquation2D, CircleEquation2D
 from sverchok.utils.math import weighted_center
 from sverchok.utils.sv_bmesh_utils import pydata_from_bmesh, bmesh_from_pydata
+from sverchok.utils.delaunay2d import voronoi_2d, AUTO
 
 TOLERANCE = 1e-9
 BIG_FLOAT = 1e38
@@ -1111,7 +1112,7 @@ class CircleBounds(Bounds):
         x,y = tuple(v)
         return x,y,0
 
-def voronoi_bounded(sites, bound_mode='BOX', clip=True, draw_bounds=True, draw_hangs=False, make_faces=False, ordered_faces=False, max_sides=10):
+def voronoi_bounded(sites, bound_mode='BOX', clip=True, draw_bounds=True, draw_hangs=False, make_faces=False, ordered_faces=False, max_sides=10, backend=AUTO):
 
     bounds = Bounds.new(bound_mode)
     bounds.init_from_sites(sites)
@@ -1128,7 +1129,11 @@ def voronoi_bounded(sites, bound_mode='BOX', clip=True, draw_bounds=True, draw_h
 
     bounds.r_max = bounds.r_max + delta
 
-    voronoi_data = computeVoronoiDiagram(source_sites, raise_exception=True)
+    voronoi_data = voronoi_2d(sites, backend=backend)
+    if voronoi_data is None:
+        # Less than three sites, or all sites are collinear;
+        # only Fortune's sweep can deal with such cases.
+        voronoi_data = computeVoronoiDiagram(source_sites, raise_exception=True)
     verts = voronoi_data.vertices
     lines = voronoi_data.lines
     all_edges = voronoi_data.edges
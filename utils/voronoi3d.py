@@ -30,10 +30,14 @@ from sverchok.utils.sv_mesh_utils import mask_vertices, polygons_to_edges, point
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata, pydata_from_bmesh, bmesh_clip
 from sverchok.utils.geom import calc_bounds, bounding_sphere, PlaneEquation
 from sverchok.utils.math import project_to_sphere, weighted_center
+from sverchok.utils.halfspace_clip import SvHalfSpaceClipper, is_convex_mesh, clip_cells
+from sverchok.utils.cvt import (SvSampledCVT, DEFAULT_SAMPLES_PER_SITE, field_density,
+            box_samples, ball_samples, mesh_surface_samples, mesh_volume_samples)
+from sverchok.utils.winding_number import SvWindingNumber
 from sverchok.dependencies import scipy, FreeCAD
 
 if scipy is not None:
-    from scipy.spatial import Voronoi, SphericalVoronoi
+    from scipy.spatial import Voronoi, SphericalVoronoi, cKDTree
 
 if FreeCAD is not None:
     from FreeCAD import Base
@@ -234,7 +238,41 @@ def calc_bvh_projections(bvh, sites):
             projections.append(loc)
     return np.array(projections)
 
-def voronoi_on_mesh_bmesh(verts, faces, n_orig_sites, sites, spacing=0.0, fill=True, precision=1e-8):
+def get_halfspaces_per_site(voronoi, spacing):
+    """
+    For each site of Voronoi diagram, return a tuple (normals, offsets) of
+    half-spaces {X: normal . X <= offset}, intersection of which is the
+    region of the site; each half-space is narrowed by half of spacing.
+    Half-spaces are sorted by distance from the site.
+    """
+    ridge_points = np.asarray(voronoi.ridge_points)
+    points = np.asarray(voronoi.points)
+    sites1, sites2 = ridge_points[:,0], ridge_points[:,1]
+    normals = points[sites2] - points[sites1]
+    normals /= np.linalg.norm(normals, axis=1)[:, np.newaxis]
+    middles = 0.5 * (points[sites1] + points[sites2])
+    offsets = (normals * middles).sum(axis=1)
+
+    site_idxs = np.concatenate((sites1, sites2))
+    all_normals = np.concatenate((normals, -normals))
+    all_offsets = np.concatenate((offsets, -offsets))
+    all_offsets -= 0.5 * np.asarray(spacing)[site_idxs]
+    distances = all_offsets - (all_normals * points[site_idxs]).sum(axis=1)
+    order = np.lexsort((distances, site_idxs))
+    site_idxs, all_normals, all_offsets = site_idxs[order], all_normals[order], all_offsets[order]
+    bounds = np.searchsorted(site_idxs, np.arange(len(points) + 1))
+    return [(all_normals[i:j], all_offsets[i:j]) for i, j in zip(bounds[:-1], bounds[1:])]
+
+def voronoi_on_mesh_bmesh(verts, faces, n_orig_sites, sites, spacing=0.0, fill=True, precision=1e-8, implementation='BMESH', workers=None):
+    """
+    Split the mesh into regions of Voronoi diagram of sites.
+
+    implementation can be 'BMESH', to cut cells one by one by bmesh bisect
+    operator, or 'NUMPY', to clip cells by NumPy (see utils/halfspace_clip.py)
+    in a pool of `workers` threads. NumPy clipping with fill=True works only
+    for convex meshes; for other meshes bmesh is used. Cells which NumPy
+    clipper can not process are cut by bmesh as well.
+    """
 
     def get_ridges_per_site(voronoi):
         result = defaultdict(list)
@@ -302,8 +340,18 @@ def voronoi_on_mesh_bmesh(verts, faces, n_orig_sites, sites, spacing=0.0, fill=T
         spacing = repeat_last_for_length(spacing, len(sites))
     else:
         spacing = [spacing for i in range(len(sites))]
-    for site_idx in range(len(sites)):
-        cell = cut_cell(verts, faces, ridges_per_site[site_idx], sites[site_idx], spacing[site_idx])
+
+    def bmesh_cell(site_idx):
+        return cut_cell(verts, faces, ridges_per_site[site_idx], sites[site_idx], spacing[site_idx])
+
+    if implementation == 'NUMPY' and (not fill or is_convex_mesh(verts, faces)):
+        clipper = SvHalfSpaceClipper(verts, faces, fill=fill, precision=precision)
+        cells = clip_cells(clipper, get_halfspaces_per_site(voronoi, spacing),
+                    workers = workers, fallback = bmesh_cell)
+    else:
+        cells = [bmesh_cell(site_idx) for site_idx in range(len(sites))]
+
+    for cell in cells:
         if cell is not None:
             new_verts, new_edges, new_faces = cell
             if new_verts:
@@ -317,7 +365,7 @@ def voronoi_on_mesh(verts, faces, sites, thickness,
     spacing = 0.0,
     clip_inner=True, clip_outer=True, do_clip=True,
     clipping=1.0, mode = 'REGIONS',
-    precision = 1e-8):
+    precision = 1e-8, implementation = 'BMESH'):
     bvh = BVHTree.FromPolygons(verts, faces)
     npoints = len(sites)
 
@@ -354,7 +402,7 @@ def voronoi_on_mesh(verts, faces, sites, thickness,
                     all_points.append(p1)
         verts, edges, faces = voronoi_on_mesh_bmesh(verts, faces, len(sites), all_points,
                 spacing = spacing, fill = (mode == 'VOLUME'),
-                precision = precision)
+                precision = precision, implementation = implementation)
         return verts, edges, faces, all_points
 
 def project_solid_normals(shell, pts, thickness, add_plus=True, add_minus=True, predicate_plus=None, predicate_minus=None):
@@ -472,6 +520,57 @@ def lloyd_in_mesh(verts, faces, sites, n_iterations, thickness=None, weight_fiel
 
     return points
 
+def _sampled_cvt(samples, weight_field):
+    if weight_field is None:
+        return SvSampledCVT(samples)
+    return SvSampledCVT(samples, field_density(weight_field, samples))
+
+def lloyd_on_mesh_samples(verts, faces, sites, n_iterations, weight_field=None,
+        samples_per_site=DEFAULT_SAMPLES_PER_SITE, tolerance=0.0):
+    """
+    Version of lloyd_on_mesh, which estimates centroids of regions by random
+    samples on the surface of the mesh (see utils/cvt.py) instead of
+    building Voronoi diagram on each iteration.
+    """
+    bvh = BVHTree.FromPolygons(verts, faces)
+    samples = mesh_surface_samples(verts, faces, max(len(sites), 1) * samples_per_site)
+    cvt = _sampled_cvt(samples, weight_field)
+
+    def restrict(points):
+        return calc_bvh_projections(bvh, points)
+
+    points = restrict(sites)
+    points = cvt.relax(points, n_iterations, tolerance=tolerance, restrict=restrict)
+    return points.tolist()
+
+def lloyd_in_mesh_samples(verts, faces, sites, n_iterations, weight_field=None,
+        samples_per_site=DEFAULT_SAMPLES_PER_SITE, tolerance=0.0):
+    """
+    Version of lloyd_in_mesh, which estimates centroids of regions by random
+    samples inside the mesh (see utils/cvt.py) instead of building Voronoi
+    diagram on each iteration. Sites which get outside of the mesh are moved
+    to the nearest sample.
+    """
+    winding = SvWindingNumber(verts, faces)
+    samples = mesh_volume_samples(verts, faces, max(len(sites), 1) * samples_per_site, winding=winding)
+    cvt = _sampled_cvt(samples, weight_field)
+    kdt = None
+
+    def restrict(points):
+        nonlocal kdt
+        points = np.array(points, dtype=np.float64)
+        outside = ~winding.are_inside(points)
+        if outside.any():
+            if kdt is None:
+                kdt = cKDTree(samples)
+            _, idxs = kdt.query(points[outside])
+            points[outside] = samples[idxs]
+        return points
+
+    points = restrict(sites)
+    points = cvt.relax(points, n_iterations, tolerance=tolerance, restrict=restrict)
+    return points.tolist()
+
 def lloyd_in_solid(solid, sites, n_iterations, tolerance=1e-4, weight_field=None):
     shell = solid.Shells[0]
 
@@ -786,3 +885,25 @@ def lloyd3d_bounded(bounds, sites, n_iterations, weight_field=None):
         points = iteration(points)
         points = restrict(points)
     return points
+
+def lloyd3d_bounded_samples(bounds, sites, n_iterations, weight_field=None,
+        samples_per_site=DEFAULT_SAMPLES_PER_SITE, tolerance=0.0):
+    """
+    Version of lloyd3d_bounded, which estimates centroids of regions by
+    random samples within the bounds (see utils/cvt.py) instead of building
+    Voronoi diagram on each iteration.
+    """
+    count = max(len(sites), 1) * samples_per_site
+    if isinstance(bounds, BoxBounds):
+        samples = box_samples((bounds.min_x, bounds.min_y, bounds.min_z),
+                              (bounds.max_x, bounds.max_y, bounds.max_z), count)
+    elif isinstance(bounds, SphereBounds):
+        samples = ball_samples(bounds.center, bounds.radius, count)
+    else:
+        raise Exception("Unsupported bounds type")
+    cvt = _sampled_cvt(samples, weight_field)
+
+    points = np.array([point if bounds.contains(point) else bounds.restrict(point) for point in sites], dtype=np.float64)
+    # Centroids of samples are always within convex bounds
+    points = cvt.relax(points, n_iterations, tolerance=tolerance)
+    return points.tolist()
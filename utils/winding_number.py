@@ -0,0 +1,155 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Generalized winding number of triangulated meshes, for inside / outside
+classification of points.
+
+Winding number of a closed mesh is 1 for points inside and 0 for points
+outside; for meshes with holes, non-manifold parts or self-intersections it
+changes smoothly, so thresholding it at 0.5 still gives a reasonable answer
+(unlike counting ray intersections). Exact winding number is a sum of solid
+angles of all triangles; here it is calculated by "fast winding number"
+method (Barill et al, 2018): contribution of a BVH node which is far enough
+from the point is approximated by a dipole, and only triangles of near leaf
+nodes are summed exactly. All points are processed at once.
+"""
+
+import numpy as np
+
+from sverchok.utils.raycast import SvTriangleBVH, _ramp, _cross, _dot
+
+def triangle_solid_angles(points, v0, v1, v2):
+    """
+    Signed solid angles of triangles (v0, v1, v2) as seen from points,
+    by van Oosterom and Strackee formula. All arguments are np.arrays of
+    shape (n, 3). The angle is positive when the point is on the side
+    opposite to triangle normal (i.e., inside, for outward normals).
+    """
+    a = v0 - points
+    b = v1 - points
+    c = v2 - points
+    la = np.linalg.norm(a, axis=1)
+    lb = np.linalg.norm(b, axis=1)
+    lc = np.linalg.norm(c, axis=1)
+    numerator = _dot(a, _cross(b, c))
+    denominator = la*lb*lc + _dot(a, b)*lc + _dot(b, c)*la + _dot(c, a)*lb
+    return 2.0 * np.arctan2(numerator, denominator)
+
+class SvWindingNumber(SvTriangleBVH):
+    """
+    Fast generalized winding number of a triangulated mesh.
+
+    Args:
+        vertices: np.array of shape (n, 3) or list of vertices.
+        polygons: list of polygons; normals are expected to point outside.
+        accuracy: a node of BVH is approximated by a dipole when the
+            distance from the point to the node is more than `accuracy`
+            times the radius of the node. Bigger values are more precise
+            and slower.
+        leaf_size: maximum number of triangles in BVH leaf node.
+        chunk_size: number of points processed together; limits memory usage.
+    """
+    def __init__(self, vertices, polygons, accuracy=2.0, leaf_size=8, chunk_size=16384):
+        super().__init__(vertices, polygons, leaf_size=leaf_size)
+        self.accuracy = accuracy
+        self.chunk_size = chunk_size
+        self._init_dipoles()
+
+    def _init_dipoles(self):
+        # area vectors (area times unit normal) and centers of triangles
+        area_vectors = 0.5 * _cross(self.edge1, self.edge2)[self.order]
+        areas = np.linalg.norm(area_vectors, axis=1)
+        centers = (self.v0 + (self.edge1 + self.edge2) / 3.0)[self.order]
+
+        # Triangles of each node are contiguous in self.order, so sums over
+        # nodes are differences of cumulative sums
+        def node_sums(values):
+            cumulative = np.concatenate((np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)))
+            return cumulative[self.node_start + self.node_count] - cumulative[self.node_start]
+
+        node_areas = node_sums(areas)
+        self.node_normals = node_sums(area_vectors)
+        box_centers = 0.5 * (self.node_lo + self.node_hi).T
+        weighted = node_sums(areas[:, np.newaxis] * centers)
+        good = node_areas > 0
+        self.node_centers = box_centers
+        self.node_centers[good] = weighted[good] / node_areas[good][:, np.newaxis]
+        extent = np.maximum(np.abs(self.node_lo.T - self.node_centers), np.abs(self.node_hi.T - self.node_centers))
+        self.node_radius = np.linalg.norm(extent, axis=1)
+        # per-axis layout, faster to gather during traversal
+        self._centers = np.ascontiguousarray(self.node_centers.T)
+        self._normals = np.ascontiguousarray(self.node_normals.T)
+        self._far_distances2 = (self.accuracy * self.node_radius) ** 2
+
+    def _winding_numbers(self, points):
+        n = len(points)
+        result = np.zeros(n)
+        if len(self.triangles) == 0 or n == 0:
+            return result
+
+        points_t = np.ascontiguousarray(points.T)
+        point_idx = np.arange(n)
+        node_idx = np.zeros(n, dtype=np.int64)
+        while len(point_idx):
+            vectors = [self._centers[axis][node_idx] - points_t[axis][point_idx] for axis in range(3)]
+            distances2 = vectors[0]*vectors[0] + vectors[1]*vectors[1] + vectors[2]*vectors[2]
+            far = distances2 > self._far_distances2[node_idx]
+            if far.any():
+                far_nodes = node_idx[far]
+                d2 = distances2[far]
+                dipole = sum(self._normals[axis][far_nodes] * vectors[axis][far] for axis in range(3))
+                dipole /= d2 * np.sqrt(d2)
+                result += np.bincount(point_idx[far], weights=dipole, minlength=n)
+
+            point_idx, node_idx = point_idx[~far], node_idx[~far]
+            leaf = self.node_left[node_idx] < 0
+            leaf_points, leaf_nodes = point_idx[leaf], node_idx[leaf]
+            if len(leaf_points):
+                counts = self.node_count[leaf_nodes]
+                pts = np.repeat(leaf_points, counts)
+                tris = self.order[np.repeat(self.node_start[leaf_nodes], counts) + _ramp(counts)]
+                v0 = self.v0[tris]
+                angles = triangle_solid_angles(points[pts], v0, v0 + self.edge1[tris], v0 + self.edge2[tris])
+                result += np.bincount(pts, weights=angles, minlength=n)
+
+            inner_points, inner_nodes = point_idx[~leaf], node_idx[~leaf]
+            lefts = self.node_left[inner_nodes]
+            point_idx = np.concatenate((inner_points, inner_points))
+            node_idx = np.concatenate((lefts, lefts + 1))
+
+        return result / (4 * np.pi)
+
+    def winding_numbers(self, points):
+        """
+        Winding numbers of the mesh around points.
+
+        Args:
+            points: np.array of shape (n, 3).
+
+        Returns:
+            np.array of shape (n,).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        result = np.empty(len(points))
+        for i in range(0, len(points), self.chunk_size):
+            chunk = slice(i, i + self.chunk_size)
+            result[chunk] = self._winding_numbers(points[chunk])
+        return result
+
+    def are_inside(self, points, threshold=0.5):
+        """
+        Mask of points which are inside the mesh: np.array of bool, shape (n,).
+        """
+        return self.winding_numbers(points) > threshold
+
+def points_inside_mesh(vertices, polygons, points, accuracy=2.0):
+    """
+    Shortcut for SvWindingNumber(vertices, polygons).are_inside(points).
+    """
+    return SvWindingNumber(vertices, polygons, accuracy=accuracy).are_inside(points)
+